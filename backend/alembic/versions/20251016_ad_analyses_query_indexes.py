@@ -0,0 +1,58 @@
+"""Add composite indexes for ad_analyses query paths
+
+Revision ID: 20251016_analysis_indexes
+Revises: 20250107_5tier, 20250917_passport_system
+Create Date: 2025-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251016_analysis_indexes'
+down_revision: Union[str, Sequence[str], None] = ('20250107_5tier', '20250917_passport_system')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, columns, partial index predicate)
+INDEXES = [
+    # History pages: WHERE user_id = ? ORDER BY created_at DESC, id DESC with a keyset cursor
+    ('ix_ad_analyses_user_created_id', ['user_id', 'created_at', 'id'], None),
+    # Dashboard and analytics aggregates only read scored analyses in a date range
+    ('ix_ad_analyses_user_created_scored', ['user_id', 'created_at'], 'overall_score IS NOT NULL'),
+    # Per-platform breakdowns
+    ('ix_ad_analyses_user_platform', ['user_id', 'platform'], None),
+]
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name == 'postgresql'
+
+    def create_indexes():
+        for name, columns, where in INDEXES:
+            predicate = sa.text(where) if where else None
+            op.create_index(
+                name, 'ad_analyses', columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_where=predicate,
+                sqlite_where=predicate,
+                postgresql_concurrently=postgres
+            )
+
+    if postgres:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction; building
+        # concurrently keeps ad_analyses writable on large tables
+        with op.get_context().autocommit_block():
+            create_indexes()
+    else:
+        create_indexes()
+
+
+def downgrade() -> None:
+    for name, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='ad_analyses', if_exists=True)
@@ -0,0 +1,39 @@
+"""Add ad_analysis_tool_results for per-tool analysis output
+
+Revision ID: 20251016_tool_results
+Revises: 20251016_analysis_indexes
+Create Date: 2025-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251016_tool_results'
+down_revision: Union[str, None] = '20251016_analysis_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing analyses keep their tool output inside analysis_data and are read
+    # as before; new analyses store one row per tool here
+    op.create_table('ad_analysis_tool_results',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('analysis_id', sa.String(), nullable=False),
+    sa.Column('tool_name', sa.String(), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['analysis_id'], ['ad_analyses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('analysis_id', 'tool_name', name='uq_ad_analysis_tool_results_analysis_tool')
+    )
+    op.create_index(op.f('ix_ad_analysis_tool_results_id'), 'ad_analysis_tool_results', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_ad_analysis_tool_results_id'), table_name='ad_analysis_tool_results')
+    op.drop_table('ad_analysis_tool_results')
@@ -6,8 +6,9 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 import asyncpg
 from dataclasses import dataclass
-from ..database import get_db_connection
+from app.core.async_database import get_db_connection
 from ..auth import get_current_user
+from . import dashboard_rollups
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
@@ -104,43 +105,13 @@ async def get_period_metrics(
     start_date: datetime, 
     end_date: datetime
 ) -> Dict[str, Any]:
-    """Get metrics for a specific time period"""
+    """Get metrics for a specific time period from the daily rollups"""
     
-    query = """
-    WITH period_analyses AS (
-        SELECT 
-            id,
-            overall_score,
-            created_at,
-            -- Calculate improvement based on difference between overall_score and baseline
-            -- Using 50 as baseline "before improvement" score
-            CASE 
-                WHEN overall_score IS NOT NULL AND overall_score > 50 
-                THEN overall_score - 50 
-                ELSE 0 
-            END as score_improvement
-        FROM ad_analyses 
-        WHERE user_id = $1 
-            AND created_at >= $2 
-            AND created_at <= $3
-            AND overall_score IS NOT NULL
-    )
-    SELECT 
-        COUNT(*) as ads_analyzed,
-        COALESCE(AVG(score_improvement), 0) as avg_improvement,
-        COALESCE(AVG(overall_score), 0) as avg_score,
-        COALESCE(MAX(overall_score), 0) as top_performing
-    FROM period_analyses;
-    """
-    
-    row = await db.fetchrow(query, user_id, start_date, end_date)
+    rows = await dashboard_rollups.fetch_window_slices(db, user_id, start_date, end_date)
+    metrics = dashboard_rollups.period_metrics(rows)
+    metrics["top_performing"] = int(metrics["top_performing"])
     
-    return {
-        "ads_analyzed": int(row["ads_analyzed"]) if row["ads_analyzed"] else 0,
-        "avg_improvement": float(row["avg_improvement"]) if row["avg_improvement"] else 0.0,
-        "avg_score": float(row["avg_score"]) if row["avg_score"] else 0.0,
-        "top_performing": int(row["top_performing"]) if row["top_performing"] else 0,
-    }
+    return metrics
 
 @router.get("/metrics/detailed")
 async def get_detailed_dashboard_metrics(
@@ -154,120 +125,18 @@ async def get_detailed_dashboard_metrics(
         current_end = datetime.utcnow()
         current_start = current_end - timedelta(days=period_days)
         
-        # Platform breakdown
-        platform_query = """
-        SELECT 
-            platform,
-            COUNT(*) as count,
-            AVG(overall_score) as avg_score
-        FROM ad_analyses 
-        WHERE user_id = $1 
-            AND created_at >= $2 
-            AND created_at <= $3
-            AND overall_score IS NOT NULL
-        GROUP BY platform
-        ORDER BY count DESC;
-        """
-        
-        platform_rows = await db.fetch(platform_query, user_id, current_start, current_end)
-        
-        # Industry breakdown  
-        industry_query = """
-        SELECT 
-            COALESCE(industry, 'Unknown') as industry,
-            COUNT(*) as count,
-            AVG(overall_score) as avg_score
-        FROM ad_analyses 
-        WHERE user_id = $1 
-            AND created_at >= $2 
-            AND created_at <= $3
-            AND overall_score IS NOT NULL
-        GROUP BY industry
-        ORDER BY count DESC
-        LIMIT 10;
-        """
-        
-        industry_rows = await db.fetch(industry_query, user_id, current_start, current_end)
-        
-        # Score distribution
-        score_distribution_query = """
-        SELECT 
-            CASE 
-                WHEN overall_score >= 90 THEN 'Excellent (90-100)'
-                WHEN overall_score >= 80 THEN 'Good (80-89)'
-                WHEN overall_score >= 70 THEN 'Fair (70-79)'
-                WHEN overall_score >= 60 THEN 'Poor (60-69)'
-                ELSE 'Needs Improvement (<60)'
-            END as score_range,
-            COUNT(*) as count
-        FROM ad_analyses 
-        WHERE user_id = $1 
-            AND created_at >= $2 
-            AND created_at <= $3
-            AND overall_score IS NOT NULL
-        GROUP BY score_range
-        ORDER BY 
-            CASE score_range
-                WHEN 'Excellent (90-100)' THEN 1
-                WHEN 'Good (80-89)' THEN 2
-                WHEN 'Fair (70-79)' THEN 3
-                WHEN 'Poor (60-69)' THEN 4
-                ELSE 5
-            END;
-        """
-        
-        score_rows = await db.fetch(score_distribution_query, user_id, current_start, current_end)
+        # Platform, industry and score breakdowns from the period's rollup slices
+        rows = await dashboard_rollups.fetch_window_slices(db, user_id, current_start, current_end)
         
         # Recent activity (last 7 days daily breakdown)
-        activity_query = """
-        SELECT 
-            DATE(created_at) as analysis_date,
-            COUNT(*) as daily_count,
-            AVG(overall_score) as daily_avg_score
-        FROM ad_analyses 
-        WHERE user_id = $1 
-            AND created_at >= $2
-            AND overall_score IS NOT NULL
-        GROUP BY DATE(created_at)
-        ORDER BY analysis_date DESC
-        LIMIT 7;
-        """
-        
         recent_start = current_end - timedelta(days=7)
-        activity_rows = await db.fetch(activity_query, user_id, recent_start)
+        activity_rows = await dashboard_rollups.fetch_window_slices(db, user_id, recent_start, current_end)
         
         return {
-            "platformBreakdown": [
-                {
-                    "platform": row["platform"] or "Unknown",
-                    "count": int(row["count"]),
-                    "avgScore": round(float(row["avg_score"]), 1)
-                }
-                for row in platform_rows
-            ],
-            "industryBreakdown": [
-                {
-                    "industry": row["industry"],
-                    "count": int(row["count"]),
-                    "avgScore": round(float(row["avg_score"]), 1)
-                }
-                for row in industry_rows
-            ],
-            "scoreDistribution": [
-                {
-                    "range": row["score_range"],
-                    "count": int(row["count"])
-                }
-                for row in score_rows
-            ],
-            "recentActivity": [
-                {
-                    "date": row["analysis_date"].isoformat(),
-                    "count": int(row["daily_count"]),
-                    "avgScore": round(float(row["daily_avg_score"]), 1)
-                }
-                for row in activity_rows
-            ]
+            "platformBreakdown": dashboard_rollups.breakdown(rows, "platform"),
+            "industryBreakdown": dashboard_rollups.breakdown(rows, "industry", limit=10),
+            "scoreDistribution": dashboard_rollups.score_distribution(rows),
+            "recentActivity": dashboard_rollups.daily_activity(activity_rows, days=7)
         }
         
     except Exception as e:
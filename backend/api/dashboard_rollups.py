@@ -0,0 +1,280 @@
+# Dashboard Rollups Query Layer
+# Answers dashboard period and breakdown queries from ad_analysis_daily_rollups
+# (database/migrations/005_ad_analysis_daily_rollups.sql) instead of raw ad_analyses rows
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Only the asyncpg query path needs it; the Supabase path runs without asyncpg
+    import asyncpg
+
+# (rollup column, dashboard label, lowest score in the bucket), best bucket first
+SCORE_BUCKETS: List[Tuple[str, str, float]] = [
+    ("bucket_excellent", "Excellent (90-100)", 90),
+    ("bucket_good", "Good (80-89)", 80),
+    ("bucket_fair", "Fair (70-79)", 70),
+    ("bucket_poor", "Poor (60-69)", 60),
+    ("bucket_needs_improvement", "Needs Improvement (<60)", 0),
+]
+
+IMPROVEMENT_BASELINE = 50
+
+
+@dataclass
+class RollupWindow:
+    """
+    A [start, end] dashboard window split for the rollup table
+
+    Whole UTC days in [full_start, full_end) are read from rollups; the partial
+    days at either edge (at most two) are aggregated from ad_analyses.
+    """
+    start: datetime
+    end: datetime
+    full_start: date
+    full_end: date
+
+    @property
+    def has_full_days(self) -> bool:
+        return self.full_start < self.full_end
+
+    @property
+    def full_start_at(self) -> datetime:
+        return datetime.combine(self.full_start, time.min, tzinfo=timezone.utc)
+
+    @property
+    def full_end_at(self) -> datetime:
+        return datetime.combine(self.full_end, time.min, tzinfo=timezone.utc)
+
+    def raw_ranges(self) -> List[Tuple[datetime, datetime, bool]]:
+        """(from, to, to_inclusive) ranges to aggregate from ad_analyses"""
+        if not self.has_full_days:
+            return [(self.start, self.end, True)]
+        ranges = []
+        if self.start < self.full_start_at:
+            ranges.append((self.start, self.full_start_at, False))
+        if self.full_end_at <= self.end:
+            ranges.append((self.full_end_at, self.end, True))
+        return ranges
+
+
+def _as_utc(value: datetime) -> datetime:
+    # The dashboard passes naive datetime.utcnow() values
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def split_window(start: datetime, end: datetime) -> RollupWindow:
+    """Split a window into whole UTC days and partial edge days"""
+    start, end = _as_utc(start), _as_utc(end)
+    full_start = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+    # The end day is always partial: the window includes end itself but not the rest of its day
+    full_end = max(full_start, end.date())
+    return RollupWindow(start=start, end=end, full_start=full_start, full_end=full_end)
+
+
+@dataclass
+class RollupAggregate:
+    """Running COUNT/SUM/MIN/MAX and score histogram over rollup slices"""
+    count: int = 0
+    score_sum: float = 0.0
+    score_min: Optional[float] = None
+    score_max: Optional[float] = None
+    improvement_sum: float = 0.0
+    buckets: Dict[str, int] = field(default_factory=lambda: {column: 0 for column, _, _ in SCORE_BUCKETS})
+
+    def add(self, row: Dict[str, Any]):
+        """Merge one rollup row (or raw-row slice shaped like one)"""
+        count = int(row["analyses_count"] or 0)
+        if not count:
+            return
+        self.count += count
+        self.score_sum += float(row["score_sum"])
+        self.improvement_sum += float(row["improvement_sum"])
+        row_min, row_max = float(row["score_min"]), float(row["score_max"])
+        self.score_min = row_min if self.score_min is None else min(self.score_min, row_min)
+        self.score_max = row_max if self.score_max is None else max(self.score_max, row_max)
+        for column in self.buckets:
+            self.buckets[column] += int(row[column] or 0)
+
+    @property
+    def avg_score(self) -> float:
+        return self.score_sum / self.count if self.count else 0.0
+
+    @property
+    def avg_improvement(self) -> float:
+        return self.improvement_sum / self.count if self.count else 0.0
+
+
+def aggregate_rows(rows: List[Dict[str, Any]], key: Optional[str] = None) -> Dict[Any, RollupAggregate]:
+    """Merge rollup slices, grouped by a column (platform, industry, day) or into one total under None"""
+    aggregates: Dict[Any, RollupAggregate] = {}
+    for row in rows:
+        group = row[key] if key else None
+        aggregates.setdefault(group, RollupAggregate()).add(row)
+    return aggregates
+
+
+def score_bucket(score: float) -> str:
+    for column, _, lowest in SCORE_BUCKETS:
+        if score >= lowest:
+            return column
+    return SCORE_BUCKETS[-1][0]
+
+
+def rollup_rows_from_analyses(analyses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Aggregate raw ad_analyses rows into rollup-shaped slices
+
+    Used for the partial edge days of a window when rows are fetched through
+    the Supabase client instead of SQL.
+    """
+    slices: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    for analysis in analyses:
+        score = analysis.get("overall_score")
+        if score is None:
+            continue
+        score = float(score)
+        created_at = analysis.get("created_at")
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        day = _as_utc(created_at).date()
+        key = (day, analysis.get("platform") or "Unknown", analysis.get("industry") or "Unknown")
+        row = slices.get(key)
+        if row is None:
+            row = {"day": day, "platform": key[1], "industry": key[2], "analyses_count": 0,
+                   "score_sum": 0.0, "score_min": score, "score_max": score, "improvement_sum": 0.0,
+                   **{column: 0 for column, _, _ in SCORE_BUCKETS}}
+            slices[key] = row
+        row["analyses_count"] += 1
+        row["score_sum"] += score
+        row["score_min"] = min(row["score_min"], score)
+        row["score_max"] = max(row["score_max"], score)
+        row["improvement_sum"] += max(score - IMPROVEMENT_BASELINE, 0)
+        row[score_bucket(score)] += 1
+    return list(slices.values())
+
+
+# Per (day, platform, industry) slices of a window: rollup rows for whole days
+# plus the same aggregates over raw rows for the partial edge days
+_SLICE_COLUMNS = """
+    analyses_count, score_sum, score_min, score_max, improvement_sum,
+    bucket_excellent, bucket_good, bucket_fair, bucket_poor, bucket_needs_improvement
+"""
+
+_ROLLUP_SLICES_QUERY = f"""
+SELECT day, platform, industry, {_SLICE_COLUMNS}
+FROM ad_analysis_daily_rollups
+WHERE user_id = $1 AND day >= $2 AND day < $3
+"""
+
+_RAW_SLICE_QUERY = """
+SELECT
+    (created_at AT TIME ZONE 'UTC')::date AS day,
+    platform,
+    COALESCE(industry, 'Unknown') AS industry,
+    COUNT(*) AS analyses_count,
+    SUM(overall_score) AS score_sum,
+    MIN(overall_score) AS score_min,
+    MAX(overall_score) AS score_max,
+    SUM(GREATEST(overall_score - 50, 0)) AS improvement_sum,
+    COUNT(*) FILTER (WHERE overall_score >= 90) AS bucket_excellent,
+    COUNT(*) FILTER (WHERE overall_score >= 80 AND overall_score < 90) AS bucket_good,
+    COUNT(*) FILTER (WHERE overall_score >= 70 AND overall_score < 80) AS bucket_fair,
+    COUNT(*) FILTER (WHERE overall_score >= 60 AND overall_score < 70) AS bucket_poor,
+    COUNT(*) FILTER (WHERE overall_score < 60) AS bucket_needs_improvement
+FROM ad_analyses
+WHERE user_id = $1
+    AND created_at >= $2
+    AND created_at {end_operator} $3
+    AND overall_score IS NOT NULL
+GROUP BY 1, 2, 3
+"""
+
+
+async def fetch_window_slices(
+    db: "asyncpg.Connection",
+    user_id: str,
+    start: datetime,
+    end: datetime
+) -> List[Dict[str, Any]]:
+    """Get the rollup slices covering [start, end] for a user"""
+    window = split_window(start, end)
+    rows: List[Dict[str, Any]] = []
+
+    if window.has_full_days:
+        rows.extend(dict(row) for row in await db.fetch(
+            _ROLLUP_SLICES_QUERY, user_id, window.full_start, window.full_end
+        ))
+
+    for range_start, range_end, inclusive in window.raw_ranges():
+        query = _RAW_SLICE_QUERY.format(end_operator="<=" if inclusive else "<")
+        rows.extend(dict(row) for row in await db.fetch(query, user_id, range_start, range_end))
+
+    return rows
+
+
+def fetch_window_slices_supabase(client, user_id: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """Get the rollup slices covering [start, end] for a user through the Supabase client"""
+    window = split_window(start, end)
+    rows: List[Dict[str, Any]] = []
+
+    if window.has_full_days:
+        result = client.table("ad_analysis_daily_rollups").select(
+            f"day, platform, industry, {' '.join(_SLICE_COLUMNS.split())}"
+        ).eq("user_id", user_id).gte("day", window.full_start.isoformat()).lt(
+            "day", window.full_end.isoformat()
+        ).execute()
+        rows.extend(result.data or [])
+
+    for range_start, range_end, inclusive in window.raw_ranges():
+        query = client.table("ad_analyses").select(
+            "platform, industry, overall_score, created_at"
+        ).eq("user_id", user_id).gte("created_at", range_start.isoformat()).not_.is_("overall_score", "null")
+        query = query.lte("created_at", range_end.isoformat()) if inclusive else query.lt("created_at", range_end.isoformat())
+        rows.extend(rollup_rows_from_analyses(query.execute().data or []))
+
+    return rows
+
+
+def period_metrics(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """ads_analyzed / avg_improvement / avg_score / top_performing for a window"""
+    total = aggregate_rows(rows).get(None, RollupAggregate())
+    return {
+        "ads_analyzed": total.count,
+        "avg_improvement": total.avg_improvement,
+        "avg_score": total.avg_score,
+        "top_performing": total.score_max or 0,
+    }
+
+
+def breakdown(rows: List[Dict[str, Any]], key: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Count and average score per platform or industry, most used first"""
+    groups = sorted(aggregate_rows(rows, key).items(), key=lambda item: item[1].count, reverse=True)
+    return [
+        {key: group or "Unknown", "count": aggregate.count, "avgScore": round(aggregate.avg_score, 1)}
+        for group, aggregate in groups[:limit]
+    ]
+
+
+def score_distribution(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Non-empty score buckets, best first"""
+    total = aggregate_rows(rows).get(None, RollupAggregate())
+    return [
+        {"range": label, "count": total.buckets[column]}
+        for column, label, _ in SCORE_BUCKETS
+        if total.buckets[column]
+    ]
+
+
+def daily_activity(rows: List[Dict[str, Any]], days: int) -> List[Dict[str, Any]]:
+    """Count and average score per day, most recent first"""
+    by_day = sorted(aggregate_rows(rows, "day").items(), key=lambda item: str(item[0]), reverse=True)
+    return [
+        {
+            "date": day.isoformat() if isinstance(day, date) else str(day),
+            "count": aggregate.count,
+            "avgScore": round(aggregate.avg_score, 1)
+        }
+        for day, aggregate in by_day[:days]
+    ]
@@ -1,10 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, File, UploadFile, Form
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from pydantic import BaseModel
 from app.core.database import get_db
+from app.core.async_database import get_optional_async_db, AsyncSessionLocal
+from app.services import analysis_repository
+from app.services.analytics_service import invalidate_user_analytics
 from app.services.ad_analysis_service_enhanced import EnhancedAdAnalysisService
 from app.services.production_ai_generator import ProductionAIService
+from app.services.speculative_generation import get_speculative_generator
 from app.auth import get_current_user, require_subscription_limit
 from app.models.user import User
 from app.schemas.ads import (
@@ -19,6 +25,7 @@ from app.utils.text_parser import TextParser
 from app.utils.file_extract import FileExtractor
 from app.core.config import settings
 import json
+import time
 import uuid
 from datetime import datetime
 
@@ -115,7 +122,8 @@ async def analyze_ad(
                 # Generate AI-powered analysis and improvement
                 ai_result = await ai_service.generate_ad_alternative(
                     ad_data=ad_data,
-                    variant_type="comprehensive_analysis"
+                    variant_type="comprehensive_analysis",
+                    tenant_id=str(current_user.id)
                 )
                 
                 # Extract scores from AI result
@@ -173,6 +181,11 @@ async def analyze_ad(
             db=db
         )
         
+        # Pre-generate alternatives for the generate-alternatives call that usually follows
+        if settings.SPECULATIVE_GENERATION_ENABLED:
+            tier = current_user.subscription_tier.value if current_user.subscription_tier else None
+            get_speculative_generator().schedule(analysis_id, current_user.id, tier, ad_data)
+        
         return {
             "analysis_id": analysis_id,
             "scores": scores,
@@ -189,14 +202,43 @@ async def get_analysis_history(
     limit: int = 10,
     offset: int = 0,
     db: Session = Depends(get_db),
+    async_db: Optional[AsyncSession] = Depends(get_optional_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get user's analysis history"""
+    if async_db is not None:
+        return await analysis_repository.get_user_analysis_history(async_db, current_user.id, limit, offset)
+    
     ad_service = EnhancedAdAnalysisService(db)
     history = ad_service.get_user_analysis_history(current_user.id, limit, offset)
     
     return history
 
+@router.get("/history/page")
+async def get_analysis_history_page(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    async_db: Optional[AsyncSession] = Depends(get_optional_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get one page of the user's analysis history, newest first
+
+    Pass the returned next_cursor to get the following page; it is null on
+    the last page. Page loads cost the same at any depth, unlike /history
+    with a large offset.
+    """
+    limit = max(1, min(limit, 100))
+    try:
+        if async_db is not None:
+            return await analysis_repository.get_user_analysis_history_page(
+                async_db, current_user.id, limit=limit, cursor=cursor
+            )
+        ad_service = EnhancedAdAnalysisService(db)
+        return ad_service.get_user_analysis_history_page(current_user.id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/analysis/{analysis_id}")
 async def get_analysis_detail(
     analysis_id: str,
@@ -215,10 +257,24 @@ async def get_analysis_detail(
 @router.post("/generate-alternatives")
 async def generate_alternatives(
     ad: AdInput,
+    analysis_id: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Generate alternative ad variations"""
+    """Generate alternative ad variations
+    
+    Pass the analysis_id of a just-finished analysis to get alternatives
+    pre-generated in the background, when speculative generation is enabled.
+    """
+    if analysis_id and settings.SPECULATIVE_GENERATION_ENABLED:
+        pregenerated = await get_speculative_generator().claim(
+            analysis_id, current_user.id, ad_data=ad.dict(),
+            wait=settings.SPECULATIVE_GENERATION_CLAIM_WAIT
+        )
+        if pregenerated:
+            # Same shape as freshly generated alternatives
+            alternatives = [AdAlternative(**alternative) for alternative in pregenerated]
+            return {"alternatives": alternatives, "pregenerated": True}
     
     ad_service = EnhancedAdAnalysisService(db)
     alternatives = await ad_service.generate_ad_alternatives(ad)
@@ -366,6 +422,117 @@ Return as JSON array with objects containing headline, body_text, cta, platform
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
 
 
+# Variant types rotated through when streaming generated or improved copy
+STREAM_VARIANT_TYPES = ['persuasive', 'emotional', 'data_driven']
+MAX_STREAM_VARIANTS = 5
+
+
+class ImproveStreamRequest(BaseModel):
+    ad: AdInput
+    variant_types: List[str] = STREAM_VARIANT_TYPES
+    creativity_level: int = 5
+    urgency_level: int = 5
+    emotion_type: str = 'inspiring'
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _stream_alternatives_response(ad_data: dict, variants: List[dict], tenant_id: str) -> StreamingResponse:
+    """
+    Stream alternatives as Server-Sent Events
+
+    Events: 'field' (one completed headline/body/CTA/reason line of a variant),
+    'result' (a variant's validated result), 'error' (a variant that failed)
+    and a final 'done' with counts.
+    """
+    if not ai_service:
+        raise HTTPException(status_code=503, detail="AI generation service not available")
+    if not ad_data.get('headline') or not ad_data.get('body_text'):
+        raise HTTPException(status_code=400, detail="Headline and body text are required")
+
+    async def events():
+        start_time = time.time()
+        first_content_time = None
+        completed = 0
+        failed = 0
+        async for event in ai_service.stream_alternatives(ad_data, variants, tenant_id=tenant_id):
+            event_type = event.pop('type')
+            if event_type == 'field' and first_content_time is None:
+                first_content_time = time.time() - start_time
+            elif event_type == 'result':
+                completed += 1
+            elif event_type == 'error':
+                failed += 1
+            yield _sse_event(event_type, event)
+        yield _sse_event('done', {
+            'completed': completed,
+            'failed': failed,
+            'time_to_first_content': first_content_time,
+            'total_time': time.time() - start_time
+        })
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/generate/stream")
+async def generate_ad_copy_stream(
+    request: GenerateRequest,
+    current_user: User = Depends(require_subscription_limit)
+):
+    """Generate ad copy with AI, streaming each variation's fields as they are written"""
+    ad_data = {
+        "headline": request.valueProposition,
+        "body_text": f"{request.productService}. {request.keyBenefits or ''}".strip(),
+        "cta": "",
+        "platform": request.platform,
+        "industry": request.industry,
+        "target_audience": request.targetAudience
+    }
+    variants = [
+        {
+            "variant_type": STREAM_VARIANT_TYPES[i % len(STREAM_VARIANT_TYPES)],
+            "emoji_level": "moderate" if request.includeEmojis else "minimal",
+            "brand_tone": request.tone,
+            "target_audience_description": request.targetAudience,
+            "urgency_level": 7 if request.includeUrgency else 4
+        }
+        for i in range(min(request.numVariations, MAX_STREAM_VARIANTS))
+    ]
+    return _stream_alternatives_response(ad_data, variants, str(current_user.id))
+
+
+@router.post("/improve/stream")
+async def improve_ad_copy_stream(
+    request: ImproveStreamRequest,
+    current_user: User = Depends(require_subscription_limit)
+):
+    """Improve an ad with AI, streaming each alternative's fields as they are written"""
+    ad_data = {
+        "headline": request.ad.headline,
+        "body_text": request.ad.body_text,
+        "cta": request.ad.cta,
+        "platform": request.ad.platform,
+        "industry": request.ad.industry,
+        "target_audience": request.ad.target_audience
+    }
+    variants = [
+        {
+            "variant_type": variant_type,
+            "creativity_level": request.creativity_level,
+            "urgency_level": request.urgency_level,
+            "emotion_type": request.emotion_type
+        }
+        for variant_type in request.variant_types[:MAX_STREAM_VARIANTS]
+    ]
+    return _stream_alternatives_response(ad_data, variants, str(current_user.id))
+
+
 # Helper functions for AI analysis
 async def _fallback_to_enhanced_service(request: AdAnalysisRequest, db: Session, current_user: User, analysis_id: str):
     """Fallback to enhanced service when AI is not available"""
@@ -427,13 +594,19 @@ async def _save_analysis_to_supabase(analysis_id: str, user_id: int, ad_data: di
             emotion_score=scores.get('emotion_score', 75),
             cta_strength_score=scores.get('cta_strength_score', 75),
             platform_fit_score=scores.get('platform_fit_score', 75),
-            feedback=feedback,
-            analysis_data=scores.get('analysis_data', {}),
+            # AdAnalysis has no feedback column; keep the text with the analysis data
+            analysis_data={**scores.get('analysis_data', {}), 'feedback_text': feedback},
             created_at=datetime.utcnow()
         )
         
-        db.add(analysis_record)
-        db.commit()
+        if AsyncSessionLocal is not None:
+            # Insert on the async pool so the commit doesn't block the event loop
+            async with AsyncSessionLocal() as session:
+                await analysis_repository.save_analysis(session, analysis_record)
+        else:
+            db.add(analysis_record)
+            db.commit()
+        await invalidate_user_analytics(user_id)
         
         print(f"✅ Saved analysis {analysis_id} to database")
         
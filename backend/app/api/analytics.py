@@ -23,7 +23,7 @@ async def get_dashboard_analytics(
 ):
     """Get user dashboard analytics"""
     analytics_service = AnalyticsService(db)
-    analytics = analytics_service.get_user_analytics(current_user.id)
+    analytics = await analytics_service.get_user_analytics_cached(current_user.id)
     
     return analytics
 
@@ -151,7 +151,8 @@ async def generate_creative_variants(
             brand_voice_description=request.generation_options.brand_voice_description,
             include_cta=request.generation_options.include_cta,
             cta_style=request.generation_options.cta_style,
-            filter_cliches=request.creative_controls.filter_cliches
+            filter_cliches=request.creative_controls.filter_cliches,
+            tenant_id=str(current_user.id)
         )
         
         # Log successful generation for analytics
@@ -289,7 +290,8 @@ async def get_platform_optimizations(
         # Generate platform-specific optimization
         optimization_result = await ai_service.generate_ad_alternative(
             ad_data=ad_data,
-            variant_type=f"platform_optimization_{request.platform}"
+            variant_type=f"platform_optimization_{request.platform}",
+            tenant_id=str(current_user.id)
         )
         
         return {
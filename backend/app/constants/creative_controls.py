@@ -315,7 +315,8 @@ def build_creative_instructions(
     
     # Cliché filtering
     if filter_cliches:
-        cliche_list = ", ".join(list(MARKETING_CLICHES)[:15])  # Show first 15 examples
+        # Sorted so the prompt (and its generation cache key) is the same in every worker
+        cliche_list = ", ".join(sorted(MARKETING_CLICHES)[:15])  # Show first 15 examples
         instructions.append(f"AVOID marketing clichés such as: {cliche_list} and similar overused phrases.")
         instructions.append("Use fresh, original language instead of worn-out marketing speak.")
     
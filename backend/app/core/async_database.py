@@ -0,0 +1,170 @@
+"""
+Async data access on the shared asyncpg pool
+
+Every async route should reach PostgreSQL through this module instead of
+the sync ``SessionLocal`` (which blocks the event loop for the whole query)
+or a private connection helper. Both access styles draw from the single
+``async_engine`` pool configured in ``app.core.database``:
+
+- ``get_async_db`` yields an ORM ``AsyncSession``
+- ``get_db_connection`` yields a raw asyncpg connection for hand-written SQL
+
+Every query is timed; slow ones are logged and totals are available from
+``get_query_stats()`` for health and monitoring endpoints.
+"""
+
+import logging
+import time
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_engine, AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Per-worker query timing counters"""
+
+    def __init__(self, slow_query_ms: float = 200.0):
+        self.slow_query_ms = slow_query_ms
+        self.queries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow_queries = 0
+        self.errors = 0
+
+    def record(self, statement: str, elapsed_ms: float, failed: bool = False):
+        self.queries += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if failed:
+            self.errors += 1
+        if elapsed_ms >= self.slow_query_ms:
+            self.slow_queries += 1
+            logger.warning(f"Slow query ({elapsed_ms:.1f}ms): {' '.join(statement.split())[:200]}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'queries': self.queries,
+            'avg_ms': self.total_ms / self.queries if self.queries else 0.0,
+            'max_ms': self.max_ms,
+            'slow_queries': self.slow_queries,
+            'errors': self.errors,
+            'slow_query_ms': self.slow_query_ms
+        }
+
+
+query_stats = QueryStats(slow_query_ms=settings.DB_SLOW_QUERY_MS)
+
+
+def _instrument_engine(engine):
+    """Time every statement an (async) engine executes"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['query_start'].pop()
+        query_stats.record(statement, (time.perf_counter() - started) * 1000)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _record_error(exception_context):
+        starts = exception_context.connection.info.get('query_start') if exception_context.connection else None
+        if starts:
+            elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+            query_stats.record(exception_context.statement or '', elapsed_ms, failed=True)
+
+
+if async_engine is not None:
+    _instrument_engine(async_engine)
+
+
+class TimedConnection:
+    """asyncpg connection wrapper that records the timing of every query"""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    async def _timed(self, method: str, query: str, *args, **kwargs):
+        started = time.perf_counter()
+        failed = False
+        try:
+            return await getattr(self._connection, method)(query, *args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            query_stats.record(query, (time.perf_counter() - started) * 1000, failed=failed)
+
+    async def fetch(self, query: str, *args, **kwargs):
+        return await self._timed('fetch', query, *args, **kwargs)
+
+    async def fetchrow(self, query: str, *args, **kwargs):
+        return await self._timed('fetchrow', query, *args, **kwargs)
+
+    async def fetchval(self, query: str, *args, **kwargs):
+        return await self._timed('fetchval', query, *args, **kwargs)
+
+    async def execute(self, query: str, *args, **kwargs):
+        return await self._timed('execute', query, *args, **kwargs)
+
+    def __getattr__(self, name):
+        # transaction(), prepare(), copy_* etc. pass through untimed
+        return getattr(self._connection, name)
+
+
+def async_db_available() -> bool:
+    """Whether the async pool is configured (PostgreSQL DATABASE_URL)"""
+    return async_engine is not None
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency yielding an AsyncSession from the shared pool"""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database not available - ensure a PostgreSQL DATABASE_URL is configured")
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def get_optional_async_db() -> AsyncGenerator[Optional[AsyncSession], None]:
+    """Like get_async_db, but yields None when only the sync (e.g. SQLite) database is configured"""
+    if AsyncSessionLocal is None:
+        yield None
+        return
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def get_db_connection() -> AsyncGenerator[TimedConnection, None]:
+    """FastAPI dependency yielding a raw asyncpg connection from the shared pool"""
+    if async_engine is None:
+        raise RuntimeError("Async database not available - ensure a PostgreSQL DATABASE_URL is configured")
+    async with async_engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        yield TimedConnection(raw.driver_connection)
+
+
+def get_query_stats() -> Dict[str, Any]:
+    """Query timing and pool usage of this worker"""
+    stats: Dict[str, Any] = {'queries': query_stats.get_stats(), 'pool': None}
+    if async_engine is not None:
+        pool = async_engine.pool
+        stats['pool'] = {
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow()
+        }
+    return stats
+
+
+async def dispose_async_engine():
+    """Close pooled connections (application shutdown)"""
+    if async_engine is not None:
+        await async_engine.dispose()
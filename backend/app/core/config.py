@@ -56,7 +56,12 @@ class Settings(BaseSettings):
     
     # Database Configuration  
     DATABASE_URL: Optional[str] = Field(None, description="PostgreSQL database URL")
-    
+    DB_ASYNC_POOL_SIZE: int = Field(default=10, description="Persistent connections in each worker's async (asyncpg) pool")
+    DB_ASYNC_MAX_OVERFLOW: int = Field(default=10, description="Extra async connections allowed under burst load")
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=256, description="Prepared statements cached per async connection; 0 when behind a transaction-mode pgbouncer")
+    DB_COMMAND_TIMEOUT: float = Field(default=30.0, description="Seconds before an async query is cancelled")
+    DB_SLOW_QUERY_MS: float = Field(default=200.0, description="Async queries slower than this are logged")
+
     # Supabase Configuration  
     REACT_APP_SUPABASE_URL: Optional[str] = Field(None, description="Supabase project URL")
     REACT_APP_SUPABASE_ANON_KEY: Optional[str] = Field(None, description="Supabase anon key")
@@ -82,8 +87,43 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = Field(None, description="OpenAI API key")
     OPENAI_MAX_TOKENS: int = Field(default=2000, description="OpenAI max tokens per request")
     OPENAI_RATE_LIMIT: int = Field(default=100, description="OpenAI requests per minute")
+    OPENAI_BASE_URL: Optional[str] = Field(None, description="OpenAI-compatible API base URL, e.g. http://127.0.0.1:8090/v1 for scripts/mock_llm_server.py")
+    GEMINI_API_ENDPOINT: Optional[str] = Field(None, description="Gemini API endpoint override (REST transport), e.g. http://127.0.0.1:8090")
     HUGGINGFACE_API_KEY: Optional[str] = Field(None, description="HuggingFace API key")
     
+    # Pooled LLM client settings (one client per provider per worker)
+    LLM_MAX_CONNECTIONS: int = Field(default=100, description="Maximum open connections per LLM provider client")
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=20, description="Idle keep-alive connections kept per LLM provider client")
+    LLM_KEEPALIVE_EXPIRY: float = Field(default=30.0, description="Seconds an idle LLM connection is kept alive")
+    LLM_REQUEST_TIMEOUT: float = Field(default=60.0, description="LLM request timeout in seconds")
+    LLM_RATE_LIMIT_MAX_WAIT: float = Field(default=30.0, description="Longest an LLM request may queue for provider rate-limit capacity, in seconds")
+    LLM_ROUTER_HEDGING: bool = Field(default=True, description="Send a slow LLM request to a second provider once it exceeds the first provider's p95 latency")
+    LLM_ROUTER_MIN_HEDGE_DELAY: float = Field(default=1.0, description="Minimum seconds before a hedged LLM request is sent")
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5, description="Consecutive failures that take an LLM provider out of rotation")
+    LLM_CIRCUIT_ERROR_RATE: float = Field(default=0.5, description="Rolling error rate that takes an LLM provider out of rotation")
+    LLM_CIRCUIT_COOLDOWN: float = Field(default=30.0, description="Seconds an unhealthy LLM provider stays out of rotation before a probe")
+    LLM_PROMPT_TOKEN_BUDGET: int = Field(default=0, description="Maximum generation prompt tokens; optional prompt sections are trimmed to fit (0 = full prompts)")
+    
+    # Generated-alternative cache (keyed on tenant, provider, prompt and sampling parameters)
+    AI_GENERATION_CACHE_ENABLED: bool = Field(default=True, description="Cache AI-generated ad alternatives")
+    AI_GENERATION_CACHE_TTL: int = Field(default=3600, description="Generated alternative cache lifetime in seconds")
+    AI_GENERATION_CACHE_MAX_ENTRIES: int = Field(default=2048, description="Generated alternatives held in the in-process cache")
+    AI_GENERATION_CACHE_MAX_CREATIVITY: int = Field(default=7, description="Highest creativity level whose generations are cached")
+    AI_GENERATION_CACHE_SHARED: bool = Field(default=False, description="Share the generation cache across workers via REDIS_URL")
+
+    # User analytics cache (dropped whenever the user saves a new analysis)
+    ANALYTICS_CACHE_ENABLED: bool = Field(default=True, description="Cache per-user dashboard analytics")
+    ANALYTICS_CACHE_TTL: int = Field(default=300, description="Seconds cached analytics are served; bounds staleness across unshared workers")
+    ANALYTICS_CACHE_MAX_ENTRIES: int = Field(default=4096, description="Users whose analytics are held in the in-process cache")
+    ANALYTICS_CACHE_SHARED: bool = Field(default=False, description="Share the analytics cache (and its invalidation) across workers via REDIS_URL")
+
+    # Speculative pre-generation of alternatives once an analysis finishes (opt-in)
+    SPECULATIVE_GENERATION_ENABLED: bool = Field(default=False, description="Pre-generate alternatives in the background after each analysis")
+    SPECULATIVE_GENERATION_TTL: int = Field(default=900, description="Seconds pre-generated alternatives are kept for the generate endpoint")
+    SPECULATIVE_GENERATION_MAX_CONCURRENCY: int = Field(default=2, description="Speculative generation jobs running at once per worker")
+    SPECULATIVE_GENERATION_RESERVE: float = Field(default=0.5, description="Fraction of each LLM provider's rate limit a speculative job must leave free to start")
+    SPECULATIVE_GENERATION_CLAIM_WAIT: float = Field(default=3.0, description="Seconds the generate endpoint waits for a running speculative job")
+    
     # Redis Configuration
     REDIS_URL: str = Field(default="redis://localhost:6379/0", description="Redis connection URL")
     
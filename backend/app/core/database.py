@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
@@ -68,14 +69,23 @@ try:
         async_database_url = async_database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
         
         try:
+            # One pool per worker shared by AsyncSession and raw asyncpg access
+            # (app.core.async_database); prepared statements are cached per connection
             async_engine = create_async_engine(
-                async_database_url,
+                make_url(async_database_url).update_query_dict({
+                    "prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)
+                }),
                 pool_pre_ping=True,
                 pool_recycle=3600,
                 pool_timeout=20,
-                pool_size=5,
-                max_overflow=10,
-                echo=False
+                pool_size=settings.DB_ASYNC_POOL_SIZE,
+                max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+                echo=False,
+                connect_args={
+                    "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                    "command_timeout": settings.DB_COMMAND_TIMEOUT,
+                    "server_settings": {"application_name": "adcopysurge-api"}
+                }
             )
             AsyncSessionLocal = sessionmaker(
                 bind=async_engine,
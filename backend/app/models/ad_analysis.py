@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, Text, JSON, DateTime, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, Text, JSON, DateTime, ForeignKey, Boolean, Index, UniqueConstraint, text
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -25,8 +25,10 @@ class AdAnalysis(Base):
     cta_strength_score = Column(Float, nullable=False)
     platform_fit_score = Column(Float, nullable=False)
     
-    # Detailed analysis data (stored as JSON)
-    analysis_data = Column(JSON, nullable=True)
+    # Detailed analysis data (stored as JSON). Deferred: list and aggregate
+    # queries never load it; it is fetched on first access or with undefer().
+    # Per-tool outputs live in AnalysisToolResult rows, not in this blob.
+    analysis_data = deferred(Column(JSON, nullable=True))
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -36,10 +38,43 @@ class AdAnalysis(Base):
     user = relationship("User", back_populates="analyses")
     competitor_benchmarks = relationship("CompetitorBenchmark", back_populates="analysis", cascade="all, delete-orphan")
     generated_alternatives = relationship("AdGeneration", back_populates="analysis", cascade="all, delete-orphan")
+    tool_results = relationship("AnalysisToolResult", back_populates="analysis", cascade="all, delete-orphan")
+    
+    # Query-path indexes (alembic 20251016_analysis_indexes)
+    __table_args__ = (
+        Index('ix_ad_analyses_user_created_id', 'user_id', 'created_at', 'id'),
+        Index('ix_ad_analyses_user_created_scored', 'user_id', 'created_at',
+              postgresql_where=text('overall_score IS NOT NULL'),
+              sqlite_where=text('overall_score IS NOT NULL')),
+        Index('ix_ad_analyses_user_platform', 'user_id', 'platform'),
+    )
     
     def __repr__(self):
         return f"<AdAnalysis(id='{self.id}', score={self.overall_score}, platform='{self.platform}')>"
 
+class AnalysisToolResult(Base):
+    __tablename__ = "ad_analysis_tool_results"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    analysis_id = Column(String, ForeignKey("ad_analyses.id", ondelete="CASCADE"), nullable=False)
+    tool_name = Column(String, nullable=False)
+    
+    # Full output of one tool for one analysis
+    result = Column(JSON, nullable=False)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationship
+    analysis = relationship("AdAnalysis", back_populates="tool_results")
+    
+    __table_args__ = (
+        UniqueConstraint('analysis_id', 'tool_name', name='uq_ad_analysis_tool_results_analysis_tool'),
+    )
+    
+    def __repr__(self):
+        return f"<AnalysisToolResult(analysis_id='{self.analysis_id}', tool='{self.tool_name}')>"
+
 class CompetitorBenchmark(Base):
     __tablename__ = "competitor_benchmarks"
     
@@ -10,6 +10,7 @@ from app.core.config import settings
 # from app.services.cta_analyzer import CTAAnalyzer
 from app.models.ad_analysis import AdAnalysis
 from app.schemas.ads import AdInput, CompetitorAd, AdScore, AdAlternative, AdAnalysisResponse
+from app.services.analytics_service import invalidate_user_analytics
 
 class AdAnalysisService:
     """Main service for ad analysis and optimization"""
@@ -97,6 +98,7 @@ class AdAnalysisService:
         )
         self.db.add(analysis_record)
         self.db.commit()
+        await invalidate_user_analytics(user_id)
         
         return AdAnalysisResponse(
             analysis_id=analysis_id,
@@ -314,7 +316,7 @@ class AdAnalysisService:
         for comp_ad in competitor_ads:
             comp_text = f"{comp_ad.headline} {comp_ad.body_text} {comp_ad.cta}"
             comp_clarity = self.readability_analyzer.analyze_clarity(comp_text)
-            comp_emotion = self.emotion_analyzer.analyze_emotion(comp_text)
+            comp_emotion = await self.emotion_analyzer.analyze_emotion_async(comp_text)
             comp_cta = self.cta_analyzer.analyze_cta(comp_ad.cta, comp_ad.platform)
             
             competitor_scores.append({
@@ -350,7 +352,7 @@ class AdAnalysisService:
         """Get user's analysis history"""
         analyses = self.db.query(AdAnalysis)\
                           .filter(AdAnalysis.user_id == user_id)\
-                          .order_by(AdAnalysis.created_at.desc())\
+                          .order_by(AdAnalysis.created_at.desc(), AdAnalysis.id.desc())\
                           .offset(offset)\
                           .limit(limit)\
                           .all()
@@ -17,7 +17,11 @@ from packages.tools_sdk.tools import register_all_tools
 # Legacy imports for compatibility
 from app.schemas.ads import AdInput, CompetitorAd, AdScore, AdAlternative, AdAnalysisResponse
 from app.models.ad_analysis import AdAnalysis
+from app.services.analytics_service import invalidate_user_analytics
 from app.core.logging import get_logger
+from app.services.analysis_repository import (
+    history_query, history_item, history_page, detail_query, store_tool_results, full_analysis_data
+)
 
 logger = get_logger(__name__)
 
@@ -293,9 +297,11 @@ class EnhancedAdAnalysisService:
                 },
                 created_at=orchestration_result.timestamp
             )
+            store_tool_results(analysis_record)
             
             self.db.add(analysis_record)
             self.db.commit()
+            await invalidate_user_analytics(user_id)
             
             logger.info(f"Saved analysis {orchestration_result.request_id} to database")
             
@@ -378,29 +384,34 @@ class EnhancedAdAnalysisService:
     # Legacy compatibility methods
     def get_user_analysis_history(self, user_id: int, limit: int = 10, offset: int = 0) -> List[Dict]:
         """Get user's analysis history - legacy compatibility method"""
-        analyses = self.db.query(AdAnalysis)\
-                          .filter(AdAnalysis.user_id == user_id)\
-                          .order_by(AdAnalysis.created_at.desc())\
-                          .offset(offset)\
-                          .limit(limit)\
-                          .all()
+        analyses = self.db.execute(history_query(user_id, limit, offset=offset)).scalars().all()
+        return [history_item(analysis) for analysis in analyses]
+    
+    def get_user_analysis_history_page(self, user_id: int, limit: int = 10,
+                                       cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get one page of the user's analysis history, newest first
         
-        return [
-            {
-                'id': analysis.id,
-                'headline': analysis.headline,
-                'platform': analysis.platform,
-                'overall_score': analysis.overall_score,
-                'created_at': analysis.created_at.isoformat()
-            }
-            for analysis in analyses
-        ]
+        Keyset-paginated on (created_at, id), so every page is an index range
+        seek on ix_ad_analyses_user_created_id regardless of how deep it is.
+        
+        Args:
+            user_id: Owner of the analyses
+            limit: Page size
+            cursor: next_cursor of the previous page; None for the first page
+            
+        Returns:
+            {'items': [...], 'next_cursor': str or None}
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        analyses = self.db.execute(history_query(user_id, limit + 1, cursor=cursor)).scalars().all()
+        return history_page(analyses, limit)
     
     def get_analysis_by_id(self, analysis_id: str, user_id: int) -> Optional[Dict]:
         """Get specific analysis by ID - legacy compatibility method"""
-        analysis = self.db.query(AdAnalysis)\
-                          .filter(AdAnalysis.id == analysis_id, AdAnalysis.user_id == user_id)\
-                          .first()
+        analysis = self.db.execute(detail_query(analysis_id, user_id)).scalars().first()
         
         if not analysis:
             return None
@@ -419,7 +430,7 @@ class EnhancedAdAnalysisService:
                 'cta_strength': analysis.cta_strength_score,
                 'platform_fit_score': analysis.platform_fit_score
             },
-            'analysis_data': analysis.analysis_data,
+            'analysis_data': full_analysis_data(analysis),
             'created_at': analysis.created_at.isoformat()
         }
     
@@ -17,6 +17,10 @@ from packages.tools_sdk.tools import register_all_tools
 # Legacy imports for compatibility
 from app.schemas.ads import AdInput, CompetitorAd, AdScore, AdAlternative, AdAnalysisResponse
 from app.models.ad_analysis import AdAnalysis
+from app.models.user import User
+from app.services.speculative_generation import get_speculative_generator
+from app.services.analysis_repository import store_tool_results
+from app.services.analytics_service import invalidate_user_analytics
 from app.core.logging import get_logger
 from app.core.exceptions import (
     ProductionAnalysisError, 
@@ -64,7 +68,8 @@ class ProductionAdAnalysisService:
         user_id: int, 
         ad: AdInput, 
         competitor_ads: List[CompetitorAd] = [],
-        requested_tools: List[str] = None
+        requested_tools: List[str] = None,
+        subscription_tier: Optional[str] = None
     ) -> AdAnalysisResponse:
         """
         Perform production ad analysis - FAIL FAST on any errors
@@ -74,6 +79,8 @@ class ProductionAdAnalysisService:
             ad: Ad input data
             competitor_ads: Optional competitor ads for comparison
             requested_tools: Specific tools to run (if None, runs all available)
+            subscription_tier: User's tier value, selecting the speculative generation
+                budget (looked up when None)
             
         Returns:
             AdAnalysisResponse with REAL analysis data only
@@ -152,9 +159,41 @@ class ProductionAdAnalysisService:
             legacy_response
         )
         
+        # Scores are known; pre-generate alternatives for the likely follow-up request
+        self._schedule_pregeneration(user_id, ad, legacy_response.analysis_id, subscription_tier)
+        
         logger.info(f"Production analysis completed successfully for user {user_id}")
         return legacy_response
     
+    def _schedule_pregeneration(
+        self,
+        user_id: int,
+        ad: AdInput,
+        analysis_id: str,
+        subscription_tier: Optional[str]
+    ):
+        """Start speculative alternative generation - never fails the analysis"""
+        generator = get_speculative_generator()
+        if not generator.enabled:
+            return
+        
+        try:
+            if subscription_tier is None:
+                user = self.db.query(User).filter(User.id == user_id).first()
+                if user and user.subscription_tier:
+                    subscription_tier = user.subscription_tier.value
+            
+            generator.schedule(analysis_id, user_id, subscription_tier, {
+                'headline': ad.headline,
+                'body_text': ad.body_text,
+                'cta': ad.cta,
+                'platform': ad.platform,
+                'industry': getattr(ad, 'industry', None),
+                'target_audience': getattr(ad, 'target_audience', None)
+            })
+        except Exception as e:
+            logger.warning(f"Could not schedule speculative generation for analysis {analysis_id}: {e}")
+    
     def _validate_input_data(self, ad: AdInput, user_id: int):
         """Validate input data for production requirements"""
         if not ad.headline or not ad.headline.strip():
@@ -715,9 +754,11 @@ class ProductionAdAnalysisService:
                 },
                 created_at=orchestration_result.timestamp
             )
+            store_tool_results(analysis_record)
             
             self.db.add(analysis_record)
             self.db.commit()
+            await invalidate_user_analytics(user_id)
             
             logger.info(f"Saved production analysis {orchestration_result.request_id} to database")
             
@@ -22,12 +22,16 @@ except ImportError:
     from scoring_calibration import BaselineScoreCalibrator
     from improved_feedback_engine import ImprovedFeedbackGenerator
 
+from packages.tools_sdk.text_matcher import default_matcher, LexiconHits, BOUNDARY_NONE
+
 # Import OpenAI if available
 try:
     import openai
     from openai import AsyncOpenAI
+    from app.services.ai_client_registry import AIClientRegistry, get_ai_client_registry
     OPENAI_AVAILABLE = True
 except ImportError:
+    AIClientRegistry = None
     OPENAI_AVAILABLE = False
 
 
@@ -50,18 +54,33 @@ class AdImprovementService:
     Creates 3 different variations: emotional, logical, and urgency-based.
     """
     
-    def __init__(self):
+    def __init__(self, client_registry: Optional[AIClientRegistry] = None):
         self.calibrator = BaselineScoreCalibrator()
         self.feedback_generator = ImprovedFeedbackGenerator()
         
-        # Initialize OpenAI client if available
-        self.openai_client = None
-        if OPENAI_AVAILABLE and os.getenv("OPENAI_API_KEY"):
-            self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # OpenAI client comes from the worker's pooled client registry, if available
+        self.client_registry = client_registry
+        self.openai_key = os.getenv("OPENAI_API_KEY") if OPENAI_AVAILABLE else None
         
         # Load enhancement templates
         self.improvement_strategies = self._load_improvement_strategies()
-        
+    
+        # Strategy keywords are matched as raw substrings, in one pass per text
+        self.matcher = default_matcher
+        self.matcher.register_many(
+            "improvement.strategies",
+            {strategy: config['keywords'] for strategy, config in self.improvement_strategies.items()},
+            boundary=BOUNDARY_NONE
+        )
+    
+    @property
+    def openai_client(self) -> Optional['AsyncOpenAI']:
+        """Pooled OpenAI client for the configured key, or None without one"""
+        if not self.openai_key:
+            return None
+        registry = self.client_registry or get_ai_client_registry()
+        return registry.get_openai_client(self.openai_key)
+
     def _load_improvement_strategies(self) -> Dict[str, Any]:
         """Load strategic improvement templates."""
         return {
@@ -313,7 +332,15 @@ WHY: [why urgency approach will increase immediate conversions]
         
         return templates.get(strategy, templates["emotional"])
     
-    def _predict_variant_score(self, variant_text: str, platform: str) -> Dict[str, float]:
+    def predict_variant_scores(self, variant_texts: List[str], platform: str) -> List[Dict[str, Any]]:
+        """Predict scores for a batch of variants, detecting strategies with one keyword scan."""
+        return [
+            self._predict_variant_score(text, platform, self._strategy_from_hits(hits))
+            for text, hits in zip(variant_texts, self.matcher.scan_many(variant_texts))
+        ]
+    
+    def _predict_variant_score(self, variant_text: str, platform: str,
+                               detected_strategy: Optional[str] = None) -> Dict[str, float]:
         """Predict score for a variant using our calibrated scoring system."""
         # Mock component scores based on variant improvements
         # In a real system, you'd run the full analysis pipeline
@@ -333,7 +360,8 @@ WHY: [why urgency approach will increase immediate conversions]
         }
         
         # Determine strategy from content analysis
-        detected_strategy = self._detect_variant_strategy(variant_text)
+        if detected_strategy is None:
+            detected_strategy = self._detect_variant_strategy(variant_text)
         bonuses = strategy_bonuses.get(detected_strategy, {})
         
         # Apply bonuses
@@ -359,12 +387,14 @@ WHY: [why urgency approach will increase immediate conversions]
     
     def _detect_variant_strategy(self, text: str) -> str:
         """Detect which strategy a variant is using based on keywords."""
-        text_lower = text.lower()
-        
-        strategy_scores = {}
-        for strategy, config in self.improvement_strategies.items():
-            score = sum(1 for keyword in config['keywords'] if keyword in text_lower)
-            strategy_scores[strategy] = score
+        return self._strategy_from_hits(self.matcher.scan(text))
+    
+    def _strategy_from_hits(self, hits: LexiconHits) -> str:
+        """Pick the strategy with the most distinct keywords present in a scanned text."""
+        strategy_scores = {
+            strategy: len(hits.found(f"improvement.strategies.{strategy}"))
+            for strategy in self.improvement_strategies
+        }
         
         # Return strategy with highest keyword match
         return max(strategy_scores, key=strategy_scores.get)
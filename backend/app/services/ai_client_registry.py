@@ -0,0 +1,262 @@
+"""
+Pooled, long-lived LLM provider clients
+
+Generating alternatives used to build a fresh ``openai.AsyncOpenAI`` client
+(and ``genai.GenerativeModel``) per call, throwing away the HTTP connection
+pool and TLS session every time. The AIClientRegistry keeps one client per
+provider per worker process, with bounded connection pools and keep-alive,
+so fan-outs like ``generate_multiple_alternatives`` reuse warm connections.
+Clients are warmed at startup and closed on shutdown.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Dict, Any, Optional, Tuple
+
+import openai
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
+try:
+    import google.generativeai as genai
+    GENAI_AVAILABLE = True
+except ImportError:
+    genai = None
+    GENAI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _key_id(api_key: str) -> str:
+    """Short, non-reversible identifier for an API key"""
+    return hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:12]
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class AIClientRegistry:
+    """
+    One pooled client per AI provider (and API key) per worker
+
+    Async HTTP clients are bound to the event loop they first ran on; a
+    client is rebuilt if it is requested from a different loop (e.g. a
+    script calling ``asyncio.run`` twice) and the replaced one is closed.
+
+    Args:
+        max_connections: Maximum open connections per provider client
+        max_keepalive_connections: Idle connections kept open per provider client
+        keepalive_expiry: Seconds an idle connection is kept alive
+        request_timeout: Request timeout in seconds
+        openai_base_url: OpenAI-compatible API base URL; None uses the OpenAI API
+        gemini_api_endpoint: Gemini API endpoint; None uses the Google API
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 30.0, request_timeout: float = 60.0,
+                 openai_base_url: Optional[str] = None, gemini_api_endpoint: Optional[str] = None):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.request_timeout = request_timeout
+        self.openai_base_url = openai_base_url
+        self.gemini_api_endpoint = gemini_api_endpoint
+
+        # key -> (event loop, client)
+        self._openai_clients: Dict[str, Tuple[Any, Any]] = {}
+        self._gemini_models: Dict[str, Tuple[Any, Any]] = {}
+        # Close tasks for replaced clients, referenced until they finish
+        self._closing = set()
+        self._stats = {
+            'openai_clients_created': 0,
+            'openai_client_reuses': 0,
+            'openai_clients_retired': 0,
+            'gemini_models_created': 0,
+            'gemini_model_reuses': 0,
+            'warmups': 0,
+            'warmup_failures': 0
+        }
+
+    @classmethod
+    def from_settings(cls, settings) -> 'AIClientRegistry':
+        """Build a registry from application settings"""
+        return cls(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY,
+            request_timeout=settings.LLM_REQUEST_TIMEOUT,
+            openai_base_url=settings.OPENAI_BASE_URL,
+            gemini_api_endpoint=settings.GEMINI_API_ENDPOINT
+        )
+
+    def get_openai_client(self, api_key: str) -> 'openai.AsyncOpenAI':
+        """Get the pooled OpenAI client for an API key, creating it on first use"""
+        key = _key_id(api_key)
+        loop = _current_loop()
+        entry = self._openai_clients.get(key)
+        if entry is not None and (entry[0] is loop or loop is None):
+            self._stats['openai_client_reuses'] += 1
+            return entry[1]
+        if entry is not None:
+            self._retire_openai_client(*entry)
+
+        http_client = None
+        if HTTPX_AVAILABLE:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry
+                ),
+                timeout=httpx.Timeout(self.request_timeout)
+            )
+        client = openai.AsyncOpenAI(api_key=api_key, http_client=http_client, timeout=self.request_timeout,
+                                    base_url=self.openai_base_url)
+
+        self._openai_clients[key] = (loop, client)
+        self._stats['openai_clients_created'] += 1
+        return client
+
+    def _retire_openai_client(self, client_loop: Optional[asyncio.AbstractEventLoop], client: Any):
+        """
+        Close a client replaced because it was requested from another event loop
+
+        The close runs on the client's own loop when that loop is still
+        running (in another thread); otherwise on the current loop, where a
+        failure only means its connections already died with their loop.
+        """
+        self._stats['openai_clients_retired'] += 1
+        if client_loop is not None and client_loop.is_running() and not client_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self._close_openai_client(client), client_loop)
+            return
+        loop = _current_loop()
+        if loop is None:
+            return
+        task = loop.create_task(self._close_openai_client(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_openai_client(client: Any):
+        try:
+            await client.close()
+        except Exception as e:
+            logger.debug(f"Closing a replaced OpenAI client failed: {e}")
+
+    def gemini_configure_options(self) -> Dict[str, Any]:
+        """Extra ``genai.configure`` arguments for the configured endpoint"""
+        if not self.gemini_api_endpoint:
+            return {}
+        return {'transport': 'rest', 'client_options': {'api_endpoint': self.gemini_api_endpoint}}
+
+    def get_gemini_model(self, model_name: str = 'gemini-pro'):
+        """Get the shared Gemini model handle, creating it on first use"""
+        if not GENAI_AVAILABLE:
+            raise RuntimeError("google-generativeai package not installed")
+
+        loop = _current_loop()
+        entry = self._gemini_models.get(model_name)
+        if entry is not None and (entry[0] is loop or loop is None):
+            self._stats['gemini_model_reuses'] += 1
+            return entry[1]
+
+        model = genai.GenerativeModel(model_name)
+        self._gemini_models[model_name] = (loop, model)
+        self._stats['gemini_models_created'] += 1
+        return model
+
+    async def warm_up(self, openai_key: Optional[str] = None, gemini_model: Optional[str] = None,
+                      connect: bool = True) -> Dict[str, Any]:
+        """
+        Create provider clients ahead of the first request
+
+        Args:
+            openai_key: OpenAI API key to build a client for
+            gemini_model: Gemini model name to build a handle for
+            connect: Open a connection (TLS handshake) with a lightweight request
+
+        Returns:
+            Dictionary with per-provider warm-up status and timing
+        """
+        results = {}
+
+        if openai_key:
+            start_time = time.time()
+            try:
+                client = self.get_openai_client(openai_key)
+                if connect:
+                    await client.models.list()
+                results['openai'] = {'status': 'warm', 'time': time.time() - start_time}
+                self._stats['warmups'] += 1
+            except Exception as e:
+                logger.warning(f"OpenAI client warm-up failed: {e}")
+                results['openai'] = {'status': 'failed', 'error': str(e)}
+                self._stats['warmup_failures'] += 1
+
+        if gemini_model and GENAI_AVAILABLE:
+            try:
+                self.get_gemini_model(gemini_model)
+                results['gemini'] = {'status': 'warm'}
+                self._stats['warmups'] += 1
+            except Exception as e:
+                logger.warning(f"Gemini model warm-up failed: {e}")
+                results['gemini'] = {'status': 'failed', 'error': str(e)}
+                self._stats['warmup_failures'] += 1
+
+        return results
+
+    async def aclose(self):
+        """Close every pooled client"""
+        for loop, client in self._openai_clients.values():
+            if loop is not None and loop is not _current_loop():
+                # Bound to a loop that is gone; its connections died with it
+                continue
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close OpenAI client: {e}")
+        self._openai_clients.clear()
+        self._gemini_models.clear()
+        pending = [task for task in self._closing if task.get_loop() is _current_loop()]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get client creation and reuse counters"""
+        return {
+            **self._stats,
+            'openai_clients': len(self._openai_clients),
+            'gemini_models': len(self._gemini_models),
+            'max_connections': self.max_connections,
+            'max_keepalive_connections': self.max_keepalive_connections,
+            'keepalive_expiry': self.keepalive_expiry,
+            'openai_base_url': self.openai_base_url,
+            'gemini_api_endpoint': self.gemini_api_endpoint
+        }
+
+
+_default_registry: Optional[AIClientRegistry] = None
+
+
+def get_ai_client_registry() -> AIClientRegistry:
+    """Get the process-wide client registry, configured from settings"""
+    global _default_registry
+    if _default_registry is None:
+        try:
+            from app.core.config import settings
+            _default_registry = AIClientRegistry.from_settings(settings)
+        except Exception as e:
+            logger.warning(f"Using default LLM client pool settings: {e}")
+            _default_registry = AIClientRegistry()
+    return _default_registry
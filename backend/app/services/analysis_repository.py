@@ -0,0 +1,131 @@
+"""
+Ad analysis queries shared by the sync and async data access paths
+
+Each function builds a SQLAlchemy statement (or shapes its result) without
+executing it, so the sync services run it on a ``Session`` and async routes
+run the same statement on an ``AsyncSession`` from app.core.async_database.
+"""
+
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload, undefer
+
+from app.models.ad_analysis import AdAnalysis, AnalysisToolResult
+from app.utils.pagination import CursorTimestamp, encode_cursor, decode_cursor
+
+
+# Columns a history row needs; body text and analysis data stay in the database
+HISTORY_COLUMNS = (AdAnalysis.id, AdAnalysis.headline, AdAnalysis.platform,
+                   AdAnalysis.overall_score, AdAnalysis.created_at)
+
+
+def history_query(user_id: int, limit: int, offset: int = 0, cursor: Optional[str] = None):
+    """
+    Newest-first analyses of a user
+
+    With a cursor the rows start just after the cursor's row, as a keyset
+    seek on (created_at, id); history pages select limit + 1 rows to detect
+    whether another page follows.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = select(AdAnalysis).options(load_only(*HISTORY_COLUMNS)).where(AdAnalysis.user_id == user_id)
+    if cursor:
+        created_at, analysis_id = decode_cursor(cursor)
+        query = query.where(tuple_(AdAnalysis.created_at, AdAnalysis.id)
+                            < tuple_(literal(created_at, CursorTimestamp()), literal(analysis_id)))
+    query = query.order_by(AdAnalysis.created_at.desc(), AdAnalysis.id.desc())
+    if offset:
+        query = query.offset(offset)
+    return query.limit(limit)
+
+
+def history_item(analysis: AdAnalysis) -> Dict[str, Any]:
+    return {
+        'id': analysis.id,
+        'headline': analysis.headline,
+        'platform': analysis.platform,
+        'overall_score': analysis.overall_score,
+        'created_at': analysis.created_at.isoformat()
+    }
+
+
+def history_page(analyses: List[AdAnalysis], limit: int) -> Dict[str, Any]:
+    """Shape rows from history_query into {'items', 'next_cursor'}"""
+    has_more = len(analyses) > limit
+    analyses = analyses[:limit]
+    return {
+        'items': [history_item(analysis) for analysis in analyses],
+        'next_cursor': encode_cursor(analyses[-1].created_at, analyses[-1].id) if has_more else None
+    }
+
+
+async def get_user_analysis_history(db: AsyncSession, user_id: int, limit: int = 10,
+                                    offset: int = 0) -> List[Dict[str, Any]]:
+    """Async counterpart of AdAnalysisService.get_user_analysis_history"""
+    result = await db.execute(history_query(user_id, limit, offset=offset))
+    return [history_item(analysis) for analysis in result.scalars().all()]
+
+
+async def get_user_analysis_history_page(db: AsyncSession, user_id: int, limit: int = 10,
+                                         cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Async counterpart of EnhancedAdAnalysisService.get_user_analysis_history_page"""
+    result = await db.execute(history_query(user_id, limit + 1, cursor=cursor))
+    return history_page(result.scalars().all(), limit)
+
+
+def detail_query(analysis_id: str, user_id: int):
+    """One analysis with its analysis data and per-tool results, in two round trips"""
+    return select(AdAnalysis).options(
+        undefer(AdAnalysis.analysis_data),
+        selectinload(AdAnalysis.tool_results)
+    ).where(AdAnalysis.id == analysis_id, AdAnalysis.user_id == user_id)
+
+
+def store_tool_results(analysis: AdAnalysis):
+    """
+    Move per-tool outputs out of an unsaved analysis' analysis_data
+
+    Each entry of analysis_data['orchestration_result']['tool_results'] becomes
+    an AnalysisToolResult row, leaving analysis_data as a small summary.
+    """
+    data = analysis.analysis_data or {}
+    orchestration = data.get('orchestration_result')
+    if not isinstance(orchestration, dict) or not orchestration.get('tool_results'):
+        return
+    analysis.tool_results = [
+        AnalysisToolResult(tool_name=tool_name, result=result)
+        for tool_name, result in orchestration['tool_results'].items()
+    ]
+    analysis.analysis_data = {
+        **data,
+        'orchestration_result': {key: value for key, value in orchestration.items() if key != 'tool_results'}
+    }
+
+
+def full_analysis_data(analysis: AdAnalysis) -> Optional[Dict[str, Any]]:
+    """
+    analysis_data in its original shape, with per-tool results merged back
+
+    Rows saved before tool results moved to their own table carry them
+    inside analysis_data already and are returned unchanged.
+    """
+    data = analysis.analysis_data
+    if not analysis.tool_results:
+        return data
+    data = dict(data or {})
+    data['orchestration_result'] = {
+        **(data.get('orchestration_result') or {}),
+        'tool_results': {row.tool_name: row.result for row in analysis.tool_results}
+    }
+    return data
+
+
+async def save_analysis(db: AsyncSession, analysis: AdAnalysis):
+    """Insert an analysis row (and its tool results) and commit"""
+    store_tool_results(analysis)
+    db.add(analysis)
+    await db.commit()
@@ -1,11 +1,16 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
+from sqlalchemy import func, case, literal_column
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta, timezone
+import copy
 import io
 import base64
+import logging
 from app.models.ad_analysis import AdAnalysis
 from app.models.user import User
+from packages.tools_sdk.result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
 
 # Optional imports for PDF generation
 try:
@@ -19,6 +24,41 @@ except ImportError:
     REPORTLAB_AVAILABLE = False
     print("⚠️ ReportLab not available - PDF generation disabled")
 
+_analytics_cache: Optional[ResultCache] = None
+_analytics_cache_configured = False
+
+
+def get_analytics_cache() -> Optional[ResultCache]:
+    """Get the process-wide user analytics cache, or None when caching is disabled"""
+    global _analytics_cache, _analytics_cache_configured
+    if not _analytics_cache_configured:
+        _analytics_cache_configured = True
+        try:
+            from app.core.config import settings
+            if settings.ANALYTICS_CACHE_ENABLED:
+                _analytics_cache = ResultCache(
+                    namespace="user_analytics",
+                    max_entries=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+                    default_ttl=settings.ANALYTICS_CACHE_TTL,
+                    redis_url=settings.REDIS_URL if settings.ANALYTICS_CACHE_SHARED else None
+                )
+        except Exception as e:
+            logger.warning(f"Using default analytics cache settings: {e}")
+            _analytics_cache = ResultCache(namespace="user_analytics", max_entries=4096, default_ttl=300)
+    return _analytics_cache
+
+
+def _analytics_cache_key(user_id: Any) -> str:
+    return f"user:{user_id}"
+
+
+async def invalidate_user_analytics(user_id: Any):
+    """Drop a user's cached analytics (call after saving an analysis)"""
+    cache = get_analytics_cache()
+    if cache is not None:
+        await cache.invalidate(_analytics_cache_key(user_id))
+
+
 class AnalyticsService:
     """Service for analytics and reporting"""
     
@@ -26,13 +66,41 @@ class AnalyticsService:
         self.db = db
     
     def get_user_analytics(self, user_id: int) -> Dict[str, Any]:
-        """Get comprehensive user analytics"""
-        # Get user's analyses
-        analyses = self.db.query(AdAnalysis)\
-                          .filter(AdAnalysis.user_id == user_id)\
-                          .all()
+        """
+        Get comprehensive user analytics
         
-        if not analyses:
+        Every figure comes from one grouped query: the user row joined to
+        their analyses, grouped by platform and (for the last six months)
+        by month, so the cost is one round trip of a few dozen rows however
+        many analyses the user has.
+        """
+        six_months_ago = datetime.utcnow() - timedelta(days=180)
+        # Older analyses share one NULL month group; they only count towards totals
+        recent_month = case(
+            (AdAnalysis.created_at >= six_months_ago, func.date_trunc('month', AdAnalysis.created_at)),
+            else_=None
+        ).label('month')
+        
+        rows = self.db.query(
+            User.subscription_tier,
+            User.monthly_analyses,
+            User.created_at,
+            AdAnalysis.platform,
+            recent_month,
+            func.count(AdAnalysis.id).label('analyses'),
+            func.sum(AdAnalysis.overall_score).label('score_sum')
+        ).outerjoin(
+            AdAnalysis, AdAnalysis.user_id == User.id
+        ).filter(
+            User.id == user_id
+        ).group_by(
+            # By output column name: grouping on recent_month itself repeats the
+            # CASE, and its bound cutoff, in GROUP BY
+            User.id, AdAnalysis.platform, literal_column('month')
+        ).all()
+        
+        total_analyses = sum(row.analyses for row in rows)
+        if not total_analyses:
             return {
                 'total_analyses': 0,
                 'avg_score_improvement': 0,
@@ -41,18 +109,18 @@ class AnalyticsService:
                 'subscription_analytics': {}
             }
         
-        # Calculate metrics
-        total_analyses = len(analyses)
-        avg_score = sum(a.overall_score for a in analyses) / total_analyses
+        avg_score = sum(float(row.score_sum) for row in rows if row.analyses) / total_analyses
         
-        # Platform performance
+        # Platform performance and monthly usage from the groups
         platform_stats = {}
-        for analysis in analyses:
-            platform = analysis.platform
-            if platform not in platform_stats:
-                platform_stats[platform] = {'count': 0, 'total_score': 0}
-            platform_stats[platform]['count'] += 1
-            platform_stats[platform]['total_score'] += analysis.overall_score
+        monthly_stats = {}
+        for row in rows:
+            if not row.analyses:
+                continue
+            for stats in (platform_stats.setdefault(row.platform, {'count': 0, 'total_score': 0.0}),
+                          monthly_stats.setdefault(row.month, {'count': 0, 'total_score': 0.0})):
+                stats['count'] += row.analyses
+                stats['total_score'] += float(row.score_sum)
         
         top_performing_platforms = [
             {
@@ -65,14 +133,26 @@ class AnalyticsService:
         top_performing_platforms.sort(key=lambda x: x['avg_score'], reverse=True)
         
         # Monthly usage (last 6 months)
-        monthly_usage = self._get_monthly_usage(user_id)
+        monthly_usage = [
+            {
+                'month': month.strftime('%b %Y'),
+                'analyses': stats['count'],
+                'avg_score': round(stats['total_score'] / stats['count'], 1)
+            }
+            for month, stats in sorted((item for item in monthly_stats.items() if item[0] is not None),
+                                       key=lambda item: item[0])
+        ]
         
         # Subscription analytics
-        user = self.db.query(User).filter(User.id == user_id).first()
+        user = rows[0]
+        created_at = user.created_at
+        if created_at is not None and created_at.tzinfo is None:
+            # SQLite returns naive datetimes; PostgreSQL timestamptz is aware
+            created_at = created_at.replace(tzinfo=timezone.utc)
         subscription_analytics = {
-            'current_tier': user.subscription_tier.value if user else 'free',
-            'monthly_analyses': user.monthly_analyses if user else 0,
-            'account_age_days': (datetime.utcnow() - user.created_at).days if user else 0
+            'current_tier': user.subscription_tier.value if user.subscription_tier else 'free',
+            'monthly_analyses': user.monthly_analyses,
+            'account_age_days': (datetime.now(timezone.utc) - created_at).days if created_at else 0
         }
         
         return {
@@ -83,37 +163,23 @@ class AnalyticsService:
             'subscription_analytics': subscription_analytics
         }
     
-    def _get_monthly_usage(self, user_id: int) -> List[Dict]:
-        """Get monthly usage statistics for last 6 months"""
-        six_months_ago = datetime.utcnow() - timedelta(days=180)
+    async def get_user_analytics_cached(self, user_id: int) -> Dict[str, Any]:
+        """get_user_analytics served from the analytics cache until the user's next analysis"""
+        cache = get_analytics_cache()
+        if cache is None:
+            return self.get_user_analytics(user_id)
         
-        # Query monthly data
-        monthly_data = self.db.query(
-            func.date_trunc('month', AdAnalysis.created_at).label('month'),
-            func.count(AdAnalysis.id).label('analyses'),
-            func.avg(AdAnalysis.overall_score).label('avg_score')
-        ).filter(
-            AdAnalysis.user_id == user_id,
-            AdAnalysis.created_at >= six_months_ago
-        ).group_by(
-            func.date_trunc('month', AdAnalysis.created_at)
-        ).order_by(
-            func.date_trunc('month', AdAnalysis.created_at)
-        ).all()
-        
-        return [
-            {
-                'month': row.month.strftime('%b %Y'),
-                'analyses': row.analyses,
-                'avg_score': round(float(row.avg_score), 1) if row.avg_score else 0
-            }
-            for row in monthly_data
-        ]
+        key = _analytics_cache_key(user_id)
+        analytics = await cache.get(key)
+        if analytics is None:
+            analytics = self.get_user_analytics(user_id)
+            await cache.set(key, analytics)
+        return copy.deepcopy(analytics)
     
     async def generate_pdf_report(self, user_id: int, analysis_ids: List[str]) -> Dict[str, str]:
         """Generate PDF report for selected analyses"""
         # Get analyses
-        analyses = self.db.query(AdAnalysis)\
+        analyses = self.db.query(AdAnalysis.id, AdAnalysis.headline, AdAnalysis.overall_score)\
                           .filter(
                               AdAnalysis.user_id == user_id,
                               AdAnalysis.id.in_(analysis_ids)
@@ -11,6 +11,7 @@ from dataclasses import dataclass
 from app.constants.creative_controls import (
     MARKETING_CLICHES, CLICHE_ALTERNATIVES, get_cliche_alternatives
 )
+from packages.tools_sdk.text_matcher import default_matcher, LexiconHits
 
 @dataclass
 class ClicheDetection:
@@ -95,6 +96,10 @@ class ClicheFilter:
             "retail": 0.12,         # Retail can be more expressive
             "general": 0.07         # General default
         }
+        
+        # All clichés are matched in one pass over the text
+        self.matcher = default_matcher
+        self.matcher.register("cliches", sorted(MARKETING_CLICHES))
     
     def analyze_text(self, text: str, industry: str = "general") -> ClicheAnalysisResult:
         """
@@ -103,12 +108,29 @@ class ClicheFilter:
         if not text.strip():
             return self._empty_result()
         
+        return self._analyze_hits(text, self.matcher.scan(text), industry)
+    
+    def analyze_texts(self, texts: List[str], industry: str = "general") -> List[ClicheAnalysisResult]:
+        """
+        Analyze several texts (e.g. every variant of a set) with one matcher scan.
+        """
+        results = []
+        for text, hits in zip(texts, self.matcher.scan_many(texts)):
+            if not text.strip():
+                results.append(self._empty_result())
+            else:
+                results.append(self._analyze_hits(text, hits, industry))
+        return results
+    
+    def _analyze_hits(self, text: str, hits: LexiconHits, industry: str) -> ClicheAnalysisResult:
+        """
+        Build the analysis for a text from its matcher hits.
+        """
         cliches_found = []
-        text_lower = text.lower()
         
-        # Search for each known cliché
-        for cliche in MARKETING_CLICHES:
-            positions = self._find_all_positions(text_lower, cliche)
+        # Walk the clichés found in a single scan
+        for cliche in hits.found("cliches"):
+            positions = hits.positions("cliches", cliche)
             
             for position in positions:
                 # Get surrounding context
@@ -222,20 +244,6 @@ class ClicheFilter:
         # Generate generic alternatives
         return self._generate_generic_alternatives(cliche)
     
-    def _find_all_positions(self, text: str, phrase: str) -> List[int]:
-        """Find all positions where a phrase occurs in text."""
-        positions = []
-        start = 0
-        
-        while True:
-            pos = text.find(phrase, start)
-            if pos == -1:
-                break
-            positions.append(pos)
-            start = pos + 1
-        
-        return positions
-    
     def _calculate_originality_score(
         self, 
         text: str, 
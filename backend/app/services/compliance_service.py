@@ -16,6 +16,7 @@ from app.constants.compliance_rules import (
     calculate_caps_percentage, get_compliance_instructions
 )
 from app.services.readability_service import ReadabilityService, ReadabilityScore
+from packages.tools_sdk.text_matcher import default_matcher
 
 @dataclass
 class ComplianceViolation:
@@ -65,6 +66,14 @@ class ComplianceValidator:
             "instant": "quick",
             "immediate": "fast"
         }
+        
+        # Each mode's banned terms are compiled into the shared single-pass matcher
+        self.matcher = default_matcher
+        for mode in ComplianceMode:
+            self.matcher.register(
+                f"compliance_mode.{mode.value}",
+                sorted(get_compliance_config(mode).get("banned_terms", set()))
+            )
     
     def validate_content(
         self, 
@@ -163,42 +172,42 @@ class ComplianceValidator:
         violations = []
         found_words = []
         
-        config = get_compliance_config(compliance_mode)
-        banned_terms = config.get("banned_terms", set())
+        lexicon = f"compliance_mode.{compliance_mode.value}"
+        hits = self.matcher.scan(text)
+        found_terms = [(term, hits.first_position(lexicon, term)) for term in hits.found(lexicon)]
         
-        # Add custom banned words if provided
+        # Custom banned words vary per request, so they are checked directly
+        # rather than recompiling the shared automaton
         if custom_banned_words:
-            banned_terms = banned_terms.union(custom_banned_words)
-        
-        text_lower = text.lower()
-        
-        for term in banned_terms:
-            if term in text_lower:
-                found_words.append(term)
-                
-                # Determine severity based on compliance mode
-                if compliance_mode in [ComplianceMode.HEALTHCARE_SAFE, 
-                                     ComplianceMode.FINANCE_SAFE, 
-                                     ComplianceMode.LEGAL_SAFE]:
-                    severity = ComplianceSeverity.ERROR
-                else:
-                    severity = ComplianceSeverity.WARNING
-                
-                # Find position in text
-                position = text_lower.find(term)
-                
-                # Get replacement suggestion if available
-                suggestion = self.spam_word_replacements.get(term)
-                suggestion_text = f" Consider: '{suggestion}'" if suggestion else ""
-                
-                violations.append(ComplianceViolation(
-                    type="banned_word",
-                    severity=severity,
-                    message=f"Banned term detected: '{term}'{suggestion_text}",
-                    suggestion=suggestion,
-                    position=position,
-                    word_or_phrase=term
-                ))
+            text_lower = text.lower()
+            for term in custom_banned_words:
+                term = term.lower()
+                if term in text_lower and not hits.contains(lexicon, term):
+                    found_terms.append((term, text_lower.find(term)))
+        
+        for term, position in found_terms:
+            found_words.append(term)
+            
+            # Determine severity based on compliance mode
+            if compliance_mode in [ComplianceMode.HEALTHCARE_SAFE, 
+                                 ComplianceMode.FINANCE_SAFE, 
+                                 ComplianceMode.LEGAL_SAFE]:
+                severity = ComplianceSeverity.ERROR
+            else:
+                severity = ComplianceSeverity.WARNING
+            
+            # Get replacement suggestion if available
+            suggestion = self.spam_word_replacements.get(term)
+            suggestion_text = f" Consider: '{suggestion}'" if suggestion else ""
+            
+            violations.append(ComplianceViolation(
+                type="banned_word",
+                severity=severity,
+                message=f"Banned term detected: '{term}'{suggestion_text}",
+                suggestion=suggestion,
+                position=position,
+                word_or_phrase=term
+            ))
         
         return violations, found_words
     
@@ -13,34 +13,44 @@ except ImportError:
     pipeline = None
     torch = None
 
+from packages.tools_sdk.inference_service import get_inference_service
+from packages.tools_sdk.text_matcher import default_matcher
+
+
+def _load_emotion_classifier():
+    """Load the emotion model once per process, falling back to basic sentiment"""
+    if not TORCH_AVAILABLE:
+        print("⚠️ PyTorch not available - using rule-based emotion analysis")
+        return None
+    
+    try:
+        classifier = pipeline(
+            "text-classification",
+            model="j-hartmann/emotion-english-distilroberta-base",
+            device=0 if torch.cuda.is_available() else -1
+        )
+        print("✅ Emotion AI model loaded successfully")
+        return classifier
+    except Exception as e:
+        print(f"⚠️ Failed to load emotion AI model: {e}")
+        try:
+            # Fallback to basic sentiment
+            classifier = pipeline("sentiment-analysis")
+            print("✅ Fallback sentiment model loaded")
+            return classifier
+        except Exception as e2:
+            print(f"⚠️ Failed to load fallback model: {e2}")
+            return None
+
+
 class EmotionAnalyzer:
     """Analyzes emotional content and sentiment in ad copy"""
     
     def __init__(self):
-        # Initialize emotion classification model
-        self.emotion_classifier = None
-        self.use_ai_model = False
-        
-        if TORCH_AVAILABLE:
-            try:
-                self.emotion_classifier = pipeline(
-                    "text-classification",
-                    model="j-hartmann/emotion-english-distilroberta-base",
-                    device=0 if torch.cuda.is_available() else -1
-                )
-                self.use_ai_model = True
-                print("✅ Emotion AI model loaded successfully")
-            except Exception as e:
-                print(f"⚠️ Failed to load emotion AI model: {e}")
-                try:
-                    # Fallback to basic sentiment
-                    self.emotion_classifier = pipeline("sentiment-analysis")
-                    self.use_ai_model = True
-                    print("✅ Fallback sentiment model loaded")
-                except Exception as e2:
-                    print(f"⚠️ Failed to load fallback model: {e2}")
-        else:
-            print("⚠️ PyTorch not available - using rule-based emotion analysis")
+        # Shared emotion classification model with batched, off-event-loop inference
+        self.inference_service = get_inference_service("emotion", _load_emotion_classifier)
+        self.emotion_classifier = self.inference_service.predict_fn if self.inference_service else None
+        self.use_ai_model = self.emotion_classifier is not None
         
         # Emotion words mapping
         self.emotion_words = {
@@ -52,13 +62,11 @@ class EmotionAnalyzer:
             'trust': ['trusted', 'reliable', 'proven', 'guaranteed', 'secure', 'safe'],
             'urgency': ['now', 'today', 'limited', 'hurry', 'deadline', 'expires', 'quick']
         }
+        self.matcher = default_matcher
+        self.matcher.register_many('emotion', self.emotion_words)
     
     def analyze_emotion(self, text: str) -> Dict[str, Any]:
-        """Analyze emotional content of text"""
-        # Always analyze emotion words and intensity (rule-based)
-        emotion_word_analysis = self._analyze_emotion_words(text)
-        intensity = self._calculate_emotional_intensity(text)
-        
+        """Analyze emotional content of text (blocking; prefer analyze_emotion_async in async code)"""
         emotions = []
         
         # Try to use AI model if available
@@ -69,6 +77,29 @@ class EmotionAnalyzer:
                 print(f"⚠️ AI emotion analysis failed: {e}")
                 emotions = []
         
+        return self._build_emotion_result(text, emotions)
+    
+    async def analyze_emotion_async(self, text: str) -> Dict[str, Any]:
+        """Analyze emotional content of text without blocking the event loop"""
+        emotions = []
+        
+        # Model inference is batched with concurrent callers on a worker thread
+        if self.use_ai_model and self.inference_service:
+            try:
+                result = await self.inference_service.infer(text)
+                emotions = result if isinstance(result, list) else [result]
+            except Exception as e:
+                print(f"⚠️ AI emotion analysis failed: {e}")
+                emotions = []
+        
+        return self._build_emotion_result(text, emotions)
+    
+    def _build_emotion_result(self, text: str, emotions: List[Dict]) -> Dict[str, Any]:
+        """Combine model output with rule-based emotion analysis"""
+        # Always analyze emotion words and intensity (rule-based)
+        emotion_word_analysis = self._analyze_emotion_words(text)
+        intensity = self._calculate_emotional_intensity(text)
+        
         # Calculate emotion score (works with or without AI)
         emotion_score = self._calculate_emotion_score(emotions, emotion_word_analysis, intensity)
         
@@ -93,11 +124,11 @@ class EmotionAnalyzer:
     
     def _analyze_emotion_words(self, text: str) -> Dict[str, Any]:
         """Analyze presence of emotion-triggering words"""
-        text_lower = text.lower()
+        hits = self.matcher.scan(text)
         emotion_breakdown = {}
         
-        for emotion, words in self.emotion_words.items():
-            found_words = [word for word in words if word in text_lower]
+        for emotion in self.emotion_words:
+            found_words = hits.found(f'emotion.{emotion}')
             emotion_breakdown[emotion] = {
                 'count': len(found_words),
                 'words': found_words,
@@ -0,0 +1,173 @@
+"""
+Cache for AI-generated ad alternatives
+
+Regenerating an alternative for an ad that was just improved with the same
+settings (page reloads, retries, repeated variant sets) paid for a full LLM
+call every time. The GenerationCache keys each generation on the tenant, the
+provider and model, the normalized prompt built by ``_build_production_prompt``
+and the sampling parameters, so only byte-for-byte equivalent requests share
+a result. Entries are scoped per tenant and can be dropped per tenant; high
+creativity requests, where users expect a different answer each time, are
+never cached. Hit rate and the tokens and cost saved are reported through
+``ProductionAIService.get_usage_summary``.
+"""
+
+import copy
+import logging
+import re
+from typing import Dict, Any, Optional, Sequence
+
+from packages.tools_sdk.result_cache import ResultCache, content_hash, normalize_text
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+SHARED_TENANT = 'shared'
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize a prompt for keying (unicode NFC, whitespace runs collapsed)"""
+    return _WHITESPACE_PATTERN.sub(' ', normalize_text(prompt))
+
+
+class GenerationCache:
+    """
+    TTL cache of generated alternatives, isolated per tenant
+
+    Args:
+        ttl: Entry lifetime in seconds
+        max_entries: Maximum entries held in the in-process tier
+        max_creativity: Highest creativity level that is cached
+        redis_url: Redis URL to share entries across workers; None keeps them process-local
+        enabled: False turns every lookup into a bypass
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 2048, max_creativity: int = 7,
+                 redis_url: Optional[str] = None, enabled: bool = True):
+        self.ttl = ttl
+        self.max_creativity = max_creativity
+        self.enabled = enabled
+        self._cache = ResultCache(
+            namespace="ai_generation",
+            max_entries=max_entries,
+            default_ttl=ttl,
+            redis_url=redis_url
+        )
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'bypassed': 0,
+            'stores': 0,
+            'tokens_saved': 0,
+            'cost_saved': 0.0
+        }
+
+    @classmethod
+    def from_settings(cls, settings) -> 'GenerationCache':
+        """Build a cache from application settings"""
+        return cls(
+            ttl=settings.AI_GENERATION_CACHE_TTL,
+            max_entries=settings.AI_GENERATION_CACHE_MAX_ENTRIES,
+            max_creativity=settings.AI_GENERATION_CACHE_MAX_CREATIVITY,
+            redis_url=settings.REDIS_URL if settings.AI_GENERATION_CACHE_SHARED else None,
+            enabled=settings.AI_GENERATION_CACHE_ENABLED
+        )
+
+    def is_cacheable(self, creativity_level: int) -> bool:
+        """Whether a generation at this creativity level may be served from cache"""
+        if self.enabled and creativity_level <= self.max_creativity:
+            return True
+        self._stats['bypassed'] += 1
+        return False
+
+    def make_key(self, tenant_id: Optional[str], provider: str, model: str,
+                 prompt: str, sampling: Dict[str, Any]) -> str:
+        """Build the cache key for one generation request"""
+        return content_hash({
+            'tenant': tenant_id or SHARED_TENANT,
+            'provider': provider,
+            'model': model,
+            'prompt': normalize_prompt(prompt),
+            'sampling': sampling
+        })
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of a cached generation, or None on miss"""
+        return await self.get_first((key,))
+
+    async def get_first(self, keys: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """
+        Get a copy of the first cached generation among keys, or None on miss
+
+        Counts as a single lookup however many keys are checked.
+        """
+        for key in keys:
+            entry = await self._cache.get(key)
+            if entry is not None:
+                self._stats['hits'] += 1
+                self._stats['tokens_saved'] += entry.get('tokens', 0)
+                self._stats['cost_saved'] += entry.get('cost', 0.0)
+                return copy.deepcopy(entry['result'])
+        self._stats['misses'] += 1
+        return None
+
+    async def set(self, key: str, tenant_id: Optional[str], result: Dict[str, Any],
+                  tokens: int = 0, cost: float = 0.0):
+        """
+        Store a generation
+
+        Args:
+            key: Cache key (see make_key)
+            tenant_id: Tenant the generation belongs to
+            result: Parsed generation result
+            tokens: Tokens the generation used, counted as saved on each hit
+            cost: Cost of the generation, counted as saved on each hit
+        """
+        entry = {'result': copy.deepcopy(result), 'tokens': tokens, 'cost': cost}
+        await self._cache.set(key, entry, ttl=self.ttl, tags=(self._tenant_tag(tenant_id),))
+        self._stats['stores'] += 1
+
+    async def invalidate_tenant(self, tenant_id: Optional[str]) -> int:
+        """
+        Drop every cached generation of a tenant
+
+        Returns:
+            Number of in-process entries removed
+        """
+        return await self._cache.invalidate_tag(self._tenant_tag(tenant_id))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit rate and savings"""
+        lookups = self._stats['hits'] + self._stats['misses']
+        cache_stats = self._cache.get_stats()
+        return {
+            **self._stats,
+            'hit_rate': self._stats['hits'] / lookups if lookups else 0.0,
+            'entries': cache_stats['entries'],
+            'evictions': cache_stats['evictions'],
+            'redis_enabled': cache_stats['redis_enabled'],
+            'enabled': self.enabled,
+            'ttl': self.ttl,
+            'max_creativity': self.max_creativity
+        }
+
+    @staticmethod
+    def _tenant_tag(tenant_id: Optional[str]) -> str:
+        return f"tenant:{tenant_id or SHARED_TENANT}"
+
+
+_default_cache: Optional[GenerationCache] = None
+
+
+def get_generation_cache() -> GenerationCache:
+    """Get the process-wide generation cache, configured from settings"""
+    global _default_cache
+    if _default_cache is None:
+        try:
+            from app.core.config import settings
+            _default_cache = GenerationCache.from_settings(settings)
+        except Exception as e:
+            logger.warning(f"Using default generation cache settings: {e}")
+            _default_cache = GenerationCache()
+    return _default_cache
@@ -6,6 +6,7 @@ that only uses real AI providers and fails fast when they're unavailable.
 """
 
 import asyncio
+import json
 import openai
 try:
     import google.generativeai as genai
@@ -13,11 +14,19 @@ try:
 except ImportError:
     genai = None
     GENAI_AVAILABLE = False
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, AsyncIterator
 import time
 import logging
 from dataclasses import dataclass
 from app.core.exceptions import AIProviderUnavailable, ProductionError, fail_fast_on_mock_data
+from app.services.ai_client_registry import AIClientRegistry, get_ai_client_registry
+from app.services.generation_cache import GenerationCache, get_generation_cache
+from app.services.provider_rate_governor import get_rate_governor
+from app.services.prompt_templates import (
+    PromptTemplateRegistry, count_tokens, get_prompt_templates
+)
+from app.services.provider_router import ProviderRouter, get_provider_router
+from app.services.streaming_response_parser import RESPONSE_FIELDS, StreamingFieldParser, parse_field_line
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +39,8 @@ class AIProviderConfig:
     max_tokens: int
     rate_limit_rpm: int
     required_env_var: str
+    rate_limit_tpm: int = 0  # 0 = no token limit
+    prompt_token_budget: int = 0  # 0 = no prompt size limit
 
 
 class ProductionAIService:
@@ -40,33 +51,79 @@ class ProductionAIService:
     Fails fast with proper error codes when AI is unavailable
     """
     
-    def __init__(self, openai_key: str, gemini_key: str = None):
+    # Provider preference per task; the router reorders by observed latency, errors and cost
+    TASK_PREFERENCES = {
+        'creative_rewrite': ['openai', 'gemini'],
+        'emotional_analysis': ['openai', 'gemini'], 
+        'platform_optimization': ['gemini', 'openai'],
+        'data_analysis': ['gemini', 'openai']
+    }
+    
+    # Options set per variant in a batched request, with their defaults; the
+    # rest (style, audience, brand voice) must be shared by the whole batch
+    BATCH_BRIEF_OPTIONS = {
+        'variant_type': 'persuasive',
+        'creativity_level': 5,
+        'urgency_level': 5,
+        'emotion_type': 'inspiring',
+        'filter_cliches': True
+    }
+    
+    OPENAI_MODEL = 'gpt-4'
+    GEMINI_MODEL = 'gemini-pro'
+    MAX_OUTPUT_TOKENS = 500
+    
+    def __init__(self, openai_key: str, gemini_key: str = None,
+                 client_registry: Optional[AIClientRegistry] = None,
+                 generation_cache: Optional[GenerationCache] = None,
+                 router: Optional[ProviderRouter] = None,
+                 prompt_templates: Optional[PromptTemplateRegistry] = None):
         self.providers = {}
+        self.openai_key = None
+        
+        # Full prompts run ~880-980 tokens, so any budget trims guidance; off unless configured
+        try:
+            from app.core.config import settings
+            prompt_token_budget = settings.LLM_PROMPT_TOKEN_BUDGET
+        except Exception as e:
+            logger.warning(f"Using default prompt token budget: {e}")
+            prompt_token_budget = 0
+        
+        # Pooled provider clients shared by every service instance in the worker
+        self.client_registry = client_registry or get_ai_client_registry()
+        
+        # Cached generations, also shared across instances in the worker
+        self.generation_cache = generation_cache or get_generation_cache()
         
         # Initialize only real AI providers
         if openai_key and openai_key.startswith('sk-'):
             openai.api_key = openai_key
+            self.openai_key = openai_key
             self.providers['openai'] = AIProviderConfig(
                 name='openai',
                 priority=1,
                 cost_per_1k_tokens=0.03,  # GPT-4 pricing
                 max_tokens=4096,
                 rate_limit_rpm=3000,
-                required_env_var='OPENAI_API_KEY'
+                required_env_var='OPENAI_API_KEY',
+                rate_limit_tpm=300000,
+                prompt_token_budget=prompt_token_budget
             )
         else:
             logger.warning("OpenAI API key not provided or invalid")
         
         if gemini_key and GENAI_AVAILABLE:
             try:
-                genai.configure(api_key=gemini_key)
+                genai.configure(api_key=gemini_key, **self.client_registry.gemini_configure_options())
                 self.providers['gemini'] = AIProviderConfig(
                     name='gemini',
                     priority=2,
                     cost_per_1k_tokens=0.001,
                     max_tokens=2048,
                     rate_limit_rpm=60,
-                    required_env_var='GEMINI_API_KEY'
+                    required_env_var='GEMINI_API_KEY',
+                    rate_limit_tpm=32000,
+                    prompt_token_budget=prompt_token_budget
                 )
             except Exception as e:
                 logger.warning(f"Gemini initialization failed: {e}")
@@ -80,9 +137,32 @@ class ProductionAIService:
                 "No AI providers configured. Production requires OpenAI or Gemini API keys."
             )
         
+        # Rate limits are enforced per worker, across every service instance
+        self.rate_governors = {
+            name: get_rate_governor(name, config.rate_limit_rpm, config.rate_limit_tpm)
+            for name, config in self.providers.items()
+        }
+        
+        # Latency/error history is shared so every instance routes on the same data
+        self.router = router or get_provider_router()
+        for name, config in self.providers.items():
+            self.router.register(name, config.cost_per_1k_tokens)
+        
+        # A prompt is built once and may fail over, so it must fit every provider's budget
+        self.prompt_templates = prompt_templates or get_prompt_templates()
+        budgets = [config.prompt_token_budget for config in self.providers.values() if config.prompt_token_budget]
+        self.prompt_token_budget = min(budgets) if budgets else None
+        
         # Usage tracking for production monitoring
         self.usage_stats = {provider: {'requests': 0, 'tokens': 0, 'cost': 0} 
                            for provider in self.providers}
+        self.batch_stats = {
+            'batch_requests': 0,
+            'batch_failures': 0,
+            'batched_variants': 0,
+            'parsed_variants': 0,
+            'fallback_variants': 0
+        }
         
         logger.info(f"Production AI service initialized with providers: {list(self.providers.keys())}")
     
@@ -90,38 +170,37 @@ class ProductionAIService:
         """
         Select best available AI provider - NO TEMPLATE FALLBACK
         """
+        return self.rank_providers(task_type)[0]
+    
+    def rank_providers(self, task_type: str) -> List[str]:
+        """
+        Available providers for a task, best first
+        
+        Ranked by the router on observed p50 latency, error rate and cost, with
+        the task preference order breaking ties; providers whose circuit is
+        open are left out.
+        """
         if not self.providers:
             raise AIProviderUnavailable(
                 "provider_selection",
                 "No AI providers available for task"
             )
         
-        # Task preferences for production AI providers only
-        task_preferences = {
-            'creative_rewrite': ['openai', 'gemini'],
-            'emotional_analysis': ['openai', 'gemini'], 
-            'platform_optimization': ['gemini', 'openai'],
-            'data_analysis': ['gemini', 'openai']
-        }
-        
-        preferred_order = task_preferences.get(task_type, ['openai', 'gemini'])
-        
-        # Select first available provider from preferences
-        for provider_name in preferred_order:
-            if provider_name in self.providers and self._is_provider_available(provider_name):
-                return provider_name
+        preferred_order = self.TASK_PREFERENCES.get(task_type, ['openai', 'gemini'])
         
-        # If no preferred providers available, use any available
-        available_providers = [name for name in self.providers.keys() 
-                             if self._is_provider_available(name)]
+        # Preferred providers first, then any other configured provider
+        candidates = [name for name in preferred_order if self._is_provider_available(name)]
+        candidates += [name for name in self.providers if name not in candidates]
         
-        if not available_providers:
+        ranked = self.router.rank(candidates)
+        if not ranked:
             raise AIProviderUnavailable(
                 "all_providers",
-                f"No AI providers available for {task_type}. Required providers: {preferred_order}"
+                f"No AI providers available for {task_type}. Required providers: {preferred_order}",
+                retry_after=int(self.router.health_options.get('cooldown', 30))
             )
         
-        return available_providers[0]
+        return ranked
     
     def _is_provider_available(self, provider_name: str) -> bool:
         """Check if provider is available and configured"""
@@ -140,45 +219,656 @@ class ProductionAIService:
                                     creativity_level: int = 5,
                                     urgency_level: int = 5,
                                     emotion_type: str = "inspiring",
-                                    filter_cliches: bool = True) -> Dict:
+                                    filter_cliches: bool = True,
+                                    tenant_id: Optional[str] = None) -> Dict:
         """
         Generate ad alternative using REAL AI only - NO TEMPLATES
+        
+        Results are cached per tenant_id, keyed on the built prompt and sampling
+        parameters; generations above the cache's creativity limit always call
+        the provider.
         """
-        # Validate input data
-        fail_fast_on_mock_data(ad_data, "ai_generation_input")
+        # Rank providers; the first is used unless it is slow or fails
+        providers = self._prepare_generation(ad_data)
+        provider = providers[0]
         
-        if not ad_data.get('headline') or not ad_data.get('body_text'):
-            raise ProductionError(
-                "Invalid ad data for AI generation",
-                "INVALID_AI_INPUT",
-                {"ad_data": ad_data}
+        try:
+            # Build the prompt once; it is both the cache key and the provider input
+            ai_params = self._resolve_sampling_params(
+                ad_data, human_tone, creativity_level, urgency_level, emotion_type
+            )
+            prompt = self._build_production_prompt(
+                ad_data, variant_type, emoji_level, human_tone,
+                brand_tone, formality_level, target_audience_description,
+                brand_voice_description, include_cta, cta_style,
+                creativity_level, urgency_level, emotion_type, filter_cliches
+            )
+            
+            cache_keys = None
+            if self.generation_cache.is_cacheable(creativity_level):
+                cache_keys = self._generation_cache_keys(tenant_id, providers, prompt, ai_params)
+                cached = await self.generation_cache.get_first(list(cache_keys.values()))
+                if cached is not None:
+                    return cached
+            
+            generation_args = (
+                ad_data, variant_type, emoji_level, human_tone,
+                brand_tone, formality_level, target_audience_description,
+                brand_voice_description, include_cta, cta_style,
+                creativity_level, urgency_level, emotion_type, filter_cliches
+            )
+            
+            async def generate() -> Dict:
+                result, used_provider, tokens = await self._generate_routed(
+                    providers, generation_args, prompt, ai_params
+                )
+                
+                if cache_keys is not None:
+                    # Stored under the provider that produced it, which after failover
+                    # or a hedge win is not necessarily the first-ranked one
+                    await self.generation_cache.set(
+                        cache_keys[used_provider], tenant_id, result,
+                        tokens=tokens, cost=tokens * self.providers[used_provider].cost_per_1k_tokens / 1000
+                    )
+                
+                return result
+            
+            # Identical cacheable requests already in flight share one provider call
+            if cache_keys is not None:
+                return await self.rate_governors[provider].coalesce(cache_keys[provider], generate)
+            return await generate()
+            
+        except Exception as e:
+            # NO FALLBACKS - propagate error up
+            if isinstance(e, AIProviderUnavailable):
+                raise
+            else:
+                raise AIProviderUnavailable(
+                    provider,
+                    f"AI generation failed: {str(e)}"
+                )
+    
+    async def generate_alternatives_batched(self, ad_data: Dict, variants: List[Dict[str, Any]],
+                                            tenant_id: Optional[str] = None,
+                                            **shared_options) -> List[Any]:
+        """
+        Generate several alternatives with a single provider request
+        
+        The shared ad context and style instructions are sent once, followed
+        by one brief per variant carrying its variant type and creative
+        controls, and the model answers with a JSON array. Variants share a
+        request when their other options (style, audience, brand voice)
+        match; a variant with no match is generated on its own. Variants already in the generation
+        cache are served from it; variants missing or unusable in the response
+        (or all of them, if the batch request fails) are generated with their
+        own generate_ad_alternative call.
+        
+        Args:
+            ad_data: Ad to generate alternatives for
+            variants: Per-variant options for generate_ad_alternative, e.g.
+                variant_type, creativity_level, urgency_level, emotion_type
+            tenant_id: Tenant for generation cache isolation
+            **shared_options: generate_ad_alternative options applied to every variant
+        
+        Returns:
+            One entry per variant, in order: the result, or the exception that
+            variant failed with
+        """
+        providers = self._prepare_generation(ad_data)
+        provider = providers[0]
+        results: List[Any] = [None] * len(variants)
+        
+        # Serve cached variants; only the rest go into the batch
+        for index, variant in enumerate(variants):
+            options = {**shared_options, **variant}
+            if not self.generation_cache.is_cacheable(options.get('creativity_level', 5)):
+                continue
+            try:
+                prompt, ai_params = self._single_generation_request(ad_data, options)
+            except Exception as e:
+                logger.warning(f"Could not build prompt for variant {index + 1}: {e}")
+                continue
+            cache_keys = self._generation_cache_keys(tenant_id, providers, prompt, ai_params)
+            results[index] = await self.generation_cache.get_first(list(cache_keys.values()))
+        
+        # A request has one style context, so only variants whose options match
+        # apart from their briefs share a batch
+        batches: Dict[Tuple, List[int]] = {}
+        for index, result in enumerate(results):
+            if result is None:
+                options = self._batch_options(variants[index], shared_options)
+                group = tuple(sorted((name, repr(value)) for name, value in options.items()))
+                batches.setdefault(group, []).append(index)
+        
+        batched = [batch for batch in batches.values() if len(batch) > 1]
+        for batch in batched:
+            try:
+                parsed, _ = await self._generate_batch(
+                    provider, ad_data, [variants[index] for index in batch], shared_options,
+                    tenant_id=tenant_id
+                )
+            except Exception as e:
+                logger.warning(f"Batched generation of {len(batch)} variants failed, "
+                               f"generating them individually: {e}")
+                self.batch_stats['batch_failures'] += 1
+                parsed = [None] * len(batch)
+            
+            for index, result in zip(batch, parsed):
+                if result is not None:
+                    results[index] = result
+        
+        # Individual calls for whatever the batch did not produce
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            self.batch_stats['fallback_variants'] += sum(
+                1 for batch in batched for index in batch if results[index] is None
             )
+            fallback_results = await asyncio.gather(*[
+                self.generate_ad_alternative(ad_data, tenant_id=tenant_id, **{**shared_options, **variants[index]})
+                for index in missing
+            ], return_exceptions=True)
+            for index, result in zip(missing, fallback_results):
+                results[index] = result
+        
+        return results
+    
+    async def _generate_batch(self, provider: str, ad_data: Dict, variants: List[Dict[str, Any]],
+                              shared_options: Dict[str, Any],
+                              tenant_id: Optional[str] = None) -> Tuple[List[Optional[Dict]], int]:
+        """
+        Request several variants in one completion
+        
+        The variants must share every option outside BATCH_BRIEF_OPTIONS. Each
+        brief carries its variant's creative controls; the request is sampled
+        with the mean of the variants' sampling parameters. Batch results are
+        cached under the batch prompt and those parameters, never under
+        single-variant keys.
+        
+        Batched calls are not sampled by the router: their latency is not
+        comparable with single generations and would skew hedge delays.
+        
+        Returns:
+            (parsed variant per input variant, None where unusable; tokens used)
+        """
+        batch_options = [self._batch_options(variant, shared_options) for variant in variants]
+        if any(options != batch_options[0] for options in batch_options[1:]):
+            raise ValueError("Batched variants must share every option outside BATCH_BRIEF_OPTIONS")
+        options = batch_options[0]
+        briefs = [
+            {name: variant.get(name, shared_options.get(name, default))
+             for name, default in self.BATCH_BRIEF_OPTIONS.items()}
+            for variant in variants
+        ]
+        human_tone = options.get('human_tone', 'conversational')
+        
+        prompt = self.prompt_templates.build_batch(
+            ad_data, briefs,
+            emoji_level=options.get('emoji_level', 'moderate'),
+            human_tone=human_tone,
+            brand_tone=options.get('brand_tone', 'casual'),
+            formality_level=options.get('formality_level', 5),
+            target_audience_description=options.get('target_audience_description'),
+            brand_voice_description=options.get('brand_voice_description'),
+            include_cta=options.get('include_cta', True),
+            cta_style=options.get('cta_style', 'medium'),
+            token_budget=self.prompt_token_budget
+        )
+        ai_params = self._batch_sampling_params(ad_data, human_tone, briefs)
+        max_tokens = min(self.MAX_OUTPUT_TOKENS * len(variants), self.providers[provider].max_tokens)
+        
+        cache_key = None
+        if all(self.generation_cache.is_cacheable(brief['creativity_level']) for brief in briefs):
+            cache_key = self.generation_cache.make_key(
+                tenant_id, provider, self._provider_model(provider), prompt,
+                {**ai_params, 'max_tokens': max_tokens}
+            )
+            cached = await self.generation_cache.get(cache_key)
+            if cached is not None:
+                return cached['variants'], 0
+        
+        self.batch_stats['batch_requests'] += 1
+        self.batch_stats['batched_variants'] += len(variants)
+        if provider == 'openai':
+            content, tokens_used = await self._openai_complete(prompt, ai_params, max_tokens)
+        elif provider == 'gemini':
+            content, tokens_used = await self._gemini_complete(prompt, ai_params, max_tokens)
+        else:
+            raise AIProviderUnavailable(
+                provider,
+                f"Unknown provider requested: {provider}"
+            )
+        
+        parsed = self._parse_batch_response(content, [brief['variant_type'] for brief in briefs])
+        self.batch_stats['parsed_variants'] += sum(1 for result in parsed if result is not None)
+        
+        # Only complete answers are cached; a partial one is retried per variant
+        if cache_key is not None and all(result is not None for result in parsed):
+            await self.generation_cache.set(
+                cache_key, tenant_id, {'variants': parsed}, tokens=tokens_used,
+                cost=tokens_used * self.providers[provider].cost_per_1k_tokens / 1000
+            )
+        return parsed, tokens_used
+    
+    @classmethod
+    def _batch_options(cls, variant: Dict[str, Any], shared_options: Dict[str, Any]) -> Dict[str, Any]:
+        """A variant's generation options apart from those its batch brief sets"""
+        return {name: value for name, value in {**shared_options, **variant}.items()
+                if name not in cls.BATCH_BRIEF_OPTIONS}
+    
+    def _batch_sampling_params(self, ad_data: Dict, human_tone: str,
+                               briefs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """One set of sampling parameters for a batch: the mean over its variants"""
+        variant_params = [
+            self._resolve_sampling_params(
+                ad_data, human_tone, brief['creativity_level'], brief['urgency_level'], brief['emotion_type']
+            )
+            for brief in briefs
+        ]
+        return {
+            name: round(sum(params[name] for params in variant_params) / len(variant_params), 2)
+            for name in variant_params[0]
+        }
+    
+    def _single_generation_request(self, ad_data: Dict, options: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Prompt and sampling parameters generate_ad_alternative would use for these options"""
+        ai_params = self._resolve_sampling_params(
+            ad_data,
+            options.get('human_tone', 'conversational'),
+            options.get('creativity_level', 5),
+            options.get('urgency_level', 5),
+            options.get('emotion_type', 'inspiring')
+        )
+        prompt = self._build_production_prompt(
+            ad_data, options.get('variant_type', 'persuasive'),
+            options.get('emoji_level', 'moderate'),
+            options.get('human_tone', 'conversational'),
+            options.get('brand_tone', 'casual'),
+            options.get('formality_level', 5),
+            options.get('target_audience_description'),
+            options.get('brand_voice_description'),
+            options.get('include_cta', True),
+            options.get('cta_style', 'medium'),
+            options.get('creativity_level', 5),
+            options.get('urgency_level', 5),
+            options.get('emotion_type', 'inspiring'),
+            options.get('filter_cliches', True)
+        )
+        return prompt, ai_params
+    
+    async def stream_ad_alternative(self, ad_data: Dict, variant_type: str,
+                                    emoji_level: str = "moderate",
+                                    human_tone: str = "conversational",
+                                    brand_tone: str = "casual",
+                                    formality_level: int = 5,
+                                    target_audience_description: str = None,
+                                    brand_voice_description: str = None,
+                                    include_cta: bool = True,
+                                    cta_style: str = "medium",
+                                    creativity_level: int = 5,
+                                    urgency_level: int = 5,
+                                    emotion_type: str = "inspiring",
+                                    filter_cliches: bool = True,
+                                    tenant_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate an ad alternative, yielding each field as soon as it is complete
+        
+        Yields {'type': 'field', 'field': ..., 'value': ...} events in the order
+        the model writes them, then {'type': 'result', 'result': ..., 'cached': ...}
+        with the validated result. Each field is checked for placeholder content
+        as it arrives, so a template response fails before it reaches the user.
+        A provider that fails before its first field hands over to the next one.
+        """
+        providers = self._prepare_generation(ad_data)
         
-        # Select optimal provider
         try:
-            provider = self.select_optimal_provider('creative_rewrite')
-        except AIProviderUnavailable as e:
-            # Re-raise with more context
+            ai_params = self._resolve_sampling_params(
+                ad_data, human_tone, creativity_level, urgency_level, emotion_type
+            )
+            prompt = self._build_production_prompt(
+                ad_data, variant_type, emoji_level, human_tone,
+                brand_tone, formality_level, target_audience_description,
+                brand_voice_description, include_cta, cta_style,
+                creativity_level, urgency_level, emotion_type, filter_cliches
+            )
+        except Exception as e:
+            raise AIProviderUnavailable(providers[0], f"AI generation failed: {str(e)}")
+        
+        cache_keys = None
+        if self.generation_cache.is_cacheable(creativity_level):
+            cache_keys = self._generation_cache_keys(tenant_id, providers, prompt, ai_params)
+            cached = await self.generation_cache.get_first(list(cache_keys.values()))
+            if cached is not None:
+                for field in ('headline', 'body_text', 'cta', 'improvement_reason'):
+                    if field in cached:
+                        yield {'type': 'field', 'field': field, 'value': cached[field]}
+                yield {'type': 'result', 'result': cached, 'provider': None, 'cached': True}
+                return
+        
+        errors = []
+        for attempt, provider in enumerate(providers):
+            if attempt:
+                self.router.record_failover()
+            
+            parser = StreamingFieldParser()
+            text_parts = []
+            emitted = False
+            estimated_tokens = self._estimate_tokens(prompt)
+            if not self.router.try_dispatch(provider):
+                errors.append(AIProviderUnavailable(provider, f"{provider} circuit is open"))
+                continue
+            try:
+                await self.rate_governors[provider].acquire(estimated_tokens)
+            except AIProviderUnavailable as e:
+                # Local rate limit queue is full; not a provider failure
+                self.router.on_cancel(provider)
+                errors.append(e)
+                continue
+            except BaseException:
+                self.router.on_cancel(provider)
+                raise
+            
+            start_time = time.monotonic()
+            try:
+                async for text in self._stream_provider_text(provider, prompt, ai_params, estimated_tokens):
+                    text_parts.append(text)
+                    for field, value in parser.feed(text):
+                        if self._is_placeholder_text(value):
+                            raise AIProviderUnavailable(provider, f"{provider} returned placeholder content")
+                        emitted = True
+                        yield {'type': 'field', 'field': field, 'value': value}
+                
+                for field, value in parser.close():
+                    if self._is_placeholder_text(value):
+                        raise AIProviderUnavailable(provider, f"{provider} returned placeholder content")
+                    emitted = True
+                    yield {'type': 'field', 'field': field, 'value': value}
+                
+                result = self._parse_structured_response(''.join(text_parts), variant_type)
+                fail_fast_on_mock_data(result, f"ai_generation_result_{provider}")
+            except (asyncio.CancelledError, GeneratorExit):
+                # Client went away; says nothing about provider health
+                self.router.on_cancel(provider)
+                raise
+            except Exception as e:
+                self.router.record_failure(provider, time.monotonic() - start_time)
+                error = e if isinstance(e, AIProviderUnavailable) else AIProviderUnavailable(
+                    provider, f"AI generation failed: {str(e)}"
+                )
+                if emitted:
+                    # Fields already reached the client; a second provider would contradict them
+                    raise error
+                errors.append(error)
+                continue
+            
+            tokens_used = self._streamed_tokens(prompt, ''.join(text_parts))
+            self._track_usage(provider, tokens_used)
+            self.router.record_success(provider, time.monotonic() - start_time, tokens_used)
+            
+            if cache_keys is not None:
+                await self.generation_cache.set(
+                    cache_keys[provider], tenant_id, result,
+                    tokens=tokens_used, cost=tokens_used * self.providers[provider].cost_per_1k_tokens / 1000
+                )
+            
+            yield {'type': 'result', 'result': result, 'provider': provider, 'cached': False}
+            return
+        
+        if len(errors) == 1:
+            raise errors[0]
+        raise AIProviderUnavailable(
+            "all_providers",
+            f"All AI providers failed: {'; '.join(str(e) for e in errors)}"
+        )
+    
+    async def stream_alternatives(self, ad_data: Dict, variants: List[Dict[str, Any]],
+                                  tenant_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream several alternatives concurrently
+        
+        Args:
+            ad_data: Ad to generate alternatives for
+            variants: Keyword arguments for stream_ad_alternative, one dict per
+                alternative (must include variant_type)
+            tenant_id: Tenant for generation cache isolation
+        
+        Yields:
+            stream_ad_alternative events tagged with 'variant' (the index into
+            variants), interleaved as they arrive, plus {'type': 'error'} events
+            for alternatives that failed
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def pump(index: int, options: Dict[str, Any]):
+            try:
+                async for event in self.stream_ad_alternative(ad_data, tenant_id=tenant_id, **options):
+                    await queue.put({**event, 'variant': index})
+            except Exception as e:
+                logger.warning(f"Failed to stream {options.get('variant_type')} alternative: {e}")
+                await queue.put({'type': 'error', 'variant': index, 'error': str(e)})
+            finally:
+                await queue.put(None)
+        
+        tasks = [asyncio.ensure_future(pump(index, options)) for index, options in enumerate(variants)]
+        try:
+            finished = 0
+            while finished < len(tasks):
+                event = await queue.get()
+                if event is None:
+                    finished += 1
+                    continue
+                yield event
+        finally:
+            # Consumer stopped early (e.g. client disconnected); stop generating
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _stream_provider_text(self, provider: str, prompt: str, ai_params: Dict[str, Any],
+                                    estimated_tokens: int) -> AsyncIterator[str]:
+        """
+        Yield completion text chunks from a provider as they arrive
+        
+        The caller must already hold rate-limit capacity for estimated_tokens;
+        it is settled when the stream ends.
+        """
+        streamed: List[str] = []
+        try:
+            async for text in self._provider_text_chunks(provider, prompt, ai_params):
+                streamed.append(text)
+                yield text
+        finally:
+            # Settle the admission estimate with what was streamed; nothing streamed gives it all back
+            self.rate_governors[provider].record_usage(
+                estimated_tokens, self._streamed_tokens(prompt, ''.join(streamed)) if streamed else 0
+            )
+    
+    @staticmethod
+    def _streamed_tokens(prompt: str, text: str) -> int:
+        """Token estimate for a streamed completion, which carries no usage block"""
+        return len(prompt) // 4 + int(len(text.split()) * 1.3)
+    
+    async def _provider_text_chunks(self, provider: str, prompt: str,
+                                    ai_params: Dict[str, Any]) -> AsyncIterator[str]:
+        """Stream completion text from a provider, without admission control"""
+        if provider == 'openai':
+            client = self.client_registry.get_openai_client(self.openai_key or openai.api_key)
+            try:
+                stream = await client.chat.completions.create(
+                    model=self.OPENAI_MODEL,
+                    messages=[
+                        {
+                            "role": "system", 
+                            "content": "You are an expert copywriter with 15+ years creating high-converting ads. Respond only with the requested format, no extra text."
+                        },
+                        {
+                            "role": "user", 
+                            "content": prompt
+                        }
+                    ],
+                    max_tokens=self.MAX_OUTPUT_TOKENS,
+                    temperature=ai_params["temperature"],
+                    presence_penalty=ai_params["presence_penalty"],
+                    frequency_penalty=ai_params["frequency_penalty"],
+                    stream=True
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            except openai.RateLimitError as e:
+                raise AIProviderUnavailable(
+                    "openai",
+                    f"OpenAI rate limit exceeded: {str(e)}",
+                    retry_after=60
+                )
+            except openai.APIError as e:
+                raise AIProviderUnavailable(
+                    "openai",
+                    f"OpenAI API error: {str(e)}"
+                )
+        elif provider == 'gemini':
+            model = self.client_registry.get_gemini_model(self.GEMINI_MODEL)
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=genai.types.GenerationConfig(
+                    max_output_tokens=self.MAX_OUTPUT_TOKENS,
+                    temperature=ai_params["temperature"],
+                ),
+                stream=True
+            )
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        else:
             raise AIProviderUnavailable(
-                "creative_rewrite",
-                f"No AI providers available for alternative generation: {str(e)}"
+                provider,
+                f"Unknown provider requested: {provider}"
             )
+    
+    async def _generate_routed(self, providers: List[str], generation_args: tuple,
+                               prompt: str, ai_params: Dict[str, Any]) -> Tuple[Dict, str, int]:
+        """
+        Generate on the first ranked provider, hedging and failing over to the next
+        
+        If the first provider is still running its p95 latency after it was
+        admitted by its rate governor, the same request is sent to the next
+        provider and whichever result arrives first is used. A provider that
+        fails (or whose rate governor rejects the request) hands over to the
+        next one.
         
-        # Generate using selected provider
+        Returns:
+            (result, provider that produced it, tokens used)
+        """
+        remaining = list(providers)
+        pending: Dict[asyncio.Future, str] = {}
+        errors: List[Exception] = []
+        
+        def launch(dispatched: Optional[asyncio.Event] = None):
+            next_provider = remaining.pop(0)
+            task = asyncio.ensure_future(
+                self._call_provider(next_provider, generation_args, prompt, ai_params, dispatched)
+            )
+            pending[task] = next_provider
+        
+        # The hedge clock starts at dispatch: time queued for local rate-limit
+        # capacity is not provider slowness, and hedging it would only
+        # duplicate requests while rate limited
+        hedge_delay = self.router.hedge_delay(providers[0]) if len(providers) > 1 else None
+        dispatched = asyncio.Event()
+        dispatch_wait = asyncio.ensure_future(dispatched.wait()) if hedge_delay is not None else None
+        launch(dispatched)
+        hedged = False
+        hedge_at = None
+        
+        try:
+            while pending:
+                if dispatch_wait is not None and dispatch_wait.done():
+                    dispatch_wait = None
+                    hedge_at = time.monotonic() + hedge_delay
+                waiting = list(pending) + ([dispatch_wait] if dispatch_wait is not None else [])
+                timeout = max(0.0, hedge_at - time.monotonic()) if hedge_at is not None else None
+                done, _ = await asyncio.wait(waiting, timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Slower than its p95: race the next provider
+                    hedge_at = None
+                    hedged = True
+                    self.router.record_hedge()
+                    launch()
+                    continue
+                
+                for task in done:
+                    if task is dispatch_wait:
+                        continue
+                    task_provider = pending.pop(task)
+                    try:
+                        result, tokens = task.result()
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    if hedged and task_provider != providers[0]:
+                        self.router.record_hedge(won=True)
+                    return result, task_provider, tokens
+                
+                if not pending and remaining:
+                    hedge_at = None
+                    if dispatch_wait is not None:
+                        dispatch_wait.cancel()
+                        dispatch_wait = None
+                    self.router.record_failover()
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if dispatch_wait is not None:
+                dispatch_wait.cancel()
+        
+        if len(errors) == 1:
+            raise errors[0]
+        raise AIProviderUnavailable(
+            "all_providers",
+            f"All AI providers failed: {'; '.join(str(e) for e in errors)}"
+        )
+    
+    async def _call_provider(self, provider: str, generation_args: tuple,
+                             prompt: str, ai_params: Dict[str, Any],
+                             dispatched: Optional[asyncio.Event] = None) -> Tuple[Dict, int]:
+        """
+        Run one generation on a provider, recording latency and outcome for routing
+        
+        Rate-limit capacity is acquired first: the router times only the
+        provider call, and a local rejection (AIProviderUnavailable from the
+        rate governor) is not held against the provider's health. dispatched,
+        if given, is set once the request is admitted.
+        
+        The dispatch slot is claimed before any await, so of several requests
+        ranking a half-open provider only one sends the probe; the others get
+        AIProviderUnavailable and fail over.
+        """
+        if not self.router.try_dispatch(provider):
+            raise AIProviderUnavailable(provider, f"{provider} circuit is open")
+        
+        estimated_tokens = self._estimate_tokens(prompt)
+        try:
+            await self.rate_governors[provider].acquire(estimated_tokens)
+        except BaseException:
+            # Rejected or cancelled before sending; give the slot back
+            self.router.on_cancel(provider)
+            raise
+        if dispatched is not None:
+            dispatched.set()
+        
+        usage = {}
+        start_time = time.monotonic()
         try:
             if provider == 'openai':
                 result = await self._openai_generate(
-                    ad_data, variant_type, emoji_level, human_tone,
-                    brand_tone, formality_level, target_audience_description,
-                    brand_voice_description, include_cta, cta_style,
-                    creativity_level, urgency_level, emotion_type, filter_cliches
+                    *generation_args, prompt=prompt, ai_params=ai_params, usage=usage,
+                    admitted_tokens=estimated_tokens
                 )
             elif provider == 'gemini':
                 result = await self._gemini_generate(
-                    ad_data, variant_type, emoji_level, human_tone,
-                    brand_tone, formality_level, target_audience_description,
-                    brand_voice_description, include_cta, cta_style,
-                    creativity_level, urgency_level, emotion_type, filter_cliches
+                    *generation_args, prompt=prompt, ai_params=ai_params, usage=usage,
+                    admitted_tokens=estimated_tokens
                 )
             else:
                 raise AIProviderUnavailable(
@@ -188,18 +878,102 @@ class ProductionAIService:
             
             # Validate result is not mock data
             fail_fast_on_mock_data(result, f"ai_generation_result_{provider}")
+        except asyncio.CancelledError:
+            # Lost a hedge race; says nothing about provider health
+            self.router.on_cancel(provider)
+            raise
+        except Exception:
+            self.router.record_failure(provider, time.monotonic() - start_time)
+            raise
+        
+        tokens = usage.get('tokens', 0)
+        self.router.record_success(provider, time.monotonic() - start_time, tokens)
+        return result, tokens
+    
+    def _prepare_generation(self, ad_data: Dict) -> List[str]:
+        """Validate generation input and rank providers for it"""
+        # Validate input data
+        fail_fast_on_mock_data(ad_data, "ai_generation_input")
+        
+        if not ad_data.get('headline') or not ad_data.get('body_text'):
+            raise ProductionError(
+                "Invalid ad data for AI generation",
+                "INVALID_AI_INPUT",
+                {"ad_data": ad_data}
+            )
+        
+        try:
+            return self.rank_providers('creative_rewrite')
+        except AIProviderUnavailable as e:
+            # Re-raise with more context
+            raise AIProviderUnavailable(
+                "creative_rewrite",
+                f"No AI providers available for alternative generation: {str(e)}"
+            )
+    
+    def _generation_cache_key(self, tenant_id: Optional[str], provider: str,
+                              prompt: str, ai_params: Dict[str, Any]) -> str:
+        """Generation cache key for a single-variant request answered by provider"""
+        return self.generation_cache.make_key(
+            tenant_id, provider, self._provider_model(provider), prompt,
+            {**ai_params, 'max_tokens': self.MAX_OUTPUT_TOKENS}
+        )
+    
+    def _generation_cache_keys(self, tenant_id: Optional[str], providers: List[str],
+                               prompt: str, ai_params: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Cache key per configured provider, ranked providers first
+        
+        Lookups check every provider's key, so a cached result is found however
+        the ranking has changed since it was stored (even while its provider's
+        circuit is open); results are stored under the key of the provider
+        that produced them.
+        """
+        ordered = list(providers) + [name for name in self.providers if name not in providers]
+        return {provider: self._generation_cache_key(tenant_id, provider, prompt, ai_params)
+                for provider in ordered}
+    
+    def _provider_model(self, provider: str) -> str:
+        """Model name used for a provider"""
+        return self.OPENAI_MODEL if provider == 'openai' else self.GEMINI_MODEL
+    
+    def _estimate_tokens(self, prompt: str, max_tokens: Optional[int] = None) -> int:
+        """Prompt plus completion token count, for rate-limit admission"""
+        return count_tokens(prompt) + (max_tokens or self.MAX_OUTPUT_TOKENS)
+    
+    def _resolve_sampling_params(self, ad_data: Dict, human_tone: str, creativity_level: int,
+                                 urgency_level: int, emotion_type: str) -> Dict[str, Any]:
+        """Sampling parameters for the creative controls, tuned to the ad's platform"""
+        # Import platform limits for parameter mapping and creative controls
+        from app.constants.platform_limits import HumanTone, get_optimal_creative_parameters
+        from app.constants.creative_controls import EmotionType
+        
+        platform = ad_data.get('platform', 'facebook')
+        
+        try:
+            emotion_enum = EmotionType(emotion_type)
+        except ValueError:
+            emotion_enum = EmotionType.INSPIRING
             
-            return result
-            
-        except Exception as e:
-            # NO FALLBACKS - propagate error up
-            if isinstance(e, AIProviderUnavailable):
-                raise
-            else:
-                raise AIProviderUnavailable(
-                    provider,
-                    f"AI generation failed: {str(e)}"
-                )
+        try:
+            tone_enum = HumanTone(human_tone)
+        except ValueError:
+            tone_enum = HumanTone.CONVERSATIONAL
+        
+        # Get optimal parameters that prioritize creativity level over human tone
+        optimal_params = get_optimal_creative_parameters(
+            platform=platform,
+            creativity_level=creativity_level,
+            urgency_level=urgency_level,
+            emotion_type=emotion_enum,
+            human_tone=tone_enum
+        )
+        
+        # Log any platform warnings for monitoring
+        if optimal_params["platform_warnings"]:
+            logger.info(f"Creative warnings for {platform}: {optimal_params['platform_warnings']}")
+        
+        return optimal_params["ai_parameters"]
     
     async def _openai_generate(self, ad_data: Dict, variant_type: str, 
                                 emoji_level: str = "moderate", 
@@ -214,75 +988,34 @@ class ProductionAIService:
                                 creativity_level: int = 5,
                                 urgency_level: int = 5,
                                 emotion_type: str = "inspiring",
-                                filter_cliches: bool = True) -> Dict:
-        """Generate using OpenAI GPT-4 - production implementation with creative controls"""
+                                filter_cliches: bool = True,
+                                prompt: Optional[str] = None,
+                                ai_params: Optional[Dict[str, Any]] = None,
+                                usage: Optional[Dict[str, Any]] = None,
+                                admitted_tokens: Optional[int] = None) -> Dict:
+        """
+        Generate using OpenAI GPT-4 - production implementation with creative controls
+        
+        prompt and ai_params are built from the other arguments unless given;
+        usage, if given, receives the tokens used. admitted_tokens is passed
+        to _openai_complete.
+        """
         try:
-            # Import platform limits for parameter mapping and creative controls
-            from app.constants.platform_limits import (
-                get_ai_parameters, HumanTone, get_optimal_creative_parameters
-            )
-            from app.constants.creative_controls import EmotionType
-            
-            platform = ad_data.get('platform', 'facebook')
-            
-            # Get optimal creative parameters combining creativity level with platform settings
-            try:
-                emotion_enum = EmotionType(emotion_type)
-            except ValueError:
-                emotion_enum = EmotionType.INSPIRING
-                
-            try:
-                tone_enum = HumanTone(human_tone)
-            except ValueError:
-                tone_enum = HumanTone.CONVERSATIONAL
-            
-            # Get optimal parameters that prioritize creativity level over human tone
-            optimal_params = get_optimal_creative_parameters(
-                platform=platform,
-                creativity_level=creativity_level,
-                urgency_level=urgency_level,
-                emotion_type=emotion_enum,
-                human_tone=tone_enum
-            )
-            
-            ai_params = optimal_params["ai_parameters"]
-            
-            # Log any platform warnings for monitoring
-            if optimal_params["platform_warnings"]:
-                logger.info(f"Creative warnings for {platform}: {optimal_params['platform_warnings']}")
-            
-            prompt = self._build_production_prompt(
-                ad_data, variant_type, emoji_level, human_tone,
-                brand_tone, formality_level, target_audience_description,
-                brand_voice_description, include_cta, cta_style,
-                creativity_level, urgency_level, emotion_type, filter_cliches
-            )
-            
-            # Use new OpenAI client
-            client = openai.AsyncOpenAI(api_key=openai.api_key)
-            
-            response = await client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert copywriter with 15+ years creating high-converting ads. Respond only with the requested format, no extra text."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                max_tokens=500,
-                temperature=ai_params["temperature"],
-                presence_penalty=ai_params["presence_penalty"],
-                frequency_penalty=ai_params["frequency_penalty"]
-            )
-            
-            content = response.choices[0].message.content
-            tokens_used = response.usage.total_tokens
+            if ai_params is None:
+                ai_params = self._resolve_sampling_params(
+                    ad_data, human_tone, creativity_level, urgency_level, emotion_type
+                )
+            if prompt is None:
+                prompt = self._build_production_prompt(
+                    ad_data, variant_type, emoji_level, human_tone,
+                    brand_tone, formality_level, target_audience_description,
+                    brand_voice_description, include_cta, cta_style,
+                    creativity_level, urgency_level, emotion_type, filter_cliches
+                )
             
-            self._track_usage('openai', tokens_used)
+            content, tokens_used = await self._openai_complete(prompt, ai_params, admitted_tokens=admitted_tokens)
+            if usage is not None:
+                usage['tokens'] = tokens_used
             
             # Parse and validate response
             parsed_result = self._parse_structured_response(content, variant_type)
@@ -296,17 +1029,20 @@ class ProductionAIService:
             
             return parsed_result
             
-        except openai.APIError as e:
-            raise AIProviderUnavailable(
-                "openai",
-                f"OpenAI API error: {str(e)}"
-            )
+        except AIProviderUnavailable:
+            raise
         except openai.RateLimitError as e:
+            # Subclass of APIError, so it must be caught first
             raise AIProviderUnavailable(
                 "openai", 
                 f"OpenAI rate limit exceeded: {str(e)}",
                 retry_after=60
             )
+        except openai.APIError as e:
+            raise AIProviderUnavailable(
+                "openai",
+                f"OpenAI API error: {str(e)}"
+            )
         except Exception as e:
             raise AIProviderUnavailable(
                 "openai",
@@ -326,65 +1062,37 @@ class ProductionAIService:
                                 creativity_level: int = 5,
                                 urgency_level: int = 5,
                                 emotion_type: str = "inspiring",
-                                filter_cliches: bool = True) -> Dict:
-        """Generate using Google Gemini - production implementation with creative controls"""
+                                filter_cliches: bool = True,
+                                prompt: Optional[str] = None,
+                                ai_params: Optional[Dict[str, Any]] = None,
+                                usage: Optional[Dict[str, Any]] = None,
+                                admitted_tokens: Optional[int] = None) -> Dict:
+        """
+        Generate using Google Gemini - production implementation with creative controls
+        
+        prompt and ai_params are built from the other arguments unless given;
+        usage, if given, receives the estimated tokens used. admitted_tokens
+        is passed to _gemini_complete.
+        """
         try:
-            # Import platform limits for parameter mapping and creative controls
-            from app.constants.platform_limits import (
-                get_ai_parameters, HumanTone, get_optimal_creative_parameters
-            )
-            from app.constants.creative_controls import EmotionType
-            
-            platform = ad_data.get('platform', 'facebook')
-            
-            # Get optimal creative parameters combining creativity level with platform settings
-            try:
-                emotion_enum = EmotionType(emotion_type)
-            except ValueError:
-                emotion_enum = EmotionType.INSPIRING
-                
-            try:
-                tone_enum = HumanTone(human_tone)
-            except ValueError:
-                tone_enum = HumanTone.CONVERSATIONAL
-            
-            # Get optimal parameters that prioritize creativity level over human tone
-            optimal_params = get_optimal_creative_parameters(
-                platform=platform,
-                creativity_level=creativity_level,
-                urgency_level=urgency_level,
-                emotion_type=emotion_enum,
-                human_tone=tone_enum
-            )
-            
-            ai_params = optimal_params["ai_parameters"]
-            
-            # Log any platform warnings for monitoring
-            if optimal_params["platform_warnings"]:
-                logger.info(f"Creative warnings for {platform}: {optimal_params['platform_warnings']}")
-                
-            model = genai.GenerativeModel('gemini-pro')
-            prompt = self._build_production_prompt(
-                ad_data, variant_type, emoji_level, human_tone,
-                brand_tone, formality_level, target_audience_description,
-                brand_voice_description, include_cta, cta_style,
-                creativity_level, urgency_level, emotion_type, filter_cliches
-            )
-            
-            response = await model.generate_content_async(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=500,
-                    temperature=ai_params["temperature"],
+            if ai_params is None:
+                ai_params = self._resolve_sampling_params(
+                    ad_data, human_tone, creativity_level, urgency_level, emotion_type
+                )
+            if prompt is None:
+                prompt = self._build_production_prompt(
+                    ad_data, variant_type, emoji_level, human_tone,
+                    brand_tone, formality_level, target_audience_description,
+                    brand_voice_description, include_cta, cta_style,
+                    creativity_level, urgency_level, emotion_type, filter_cliches
                 )
-            )
             
-            # Estimate tokens for tracking
-            estimated_tokens = len(response.text.split()) * 1.3
-            self._track_usage('gemini', int(estimated_tokens))
+            content, tokens_used = await self._gemini_complete(prompt, ai_params, admitted_tokens=admitted_tokens)
+            if usage is not None:
+                usage['tokens'] = tokens_used
             
             # Parse and validate response
-            parsed_result = self._parse_structured_response(response.text, variant_type)
+            parsed_result = self._parse_structured_response(content, variant_type)
             
             # Ensure we got real content
             if self._is_placeholder_content(parsed_result):
@@ -395,12 +1103,113 @@ class ProductionAIService:
             
             return parsed_result
             
+        except AIProviderUnavailable:
+            raise
         except Exception as e:
             raise AIProviderUnavailable(
                 "gemini",
                 f"Gemini generation error: {str(e)}"
             )
     
+    async def _openai_complete(self, prompt: str, ai_params: Dict[str, Any],
+                               max_tokens: Optional[int] = None,
+                               admitted_tokens: Optional[int] = None) -> Tuple[str, int]:
+        """
+        Run one OpenAI completion under the rate governor
+        
+        Args:
+            admitted_tokens: Token estimate the caller already acquired capacity
+                for; None acquires it here
+        
+        Returns:
+            (completion text, total tokens used)
+        """
+        max_tokens = max_tokens or self.MAX_OUTPUT_TOKENS
+        estimated_tokens = admitted_tokens
+        if estimated_tokens is None:
+            estimated_tokens = self._estimate_tokens(prompt, max_tokens)
+            await self.rate_governors['openai'].acquire(estimated_tokens)
+        
+        # Pooled client: reuses connections across calls and concurrent variants
+        tokens_used = 0
+        try:
+            client = self.client_registry.get_openai_client(self.openai_key or openai.api_key)
+            response = await client.chat.completions.create(
+                model=self.OPENAI_MODEL,
+                messages=[
+                    {
+                        "role": "system", 
+                        "content": "You are an expert copywriter with 15+ years creating high-converting ads. Respond only with the requested format, no extra text."
+                    },
+                    {
+                        "role": "user", 
+                        "content": prompt
+                    }
+                ],
+                max_tokens=max_tokens,
+                temperature=ai_params["temperature"],
+                presence_penalty=ai_params["presence_penalty"],
+                frequency_penalty=ai_params["frequency_penalty"]
+            )
+            tokens_used = response.usage.total_tokens
+        except openai.RateLimitError as e:
+            # Subclass of APIError, so it must be caught first
+            raise AIProviderUnavailable(
+                "openai", 
+                f"OpenAI rate limit exceeded: {str(e)}",
+                retry_after=60
+            )
+        except openai.APIError as e:
+            raise AIProviderUnavailable(
+                "openai",
+                f"OpenAI API error: {str(e)}"
+            )
+        finally:
+            # Settle the admission estimate; a failed call gives it all back
+            self.rate_governors['openai'].record_usage(estimated_tokens, tokens_used)
+        
+        content = response.choices[0].message.content
+        self._track_usage('openai', tokens_used)
+        return content, tokens_used
+    
+    async def _gemini_complete(self, prompt: str, ai_params: Dict[str, Any],
+                               max_tokens: Optional[int] = None,
+                               admitted_tokens: Optional[int] = None) -> Tuple[str, int]:
+        """
+        Run one Gemini completion under the rate governor
+        
+        Args:
+            admitted_tokens: Token estimate the caller already acquired capacity
+                for; None acquires it here
+        
+        Returns:
+            (completion text, estimated tokens used)
+        """
+        max_tokens = max_tokens or self.MAX_OUTPUT_TOKENS
+        estimated_tokens = admitted_tokens
+        if estimated_tokens is None:
+            estimated_tokens = self._estimate_tokens(prompt, max_tokens)
+            await self.rate_governors['gemini'].acquire(estimated_tokens)
+        
+        tokens_used = 0
+        try:
+            model = self.client_registry.get_gemini_model(self.GEMINI_MODEL)
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=genai.types.GenerationConfig(
+                    max_output_tokens=max_tokens,
+                    temperature=ai_params["temperature"],
+                )
+            )
+            # Estimate tokens for tracking
+            tokens_used = int(len(response.text.split()) * 1.3)
+        finally:
+            # Settle the admission estimate; a failed call gives it all back
+            self.rate_governors['gemini'].record_usage(estimated_tokens, tokens_used)
+        
+        self._track_usage('gemini', tokens_used)
+        return response.text, tokens_used
+    
     def _build_production_prompt(self, ad_data: Dict, variant_type: str, 
                                  emoji_level: str = "moderate",
                                  human_tone: str = "conversational",
@@ -415,230 +1224,85 @@ class ProductionAIService:
                                  urgency_level: int = 5,
                                  emotion_type: str = "inspiring",
                                  filter_cliches: bool = True) -> str:
-        """Build enhanced prompt for production AI generation with Phase 4 & 5 creative controls"""
-        
-        # Import platform configuration and creative controls
-        from app.constants.platform_limits import (
-            get_platform_limit, get_emoji_guideline, get_tone_instruction, 
-            EmojiLevel, HumanTone, get_platform_config, BrandTone, CTAStyle,
-            get_brand_tone_guideline, get_formality_guideline, get_cta_examples,
-            build_platform_creative_prompt
-        )
-        from app.constants.creative_controls import (
-            EmotionType, get_creativity_description, get_urgency_description,
-            get_emotion_config
+        """
+        Build enhanced prompt for production AI generation with Phase 4 & 5 creative controls
+        
+        Rendered from a precompiled template and trimmed to the prompt token budget.
+        """
+        return self.prompt_templates.build(
+            ad_data, variant_type, emoji_level, human_tone, brand_tone, formality_level,
+            target_audience_description, brand_voice_description, include_cta, cta_style,
+            creativity_level, urgency_level, emotion_type, filter_cliches,
+            token_budget=self.prompt_token_budget
         )
+    
+    def _parse_batch_response(self, response: str, variant_types: List[str]) -> List[Optional[Dict]]:
+        """
+        Parse a JSON array of variants, tolerating fences, extra text and truncation
         
-        platform = ad_data.get('platform', 'facebook')
-        character_limit = get_platform_limit(platform)
-        platform_config = get_platform_config(platform)
+        Returns:
+            One entry per requested variant: the validated result, or None if the
+            response did not contain a usable variant for it
+        """
+        results: List[Optional[Dict]] = [None] * len(variant_types)
         
-        # Get emoji and tone instructions
-        try:
-            emoji_enum = EmojiLevel(emoji_level)
-            emoji_guideline = get_emoji_guideline(emoji_enum)
-        except ValueError:
-            emoji_guideline = get_emoji_guideline(EmojiLevel.MODERATE)
+        for position, item in enumerate(self._extract_json_objects(response)):
+            number = item.get('variant')
+            index = number - 1 if isinstance(number, int) and 1 <= number <= len(variant_types) else position
+            if index >= len(variant_types) or results[index] is not None:
+                continue
             
-        try:
-            tone_enum = HumanTone(human_tone)
-            tone_instruction = get_tone_instruction(tone_enum)
-        except ValueError:
-            tone_instruction = get_tone_instruction(HumanTone.CONVERSATIONAL)
+            parsed = {}
+            for key, (field, limit) in RESPONSE_FIELDS.items():
+                value = item.get(field, item.get(key.lower()))
+                if isinstance(value, str):
+                    parsed[field] = value.strip()[:limit]
             
-        # Get brand tone guidelines
-        try:
-            brand_tone_enum = BrandTone(brand_tone)
-            brand_tone_guideline = get_brand_tone_guideline(brand_tone_enum)
-        except ValueError:
-            brand_tone_guideline = get_brand_tone_guideline(BrandTone.CASUAL)
+            # Same validation as the single-variant format
+            if any(len(parsed.get(field, '')) < 5 for field, _ in RESPONSE_FIELDS.values()):
+                continue
+            if self._is_placeholder_content(parsed):
+                continue
             
-        # Get formality guideline
-        formality_guideline = get_formality_guideline(formality_level)
-        
-        # Get CTA examples if CTA is included
-        cta_instruction = ""
-        if include_cta:
+            parsed['variant_type'] = variant_types[index]
+            parsed['ai_generated'] = True
+            parsed['generation_timestamp'] = time.time()
             try:
-                cta_style_enum = CTAStyle(cta_style)
-                cta_examples = get_cta_examples(cta_style_enum)
-                cta_instruction = f"Include a {cta_style} call-to-action. Examples: {', '.join(cta_examples[:3])}"
-            except ValueError:
-                cta_instruction = "Include a moderate call-to-action like 'Get Started' or 'Learn More'"
-        else:
-            cta_instruction = "Do not include any call-to-action. Focus on information and engagement."
-        
-        # Enhanced audience context
-        audience_context = target_audience_description or ad_data.get('target_audience', 'general audience')
-        brand_voice_context = brand_voice_description or "authentic and engaging"
+                fail_fast_on_mock_data(parsed, "ai_generation_result_batch")
+            except Exception:
+                continue
+            results[index] = parsed
         
-        # Phase 4 & 5: Creative control descriptions
-        try:
-            emotion_enum = EmotionType(emotion_type)
-            emotion_config = get_emotion_config(emotion_enum)
-        except ValueError:
-            emotion_config = get_emotion_config(EmotionType.INSPIRING)
-        
-        creativity_desc = get_creativity_description(creativity_level)
-        urgency_desc = get_urgency_description(urgency_level)
-        
-        base_context = f"""
-Original Ad Copy:
-- Headline: {ad_data.get('headline', '')}
-- Body: {ad_data.get('body_text', '')}
-- CTA: {ad_data.get('cta', '')}
-- Platform: {platform}
-- Industry: {ad_data.get('industry', 'general')}
-
-AUDIENCE & BRAND:
-- Target Audience: {audience_context}
-- Brand Voice: {brand_voice_context}
-- Brand Tone: {brand_tone.title()}
-- Formality Level: {formality_level}/10
-
-PLATFORM REQUIREMENTS:
-- Character Limit: {character_limit} characters maximum
-- Platform Culture: {platform_config.get('audience_mindset', 'General audience')}
-
-CREATIVE CONTROLS (Phase 4 & 5):
-- Creativity Level: {creativity_level}/10 ({creativity_desc})
-- Urgency Level: {urgency_level}/10 ({urgency_desc})
-- Emotion Type: {emotion_type.title()} - {emotion_config['description']}
-- Emotion Keywords: {', '.join(emotion_config['keywords'])}
-- Filter Clichés: {'YES - Avoid overused marketing phrases' if filter_cliches else 'NO - Standard filtering'}
-
-STYLE GUIDELINES:
-- Emoji Usage: {emoji_guideline}
-- Human Tone: {tone_instruction}
-- Brand Tone: {brand_tone_guideline}
-- Formality: {formality_guideline}
-- Emotional Approach: {emotion_config['approach']}
-
-CALL-TO-ACTION:
-{cta_instruction}
-"""
-        
-        # Add TikTok-specific instructions if needed
-        tiktok_note = ""
-        if platform.lower() == 'tiktok':
-            tiktok_note = f"""
-            
-⚠️ TIKTOK SPECIAL REQUIREMENTS:
-- Use Gen Z language naturally (not forced)
-- Focus on hooks that stop the scroll
-- Be conversational and relatable, not promotional
-- Embrace humor and authenticity over polish
-- 100 character limit is STRICT - be concise!
-"""
-
-        # Add platform-specific creative instructions from Phase 4 & 5
-        try:
-            platform_creative_instructions = build_platform_creative_prompt(
-                platform, creativity_level, urgency_level, 
-                EmotionType(emotion_type), filter_cliches
-            )
-        except ValueError:
-            platform_creative_instructions = build_platform_creative_prompt(
-                platform, creativity_level, urgency_level, 
-                EmotionType.INSPIRING, filter_cliches
-            )
-        
-        # Character limit enforcement
-        char_limit_note = f"\n\n⚠️ STRICT CHARACTER LIMIT: Your entire response MUST NOT exceed {character_limit} characters. Count carefully!"
-        
-        # Creative instructions based on settings
-        creative_instructions = f"""
-        
-🎨 CREATIVE INSTRUCTIONS:
-{platform_creative_instructions}
-
-⚠️ AVOID if filtering clichés is enabled: overused phrases like "game-changer", "next-level", "cutting-edge", "revolutionary", "world-class", "amazing results", "transform your life", etc.
-""" if filter_cliches else ""
+        return results
+    
+    @staticmethod
+    def _extract_json_objects(response: str) -> List[Dict]:
+        """JSON objects in a response: the top-level array, or whatever complete objects can be salvaged"""
+        decoder = json.JSONDecoder()
+        text = response.strip()
         
-        # Production-quality prompts for each variant type
-        variant_prompts = {
-            'persuasive': f"""
-{base_context}{tiktok_note}{creative_instructions}
-
-Create a HIGHLY PERSUASIVE ad variation that:
-1. Uses specific social proof (numbers, testimonials, popularity indicators)
-2. Creates urgency with time-sensitive language
-3. Emphasizes concrete benefits over features  
-4. Addresses common objections preemptively
-5. Uses power words that drive immediate action
-6. Includes scarcity or limited-time elements
-7. Leverages authority and credibility markers
-{char_limit_note}
-
-CRITICAL: Respond ONLY in this exact format:
-HEADLINE: [new persuasive headline]
-BODY: [new persuasive body text]  
-CTA: [new persuasive call-to-action]
-REASON: [specific persuasion tactics used]
-""",
-            
-            'emotional': f"""
-{base_context}{tiktok_note}{creative_instructions}
-
-Create an EMOTIONALLY COMPELLING ad variation that:
-1. Identifies and targets the core emotion (fear, desire, aspiration, frustration)
-2. Creates a relatable scenario or micro-story that connects
-3. Uses sensory language and vivid, specific imagery
-4. Appeals to identity and self-image transformation
-5. Builds emotional tension that resolves with action
-6. Uses emotional triggers appropriate for the target audience
-7. Incorporates aspirational outcomes and future-state benefits
-{char_limit_note}
-
-CRITICAL: Respond ONLY in this exact format:
-HEADLINE: [emotionally compelling headline]
-BODY: [emotional story/scenario body text]
-CTA: [emotion-driven call-to-action]
-REASON: [specific emotional triggers and tactics used]
-""",
-            
-            'data_driven': f"""
-{base_context}{tiktok_note}{creative_instructions}
-
-Create a DATA-RICH and EVIDENCE-BASED ad variation that:
-1. Include specific statistics, percentages, or quantified metrics
-2. Mention customer counts, time savings, ROI improvements with numbers
-3. Reference studies, awards, certifications, or third-party validation
-4. Use quantified benefits instead of vague claims
-5. Appeal to logical, evidence-based decision making
-6. Incorporate comparison data vs competitors or industry averages
-7. Use concrete before/after numbers and success metrics
-{char_limit_note}
-
-CRITICAL: Respond ONLY in this exact format:
-HEADLINE: [data-rich headline with numbers]
-BODY: [statistically-heavy body text with metrics]
-CTA: [results-focused call-to-action]
-REASON: [specific data points and proof elements used]
-""",
-            
-            'platform_optimized': f"""
-{base_context}{tiktok_note}{creative_instructions}
-
-Create a {ad_data.get('platform', 'FACEBOOK').upper()}-OPTIMIZED ad variation that:
-1. Follows platform-specific character limits and formatting best practices
-2. Uses platform-appropriate tone, language, and communication style
-3. Leverages platform user behavior patterns and expectations
-4. Optimizes for platform algorithm preferences and engagement factors
-5. Considers platform-specific demographics and user mindset
-6. Incorporates platform-native features and call-to-action styles
-7. Aligns with how successful ads perform on this specific platform
-{char_limit_note}
-
-CRITICAL: Respond ONLY in this exact format:
-HEADLINE: [platform-optimized headline]
-BODY: [platform-optimized body text]
-CTA: [platform-appropriate call-to-action]
-REASON: [specific platform optimizations applied]
-"""
-        }
+        array_start = text.find('[')
+        if array_start != -1:
+            try:
+                data, _ = decoder.raw_decode(text, array_start)
+                if isinstance(data, list):
+                    return [item for item in data if isinstance(item, dict)]
+            except ValueError:
+                pass
         
-        return variant_prompts.get(variant_type, variant_prompts['persuasive'])
+        # Malformed or truncated array: keep every complete object
+        objects = []
+        position = text.find('{')
+        while position != -1:
+            try:
+                item, end = decoder.raw_decode(text, position)
+            except ValueError:
+                position = text.find('{', position + 1)
+                continue
+            if isinstance(item, dict):
+                objects.append(item)
+            position = text.find('{', end)
+        return objects
     
     def _parse_structured_response(self, response: str, variant_type: str) -> Dict:
         """Parse AI response into structured format - production validation"""
@@ -647,20 +1311,10 @@ REASON: [specific platform optimizations applied]
             parsed = {}
             
             for line in lines:
-                line = line.strip()
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    key = key.strip().upper()
-                    value = value.strip()
-                    
-                    if key == 'HEADLINE':
-                        parsed['headline'] = value[:80]  # Platform limits
-                    elif key == 'BODY':
-                        parsed['body_text'] = value[:250]
-                    elif key == 'CTA':
-                        parsed['cta'] = value[:40]
-                    elif key == 'REASON':
-                        parsed['improvement_reason'] = value[:200]
+                # Known fields, truncated to platform limits
+                field = parse_field_line(line)
+                if field is not None:
+                    parsed[field[0]] = field[1]
             
             # Validate required fields are present and not empty
             required_fields = ['headline', 'body_text', 'cta', 'improvement_reason']
@@ -687,14 +1341,14 @@ REASON: [specific platform optimizations applied]
                 {"response": response, "variant_type": variant_type}
             )
     
+    PLACEHOLDER_INDICATORS = (
+        '[new]', '[headline]', '[body]', '[cta]', '[reason]',
+        'enhanced copy', 'optimized copy', 'improved copy',
+        'take action', 'click here', 'learn more'
+    )
+    
     def _is_placeholder_content(self, parsed_result: Dict) -> bool:
         """Check if AI returned placeholder/template content"""
-        placeholder_indicators = [
-            '[new]', '[headline]', '[body]', '[cta]', '[reason]',
-            'enhanced copy', 'optimized copy', 'improved copy',
-            'take action', 'click here', 'learn more'
-        ]
-        
         content_to_check = [
             parsed_result.get('headline', ''),
             parsed_result.get('body_text', ''),
@@ -702,13 +1356,12 @@ REASON: [specific platform optimizations applied]
             parsed_result.get('improvement_reason', '')
         ]
         
-        for content in content_to_check:
-            content_lower = content.lower()
-            for indicator in placeholder_indicators:
-                if indicator in content_lower:
-                    return True
-        
-        return False
+        return any(self._is_placeholder_text(content) for content in content_to_check)
+    
+    def _is_placeholder_text(self, content: str) -> bool:
+        """Check a single field for placeholder/template content"""
+        content_lower = content.lower()
+        return any(indicator in content_lower for indicator in self.PLACEHOLDER_INDICATORS)
     
     def _track_usage(self, provider: str, tokens: int):
         """Track usage statistics for production monitoring"""
@@ -727,11 +1380,41 @@ REASON: [specific platform optimizations applied]
             'total_tokens': sum(stats['tokens'] for stats in self.usage_stats.values()),
             'by_provider': self.usage_stats,
             'available_providers': list(self.providers.keys()),
-            'production_ready': len(self.providers) > 0
+            'production_ready': len(self.providers) > 0,
+            'client_pool': self.client_registry.get_stats(),
+            'generation_cache': self.generation_cache.get_stats(),
+            'rate_limits': {name: governor.get_stats() for name, governor in self.rate_governors.items()},
+            'routing': self.router.get_state(),
+            'prompt_templates': {**self.prompt_templates.get_stats(), 'token_budget': self.prompt_token_budget},
+            'batched_generation': self.batch_stats
         }
         
         return summary
     
+    async def warm_up(self, connect: bool = True) -> Dict[str, Any]:
+        """Create pooled provider clients ahead of the first request"""
+        return await self.client_registry.warm_up(
+            openai_key=self.openai_key if 'openai' in self.providers else None,
+            gemini_model=self.GEMINI_MODEL if 'gemini' in self.providers else None,
+            connect=connect
+        )
+    
+    async def aclose(self):
+        """Close pooled provider clients"""
+        await self.client_registry.aclose()
+    
+    def get_routing_state(self) -> Dict[str, Any]:
+        """Provider ranking inputs and circuit states, for health endpoints"""
+        return {
+            'order': {
+                task_type: self.router.rank(
+                    [name for name in preferred_order if name in self.providers], record=False
+                )
+                for task_type, preferred_order in self.TASK_PREFERENCES.items()
+            },
+            **self.router.get_state()
+        }
+    
     async def health_check(self) -> Dict[str, Any]:
         """Production health check for AI services"""
         health_status = {
@@ -773,6 +1456,9 @@ REASON: [specific platform optimizations applied]
             
             health_status['providers'][provider_name] = provider_health
         
+        # Routing decisions (latency percentiles, error rates, circuit states)
+        health_status['routing'] = self.get_routing_state()
+        
         # Determine overall status
         if health_status['healthy_providers'] == 0:
             health_status['status'] = 'critical'
@@ -781,20 +1467,32 @@ REASON: [specific platform optimizations applied]
         
         return health_status
     
-    async def generate_multiple_alternatives(self, ad_data: Dict, variant_types: List[str] = None) -> List[Dict]:
-        """Generate multiple alternatives in parallel - production implementation"""
+    async def generate_multiple_alternatives(self, ad_data: Dict, variant_types: List[str] = None,
+                                             tenant_id: Optional[str] = None,
+                                             batched: bool = True) -> List[Dict]:
+        """
+        Generate multiple alternatives - production implementation
+        
+        With batched=True all variants are requested in a single provider call
+        (see generate_alternatives_batched); otherwise one call per variant.
+        """
         
         if not variant_types:
             variant_types = ['persuasive', 'emotional', 'data_driven', 'platform_optimized']
         
-        # Generate alternatives in parallel for efficiency
-        tasks = [
-            self.generate_ad_alternative(ad_data, variant_type)
-            for variant_type in variant_types
-        ]
-        
         try:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            if batched:
+                results = await self.generate_alternatives_batched(
+                    ad_data, [{'variant_type': variant_type} for variant_type in variant_types],
+                    tenant_id=tenant_id
+                )
+            else:
+                results = await asyncio.gather(*[
+                    self.generate_ad_alternative(ad_data, variant_type, tenant_id=tenant_id)
+                    for variant_type in variant_types
+                ], return_exceptions=True)
+        except ProductionError:
+            raise
         except Exception as e:
             raise AIProviderUnavailable(
                 "batch_generation",
@@ -830,9 +1528,14 @@ REASON: [specific platform optimizations applied]
         emotion_type: str = "inspiring",
         filter_cliches: bool = True,
         variant_type: str = "persuasive",
+        batched: bool = True,
         **kwargs
     ) -> List[Dict]:
-        """Generate multiple creative variants with different approaches - Phase 4 & 5 feature"""
+        """
+        Generate multiple creative variants with different approaches - Phase 4 & 5 feature
+        
+        With batched=True the variants share a single provider call.
+        """
         
         if num_variants < 1 or num_variants > 5:
             raise ProductionError(
@@ -883,22 +1586,28 @@ REASON: [specific platform optimizations applied]
             }
             variant_strategies.append(strategy)
         
-        # Generate variants in parallel
-        tasks = []
-        for strategy in variant_strategies:
-            task = self.generate_ad_alternative(
-                ad_data=ad_data,
-                variant_type=variant_type,
-                creativity_level=strategy['creativity_level'],
-                urgency_level=strategy['urgency_level'],
-                emotion_type=strategy['emotion_type'],
-                filter_cliches=strategy['filter_cliches'],
-                **kwargs  # Pass through other parameters like emoji_level, human_tone, etc.
-            )
-            tasks.append(task)
+        variant_options = [
+            {
+                'variant_type': variant_type,
+                'creativity_level': strategy['creativity_level'],
+                'urgency_level': strategy['urgency_level'],
+                'emotion_type': strategy['emotion_type'],
+                'filter_cliches': strategy['filter_cliches']
+            }
+            for strategy in variant_strategies
+        ]
         
         try:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            if batched:
+                # Other parameters like emoji_level, human_tone, etc. are shared by every variant
+                results = await self.generate_alternatives_batched(ad_data, variant_options, **kwargs)
+            else:
+                results = await asyncio.gather(*[
+                    self.generate_ad_alternative(ad_data=ad_data, **options, **kwargs)
+                    for options in variant_options
+                ], return_exceptions=True)
+        except ProductionError:
+            raise
         except Exception as e:
             raise AIProviderUnavailable(
                 "creative_variant_generation",
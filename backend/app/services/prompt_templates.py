@@ -0,0 +1,614 @@
+"""
+Precompiled generation prompts with a per-provider token budget
+
+``_build_production_prompt`` re-imported the platform and creative-control
+constants and re-rendered every instruction block on each call, although
+almost all of the prompt depends only on the platform, the variant type and
+the style options. A PromptTemplate is compiled once per (platform,
+variant_type, style) -- style being the emoji, tone, brand tone, formality
+and CTA options -- with those sections rendered and token-counted up front;
+creative-control sections are compiled once per (platform, creativity,
+urgency, emotion, cliché filter). Rendering only fills in the ad copy and
+audience.
+
+Optional sections carry a trim rank. When a prompt is over the token budget
+the lowest-ranked sections are dropped first (platform creative guidance,
+then emotion keywords, platform culture, the cliché list and style
+guidelines); the ad copy, audience, creative controls, call-to-action,
+variant instructions, character limit and response format are always kept.
+Average prompt tokens per (platform, variant_type, tone) are reported
+through ``ProductionAIService.get_usage_summary``.
+
+Multi-variant (batch) prompts are compiled per (platform, style) the same
+way and share the trimming budget; each variant's brief reuses the compiled
+creative sections for its creative controls.
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Tokens in text
+
+    Uses the cl100k_base encoding when tiktoken is installed, otherwise
+    estimates four characters per token.
+    """
+    global _encoding, TIKTOKEN_AVAILABLE
+    if TIKTOKEN_AVAILABLE:
+        if _encoding is None:
+            try:
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.warning(f"tiktoken encoding unavailable, estimating prompt tokens: {e}")
+                TIKTOKEN_AVAILABLE = False
+                return (len(text) + 3) // 4
+        return len(_encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+# Lower trim ranks are dropped first when a prompt is over budget
+TRIM_CREATIVE_GUIDANCE = 1
+TRIM_EMOTION_KEYWORDS = 2
+TRIM_PLATFORM_REQUIREMENTS = 3
+TRIM_CLICHE_AVOIDANCE = 4
+TRIM_STYLE_GUIDELINES = 5
+
+TIKTOK_NOTE = """
+
+⚠️ TIKTOK SPECIAL REQUIREMENTS:
+- Use Gen Z language naturally (not forced)
+- Focus on hooks that stop the scroll
+- Be conversational and relatable, not promotional
+- Embrace humor and authenticity over polish
+- 100 character limit is STRICT - be concise!
+"""
+
+CLICHE_AVOIDANCE = """
+⚠️ AVOID if filtering clichés is enabled: overused phrases like "game-changer", "next-level", "cutting-edge", "revolutionary", "world-class", "amazing results", "transform your life", etc.
+"""
+
+# Variant type -> one-line focus for a brief in a multi-variant prompt
+BATCH_VARIANT_FOCUS: Dict[str, str] = {
+    'persuasive': "HIGHLY PERSUASIVE - specific social proof, time-sensitive urgency, concrete benefits, pre-empted objections, power words",
+    'emotional': "EMOTIONALLY COMPELLING - core emotion, relatable micro-story, vivid sensory language, aspirational outcome",
+    'data_driven': "DATA-RICH - specific statistics, quantified benefits and results, third-party validation, before/after numbers",
+    'platform_optimized': "PLATFORM-OPTIMIZED - platform-native tone, format and call-to-action style, engagement patterns of its users"
+}
+
+# Variant type -> (instructions, response format); {platform_upper} is the ad's platform
+VARIANT_INSTRUCTIONS: Dict[str, Tuple[str, str]] = {
+    'persuasive': ("""
+
+Create a HIGHLY PERSUASIVE ad variation that:
+1. Uses specific social proof (numbers, testimonials, popularity indicators)
+2. Creates urgency with time-sensitive language
+3. Emphasizes concrete benefits over features
+4. Addresses common objections preemptively
+5. Uses power words that drive immediate action
+6. Includes scarcity or limited-time elements
+7. Leverages authority and credibility markers
+""", """HEADLINE: [new persuasive headline]
+BODY: [new persuasive body text]
+CTA: [new persuasive call-to-action]
+REASON: [specific persuasion tactics used]
+"""),
+
+    'emotional': ("""
+
+Create an EMOTIONALLY COMPELLING ad variation that:
+1. Identifies and targets the core emotion (fear, desire, aspiration, frustration)
+2. Creates a relatable scenario or micro-story that connects
+3. Uses sensory language and vivid, specific imagery
+4. Appeals to identity and self-image transformation
+5. Builds emotional tension that resolves with action
+6. Uses emotional triggers appropriate for the target audience
+7. Incorporates aspirational outcomes and future-state benefits
+""", """HEADLINE: [emotionally compelling headline]
+BODY: [emotional story/scenario body text]
+CTA: [emotion-driven call-to-action]
+REASON: [specific emotional triggers and tactics used]
+"""),
+
+    'data_driven': ("""
+
+Create a DATA-RICH and EVIDENCE-BASED ad variation that:
+1. Include specific statistics, percentages, or quantified metrics
+2. Mention customer counts, time savings, ROI improvements with numbers
+3. Reference studies, awards, certifications, or third-party validation
+4. Use quantified benefits instead of vague claims
+5. Appeal to logical, evidence-based decision making
+6. Incorporate comparison data vs competitors or industry averages
+7. Use concrete before/after numbers and success metrics
+""", """HEADLINE: [data-rich headline with numbers]
+BODY: [statistically-heavy body text with metrics]
+CTA: [results-focused call-to-action]
+REASON: [specific data points and proof elements used]
+"""),
+
+    'platform_optimized': ("""
+
+Create a {platform_upper}-OPTIMIZED ad variation that:
+1. Follows platform-specific character limits and formatting best practices
+2. Uses platform-appropriate tone, language, and communication style
+3. Leverages platform user behavior patterns and expectations
+4. Optimizes for platform algorithm preferences and engagement factors
+5. Considers platform-specific demographics and user mindset
+6. Incorporates platform-native features and call-to-action styles
+7. Aligns with how successful ads perform on this specific platform
+""", """HEADLINE: [platform-optimized headline]
+BODY: [platform-optimized body text]
+CTA: [platform-appropriate call-to-action]
+REASON: [specific platform optimizations applied]
+"""),
+}
+
+
+@dataclass(frozen=True)
+class PromptSection:
+    """A rendered piece of a prompt"""
+    name: str
+    text: str
+    tokens: int
+    trim_rank: Optional[int] = None  # None = never trimmed
+
+    @classmethod
+    def build(cls, name: str, text: str, trim_rank: Optional[int] = None) -> 'PromptSection':
+        return cls(name, text, count_tokens(text) if text else 0, trim_rank)
+
+
+@lru_cache(maxsize=256)
+def resolve_style_guidelines(emoji_level: str, human_tone: str, brand_tone: str,
+                             formality_level: int, include_cta: bool, cta_style: str) -> Dict[str, str]:
+    """Prompt instructions for the style options, falling back to defaults for unknown values"""
+    from app.constants.platform_limits import (
+        get_emoji_guideline, get_tone_instruction, EmojiLevel, HumanTone, BrandTone, CTAStyle,
+        get_brand_tone_guideline, get_formality_guideline, get_cta_examples
+    )
+
+    try:
+        emoji_guideline = get_emoji_guideline(EmojiLevel(emoji_level))
+    except ValueError:
+        emoji_guideline = get_emoji_guideline(EmojiLevel.MODERATE)
+
+    try:
+        tone_instruction = get_tone_instruction(HumanTone(human_tone))
+    except ValueError:
+        tone_instruction = get_tone_instruction(HumanTone.CONVERSATIONAL)
+
+    try:
+        brand_tone_guideline = get_brand_tone_guideline(BrandTone(brand_tone))
+    except ValueError:
+        brand_tone_guideline = get_brand_tone_guideline(BrandTone.CASUAL)
+
+    formality_guideline = get_formality_guideline(formality_level)
+
+    if include_cta:
+        try:
+            cta_examples = get_cta_examples(CTAStyle(cta_style))
+            cta_instruction = f"Include a {cta_style} call-to-action. Examples: {', '.join(cta_examples[:3])}"
+        except ValueError:
+            cta_instruction = "Include a moderate call-to-action like 'Get Started' or 'Learn More'"
+    else:
+        cta_instruction = "Do not include any call-to-action. Focus on information and engagement."
+
+    return {
+        'emoji_guideline': emoji_guideline,
+        'tone_instruction': tone_instruction,
+        'brand_tone_guideline': brand_tone_guideline,
+        'formality_guideline': formality_guideline,
+        'cta_instruction': cta_instruction
+    }
+
+
+class _StyleTemplate:
+    """
+    Prompt sections that depend only on the platform and the style options
+
+    Args:
+        platform: Ad platform
+        emoji_level, human_tone, brand_tone, formality_level, include_cta, cta_style:
+            Style options, as accepted by _build_production_prompt
+        limit_scope: Appended to the character limit line, e.g. " per variation"
+    """
+
+    def __init__(self, platform: str, emoji_level: str, human_tone: str, brand_tone: str,
+                 formality_level: int, include_cta: bool, cta_style: str, limit_scope: str = ""):
+        from app.constants.platform_limits import get_platform_limit, get_platform_config
+
+        self.platform = platform
+        self.brand_tone = brand_tone
+        self.formality_level = formality_level
+
+        self.character_limit = get_platform_limit(platform)
+        platform_config = get_platform_config(platform)
+        guidelines = resolve_style_guidelines(
+            emoji_level, human_tone, brand_tone, formality_level, include_cta, cta_style
+        )
+
+        self.platform_requirements = PromptSection.build('platform_requirements', f"""PLATFORM REQUIREMENTS:
+- Character Limit: {self.character_limit} characters maximum{limit_scope}
+- Platform Culture: {platform_config.get('audience_mindset', 'General audience')}
+
+""", TRIM_PLATFORM_REQUIREMENTS)
+        # Completed per render with the emotional approach line
+        self.style_guidelines = f"""STYLE GUIDELINES:
+- Emoji Usage: {guidelines['emoji_guideline']}
+- Human Tone: {guidelines['tone_instruction']}
+- Brand Tone: {guidelines['brand_tone_guideline']}
+- Formality: {guidelines['formality_guideline']}
+"""
+        self.style_guidelines_tokens = count_tokens(self.style_guidelines)
+        self.call_to_action = PromptSection.build('call_to_action', f"""
+CALL-TO-ACTION:
+{guidelines['cta_instruction']}
+""")
+        self.platform_note = PromptSection.build(
+            'platform_note', TIKTOK_NOTE if platform.lower() == 'tiktok' else ""
+        )
+
+    def context_sections(self, ad_data: Dict, audience_context: str,
+                         brand_voice_context: str) -> Tuple[PromptSection, PromptSection]:
+        """The ad copy and audience sections for an ad"""
+        ad_copy = PromptSection.build('ad_copy', f"""
+
+Original Ad Copy:
+- Headline: {ad_data.get('headline', '')}
+- Body: {ad_data.get('body_text', '')}
+- CTA: {ad_data.get('cta', '')}
+- Platform: {self.platform}
+- Industry: {ad_data.get('industry', 'general')}
+
+""")
+        audience = PromptSection.build('audience', f"""AUDIENCE & BRAND:
+- Target Audience: {audience_context}
+- Brand Voice: {brand_voice_context}
+- Brand Tone: {self.brand_tone.title()}
+- Formality Level: {self.formality_level}/10
+
+""")
+        return ad_copy, audience
+
+
+class PromptTemplate(_StyleTemplate):
+    """
+    Generation prompt for one (platform, variant_type, style), compiled once
+
+    Args:
+        platform: Ad platform
+        variant_type: One of VARIANT_INSTRUCTIONS
+        emoji_level, human_tone, brand_tone, formality_level, include_cta, cta_style:
+            Style options, as accepted by _build_production_prompt
+    """
+
+    def __init__(self, platform: str, variant_type: str, emoji_level: str, human_tone: str,
+                 brand_tone: str, formality_level: int, include_cta: bool, cta_style: str):
+        super().__init__(platform, emoji_level, human_tone, brand_tone, formality_level, include_cta, cta_style)
+        self.variant_type = variant_type
+        self.label = f"{platform}:{variant_type}:{human_tone}"
+
+        instructions, response_format = VARIANT_INSTRUCTIONS[variant_type]
+        self.variant_instructions = PromptSection.build(
+            'variant_instructions', instructions.format(platform_upper=platform.upper())
+        )
+        self.response_format = PromptSection.build('response_format', (
+            f"\n\n⚠️ STRICT CHARACTER LIMIT: Your entire response MUST NOT exceed {self.character_limit} characters. Count carefully!"
+            f"\n\nCRITICAL: Respond ONLY in this exact format:\n{response_format}"
+        ))
+
+    def sections(self, ad_data: Dict, audience_context: str, brand_voice_context: str,
+                 creative: 'CreativeSections') -> List[PromptSection]:
+        """Every section of the prompt for an ad, in order"""
+        ad_copy, audience = self.context_sections(ad_data, audience_context, brand_voice_context)
+        style = PromptSection(
+            'style_guidelines',
+            self.style_guidelines + creative.emotional_approach.text,
+            self.style_guidelines_tokens + creative.emotional_approach.tokens,
+            TRIM_STYLE_GUIDELINES
+        )
+        return [
+            ad_copy,
+            audience,
+            self.platform_requirements,
+            creative.controls,
+            creative.emotion_keywords,
+            creative.cliche_filter,
+            style,
+            self.call_to_action,
+            self.platform_note,
+            creative.guidance,
+            creative.cliche_avoidance,
+            self.variant_instructions,
+            self.response_format
+        ]
+
+
+class BatchPromptTemplate(_StyleTemplate):
+    """
+    Multi-variant generation prompt for one (platform, style), compiled once
+
+    Every variant gets a brief with its own focus and creative controls; the
+    model answers with one JSON array.
+    """
+
+    def __init__(self, platform: str, emoji_level: str, human_tone: str, brand_tone: str,
+                 formality_level: int, include_cta: bool, cta_style: str):
+        super().__init__(platform, emoji_level, human_tone, brand_tone, formality_level,
+                         include_cta, cta_style, limit_scope=" per variation")
+        self.label = f"{platform}:batch:{human_tone}"
+        self.style = PromptSection.build('style_guidelines', self.style_guidelines, TRIM_STYLE_GUIDELINES)
+        self.cliche_avoidance = PromptSection.build('cliche_avoidance', CLICHE_AVOIDANCE, TRIM_CLICHE_AVOIDANCE)
+
+    def sections(self, ad_data: Dict, audience_context: str, brand_voice_context: str,
+                 briefs: List[Tuple[str, 'CreativeSections']]) -> List[PromptSection]:
+        """
+        Every section of the prompt for an ad, in order
+
+        Args:
+            briefs: (variant_type, creative sections) per variant, in response order
+        """
+        ad_copy, audience = self.context_sections(ad_data, audience_context, brand_voice_context)
+        count = len(briefs)
+        brief_lines = [
+            f"{number}. {BATCH_VARIANT_FOCUS.get(variant_type, BATCH_VARIANT_FOCUS['persuasive'])}\n"
+            f"   {creative.brief}"
+            for number, (variant_type, creative) in enumerate(briefs, 1)
+        ]
+        filters_cliches = any(creative.filter_cliches for _, creative in briefs)
+        return [
+            ad_copy,
+            audience,
+            self.platform_requirements,
+            self.style,
+            self.call_to_action,
+            self.platform_note,
+            self.cliche_avoidance if filters_cliches else PromptSection('cliche_avoidance', "", 0),
+            PromptSection.build('variant_briefs', (
+                f"\nWrite {count} DISTINCT ad variations, one per brief:\n" + "\n".join(brief_lines) + "\n"
+            )),
+            PromptSection.build('response_format', (
+                f"\nCRITICAL: Respond ONLY with a JSON array of exactly {count} objects, in brief order, no extra text:\n"
+                '[{"variant": 1, "headline": "...", "body_text": "...", "cta": "...", '
+                '"improvement_reason": "specific tactics used"}]\n'
+            ))
+        ]
+
+
+class CreativeSections:
+    """Creative-control sections for one (platform, creativity, urgency, emotion, cliché filter)"""
+
+    def __init__(self, platform: str, creativity_level: int, urgency_level: int,
+                 emotion_type: str, filter_cliches: bool):
+        from app.constants.platform_limits import build_platform_creative_prompt
+        from app.constants.creative_controls import (
+            EmotionType, get_creativity_description, get_urgency_description, get_emotion_config
+        )
+
+        try:
+            emotion_enum = EmotionType(emotion_type)
+        except ValueError:
+            emotion_enum = EmotionType.INSPIRING
+        emotion_config = get_emotion_config(emotion_enum)
+        self.filter_cliches = filter_cliches
+        # One-line summary of the controls for a brief in a multi-variant prompt
+        self.brief = (
+            f"Creativity {creativity_level}/10 ({get_creativity_description(creativity_level)}); "
+            f"Urgency {urgency_level}/10 ({get_urgency_description(urgency_level)}); "
+            f"Emotion: {emotion_type.title()} - {emotion_config['approach']}"
+            + ("; avoid clichés" if filter_cliches else "")
+        )
+
+        self.controls = PromptSection.build('creative_controls', f"""CREATIVE CONTROLS (Phase 4 & 5):
+- Creativity Level: {creativity_level}/10 ({get_creativity_description(creativity_level)})
+- Urgency Level: {urgency_level}/10 ({get_urgency_description(urgency_level)})
+- Emotion Type: {emotion_type.title()} - {emotion_config['description']}
+""")
+        self.emotion_keywords = PromptSection.build(
+            'emotion_keywords', f"- Emotion Keywords: {', '.join(emotion_config['keywords'])}\n",
+            TRIM_EMOTION_KEYWORDS
+        )
+        self.cliche_filter = PromptSection.build(
+            'cliche_filter',
+            f"- Filter Clichés: {'YES - Avoid overused marketing phrases' if filter_cliches else 'NO - Standard filtering'}\n\n"
+        )
+        self.emotional_approach = PromptSection.build(
+            'emotional_approach', f"- Emotional Approach: {emotion_config['approach']}\n"
+        )
+
+        if filter_cliches:
+            platform_instructions = build_platform_creative_prompt(
+                platform, creativity_level, urgency_level, emotion_enum, filter_cliches
+            )
+            self.guidance = PromptSection.build('creative_guidance', f"""
+
+🎨 CREATIVE INSTRUCTIONS:
+{platform_instructions}
+""", TRIM_CREATIVE_GUIDANCE)
+            self.cliche_avoidance = PromptSection.build('cliche_avoidance', CLICHE_AVOIDANCE, TRIM_CLICHE_AVOIDANCE)
+        else:
+            self.guidance = PromptSection('creative_guidance', "", 0, TRIM_CREATIVE_GUIDANCE)
+            self.cliche_avoidance = PromptSection('cliche_avoidance', "", 0, TRIM_CLICHE_AVOIDANCE)
+
+
+class PromptTemplateRegistry:
+    """
+    Compiled prompt templates and per-template prompt size stats
+
+    Args:
+        max_templates: Compiled templates (and creative section sets) kept, least recently used dropped
+    """
+
+    def __init__(self, max_templates: int = 512):
+        self.max_templates = max_templates
+        self._templates: 'OrderedDict[Tuple, PromptTemplate]' = OrderedDict()
+        self._batch_templates: 'OrderedDict[Tuple, BatchPromptTemplate]' = OrderedDict()
+        self._creative: 'OrderedDict[Tuple, CreativeSections]' = OrderedDict()
+        self._template_stats: Dict[str, Dict[str, int]] = {}
+        self._stats = {
+            'renders': 0,
+            'compiled': 0,
+            'trimmed_renders': 0,
+            'tokens_trimmed': 0
+        }
+
+    def build(self, ad_data: Dict, variant_type: str,
+              emoji_level: str = "moderate",
+              human_tone: str = "conversational",
+              brand_tone: str = "casual",
+              formality_level: int = 5,
+              target_audience_description: str = None,
+              brand_voice_description: str = None,
+              include_cta: bool = True,
+              cta_style: str = "medium",
+              creativity_level: int = 5,
+              urgency_level: int = 5,
+              emotion_type: str = "inspiring",
+              filter_cliches: bool = True,
+              token_budget: Optional[int] = None) -> str:
+        """
+        Render the generation prompt for an ad
+
+        Args:
+            token_budget: Maximum prompt tokens; optional sections are trimmed
+                to fit. None or 0 keeps the full prompt.
+        """
+        platform = ad_data.get('platform', 'facebook')
+        if variant_type not in VARIANT_INSTRUCTIONS:
+            variant_type = 'persuasive'
+
+        template = self._get(self._templates, (
+            platform, variant_type, emoji_level, human_tone, brand_tone,
+            formality_level, include_cta, cta_style
+        ), PromptTemplate)
+        creative = self._get(self._creative, (
+            platform, creativity_level, urgency_level, emotion_type, filter_cliches
+        ), CreativeSections)
+
+        sections = template.sections(
+            ad_data,
+            target_audience_description or ad_data.get('target_audience', 'general audience'),
+            brand_voice_description or "authentic and engaging",
+            creative
+        )
+        return self._render(template.label, sections, token_budget)
+
+    def build_batch(self, ad_data: Dict, variants: List[Dict[str, Any]],
+                    emoji_level: str = "moderate",
+                    human_tone: str = "conversational",
+                    brand_tone: str = "casual",
+                    formality_level: int = 5,
+                    target_audience_description: str = None,
+                    brand_voice_description: str = None,
+                    include_cta: bool = True,
+                    cta_style: str = "medium",
+                    token_budget: Optional[int] = None) -> str:
+        """
+        Render one prompt asking for several variants as a JSON array
+
+        Args:
+            variants: Per-variant options: variant_type, creativity_level,
+                urgency_level, emotion_type, filter_cliches (defaults as in build)
+            token_budget: Maximum prompt tokens; optional sections are trimmed
+                to fit. None or 0 keeps the full prompt.
+        """
+        platform = ad_data.get('platform', 'facebook')
+        template = self._get(self._batch_templates, (
+            platform, emoji_level, human_tone, brand_tone, formality_level, include_cta, cta_style
+        ), BatchPromptTemplate)
+        briefs = [
+            (variant.get('variant_type', 'persuasive'), self._get(self._creative, (
+                platform,
+                variant.get('creativity_level', 5),
+                variant.get('urgency_level', 5),
+                variant.get('emotion_type', 'inspiring'),
+                variant.get('filter_cliches', True)
+            ), CreativeSections))
+            for variant in variants
+        ]
+
+        sections = template.sections(
+            ad_data,
+            target_audience_description or ad_data.get('target_audience', 'general audience'),
+            brand_voice_description or "authentic and engaging",
+            briefs
+        )
+        return self._render(template.label, sections, token_budget)
+
+    def _render(self, label: str, sections: List[PromptSection], token_budget: Optional[int]) -> str:
+        """Join the sections, dropping the lowest-ranked optional ones while over budget"""
+        tokens = sum(section.tokens for section in sections)
+
+        if token_budget and tokens > token_budget:
+            full_tokens = tokens
+            dropped = set()
+            for section in sorted((s for s in sections if s.trim_rank is not None and s.tokens),
+                                  key=lambda s: s.trim_rank):
+                dropped.add(section.name)
+                tokens -= section.tokens
+                if tokens <= token_budget:
+                    break
+            sections = [section for section in sections if section.name not in dropped]
+            self._stats['trimmed_renders'] += 1
+            self._stats['tokens_trimmed'] += full_tokens - tokens
+            if tokens > token_budget:
+                logger.debug(f"Prompt {label} is {tokens} tokens after trimming, "
+                             f"over the {token_budget} token budget")
+
+        self._record(label, tokens)
+        return ''.join(section.text for section in sections)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compile/render counters and average prompt tokens per (platform, variant_type, tone)"""
+        return {
+            **self._stats,
+            'templates': len(self._templates) + len(self._batch_templates),
+            'tokenizer': 'tiktoken' if TIKTOKEN_AVAILABLE else 'estimate',
+            'avg_prompt_tokens': {
+                label: round(stats['tokens'] / stats['renders'], 1)
+                for label, stats in self._template_stats.items()
+            }
+        }
+
+    def _get(self, cache: OrderedDict, key: Tuple, factory):
+        compiled = cache.get(key)
+        if compiled is None:
+            compiled = factory(*key)
+            cache[key] = compiled
+            self._stats['compiled'] += 1
+            if len(cache) > self.max_templates:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return compiled
+
+    def _record(self, label: str, tokens: int):
+        self._stats['renders'] += 1
+        stats = self._template_stats.setdefault(label, {'renders': 0, 'tokens': 0})
+        stats['renders'] += 1
+        stats['tokens'] += tokens
+
+
+_default_registry: Optional[PromptTemplateRegistry] = None
+
+
+def get_prompt_templates() -> PromptTemplateRegistry:
+    """Get the process-wide prompt template registry"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = PromptTemplateRegistry()
+    return _default_registry
@@ -0,0 +1,249 @@
+"""
+Per-provider request/token rate governor
+
+``AIProviderConfig.rate_limit_rpm`` was declared but never enforced, so a
+burst of concurrent generations (e.g. ``generate_creative_variants``) ran
+straight into provider 429s, which surfaced as ``AIProviderUnavailable``.
+A ProviderRateGovernor holds two token buckets per provider -- requests per
+minute and tokens per minute -- shared by every coroutine in the worker.
+Callers queue in FIFO order for capacity; a caller whose projected wait
+exceeds its deadline is rejected immediately instead of timing out in the
+queue. Identical in-flight prompts are coalesced so only one provider call
+is made and every waiter gets a copy of its result.
+"""
+
+import asyncio
+import copy
+import logging
+import math
+import time
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from app.core.exceptions import AIProviderUnavailable
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Continuously refilling token bucket with FIFO waiters
+
+    Args:
+        rate_per_minute: Tokens added per minute; 0 or less disables the limit
+        capacity: Maximum burst size; defaults to one minute of tokens
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate_per_minute <= 0
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available"""
+        self._refill()
+        return self._tokens
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount tokens are available, ignoring queued waiters"""
+        if self.unlimited:
+            return 0.0
+        shortfall = min(amount, self.capacity) - self.available
+        return max(0.0, shortfall * 60.0 / self.rate_per_minute)
+
+    async def acquire(self, amount: float = 1.0, deadline: Optional[float] = None) -> bool:
+        """
+        Take amount tokens, waiting in line for them
+
+        Args:
+            amount: Tokens to take; capped at capacity so oversize requests can still run
+            deadline: time.monotonic() value by which the tokens must be granted
+
+        Returns:
+            False, without taking anything, if the tokens cannot be granted by the deadline
+        """
+        if self.unlimited:
+            return True
+        amount = min(amount, self.capacity)
+
+        if deadline is None:
+            await self._lock.acquire()
+        else:
+            try:
+                await asyncio.wait_for(self._lock.acquire(), timeout=max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                return False
+
+        try:
+            while True:
+                wait = self.wait_time(amount)
+                if wait <= 0:
+                    self._tokens -= amount
+                    return True
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    return False
+                await asyncio.sleep(wait)
+        finally:
+            self._lock.release()
+
+    def adjust(self, amount: float):
+        """Return (positive) or charge (negative) tokens after the actual cost is known"""
+        if self.unlimited:
+            return
+        self._refill()
+        # May go negative: an underestimated request is paid back by later callers
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_minute / 60.0)
+        self._updated_at = now
+
+
+class ProviderRateGovernor:
+    """
+    Admission control for one AI provider
+
+    Args:
+        provider: Provider name, used in errors and stats
+        requests_per_minute: Request quota; 0 disables the request limit
+        tokens_per_minute: Token quota; 0 disables the token limit
+        max_wait: Longest a request may queue for capacity, in seconds
+    """
+
+    def __init__(self, provider: str, requests_per_minute: int, tokens_per_minute: int = 0,
+                 max_wait: float = 30.0):
+        self.provider = provider
+        self.max_wait = max_wait
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = {
+            'admitted': 0,
+            'rejected': 0,
+            'queued': 0,
+            'total_wait': 0.0,
+            'max_wait_seen': 0.0,
+            'coalesced': 0
+        }
+
+    async def acquire(self, estimated_tokens: int = 0, timeout: Optional[float] = None) -> float:
+        """
+        Wait for capacity for one request
+
+        Args:
+            estimated_tokens: Expected prompt plus completion tokens
+            timeout: Longest to wait; defaults to max_wait
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            AIProviderUnavailable: If capacity will not free up before the timeout
+        """
+        start_time = time.monotonic()
+        deadline = start_time + (timeout if timeout is not None else self.max_wait)
+
+        projected_wait = max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+        if start_time + projected_wait > deadline:
+            self._reject(projected_wait)
+
+        if not await self.requests.acquire(1, deadline):
+            self._reject(self.requests.wait_time(1))
+        if not await self.tokens.acquire(estimated_tokens, deadline):
+            # Give the request slot back; the call is not going to happen
+            self.requests.adjust(1)
+            self._reject(self.tokens.wait_time(estimated_tokens))
+
+        waited = time.monotonic() - start_time
+        self._stats['admitted'] += 1
+        self._stats['total_wait'] += waited
+        self._stats['max_wait_seen'] = max(self._stats['max_wait_seen'], waited)
+        if waited > 0.01:
+            self._stats['queued'] += 1
+        return waited
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """Settle the token bucket once a request's real token count is known"""
+        self.tokens.adjust(estimated_tokens - actual_tokens)
+
+    async def coalesce(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run factory once for concurrent callers with the same key
+
+        The first caller runs factory; callers arriving while it is in flight
+        wait for it and get a deep copy of its result (or its exception).
+        """
+        while key in self._inflight:
+            future = self._inflight[key]
+            self._stats['coalesced'] += 1
+            try:
+                return copy.deepcopy(await asyncio.shield(future))
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leading caller was cancelled; take over the call
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await factory()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a caller without followers does not log it twice
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get admission counters, queue wait and remaining capacity"""
+        admitted = self._stats['admitted']
+        return {
+            **self._stats,
+            'avg_wait': self._stats['total_wait'] / admitted if admitted else 0.0,
+            'inflight_coalescable': len(self._inflight),
+            'requests_per_minute': self.requests.rate_per_minute,
+            'tokens_per_minute': self.tokens.rate_per_minute,
+            'requests_available': None if self.requests.unlimited else round(self.requests.available, 2),
+            'tokens_available': None if self.tokens.unlimited else round(self.tokens.available, 2),
+            'max_wait': self.max_wait
+        }
+
+    def _reject(self, wait: float):
+        self._stats['rejected'] += 1
+        raise AIProviderUnavailable(
+            self.provider,
+            f"Rate limit queue wait of {wait:.1f}s exceeds {self.max_wait:.1f}s",
+            retry_after=max(1, math.ceil(wait))
+        )
+
+
+_governors: Dict[str, ProviderRateGovernor] = {}
+
+
+def get_rate_governor(provider: str, requests_per_minute: int, tokens_per_minute: int = 0) -> ProviderRateGovernor:
+    """Get the worker-wide governor for a provider, creating it on first use"""
+    governor = _governors.get(provider)
+    if governor is None:
+        try:
+            from app.core.config import settings
+            max_wait = settings.LLM_RATE_LIMIT_MAX_WAIT
+        except Exception as e:
+            logger.warning(f"Using default rate limit wait: {e}")
+            max_wait = 30.0
+        governor = ProviderRateGovernor(provider, requests_per_minute, tokens_per_minute, max_wait)
+        _governors[provider] = governor
+    return governor
@@ -0,0 +1,300 @@
+"""
+Latency- and cost-aware AI provider routing
+
+``select_optimal_provider`` used to walk a static per-task preference table,
+so a provider that slowed down kept receiving every request until it failed
+outright. The ProviderRouter keeps a rolling window of latency and outcome
+per provider and ranks providers by observed p50 latency, error rate and
+token cost, using the task preference table only as the tie-breaker (and as
+the order until enough samples exist). Each provider has a circuit breaker:
+repeated failures, or an error rate above threshold, open the circuit and the
+provider is skipped until a cooldown elapses and a single probe succeeds.
+The router also supplies the hedge delay -- a provider's own p95 -- after
+which a request is duplicated to the next-ranked provider.
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class ProviderHealth:
+    """
+    Rolling latency/outcome window and circuit breaker for one provider
+
+    Args:
+        name: Provider name
+        cost_per_1k_tokens: Provider price, used for ranking
+        window_size: Number of recent calls kept
+        failure_threshold: Consecutive failures that open the circuit
+        error_rate_threshold: Error rate over the window that opens the circuit
+        min_samples: Calls needed before latency and error rate are trusted
+        cooldown: Seconds the circuit stays open before a probe is allowed
+    """
+
+    def __init__(self, name: str, cost_per_1k_tokens: float = 0.0, window_size: int = 100,
+                 failure_threshold: int = 5, error_rate_threshold: float = 0.5,
+                 min_samples: int = 10, cooldown: float = 30.0):
+        self.name = name
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+
+        # (latency seconds, succeeded)
+        self._samples: deque = deque(maxlen=window_size)
+        self.consecutive_failures = 0
+        self.circuit = CIRCUIT_CLOSED
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self.tokens = 0
+        self.cost = 0.0
+        self.times_opened = 0
+
+    @property
+    def sample_count(self) -> int:
+        return len(self._samples)
+
+    @property
+    def error_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, succeeded in self._samples if not succeeded) / len(self._samples)
+
+    def latency_percentile(self, fraction: float) -> Optional[float]:
+        """Latency percentile of successful calls, or None without enough samples"""
+        latencies = sorted(latency for latency, succeeded in self._samples if succeeded)
+        if len(latencies) < self.min_samples:
+            return None
+        return _percentile(latencies, fraction)
+
+    def is_available(self) -> bool:
+        """Whether a request may be sent; moves an expired open circuit to half-open"""
+        if self.circuit == CIRCUIT_CLOSED:
+            return True
+        if self.circuit == CIRCUIT_OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+            self.circuit = CIRCUIT_HALF_OPEN
+            self._probe_in_flight = False
+        if self.circuit == CIRCUIT_HALF_OPEN and not self._probe_in_flight:
+            return True
+        return False
+
+    def try_dispatch(self) -> bool:
+        """
+        Claim the right to send a request, checking availability in the same step
+
+        In half-open state only the first caller gets the single probe;
+        concurrent requests that ranked the provider before the probe was
+        claimed are refused. The claim is released by on_cancel or the outcome.
+        """
+        if not self.is_available():
+            return False
+        if self.circuit == CIRCUIT_HALF_OPEN:
+            self._probe_in_flight = True
+        return True
+
+    def on_cancel(self):
+        """Note a request abandoned before it finished (e.g. a lost hedge)"""
+        if self.circuit == CIRCUIT_HALF_OPEN:
+            self._probe_in_flight = False
+
+    def record_success(self, latency: float, tokens: int = 0):
+        self._samples.append((latency, True))
+        self.consecutive_failures = 0
+        self.tokens += tokens
+        self.cost += tokens * self.cost_per_1k_tokens / 1000
+        if self.circuit != CIRCUIT_CLOSED:
+            logger.info(f"AI provider {self.name} recovered; closing circuit")
+        self.circuit = CIRCUIT_CLOSED
+        self._probe_in_flight = False
+
+    def record_failure(self, latency: float):
+        self._samples.append((latency, False))
+        self.consecutive_failures += 1
+        if self.circuit == CIRCUIT_HALF_OPEN:
+            self._open()
+        elif self.circuit == CIRCUIT_CLOSED and (
+            self.consecutive_failures >= self.failure_threshold
+            or (self.sample_count >= self.min_samples and self.error_rate >= self.error_rate_threshold)
+        ):
+            self._open()
+
+    def _open(self):
+        logger.warning(f"AI provider {self.name} unhealthy "
+                       f"(error rate {self.error_rate:.0%}, {self.consecutive_failures} consecutive failures); "
+                       f"opening circuit for {self.cooldown}s")
+        self.circuit = CIRCUIT_OPEN
+        self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.times_opened += 1
+
+    def get_state(self) -> Dict[str, Any]:
+        p50 = self.latency_percentile(0.5)
+        p95 = self.latency_percentile(0.95)
+        return {
+            'circuit': self.circuit,
+            'available': self.is_available(),
+            'samples': self.sample_count,
+            'p50_latency': round(p50, 3) if p50 is not None else None,
+            'p95_latency': round(p95, 3) if p95 is not None else None,
+            'error_rate': round(self.error_rate, 3),
+            'consecutive_failures': self.consecutive_failures,
+            'times_opened': self.times_opened,
+            'cost_per_1k_tokens': self.cost_per_1k_tokens,
+            'tokens': self.tokens,
+            'cost': round(self.cost, 6)
+        }
+
+
+class ProviderRouter:
+    """
+    Ranks AI providers by observed latency, reliability and cost
+
+    Args:
+        hedging_enabled: Whether callers should hedge slow requests
+        min_hedge_delay: Floor on the hedge delay, in seconds
+        error_penalty: Seconds added to a provider's score per unit of error rate
+        cost_weight: Seconds added to a provider's score per dollar per 1k tokens
+        **health_options: Passed to each ProviderHealth
+    """
+
+    def __init__(self, hedging_enabled: bool = True, min_hedge_delay: float = 1.0,
+                 error_penalty: float = 10.0, cost_weight: float = 10.0, **health_options):
+        self.hedging_enabled = hedging_enabled
+        self.min_hedge_delay = min_hedge_delay
+        self.error_penalty = error_penalty
+        self.cost_weight = cost_weight
+        self.health_options = health_options
+        self.providers: Dict[str, ProviderHealth] = {}
+        self._stats = {
+            'routed': 0,
+            'reordered': 0,
+            'hedges': 0,
+            'hedge_wins': 0,
+            'failovers': 0,
+            'all_unavailable': 0
+        }
+
+    @classmethod
+    def from_settings(cls, settings) -> 'ProviderRouter':
+        """Build a router from application settings"""
+        return cls(
+            hedging_enabled=settings.LLM_ROUTER_HEDGING,
+            min_hedge_delay=settings.LLM_ROUTER_MIN_HEDGE_DELAY,
+            failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            error_rate_threshold=settings.LLM_CIRCUIT_ERROR_RATE,
+            cooldown=settings.LLM_CIRCUIT_COOLDOWN
+        )
+
+    def register(self, name: str, cost_per_1k_tokens: float):
+        """Add a provider, keeping its history if already registered"""
+        if name not in self.providers:
+            self.providers[name] = ProviderHealth(name, cost_per_1k_tokens, **self.health_options)
+
+    def rank(self, preferred_order: Sequence[str], record: bool = True) -> List[str]:
+        """
+        Available providers, best first
+
+        Providers are scored by p50 latency plus error and cost penalties;
+        providers without enough samples score like the best measured one, so
+        the preference order decides among them.
+
+        Args:
+            preferred_order: Registered providers in task preference order
+            record: Count this ranking in the routing stats (False for previews)
+        """
+        candidates = [name for name in preferred_order
+                      if name in self.providers and self.providers[name].is_available()]
+        if record:
+            self._stats['routed'] += 1
+        if not candidates:
+            if record:
+                self._stats['all_unavailable'] += 1
+            return []
+
+        scores = {name: self._score(name) for name in candidates}
+        known_scores = [score for score in scores.values() if score is not None]
+        default_score = min(known_scores) if known_scores else 0.0
+        ranked = sorted(
+            candidates,
+            key=lambda name: (scores[name] if scores[name] is not None else default_score,
+                              preferred_order.index(name))
+        )
+        if record and ranked[0] != candidates[0]:
+            self._stats['reordered'] += 1
+        return ranked
+
+    def hedge_delay(self, name: str) -> Optional[float]:
+        """Seconds to wait on a provider before hedging, or None to not hedge"""
+        if not self.hedging_enabled or name not in self.providers:
+            return None
+        p95 = self.providers[name].latency_percentile(0.95)
+        if p95 is None:
+            return None
+        return max(self.min_hedge_delay, p95)
+
+    def try_dispatch(self, name: str) -> bool:
+        return self.providers[name].try_dispatch()
+
+    def on_cancel(self, name: str):
+        self.providers[name].on_cancel()
+
+    def record_success(self, name: str, latency: float, tokens: int = 0):
+        self.providers[name].record_success(latency, tokens)
+
+    def record_failure(self, name: str, latency: float):
+        self.providers[name].record_failure(latency)
+
+    def record_hedge(self, won: bool = False):
+        if won:
+            self._stats['hedge_wins'] += 1
+        else:
+            self._stats['hedges'] += 1
+
+    def record_failover(self):
+        self._stats['failovers'] += 1
+
+    def get_state(self) -> Dict[str, Any]:
+        """Routing counters and per-provider health, for the health endpoint"""
+        return {
+            **self._stats,
+            'hedging_enabled': self.hedging_enabled,
+            'providers': {name: health.get_state() for name, health in self.providers.items()}
+        }
+
+    def _score(self, name: str) -> Optional[float]:
+        health = self.providers[name]
+        p50 = health.latency_percentile(0.5)
+        if p50 is None:
+            return None
+        return p50 + self.error_penalty * health.error_rate + self.cost_weight * health.cost_per_1k_tokens
+
+
+_default_router: Optional[ProviderRouter] = None
+
+
+def get_provider_router() -> ProviderRouter:
+    """Get the process-wide provider router, configured from settings"""
+    global _default_router
+    if _default_router is None:
+        try:
+            from app.core.config import settings
+            _default_router = ProviderRouter.from_settings(settings)
+        except Exception as e:
+            logger.warning(f"Using default provider router settings: {e}")
+            _default_router = ProviderRouter()
+    return _default_router
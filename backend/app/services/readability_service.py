@@ -9,6 +9,8 @@ import re
 from typing import Dict, List, Tuple
 from dataclasses import dataclass
 
+from packages.tools_sdk.text_analysis import count_syllables
+
 @dataclass
 class ReadabilityScore:
     """Container for readability analysis results"""
@@ -128,33 +130,7 @@ class ReadabilityService:
         """
         Count syllables in a single word using heuristic rules.
         """
-        word = word.lower()
-        
-        # Handle empty words
-        if not word:
-            return 1
-        
-        # Count vowel groups
-        vowel_groups = 0
-        prev_was_vowel = False
-        
-        for char in word:
-            is_vowel = bool(self.vowel_pattern.match(char))
-            if is_vowel and not prev_was_vowel:
-                vowel_groups += 1
-            prev_was_vowel = is_vowel
-        
-        # Apply common English rules
-        if word.endswith('e'):
-            vowel_groups -= 1
-        
-        if word.endswith('le') and len(word) > 2 and not self.vowel_pattern.match(word[-3]):
-            vowel_groups += 1
-        
-        if vowel_groups == 0:
-            vowel_groups = 1
-        
-        return vowel_groups
+        return count_syllables(word)
     
     def _interpret_flesch_score(self, score: float) -> Tuple[str, str, str]:
         """Interpret Flesch Reading Ease score"""
@@ -0,0 +1,302 @@
+"""
+Speculative pre-generation of ad alternatives
+
+Users almost always ask for alternatives right after an analysis finishes,
+which cost them a second full LLM round trip. When speculative generation
+is enabled, a finished analysis schedules a low-priority background job that
+generates the alternatives and stores them under the analysis_id, so
+``/api/ads/generate-alternatives?analysis_id=...`` can answer instantly (or
+after a short wait when the job is still running).
+
+Jobs run as in-process tasks. At most ``max_concurrency`` run at once per
+worker, and a job is dropped rather than started while any provider has
+less than ``reserve`` of its rate-limit capacity left, so speculation never
+queues ahead of interactive requests. Each user may trigger at most the
+daily budget of their subscription tier; the count is kept in the result
+store, so with Redis configured the budget is shared by every worker. Jobs
+that are dropped or fail are refunded, so only stored results count against
+it.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+from packages.tools_sdk.result_cache import ResultCache, content_hash, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Speculative generations per user per UTC day, by subscription tier
+TIER_DAILY_BUDGETS: Dict[str, int] = {
+    'free': 0,
+    'basic': 20,
+    'growth': 20,
+    'agency_standard': 100,
+    'agency_premium': 300,
+    'agency_unlimited': 1000,
+    'pro': 1000,
+}
+
+DEFAULT_VARIANT_TYPES = ['persuasive', 'emotional', 'data_driven']
+
+
+def ad_fingerprint(ad_data: Dict[str, Any]) -> str:
+    """Hash of the ad fields generation depends on, to detect edits between analysis and generate"""
+    return content_hash({field: normalize_text(ad_data.get(field))
+                         for field in ('headline', 'body_text', 'cta', 'platform')})
+
+
+class SpeculativeGenerator:
+    """
+    Background pre-generation of alternatives, keyed by analysis_id
+
+    Args:
+        ai_service: ProductionAIService used for generation; built from settings on first use when None
+        ttl: Seconds a pre-generated result is kept
+        max_entries: Maximum results held in the in-process store
+        max_concurrency: Speculative jobs running at once per worker
+        reserve: Fraction of each provider's rate-limit capacity left for interactive requests
+        tier_budgets: Daily speculative generations per subscription tier
+        variant_types: Variants generated for each analysis
+        redis_url: Redis URL to share results across workers; None keeps them process-local
+        enabled: False makes schedule() a no-op
+    """
+
+    def __init__(self, ai_service=None, ttl: float = 900, max_entries: int = 1024,
+                 max_concurrency: int = 2, reserve: float = 0.5,
+                 tier_budgets: Optional[Dict[str, int]] = None,
+                 variant_types: Optional[List[str]] = None,
+                 redis_url: Optional[str] = None, enabled: bool = True):
+        self.ai_service = ai_service
+        self.ttl = ttl
+        self.reserve = reserve
+        self.tier_budgets = dict(tier_budgets if tier_budgets is not None else TIER_DAILY_BUDGETS)
+        self.variant_types = list(variant_types or DEFAULT_VARIANT_TYPES)
+        self.enabled = enabled
+        self.max_concurrency = max_concurrency
+
+        self._store = ResultCache(
+            namespace="speculative_generation",
+            max_entries=max_entries,
+            default_ttl=ttl,
+            redis_url=redis_url
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._stats = {
+            'scheduled': 0,
+            'completed': 0,
+            'failed': 0,
+            'skipped_disabled': 0,
+            'skipped_budget': 0,
+            'skipped_pressure': 0,
+            'claimed': 0,
+            'claimed_after_wait': 0,
+            'missed': 0
+        }
+
+    @classmethod
+    def from_settings(cls, settings) -> 'SpeculativeGenerator':
+        """Build a generator from application settings"""
+        return cls(
+            ttl=settings.SPECULATIVE_GENERATION_TTL,
+            max_concurrency=settings.SPECULATIVE_GENERATION_MAX_CONCURRENCY,
+            reserve=settings.SPECULATIVE_GENERATION_RESERVE,
+            redis_url=settings.REDIS_URL if settings.AI_GENERATION_CACHE_SHARED else None,
+            enabled=settings.SPECULATIVE_GENERATION_ENABLED
+        )
+
+    def schedule(self, analysis_id: str, user_id: Any, subscription_tier: Optional[str],
+                 ad_data: Dict[str, Any]) -> bool:
+        """
+        Start pre-generating alternatives for a finished analysis
+
+        Must be called from a running event loop. Returns immediately.
+
+        Args:
+            analysis_id: Key the alternatives are stored under
+            user_id: Owner of the analysis; only they can claim the result
+            subscription_tier: Tier value (e.g. "growth") selecting the daily budget
+            ad_data: Ad fields (headline, body_text, cta, platform, ...); None values are dropped
+
+        Returns:
+            True if a job was started; it still checks the user's remaining daily
+            budget before generating
+        """
+        if not self.enabled:
+            self._stats['skipped_disabled'] += 1
+            return False
+        if analysis_id in self._tasks:
+            return False
+        budget = self.tier_budgets.get(subscription_tier or 'free', 0)
+        if budget <= 0:
+            self._stats['skipped_budget'] += 1
+            return False
+
+        # Unset fields are left out, as on the interactive path, so prompts fall back to their defaults
+        ad_data = {field: value for field, value in ad_data.items() if value is not None}
+        task = asyncio.get_running_loop().create_task(
+            self._run(analysis_id, str(user_id), ad_data, budget)
+        )
+        self._tasks[analysis_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(analysis_id, None))
+        self._stats['scheduled'] += 1
+        return True
+
+    async def claim(self, analysis_id: str, user_id: Any, ad_data: Optional[Dict[str, Any]] = None,
+                    wait: float = 0.0) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the pre-generated alternatives of an analysis
+
+        Args:
+            analysis_id: Analysis the alternatives were generated for
+            user_id: Requesting user; results of other users are never returned
+            ad_data: Ad the caller wants alternatives for; a result generated for a
+                different (since edited) ad is not returned
+            wait: Seconds to wait for a job that is still running
+
+        Returns:
+            The alternatives, or None if there are none (the caller generates normally)
+        """
+        entry = await self._store.get(analysis_id)
+        waited = False
+        if entry is None and wait > 0 and analysis_id in self._tasks:
+            waited = True
+            try:
+                await asyncio.wait_for(asyncio.shield(self._tasks[analysis_id]), timeout=wait)
+            except Exception:
+                # Timed out or failed; the caller generates normally
+                pass
+            entry = await self._store.get(analysis_id)
+
+        if (entry is None or entry['user_id'] != str(user_id)
+                or (ad_data is not None and entry['ad'] != ad_fingerprint(ad_data))):
+            self._stats['missed'] += 1
+            return None
+
+        self._stats['claimed_after_wait' if waited else 'claimed'] += 1
+        return [dict(alternative) for alternative in entry['alternatives']]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduling, budget and claim counters"""
+        claims = self._stats['claimed'] + self._stats['claimed_after_wait']
+        lookups = claims + self._stats['missed']
+        return {
+            **self._stats,
+            'hit_rate': claims / lookups if lookups else 0.0,
+            'running': len(self._tasks),
+            'stored': self._store.get_stats()['entries'],
+            'enabled': self.enabled,
+            'max_concurrency': self.max_concurrency,
+            'reserve': self.reserve
+        }
+
+    @staticmethod
+    def _usage_key(user_id: str, usage_day: str) -> str:
+        return f"budget:{usage_day}:{user_id}"
+
+    @staticmethod
+    def _utc_day() -> Tuple[str, float]:
+        """Current UTC day and the seconds left until it ends"""
+        now = datetime.now(timezone.utc)
+        day_end = datetime(now.year, now.month, now.day, tzinfo=timezone.utc) + timedelta(days=1)
+        return now.strftime('%Y-%m-%d'), (day_end - now).total_seconds()
+
+    async def _charge_budget(self, user_id: str, budget: int) -> Optional[str]:
+        """Count one generation against today's budget; returns the day charged, or None when spent"""
+        usage_day, seconds_left = self._utc_day()
+        key = self._usage_key(user_id, usage_day)
+        if await self._store.increment(key, 1, ttl=seconds_left) > budget:
+            await self._store.increment(key, -1, ttl=seconds_left)
+            return None
+        return usage_day
+
+    async def _refund_budget(self, user_id: str, usage_day: str):
+        """Give back a charge made on usage_day; charges from an earlier day have already reset"""
+        today, seconds_left = self._utc_day()
+        if usage_day == today:
+            await self._store.increment(self._usage_key(user_id, usage_day), -1, ttl=seconds_left)
+
+    def _get_ai_service(self):
+        if self.ai_service is None:
+            from app.core.config import settings
+            from app.services.production_ai_generator import ProductionAIService
+            self.ai_service = ProductionAIService(openai_key=settings.OPENAI_API_KEY)
+        return self.ai_service
+
+    def _has_headroom(self, ai_service) -> bool:
+        """Whether every provider has more than the reserved share of its rate limit free"""
+        for governor in ai_service.rate_governors.values():
+            for bucket in (governor.requests, governor.tokens):
+                if not bucket.unlimited and bucket.available < bucket.capacity * self.reserve:
+                    return False
+        return True
+
+    async def _run(self, analysis_id: str, user_id: str, ad_data: Dict[str, Any], budget: int):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        usage_day = await self._charge_budget(user_id, budget)
+        if usage_day is None:
+            self._stats['skipped_budget'] += 1
+            return
+
+        stored = False
+        try:
+            async with self._semaphore:
+                stored = await self._generate(analysis_id, user_id, ad_data)
+        finally:
+            if not stored:
+                # Dropped, failed or cancelled jobs do not count against the budget
+                await self._refund_budget(user_id, usage_day)
+
+    async def _generate(self, analysis_id: str, user_id: str, ad_data: Dict[str, Any]) -> bool:
+        """Generate and store the alternatives; returns whether a result was stored"""
+        try:
+            ai_service = self._get_ai_service()
+            if not self._has_headroom(ai_service):
+                self._stats['skipped_pressure'] += 1
+                return False
+
+            start_time = time.perf_counter()
+            results = await ai_service.generate_multiple_alternatives(
+                ad_data, self.variant_types, tenant_id=user_id
+            )
+            alternatives = [
+                {
+                    'variant_type': result.get('variant_type'),
+                    'headline': result['headline'],
+                    'body_text': result['body_text'],
+                    'cta': result['cta'],
+                    'improvement_reason': result.get('improvement_reason', '')
+                }
+                for result in results
+            ]
+            entry = {'user_id': user_id, 'ad': ad_fingerprint(ad_data), 'alternatives': alternatives}
+            await self._store.set(analysis_id, entry, ttl=self.ttl)
+            self._stats['completed'] += 1
+            logger.debug(f"Pre-generated {len(alternatives)} alternatives for analysis {analysis_id} "
+                         f"in {time.perf_counter() - start_time:.2f}s")
+            return True
+        except Exception as e:
+            self._stats['failed'] += 1
+            logger.warning(f"Speculative generation for analysis {analysis_id} failed: {e}")
+            return False
+
+
+_default_generator: Optional[SpeculativeGenerator] = None
+
+
+def get_speculative_generator() -> SpeculativeGenerator:
+    """Get the process-wide speculative generator, configured from settings"""
+    global _default_generator
+    if _default_generator is None:
+        try:
+            from app.core.config import settings
+            _default_generator = SpeculativeGenerator.from_settings(settings)
+        except Exception as e:
+            logger.warning(f"Using default speculative generation settings: {e}")
+            _default_generator = SpeculativeGenerator(enabled=False)
+    return _default_generator
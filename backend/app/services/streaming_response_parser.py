@@ -0,0 +1,77 @@
+"""
+Incremental parser for the line-based generation format
+
+Generation prompts ask for one field per line (``HEADLINE: ...``,
+``BODY: ...``, ``CTA: ...``, ``REASON: ...``). ``_parse_structured_response``
+reads that format once the whole completion has arrived; the
+StreamingFieldParser reads the same format from streamed text chunks and
+reports each field as soon as its line is finished, so streaming endpoints
+can forward the headline while the body is still being generated.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+# Response line key -> (result field, maximum length)
+RESPONSE_FIELDS: Dict[str, Tuple[str, int]] = {
+    'HEADLINE': ('headline', 80),
+    'BODY': ('body_text', 250),
+    'CTA': ('cta', 40),
+    'REASON': ('improvement_reason', 200),
+}
+
+
+def parse_field_line(line: str) -> Optional[Tuple[str, str]]:
+    """
+    Parse one response line
+
+    Returns:
+        (result field, value truncated to the field's limit), or None if the
+        line does not hold a known field
+    """
+    line = line.strip()
+    if ':' not in line:
+        return None
+    key, value = line.split(':', 1)
+    field = RESPONSE_FIELDS.get(key.strip().upper())
+    if field is None:
+        return None
+    name, limit = field
+    return name, value.strip()[:limit]
+
+
+class StreamingFieldParser:
+    """
+    Turns streamed completion text into completed fields
+
+    A field is complete when its line ends; feed() returns the fields
+    completed by a chunk and close() the field on the final, unterminated line.
+    If the model repeats a field, the later value is reported again and wins,
+    matching ``_parse_structured_response``.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self.fields: Dict[str, str] = {}
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """Consume a chunk of text and return the fields it completed"""
+        self._buffer += chunk
+        if '\n' not in self._buffer:
+            return []
+        *lines, self._buffer = self._buffer.split('\n')
+        return self._parse_lines(lines)
+
+    def close(self) -> List[Tuple[str, str]]:
+        """Flush the final line once the stream has ended"""
+        lines = [self._buffer]
+        self._buffer = ''
+        return self._parse_lines(lines)
+
+    def _parse_lines(self, lines: List[str]) -> List[Tuple[str, str]]:
+        completed = []
+        for line in lines:
+            parsed = parse_field_line(line)
+            if parsed is not None:
+                self.fields[parsed[0]] = parsed[1]
+                completed.append(parsed)
+        return completed
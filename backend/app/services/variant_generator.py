@@ -6,7 +6,6 @@ emotional tones, and urgency levels. Includes side-by-side comparison and
 mix-and-match functionality for optimal creative testing.
 """
 
-import asyncio
 import time
 import logging
 from typing import Dict, List, Optional, Any, Tuple
@@ -15,6 +14,7 @@ from enum import Enum
 
 from app.services.production_ai_generator import ProductionAIService
 from app.services.cliche_filter import ClicheFilter
+from app.services.ad_improvement_service import AdImprovementService
 from app.constants.creative_controls import (
     CreativityLevel, UrgencyLevel, EmotionType,
     get_creativity_description, get_urgency_description,
@@ -62,6 +62,7 @@ class VariantComparison:
     cliche_count: int = 0
     risk_assessment: str = "Medium"
     platform_compatibility: str = "Good"
+    predicted_score: Optional[float] = None
 
 class VariantGenerator:
     """
@@ -76,9 +77,14 @@ class VariantGenerator:
     - Cliché filtering and analysis
     """
     
-    def __init__(self, ai_service: ProductionAIService):
+    def __init__(self, ai_service: ProductionAIService,
+                 improvement_service: Optional[AdImprovementService] = None):
         self.ai_service = ai_service
         self.cliche_filter = ClicheFilter()
+        # Shares the generation service's pooled clients instead of opening its own
+        self.improvement_service = improvement_service or AdImprovementService(
+            client_registry=ai_service.client_registry
+        )
         logger.info("VariantGenerator initialized with advanced creative controls")
     
     async def generate_variant_set(
@@ -116,16 +122,15 @@ class VariantGenerator:
             base_emotion, platform, platform_config
         )
         
-        # Generate all variants in parallel
-        generation_tasks = []
-        for config in variant_configs:
-            task = self._generate_single_variant(
-                ad_data, config, variant_type, **generation_kwargs
-            )
-            generation_tasks.append(task)
-        
+        # Generate all variants with one provider request (individual calls as fallback)
         try:
-            variant_results = await asyncio.gather(*generation_tasks, return_exceptions=True)
+            variant_results = await self.ai_service.generate_alternatives_batched(
+                ad_data,
+                [self._variant_generation_options(config, variant_type) for config in variant_configs],
+                **generation_kwargs
+            )
+        except ProductionError:
+            raise
         except Exception as e:
             raise AIProviderUnavailable(
                 "variant_set_generation",
@@ -144,7 +149,7 @@ class VariantGenerator:
                 })
                 logger.warning(f"Failed to generate {variant_configs[i].variant_name}: {result}")
             else:
-                successful_variants.append(result)
+                successful_variants.append(self._annotate_variant(result, variant_configs[i]))
         
         if not successful_variants:
             raise AIProviderUnavailable(
@@ -276,39 +281,25 @@ class VariantGenerator:
         
         return configs
     
-    async def _generate_single_variant(
-        self,
-        ad_data: Dict,
-        config: VariantConfig,
-        variant_type: str,
-        **generation_kwargs
-    ) -> Dict[str, Any]:
-        """Generate a single variant with given configuration"""
-        
-        try:
-            result = await self.ai_service.generate_ad_alternative(
-                ad_data=ad_data,
-                variant_type=variant_type,
-                creativity_level=config.creativity_level,
-                urgency_level=config.urgency_level,
-                emotion_type=config.emotion_type.value,
-                filter_cliches=config.filter_cliches,
-                **generation_kwargs
-            )
-            
-            # Add variant configuration metadata
-            result.update({
-                "variant_config": asdict(config),
-                "generation_strategy": config.strategy_description,
-                "variant_name": config.variant_name,
-                "risk_level": config.risk_level
-            })
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Failed to generate variant {config.variant_name}: {e}")
-            raise
+    def _variant_generation_options(self, config: VariantConfig, variant_type: str) -> Dict[str, Any]:
+        """Per-variant generation options for a variant configuration"""
+        return {
+            "variant_type": variant_type,
+            "creativity_level": config.creativity_level,
+            "urgency_level": config.urgency_level,
+            "emotion_type": config.emotion_type.value,
+            "filter_cliches": config.filter_cliches
+        }
+    
+    def _annotate_variant(self, result: Dict[str, Any], config: VariantConfig) -> Dict[str, Any]:
+        """Add variant configuration metadata to a generated variant"""
+        result.update({
+            "variant_config": asdict(config),
+            "generation_strategy": config.strategy_description,
+            "variant_name": config.variant_name,
+            "risk_level": config.risk_level
+        })
+        return result
     
     async def _create_variant_comparison_set(
         self,
@@ -321,36 +312,38 @@ class VariantGenerator:
         
         platform = ad_data.get('platform', 'facebook')
         
-        # Create comparison objects for each variant
-        comparisons = []
+        # Post-process the whole set at once: clichés and strategy keywords
+        # for every variant come from one matcher scan over the combined texts
+        texts = [
+            f"{variant.get('headline', '')} {variant.get('body_text', '')} {variant.get('cta', '')}"
+            for variant in variants
+        ]
+        cliche_analyses = self.cliche_filter.analyze_texts(texts, ad_data.get('industry') or "general")
+        predicted_scores = self.improvement_service.predict_variant_scores(texts, platform)
         
-        for i, variant in enumerate(variants):
-            # Analyze clichés
-            cliche_analysis = await self.cliche_filter.analyze_copy_originality(
-                variant.get('headline', '') + ' ' + variant.get('body_text', '')
-            )
-            
-            # Get platform compatibility
-            emotion_type = variant.get('variant_config', {}).get('emotion_type', 'inspiring')
-            try:
-                emotion_enum = EmotionType(emotion_type)
-                emotion_compatibility = get_emotion_platform_compatibility(emotion_enum)
-                platform_compat = emotion_compatibility.get(platform, "Good")
-            except (ValueError, AttributeError):
-                platform_compat = "Good"
+        # Platform compatibility depends only on the emotion, so look each one up once
+        compatibility_by_emotion: Dict[str, str] = {}
+        
+        comparisons = []
+        for i, (variant, cliche_analysis, prediction) in enumerate(zip(variants, cliche_analyses, predicted_scores)):
+            variant_config = variant.get('variant_config', {})
+            emotion_type = variant_config.get('emotion_type', 'inspiring')
+            if emotion_type not in compatibility_by_emotion:
+                compatibility_by_emotion[emotion_type] = self._emotion_platform_compatibility(emotion_type, platform)
             
             comparison = VariantComparison(
                 variant_id=f"variant_{i+1}",
                 headline=variant.get('headline', ''),
                 body_text=variant.get('body_text', ''),
                 cta=variant.get('cta', ''),
-                creativity_score=variant.get('variant_config', {}).get('creativity_level', 5),
-                urgency_score=variant.get('variant_config', {}).get('urgency_level', 5),
+                creativity_score=variant_config.get('creativity_level', 5),
+                urgency_score=variant_config.get('urgency_level', 5),
                 emotion_type=emotion_type,
                 character_count=len(variant.get('headline', '') + variant.get('body_text', '') + variant.get('cta', '')),
-                cliche_count=len(cliche_analysis.get('cliches_found', [])),
+                cliche_count=cliche_analysis.total_cliches,
                 risk_assessment=variant.get('risk_level', 'Medium'),
-                platform_compatibility=platform_compat
+                platform_compatibility=compatibility_by_emotion[emotion_type],
+                predicted_score=prediction['overall_score']
             )
             
             comparisons.append(comparison)
@@ -375,6 +368,14 @@ class VariantGenerator:
             "mix_and_match": self._create_mix_and_match_suggestions(variants, comparisons)
         }
     
+    def _emotion_platform_compatibility(self, emotion_type: str, platform: str) -> str:
+        """Compatibility rating of an emotion on a platform"""
+        try:
+            emotion_compatibility = get_emotion_platform_compatibility(EmotionType(emotion_type))
+            return emotion_compatibility.get(platform, "Good")
+        except (ValueError, AttributeError):
+            return "Good"
+    
     def _calculate_comparison_metrics(self, comparisons: List[VariantComparison]) -> Dict[str, Any]:
         """Calculate metrics for comparing variants"""
         
@@ -382,6 +383,7 @@ class VariantGenerator:
         urgency_scores = [comp.urgency_score for comp in comparisons]
         character_counts = [comp.character_count for comp in comparisons]
         cliche_counts = [comp.cliche_count for comp in comparisons]
+        predicted_scores = [comp.predicted_score for comp in comparisons if comp.predicted_score is not None]
         
         return {
             "creativity_range": {
@@ -404,6 +406,11 @@ class VariantGenerator:
                 "least_original": max(cliche_counts),
                 "average_cliches": sum(cliche_counts) / len(cliche_counts)
             },
+            "predicted_score_range": {
+                "min": min(predicted_scores),
+                "max": max(predicted_scores),
+                "average": sum(predicted_scores) / len(predicted_scores)
+            } if predicted_scores else None,
             "risk_distribution": {
                 risk: len([c for c in comparisons if c.risk_assessment == risk])
                 for risk in ["Low", "Medium", "High"]
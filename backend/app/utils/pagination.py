@@ -0,0 +1,62 @@
+"""
+Keyset (cursor) pagination helpers
+
+Listing endpoints page newest-first on (created_at, id). A cursor encodes
+the sort key of the last row of a page, so the next page is a range seek on
+the (user_id, created_at, id) index instead of an OFFSET that scans and
+discards every earlier row.
+"""
+
+import base64
+from datetime import datetime
+from typing import Tuple
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.types import TypeDecorator
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Opaque cursor pointing just after a row"""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor from encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8').split('|', 1)
+        return datetime.fromisoformat(created_at), row_id
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
+class CursorTimestamp(TypeDecorator):
+    """
+    Bind type for a cursor's created_at
+
+    SQLite stores timestamps as text and compares them as strings. Rows
+    whose created_at came from the CURRENT_TIMESTAMP server default are
+    stored to the second ('2024-01-05 10:00:07'), which sorts below the
+    '2024-01-05 10:00:07.000000' SQLAlchemy binds, so the seek kept
+    returning the cursor's own second. On SQLite whole-second values are
+    bound at that precision (matching the server default, the only writer
+    of whole-second timestamps); other databases get the datetime unchanged.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'sqlite':
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != 'sqlite':
+            return value
+        return value.strftime('%Y-%m-%d %H:%M:%S' if not value.microsecond else '%Y-%m-%d %H:%M:%S.%f')
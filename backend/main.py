@@ -111,6 +111,12 @@ if blog_router is not None:
 else:
     logger.info("Blog router not included - disabled or import failed")
 
+@app.on_event("shutdown")
+async def close_database_pool():
+    """Release the worker's async database connections"""
+    from app.core.async_database import dispose_async_engine
+    await dispose_async_engine()
+
 @app.get("/")
 async def root():
     return {"message": "AdCopySurge API is running", "version": "1.0.0"}
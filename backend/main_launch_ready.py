@@ -7,6 +7,7 @@ from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import uvicorn
 from datetime import datetime
+import asyncio
 import json
 import os
 import tempfile
@@ -230,7 +231,7 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 # Use unified SDK
-from packages.tools_sdk import ToolOrchestrator, ToolRegistry, ToolInput
+from packages.tools_sdk import ToolOrchestrator, ToolRegistry, ToolInput, default_tool_pool, BatchRunner
 from packages.tools_sdk.tools import register_all_tools
 from app.utils.text_parser import parse_ad_copy_from_text
 from app.utils.file_extract import extract_text_from_file, is_supported_file
@@ -243,6 +244,14 @@ app.include_router(platforms_router, prefix="/api")
 register_all_tools()
 orchestrator = ToolOrchestrator()
 
+@app.on_event("startup")
+async def preload_tool_instances():
+    """Construct all registered tools once so requests reuse warm instances"""
+    preload_result = orchestrator.registry.preload_tools()
+    print(f"[INFO] Preloaded {len(preload_result['loaded'])} tools")
+    if preload_result['failed']:
+        print(f"[WARNING] Tool preload failures: {preload_result['failed']}")
+
 @app.get("/")
 async def root():
     return {
@@ -926,123 +935,128 @@ async def generate_ad_copy(request: GenerateRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
 
+# Batch analysis fans out across ads with bounded parallelism; tool runs go to a
+# process pool when BATCH_PROCESS_WORKERS > 0
+batch_runner = BatchRunner(
+    concurrency=int(os.getenv("BATCH_ANALYSIS_CONCURRENCY", "8")),
+    item_timeout=float(os.getenv("BATCH_AD_TIMEOUT_SECONDS", "30")),
+    process_workers=int(os.getenv("BATCH_PROCESS_WORKERS", "0"))
+)
+
+# Core analysis tools for batch (faster subset)
+BATCH_TOOLS = ["ad_copy_analyzer", "psychology_scorer", "performance_forensics"]
+
+async def analyze_batch_ad(index: int, ad_input: AdInput) -> AdAnalysisResponse:
+    """Analyze one ad of a batch; raises on failure so the batch runner records it"""
+    full_text = f"{ad_input.headline} {ad_input.body_text} {ad_input.cta}"
+    
+    # Use comprehensive Tools SDK analysis for batch processing
+    batch_tool_input = ToolInput(
+        headline=ad_input.headline,
+        body_text=ad_input.body_text,
+        cta=ad_input.cta,
+        platform=ad_input.platform,
+        target_audience=ad_input.target_audience,
+        industry=ad_input.industry
+    )
+    
+    tool_results = await batch_runner.run_tools(
+        orchestrator,
+        batch_tool_input,
+        BATCH_TOOLS,
+        execution_mode="parallel"
+    )
+    
+    ad_copy_result = tool_results.get('ad_copy_analyzer')
+    psychology_result = tool_results.get('psychology_scorer')
+    
+    ad_copy_scores = ad_copy_result.scores if ad_copy_result and ad_copy_result.success else {}
+    psychology_scores = psychology_result.scores if psychology_result and psychology_result.success else {}
+    ad_copy_recommendations = ad_copy_result.recommendations if ad_copy_result and ad_copy_result.success else []
+    
+    # Extract analysis results
+    clarity_analysis = {
+        'clarity_score': ad_copy_scores.get('clarity_score', 70),
+        'recommendations': ad_copy_recommendations or ['Improve readability']
+    }
+    power_analysis = {
+        'power_score': psychology_scores.get('overall_psychology_score', 65)
+    }
+    cta_analysis = {
+        'cta_strength_score': ad_copy_scores.get('cta_effectiveness_score', 68),
+        'recommendations': ['Improve CTA strength']
+    }
+    
+    # Calculate platform fit
+    platform_fit_score = calculate_platform_fit(ad_input)
+    
+    # Calculate individual scores
+    clarity_score = clarity_analysis['clarity_score']
+    persuasion_score = power_analysis.get('power_score', 50)
+    emotion_score = calculate_emotion_score(full_text)
+    cta_strength_score = cta_analysis['cta_strength_score']
+    
+    # Calculate overall score using the enhanced scoring system
+    scoring_result = calculate_overall_score(
+        clarity_score, 
+        persuasion_score, 
+        emotion_score, 
+        cta_strength_score, 
+        platform_fit_score, 
+        full_text
+    )
+    overall_score = scoring_result.get("overall_score", 65) if isinstance(scoring_result, dict) else scoring_result
+    
+    scores = AdScore(
+        clarity_score=clarity_score,
+        persuasion_score=persuasion_score,
+        emotion_score=emotion_score,
+        cta_strength=cta_strength_score,
+        platform_fit_score=platform_fit_score,
+        overall_score=overall_score
+    )
+    
+    # Generate feedback
+    feedback = generate_feedback(clarity_analysis, cta_analysis, scores)
+    
+    # Generate alternatives
+    alternatives = generate_template_alternatives(ad_input)
+    
+    # Generate quick wins
+    quick_wins = []
+    quick_wins.extend(clarity_analysis.get('recommendations', [])[:2])
+    quick_wins.extend(cta_analysis.get('recommendations', [])[:1])
+    
+    return AdAnalysisResponse(
+        analysis_id=f"batch_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{index}",
+        scores=scores,
+        feedback=feedback,
+        alternatives=alternatives,
+        quick_wins=quick_wins[:3]
+    )
+
 @app.post("/api/ads/analyze/batch", response_model=BatchAnalysisResponse)
 async def analyze_ads_batch(request: BatchAnalysisRequest):
-    """Analyze multiple ads in batch"""
+    """Analyze multiple ads in batch, concurrently; results keep the input order"""
     try:
         results = []
         analysis_ids = []
-        success_count = 0
+        failures = []
         
-        for i, ad_input in enumerate(request.ads):
-            try:
-                # Use the existing single ad analysis logic
-                full_text = f"{ad_input.headline} {ad_input.body_text} {ad_input.cta}"
-                
-                # Use comprehensive Tools SDK analysis for batch processing
-                batch_tool_input = ToolInput(
-                    headline=ad_input.headline,
-                    body_text=ad_input.body_text,
-                    cta=ad_input.cta,
-                    platform=ad_input.platform,
-                    target_audience=ad_input.target_audience,
-                    industry=ad_input.industry
-                )
-                
-                # Run core analysis tools for batch (faster subset)
-                batch_tools = ["ad_copy_analyzer", "psychology_scorer", "performance_forensics"]
-                
-                try:
-                    batch_result = await orchestrator.run_tools(
-                        batch_tool_input,
-                        batch_tools,
-                        execution_mode="parallel"
-                    )
-                    
-                    ad_copy_result = batch_result.tool_results.get('ad_copy_analyzer', {})
-                    psychology_result = batch_result.tool_results.get('psychology_scorer', {})
-                    performance_result = batch_result.tool_results.get('performance_forensics', {})
-                    
-                    # Extract analysis results
-                    clarity_analysis = {
-                        'clarity_score': ad_copy_result.get('clarity_score', 70),
-                        'recommendations': ad_copy_result.get('recommendations', ['Improve readability'])
-                    }
-                    power_analysis = {
-                        'power_score': psychology_result.get('persuasion_score', 65)
-                    }
-                    cta_analysis = {
-                        'cta_strength_score': ad_copy_result.get('cta_strength_score', 68),
-                        'recommendations': ad_copy_result.get('cta_recommendations', ['Improve CTA strength'])
-                    }
-                    
-                except Exception as batch_error:
-                    print(f"[ERROR] Batch SDK analysis failed: {batch_error}")
-                    # Skip this ad and continue with others
-                    continue
-                
-                # Calculate platform fit
-                platform_fit_score = calculate_platform_fit(ad_input)
-                
-                # Calculate individual scores
-                clarity_score = clarity_analysis['clarity_score']
-                persuasion_score = power_analysis.get('power_score', 50)
-                emotion_score = calculate_emotion_score(full_text)
-                cta_strength_score = cta_analysis['cta_strength_score']
-                
-                # Calculate overall score using the enhanced scoring system
-                scoring_result = calculate_overall_score(
-                    clarity_score, 
-                    persuasion_score, 
-                    emotion_score, 
-                    cta_strength_score, 
-                    platform_fit_score, 
-                    full_text
-                )
-                overall_score = scoring_result.get("overall_score", 65) if isinstance(scoring_result, dict) else scoring_result
-                
-                scores = AdScore(
-                    clarity_score=clarity_score,
-                    persuasion_score=persuasion_score,
-                    emotion_score=emotion_score,
-                    cta_strength=cta_strength_score,
-                    platform_fit_score=platform_fit_score,
-                    overall_score=overall_score
-                )
-                
-                # Generate feedback
-                feedback = generate_feedback(clarity_analysis, cta_analysis, scores)
-                
-                # Generate alternatives
-                alternatives = generate_template_alternatives(ad_input)
-                
-                # Generate quick wins
-                quick_wins = []
-                quick_wins.extend(clarity_analysis.get('recommendations', [])[:2])
-                quick_wins.extend(cta_analysis.get('recommendations', [])[:1])
-                
-                analysis_id = f"batch_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{i}"
-                analysis_ids.append(analysis_id)
-                
-                result = AdAnalysisResponse(
-                    analysis_id=analysis_id,
-                    scores=scores,
-                    feedback=feedback,
-                    alternatives=alternatives,
-                    quick_wins=quick_wins[:3]
-                )
-                
-                results.append(result)
-                success_count += 1
-                
-            except Exception as e:
-                # Log error but continue with other ads
-                print(f"Error analyzing ad {i}: {str(e)}")
-                continue
+        for item in await batch_runner.run(request.ads, analyze_batch_ad):
+            if item.success:
+                results.append(item.result)
+                analysis_ids.append(item.result.analysis_id)
+            else:
+                # Log error but keep the other ads
+                print(f"Error analyzing ad {item.index}: {item.error}")
+                failures.append(item.index)
         
+        success_count = len(results)
         warning = None
         if success_count < len(request.ads):
-            warning = f"Successfully analyzed {success_count} out of {len(request.ads)} ads"
+            warning = (f"Successfully analyzed {success_count} out of {len(request.ads)} ads"
+                       f" (failed: {failures})")
         
         return BatchAnalysisResponse(
             analysis_ids=analysis_ids,
@@ -1073,6 +1087,21 @@ async def get_tools_status():
         "launch_ready": True
     }
 
+@app.get("/api/ads/tools/pool")
+async def get_tool_pool_stats():
+    """Get statistics for the shared tool instance pool"""
+    return default_tool_pool.get_stats()
+
+@app.get("/api/ads/analyze/batch/stats")
+async def get_batch_stats():
+    """Get statistics for concurrent batch analysis"""
+    return batch_runner.get_stats()
+
+@app.on_event("shutdown")
+async def shutdown_batch_runner():
+    """Stop the batch tool process pool"""
+    batch_runner.shutdown()
+
 # ============================================================================
 # DASHBOARD METRICS ENDPOINTS - REAL DATABASE INTEGRATION
 # ============================================================================
@@ -1093,6 +1122,10 @@ except ImportError:
     print("[WARNING] Install PyJWT: pip install PyJWT")
 
 from datetime import timedelta
+from api.dashboard_rollups import (
+    fetch_window_slices_supabase, period_metrics, breakdown, daily_activity,
+    score_distribution as rollup_score_distribution
+)
 
 # Supabase configuration
 SUPABASE_URL = os.getenv('SUPABASE_URL', '')
@@ -1176,36 +1209,23 @@ async def get_dashboard_metrics(request: Request, period_days: int = 30):
         comparison_end = period_start
         comparison_start = comparison_end - timedelta(days=period_days)
 
-        current_analyses = supabase_client.table('ad_analyses').select(
-            'overall_score, clarity_score, persuasion_score, emotion_score, cta_strength, platform_fit_score, created_at'
-        ).eq('user_id', user_id).gte('created_at', period_start.isoformat()).lte('created_at', period_end.isoformat()).not_.is_('overall_score', 'null').execute()
-
-        comparison_analyses = supabase_client.table('ad_analyses').select(
-            'overall_score, created_at'
-        ).eq('user_id', user_id).gte('created_at', comparison_start.isoformat()).lte('created_at', comparison_end.isoformat()).not_.is_('overall_score', 'null').execute()
-
-        current_data = current_analyses.data or []
-        comparison_data = comparison_analyses.data or []
+        # Aggregates come from the daily rollup table; only partial edge days touch ad_analyses
+        # The Supabase client is synchronous; run both windows in worker threads off the event loop
+        current_rows, comparison_rows = await asyncio.gather(
+            asyncio.to_thread(fetch_window_slices_supabase, supabase_client, user_id, period_start, period_end),
+            asyncio.to_thread(fetch_window_slices_supabase, supabase_client, user_id, comparison_start, comparison_end)
+        )
+        current = period_metrics(current_rows)
+        comparison = period_metrics(comparison_rows)
 
-        ads_analyzed = len(current_data)
-        ads_analyzed_prev = len(comparison_data)
+        ads_analyzed = current['ads_analyzed']
+        ads_analyzed_prev = comparison['ads_analyzed']
         ads_analyzed_change = ((ads_analyzed - ads_analyzed_prev) / max(ads_analyzed_prev, 1) * 100) if ads_analyzed_prev > 0 else 0
 
-        if current_data:
-            current_scores = [a['overall_score'] for a in current_data]
-            avg_score = round(sum(current_scores) / len(current_scores), 1)
-            top_performing = round(max(current_scores), 1)
-        else:
-            avg_score = 0
-            top_performing = 0
-
-        if comparison_data:
-            comparison_scores = [a['overall_score'] for a in comparison_data]
-            avg_score_prev = round(sum(comparison_scores) / len(comparison_scores), 1)
-            top_performing_prev = round(max(comparison_scores), 1)
-        else:
-            avg_score_prev = 0
-            top_performing_prev = 0
+        avg_score = round(current['avg_score'], 1)
+        top_performing = round(current['top_performing'], 1)
+        avg_score_prev = round(comparison['avg_score'], 1)
+        top_performing_prev = round(comparison['top_performing'], 1)
 
         avg_score_change = avg_score - avg_score_prev if avg_score_prev > 0 else 0
         top_performing_change = top_performing - top_performing_prev if top_performing_prev > 0 else 0
@@ -1256,11 +1276,12 @@ async def get_metrics_summary(request: Request):
         if not supabase_client:
             raise HTTPException(status_code=503, detail="Database service unavailable")
 
-        all_analyses = supabase_client.table('ad_analyses').select(
-            'overall_score, platform, created_at'
-        ).eq('user_id', user_id).not_.is_('overall_score', 'null').order('created_at', desc=False).execute()
-
-        projects_result = supabase_client.table('projects').select('id').eq('user_id', user_id).execute()
+        all_analyses, projects_result = await asyncio.gather(
+            asyncio.to_thread(supabase_client.table('ad_analyses').select(
+                'overall_score, platform, created_at'
+            ).eq('user_id', user_id).not_.is_('overall_score', 'null').order('created_at', desc=False).execute),
+            asyncio.to_thread(supabase_client.table('projects').select('id').eq('user_id', user_id).execute)
+        )
 
         analyses_data = all_analyses.data or []
         projects_data = projects_result.data or []
@@ -1343,75 +1364,14 @@ async def get_detailed_metrics(request: Request, period_days: int = 30):
         if not supabase_client:
             raise HTTPException(status_code=503, detail="Database service unavailable")
 
-        period_start = datetime.now() - timedelta(days=period_days)
-        analyses = supabase_client.table('ad_analyses').select(
-            'platform, industry, overall_score, created_at'
-        ).eq('user_id', user_id).gte('created_at', period_start.isoformat()).not_.is_('overall_score', 'null').execute()
-
-        data = analyses.data or []
-
-        platform_stats = {}
-        for analysis in data:
-            platform = analysis.get('platform') or 'Unknown'
-            platform_stats.setdefault(platform, {'count': 0, 'scores': []})
-            platform_stats[platform]['count'] += 1
-            platform_stats[platform]['scores'].append(analysis['overall_score'])
-
-        platform_breakdown = [
-            {
-                'platform': platform,
-                'count': stats['count'],
-                'avgScore': round(sum(stats['scores']) / len(stats['scores']), 1)
-            }
-            for platform, stats in platform_stats.items()
-        ]
-
-        industry_stats = {}
-        for analysis in data:
-            industry = analysis.get('industry') or 'Unknown'
-            industry_stats.setdefault(industry, {'count': 0, 'scores': []})
-            industry_stats[industry]['count'] += 1
-            industry_stats[industry]['scores'].append(analysis['overall_score'])
-
-        industry_breakdown = [
-            {
-                'industry': industry,
-                'count': stats['count'],
-                'avgScore': round(sum(stats['scores']) / len(stats['scores']), 1)
-            }
-            for industry, stats in industry_stats.items()
-        ]
+        period_end = datetime.now()
+        period_start = period_end - timedelta(days=period_days)
+        rows = await asyncio.to_thread(fetch_window_slices_supabase, supabase_client, user_id, period_start, period_end)
 
-        all_scores = [a['overall_score'] for a in data]
-        score_distribution = []
-        if all_scores:
-            ranges = [
-                ('Excellent (90-100)', 90, 100),
-                ('Good (80-89)', 80, 89),
-                ('Fair (70-79)', 70, 79),
-                ('Poor (60-69)', 60, 69),
-                ('Needs Improvement (<60)', 0, 59)
-            ]
-            for range_name, min_score, max_score in ranges:
-                count = len([s for s in all_scores if min_score <= s <= max_score])
-                if count > 0:
-                    score_distribution.append({'range': range_name, 'count': count})
-
-        activity_stats = {}
-        for analysis in data:
-            created_date = (analysis.get('created_at') or '')[:10]
-            activity_stats.setdefault(created_date, {'count': 0, 'scores': []})
-            activity_stats[created_date]['count'] += 1
-            activity_stats[created_date]['scores'].append(analysis['overall_score'])
-
-        recent_activity = [
-            {
-                'date': date,
-                'count': stats['count'],
-                'avgScore': round(sum(stats['scores']) / len(stats['scores']), 1)
-            }
-            for date, stats in sorted(activity_stats.items(), reverse=True)
-        ][:14]
+        platform_breakdown = breakdown(rows, 'platform')
+        industry_breakdown = breakdown(rows, 'industry')
+        score_distribution = rollup_score_distribution(rows)
+        recent_activity = daily_activity(rows, days=14)
 
         return {
             'platformBreakdown': platform_breakdown,
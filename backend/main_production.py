@@ -90,6 +90,15 @@ async def lifespan(app: FastAPI):
             logger.warning(f"Redis connection failed (non-critical): {e}")
             startup_errors.append(f"Redis warning: {e}")
     
+    # Warm pooled LLM clients so the first generation skips the TLS handshake (non-critical)
+    if ads.ai_service:
+        try:
+            warmup = await ads.ai_service.warm_up()
+            logger.info(f"LLM clients warmed: {warmup}")
+        except Exception as e:
+            logger.warning(f"LLM client warm-up failed (non-critical): {e}")
+            startup_errors.append(f"LLM warm-up warning: {e}")
+    
     if startup_errors:
         logger.warning(f"Startup completed with {len(startup_errors)} warnings")
         for error in startup_errors:
@@ -101,6 +110,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down AdCopySurge API...")
+    
+    from app.services.ai_client_registry import get_ai_client_registry
+    await get_ai_client_registry().aclose()
 
 
 # Create FastAPI app with lifespan
@@ -216,7 +228,15 @@ async def kubernetes_health_check():
         health_status["checks"]["openai"] = "configured"
     else:
         health_status["checks"]["openai"] = "not_configured"
-    
+
+    # AI provider routing: per-provider latency, error rate and circuit state
+    if ads.ai_service:
+        routing = ads.ai_service.get_routing_state()
+        health_status["checks"]["ai_routing"] = routing
+        if not any(provider["available"] for provider in routing["providers"].values()):
+            # Every provider circuit is open; generation requests will be rejected
+            health_status["checks"]["ai_routing"]["status"] = "degraded"
+
     # Check Blog service (if enabled)
     if settings.ENABLE_BLOG:
         try:
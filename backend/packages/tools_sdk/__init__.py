@@ -7,7 +7,13 @@ The orchestrator can chain tools consistently using the unified ToolRunner inter
 
 from .core import ToolRunner, ToolInput, ToolOutput, ToolConfig, ToolType
 from .registry import ToolRegistry, default_registry
+from .instance_pool import ToolInstancePool, default_tool_pool
+from .text_matcher import LexiconMatcher, default_matcher
+from .regex_bank import RegexBank
+from .text_analysis import AnalyzedText
+from .result_cache import ResultCache
 from .tool_orchestrator import ToolOrchestrator, OrchestrationResult
+from .batch_runner import BatchRunner, BatchItemResult
 from .exceptions import ToolError, ToolTimeoutError, ToolConfigError
 
 __version__ = "1.0.0"
@@ -17,10 +23,19 @@ __all__ = [
     "ToolOutput",
     "ToolConfig",
     "ToolType",
+    "AnalyzedText",
     "ToolRegistry",
     "default_registry",
+    "ToolInstancePool",
+    "default_tool_pool",
+    "LexiconMatcher",
+    "default_matcher",
+    "RegexBank",
+    "ResultCache",
     "ToolOrchestrator",
     "OrchestrationResult",
+    "BatchRunner",
+    "BatchItemResult",
     "ToolError",
     "ToolTimeoutError", 
     "ToolConfigError"
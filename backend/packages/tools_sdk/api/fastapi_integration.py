@@ -13,7 +13,7 @@ import uuid
 from typing import Dict, Any, List, Optional
 
 from fastapi import FastAPI, HTTPException, Depends, Request, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.openapi.utils import get_openapi
@@ -27,11 +27,13 @@ from ..orchestrator import (
 )
 from ..contracts.api_schemas import (
     AnalysisRequest, AnalysisResponse, BatchAnalysisRequest, BatchAnalysisResponse,
+    StreamingBatchAnalysisRequest, BatchStreamResult, BatchStreamSummary, BatchStatistics,
     FlowConfiguration, HealthCheckResponse, SystemStatistics, ApiError,
     UsageAnalytics, build_error_response, build_success_response
 )
 from ..observability.metrics_collector import MetricsCollector
 from ..observability.request_logger import RequestLogger
+from ..inference_service import get_inference_stats, shutdown_inference_services
 
 
 # ===== MIDDLEWARE =====
@@ -315,6 +317,44 @@ def create_tools_api_app(
     return app
 
 
+def _to_service_request(api_req: AnalysisRequest) -> ServiceAnalysisRequest:
+    """Convert an API analysis request to a service request"""
+    return ServiceAnalysisRequest(
+        headline=api_req.headline,
+        body_text=api_req.body_text,
+        cta=api_req.cta,
+        industry=api_req.industry or "",
+        platform=api_req.platform or "",
+        target_audience=api_req.target_audience or "",
+        brand_guidelines=api_req.brand_guidelines.dict() if api_req.brand_guidelines else None,
+        analysis_type=api_req.analysis_type.value,
+        custom_flow_id=api_req.custom_flow_id,
+        request_metadata=api_req.request_metadata
+    )
+
+
+def _to_api_response(result: ServiceAnalysisResponse) -> AnalysisResponse:
+    """Convert a service analysis response to the API response format"""
+    return AnalysisResponse(
+        success=result.success,
+        request_id=result.request_id,
+        execution_time=result.execution_time,
+        analysis_type=result.analysis_type,
+        overall_score=result.overall_score,
+        performance_score=result.performance_score,
+        psychology_score=result.psychology_score,
+        brand_score=result.brand_score,
+        legal_score=result.legal_score,
+        strengths=result.strengths,
+        weaknesses=result.weaknesses,
+        recommendations=result.recommendations,
+        tool_results=result.tool_results,
+        execution_metadata=result.execution_metadata,
+        errors=result.errors,
+        warnings=result.warnings
+    )
+
+
 def _add_analysis_routes(app: FastAPI):
     """Add analysis-related routes"""
     
@@ -398,24 +438,11 @@ def _add_analysis_routes(app: FastAPI):
         batch_start = time.time()
         
         # Convert API requests to service requests
-        service_requests = []
-        for api_req in request.requests:
-            service_req = ServiceAnalysisRequest(
-                headline=api_req.headline,
-                body_text=api_req.body_text,
-                cta=api_req.cta,
-                industry=api_req.industry or "",
-                platform=api_req.platform or "",
-                target_audience=api_req.target_audience or "",
-                brand_guidelines=api_req.brand_guidelines.dict() if api_req.brand_guidelines else None,
-                analysis_type=api_req.analysis_type.value,
-                custom_flow_id=api_req.custom_flow_id,
-                request_metadata=api_req.request_metadata
-            )
-            service_requests.append(service_req)
+        service_requests = [_to_service_request(api_req) for api_req in request.requests]
         
         # Execute batch analysis
-        results = await tools_service.analyze_copy_batch(service_requests)
+        max_parallel = request.options.max_parallel if request.options else None
+        results = await tools_service.analyze_copy_batch(service_requests, max_parallel)
         
         # Calculate batch statistics
         total_time = time.time() - batch_start
@@ -433,27 +460,7 @@ def _add_analysis_routes(app: FastAPI):
         )
         
         # Convert results to API response format
-        api_results = []
-        for result in results:
-            api_result = AnalysisResponse(
-                success=result.success,
-                request_id=result.request_id,
-                execution_time=result.execution_time,
-                analysis_type=result.analysis_type,  # This might need conversion
-                overall_score=result.overall_score,
-                performance_score=result.performance_score,
-                psychology_score=result.psychology_score,
-                brand_score=result.brand_score,
-                legal_score=result.legal_score,
-                strengths=result.strengths,
-                weaknesses=result.weaknesses,
-                recommendations=result.recommendations,
-                tool_results=result.tool_results,
-                execution_metadata=result.execution_metadata,
-                errors=result.errors,
-                warnings=result.warnings
-            )
-            api_results.append(api_result)
+        api_results = [_to_api_response(result) for result in results]
         
         return BatchAnalysisResponse(
             success=failed_count == 0,
@@ -469,6 +476,77 @@ def _add_analysis_routes(app: FastAPI):
             }
         )
     
+    @app.post(
+        "/api/v1/analysis/batch/stream",
+        summary="Analyze multiple ad copies with streamed results",
+        description=(
+            "Stream each analysis result as soon as it completes, followed by a final "
+            "statistics frame. format=ndjson (default) sends one JSON object per line; "
+            "format=sse sends Server-Sent Events named 'result' and 'statistics'."
+        ),
+        tags=["Analysis"]
+    )
+    async def analyze_batch_copies_stream(
+        request: StreamingBatchAnalysisRequest,
+        format: str = "ndjson",
+        tools_service: UnifiedToolsService = Depends(get_tools_service),
+        metrics_collector: MetricsCollector = Depends(get_metrics_collector)
+    ) -> StreamingResponse:
+        
+        if format not in ("ndjson", "sse"):
+            raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+        
+        batch_id = str(uuid.uuid4())
+        service_requests = [_to_service_request(api_req) for api_req in request.requests]
+        max_parallel = request.options.max_parallel if request.options else None
+        
+        def encode_frame(event: str, frame) -> str:
+            if format == "sse":
+                return f"event: {event}\ndata: {frame.json()}\n\n"
+            return frame.json() + "\n"
+        
+        async def stream_frames():
+            batch_start = time.time()
+            # Running totals, so completed results are not kept in memory
+            successful_count = 0
+            total_time = 0.0
+            total_score = 0.0
+            
+            async for index, result in tools_service.analyze_copy_batch_stream(service_requests, max_parallel):
+                total_time += result.execution_time
+                if result.success:
+                    successful_count += 1
+                    total_score += result.overall_score
+                yield encode_frame("result", BatchStreamResult(index=index, result=_to_api_response(result)))
+            
+            batch_time = time.time() - batch_start
+            failed_count = len(service_requests) - successful_count
+            metrics_collector.record_batch_analysis(
+                batch_size=len(service_requests),
+                execution_time=batch_time,
+                success_count=successful_count,
+                failed_count=failed_count
+            )
+            
+            yield encode_frame("statistics", BatchStreamSummary(
+                batch_id=batch_id,
+                total_execution_time=batch_time,
+                statistics=BatchStatistics(
+                    total_requests=len(service_requests),
+                    successful_analyses=successful_count,
+                    failed_analyses=failed_count,
+                    average_execution_time=total_time / len(service_requests),
+                    average_overall_score=total_score / successful_count if successful_count > 0 else 0
+                )
+            ))
+        
+        media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+        return StreamingResponse(
+            stream_frames(),
+            media_type=media_type,
+            headers={"X-Batch-ID": batch_id, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
     @app.get(
         "/api/v1/analysis/types",
         summary="Get available analysis types",
@@ -568,6 +646,36 @@ def _add_health_routes(app: FastAPI):
             data=metrics,
             message="System metrics retrieved successfully"
         )
+    
+    @app.get(
+        "/api/v1/health/tool-pool",
+        summary="Tool instance pool statistics",
+        description="Get warm tool instance counts, hit rates and construction times",
+        tags=["Health"]
+    )
+    async def tool_pool_stats(
+        tools_service: UnifiedToolsService = Depends(get_tools_service)
+    ) -> Dict[str, Any]:
+        
+        pool_stats = tools_service.orchestrator.get_pool_stats()
+        
+        return build_success_response(
+            data=pool_stats,
+            message="Tool pool statistics retrieved successfully"
+        )
+    
+    @app.get(
+        "/api/v1/health/inference",
+        summary="Model inference statistics",
+        description="Get batch-size and latency histograms for batched model inference",
+        tags=["Health"]
+    )
+    async def inference_stats() -> Dict[str, Any]:
+        
+        return build_success_response(
+            data=get_inference_stats(),
+            message="Inference statistics retrieved successfully"
+        )
 
 
 def _add_configuration_routes(app: FastAPI):
@@ -724,6 +832,11 @@ def add_startup_shutdown_events(app: FastAPI):
         metrics_collector = services.get_metrics_collector()
         request_logger = services.get_request_logger()
         
+        # Warm tool instances so the first analysis does not pay constructor cost
+        preload_result = tools_service.orchestrator.preload_tools()
+        if preload_result['failed']:
+            logger.warning(f"Tool preload failures: {preload_result['failed']}")
+        
         # Perform initial health checks
         health_status = await tools_service.test_tools_health()
         logger.info(f"Tool health status: {health_status}")
@@ -743,6 +856,9 @@ def add_startup_shutdown_events(app: FastAPI):
         metrics_collector = services.get_metrics_collector()
         metrics_collector.stop_background_collection()
         
+        # Release model inference threads
+        shutdown_inference_services()
+        
         logger.info("AdCopySurge Tools API shut down successfully")
 
 
@@ -0,0 +1,243 @@
+"""
+Bounded-concurrency batch execution
+
+Batch endpoints used to await one item at a time, so a batch took the sum of
+its items' latencies. The BatchRunner keeps a bounded number of items in
+flight, starting the next as each finishes, with a per-item timeout. It
+isolates failures to the item that raised and reports results in input
+order (either all at once or as an ordered stream). Tool
+runs for CPU-heavy batches can be dispatched to a process pool so they do not
+compete for the event loop's GIL.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Set, Callable, Awaitable, AsyncIterator, Sequence, TypeVar
+
+from .core import ToolInput, ToolOutput
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of one batch item"""
+
+    index: int
+    success: bool
+    result: Any = None
+    error: Optional[str] = None
+    timed_out: bool = False
+    duration: float = 0.0
+
+
+# Per-process orchestrator used by tool runs dispatched to the process pool
+_process_orchestrator = None
+
+
+def _init_tool_process():
+    """Process pool initializer: register tools and build a warm orchestrator"""
+    global _process_orchestrator
+    from .tools import register_all_tools
+    from .tool_orchestrator import ToolOrchestrator
+
+    register_all_tools()
+    _process_orchestrator = ToolOrchestrator()
+
+
+def _run_tools_in_process(input_data: ToolInput, tool_names: List[str],
+                          execution_mode: str) -> Dict[str, ToolOutput]:
+    """Run tools on one input inside a pool process"""
+    if _process_orchestrator is None:
+        _init_tool_process()
+    result = asyncio.run(_process_orchestrator.run_tools(input_data, tool_names, execution_mode))
+    return result.tool_results
+
+
+class BatchRunner:
+    """
+    Runs a batch of items concurrently with bounded parallelism
+
+    Args:
+        concurrency: Maximum number of items in flight at once
+        item_timeout: Seconds allowed per item; None disables the timeout
+        process_workers: Size of the process pool used by run_tools();
+            0 runs tools on the event loop instead
+    """
+
+    def __init__(self, concurrency: int = 8, item_timeout: Optional[float] = 30.0,
+                 process_workers: int = 0):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.item_timeout = item_timeout
+        self.process_workers = process_workers
+        self.logger = logging.getLogger(__name__)
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._stats = {
+            'batches': 0,
+            'items': 0,
+            'succeeded': 0,
+            'failed': 0,
+            'timed_out': 0,
+            'process_runs': 0,
+            'process_fallbacks': 0
+        }
+
+    async def run(self, items: Sequence[T], worker: Callable[[int, T], Awaitable[R]]) -> List[BatchItemResult]:
+        """
+        Process every item and return the outcomes in input order
+
+        Args:
+            items: Batch items
+            worker: Coroutine function called as worker(index, item)
+        """
+        results: List[Optional[BatchItemResult]] = [None] * len(items)
+        async for item_result in self.iter_completed(items, worker):
+            results[item_result.index] = item_result
+        return results
+
+    async def iter_ordered(self, items: Sequence[T],
+                           worker: Callable[[int, T], Awaitable[R]]) -> AsyncIterator[BatchItemResult]:
+        """
+        Yield outcomes in input order, each as soon as it and all earlier items finish
+
+        Items still run concurrently; a slow item holds back the items after it.
+        At most `concurrency` finished outcomes wait on an earlier item; while
+        that many are waiting, no further items are started.
+        """
+        async for item_result in self._iter_results(items, worker, ordered=True):
+            yield item_result
+
+    async def iter_completed(self, items: Sequence[T],
+                             worker: Callable[[int, T], Awaitable[R]]) -> AsyncIterator[BatchItemResult]:
+        """Yield outcomes in completion order"""
+        async for item_result in self._iter_results(items, worker, ordered=False):
+            yield item_result
+
+    async def _iter_results(self, items: Sequence[T], worker: Callable[[int, T], Awaitable[R]],
+                            ordered: bool) -> AsyncIterator[BatchItemResult]:
+        """
+        Run items with at most `concurrency` in flight, starting the next one as each finishes
+
+        Items are only turned into tasks when a slot frees up, and finished
+        tasks are dropped once their outcome is yielded, so memory stays
+        bounded by the concurrency rather than the batch size.
+        """
+        self._stats['batches'] += 1
+        self._stats['items'] += len(items)
+        remaining = iter(enumerate(items))
+        in_flight: Set[asyncio.Future] = set()
+        # Ordered mode: finished outcomes waiting for an earlier item
+        held: Dict[int, BatchItemResult] = {}
+        next_index = 0
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(in_flight) < self.concurrency and len(held) < self.concurrency:
+                    entry = next(remaining, None)
+                    if entry is None:
+                        exhausted = True
+                    else:
+                        in_flight.add(asyncio.ensure_future(self._run_item(worker, *entry)))
+                if not in_flight:
+                    break
+
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if ordered:
+                        held[task.result().index] = task.result()
+                    else:
+                        yield task.result()
+
+                while next_index in held:
+                    yield held.pop(next_index)
+                    next_index += 1
+        finally:
+            # Consumer stopped early (e.g. client disconnected); stop remaining items
+            for task in in_flight:
+                task.cancel()
+
+    async def _run_item(self, worker: Callable[[int, T], Awaitable[R]], index: int, item: T) -> BatchItemResult:
+        """Run one item, turning a timeout or exception into a failed outcome"""
+        start_time = time.time()
+        try:
+            if self.item_timeout is not None:
+                value = await asyncio.wait_for(worker(index, item), timeout=self.item_timeout)
+            else:
+                value = await worker(index, item)
+            self._stats['succeeded'] += 1
+            return BatchItemResult(index, True, result=value, duration=time.time() - start_time)
+        except asyncio.TimeoutError:
+            self._stats['failed'] += 1
+            self._stats['timed_out'] += 1
+            return BatchItemResult(index, False, error=f"Timed out after {self.item_timeout}s",
+                                   timed_out=True, duration=time.time() - start_time)
+        except Exception as e:
+            self._stats['failed'] += 1
+            self.logger.warning(f"Batch item {index} failed: {str(e)}")
+            return BatchItemResult(index, False, error=str(e), duration=time.time() - start_time)
+
+    async def run_tools(self, orchestrator, input_data: ToolInput, tool_names: List[str],
+                        execution_mode: str = "parallel") -> Dict[str, ToolOutput]:
+        """
+        Run tools on one input, in the process pool when one is configured
+
+        Falls back to the given orchestrator on the event loop if the pool is
+        disabled or has broken.
+
+        Returns:
+            Dictionary mapping tool name to its ToolOutput
+        """
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                loop = asyncio.get_running_loop()
+                tool_results = await loop.run_in_executor(
+                    executor, _run_tools_in_process, input_data, tool_names, execution_mode
+                )
+                self._stats['process_runs'] += 1
+                return tool_results
+            except BrokenProcessPool as e:
+                self.logger.warning(f"Tool process pool broken, running on the event loop: {str(e)}")
+                self._stats['process_fallbacks'] += 1
+                self.shutdown()
+                self.process_workers = 0
+
+        result = await orchestrator.run_tools(input_data, tool_names, execution_mode)
+        return result.tool_results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batch execution statistics"""
+        return {
+            **self._stats,
+            'concurrency': self.concurrency,
+            'item_timeout': self.item_timeout,
+            'process_workers': self.process_workers
+        }
+
+    def shutdown(self):
+        """Stop the process pool, if one was started"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.process_workers <= 0:
+            return None
+        if self._executor is None:
+            # spawn: forked children would inherit the parent's dead inference threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_tool_process
+            )
+        return self._executor
@@ -272,6 +272,27 @@ class BatchAnalysisResponse(BaseModel):
     errors: Optional[List[str]] = Field(None, description="Batch-level errors")
 
 
+class StreamingBatchAnalysisRequest(BaseModel):
+    """Streaming batch analysis request; results are sent as they complete"""
+    requests: List[AnalysisRequest] = Field(..., min_items=1, max_items=5000, description="Array of analysis requests")
+    options: Optional[BatchOptions] = Field(None, description="Batch processing options")
+
+
+class BatchStreamResult(BaseModel):
+    """One result frame of a streaming batch response"""
+    type: Literal['result'] = Field('result', description="Frame type")
+    index: int = Field(..., ge=0, description="Index of the request in the batch")
+    result: AnalysisResponse = Field(..., description="Analysis result")
+
+
+class BatchStreamSummary(BaseModel):
+    """Final frame of a streaming batch response"""
+    type: Literal['statistics'] = Field('statistics', description="Frame type")
+    batch_id: str = Field(..., description="Batch identifier")
+    total_execution_time: float = Field(..., ge=0, description="Total execution time")
+    statistics: BatchStatistics = Field(..., description="Batch statistics")
+
+
 # ===== CONFIGURATION MODELS =====
 
 class ToolConfig(BaseModel):
@@ -539,6 +560,7 @@ __all__ = [
     # Models
     'AnalysisRequest', 'AnalysisResponse', 'BrandGuidelines',
     'BatchAnalysisRequest', 'BatchAnalysisResponse', 'BatchOptions', 'BatchStatistics',
+    'StreamingBatchAnalysisRequest', 'BatchStreamResult', 'BatchStreamSummary',
     'FlowConfiguration', 'FlowStep', 'ToolConfig',
     'HealthCheckResponse', 'SystemStatistics',
     'ApiError', 'ValidationError',
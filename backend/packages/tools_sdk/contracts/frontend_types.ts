@@ -320,6 +320,39 @@ export interface BatchStatistics {
   average_overall_score: number;
 }
 
+/**
+ * Result frame of a streaming batch response (one NDJSON line or SSE "result" event)
+ */
+export interface BatchStreamResult {
+  /** Frame type */
+  type: 'result';
+  
+  /** Index of the request in the batch */
+  index: number;
+  
+  /** Analysis result */
+  result: AnalysisResponse;
+}
+
+/**
+ * Final frame of a streaming batch response (SSE "statistics" event)
+ */
+export interface BatchStreamSummary {
+  /** Frame type */
+  type: 'statistics';
+  
+  /** Batch identifier */
+  batch_id: string;
+  
+  /** Total execution time */
+  total_execution_time: number;
+  
+  /** Batch statistics */
+  statistics: BatchStatistics;
+}
+
+export type BatchStreamFrame = BatchStreamResult | BatchStreamSummary;
+
 // ===== CONFIGURATION TYPES =====
 
 /**
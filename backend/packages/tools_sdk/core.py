@@ -2,13 +2,18 @@
 Core SDK interfaces and data models for unified tool integration
 """
 
+import copy
+import time
 import uuid
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Union, Tuple, ClassVar
 from datetime import datetime
 from enum import Enum
 
+from .text_analysis import AnalyzedText
+from .result_cache import ResultCache, content_hash
+
 
 class ToolType(str, Enum):
     """Tool categorization for routing and orchestration"""
@@ -51,6 +56,21 @@ class ToolInput:
     user_id: Optional[str] = None
     session_id: Optional[str] = None
     
+    # Shared preprocessing artifact, built on first use (see analyzed_text)
+    _analyzed_text: Optional[AnalyzedText] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def analyzed_text(self) -> AnalyzedText:
+        """
+        Lazily computed text features shared by every tool run on this input
+        
+        Rebuilt if the headline, body text or CTA are changed after first use.
+        """
+        source = (self.headline, self.body_text, self.cta)
+        if self._analyzed_text is None or self._analyzed_text.source != source:
+            self._analyzed_text = AnalyzedText.from_tool_input(self)
+        return self._analyzed_text
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
         return {
@@ -167,10 +187,21 @@ class ToolRunner(ABC):
     ToolInput and returns ToolOutput.
     """
     
+    # Bump when a tool's output changes for the same input; part of result cache keys
+    version: str = "1.0.0"
+    
+    # ToolInput fields the output is a pure function of. Declaring them opts the
+    # tool into memoization (see cached_run); None means never memoize.
+    cache_fields: ClassVar[Optional[Tuple[str, ...]]] = None
+    
+    # Memoized outputs shared by every tool instance in the process
+    _memo_cache: ClassVar[ResultCache] = ResultCache(namespace="tool_memo", max_entries=4096)
+    
     def __init__(self, config: ToolConfig):
         self.config = config
         self.name = config.name
         self.tool_type = config.tool_type
+        self._memo_prefix: Optional[str] = None
         
     @abstractmethod
     async def run(self, input_data: ToolInput) -> ToolOutput:
@@ -185,6 +216,76 @@ class ToolRunner(ABC):
         """
         pass
     
+    @property
+    def memoization_enabled(self) -> bool:
+        """Whether run results are memoized (declared cache_fields and config.cache_enabled)"""
+        return bool(self.cache_fields) and self.config.cache_enabled
+    
+    def get_cache_key(self, input_data: ToolInput) -> Optional[str]:
+        """
+        Build the memoization key for an input
+        
+        Only the declared cache_fields contribute, so inputs differing in
+        request metadata or irrelevant context share one entry.
+        
+        Returns:
+            Cache key, or None when memoization is disabled for this tool
+        """
+        if not self.memoization_enabled:
+            return None
+        
+        if self._memo_prefix is None:
+            tool_class = type(self)
+            self._memo_prefix = content_hash({
+                'tool_class': f"{tool_class.__module__}.{tool_class.__qualname__}",
+                'version': self.version,
+                'parameters': self.config.parameters
+            })
+        
+        return content_hash({
+            'tool': self._memo_prefix,
+            'fields': {name: getattr(input_data, name, None) for name in self.cache_fields}
+        })
+    
+    async def cached_run(self, input_data: ToolInput) -> ToolOutput:
+        """
+        Run the tool, reusing a memoized output for an equivalent input
+        
+        Only successful outputs are memoized, for config.cache_ttl seconds.
+        Cached outputs are copied and re-stamped with the caller's request_id.
+        """
+        cache_key = self.get_cache_key(input_data)
+        if cache_key is None:
+            return await self.run(input_data)
+        
+        start_time = time.time()
+        cached = await self._memo_cache.get(cache_key)
+        if cached is not None:
+            output = copy.deepcopy(cached)
+            output.request_id = input_data.request_id
+            output.timestamp = datetime.utcnow()
+            output.execution_time = time.time() - start_time
+            return output
+        
+        output = await self.run(input_data)
+        if output.success:
+            await self._memo_cache.set(cache_key, copy.deepcopy(output), ttl=self.config.cache_ttl,
+                                       tags=(self.name,))
+        return output
+    
+    @classmethod
+    def get_memo_stats(cls) -> Dict[str, Any]:
+        """Get statistics for the shared memoization cache"""
+        return cls._memo_cache.get_stats()
+    
+    @classmethod
+    async def clear_memo(cls, tool_name: Optional[str] = None):
+        """Drop memoized outputs, optionally only those of one tool"""
+        if tool_name is None:
+            cls._memo_cache.clear()
+        else:
+            await cls._memo_cache.invalidate_tag(tool_name)
+    
     @abstractmethod
     def validate_input(self, input_data: ToolInput) -> bool:
         """
@@ -0,0 +1,225 @@
+"""
+Batched, off-event-loop model inference
+
+HuggingFace pipelines are synchronous and CPU bound. Calling them directly
+from ``async def run`` blocks the event loop for the whole inference. The
+BatchedInferenceService queues texts from concurrent coroutines, coalesces
+them into micro-batches and runs each batch on a dedicated worker thread,
+so concurrent analyses share one pipeline call instead of serializing.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+
+# Histogram bucket upper bounds
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64]
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class _Histogram:
+    """Fixed-bucket histogram for batch sizes and latencies"""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.samples = 0
+
+    def observe(self, value: float):
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.samples += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"le_{b}" for b in self.buckets] + ['le_inf']
+        return {
+            'buckets': dict(zip(labels, self.counts)),
+            'count': self.samples,
+            'mean': self.total / self.samples if self.samples else 0.0
+        }
+
+
+class BatchedInferenceService:
+    """
+    Micro-batching front end for a synchronous batch predictor
+
+    Args:
+        predict_fn: Callable taking a list of texts and returning one result per text
+            (a HuggingFace pipeline called with a list satisfies this)
+        name: Service name used in logs and stats
+        max_batch_size: Maximum number of texts coalesced into one call
+        max_wait_ms: How long the first queued text waits for companions
+        executor: Executor running inference; defaults to a single dedicated thread
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[List[str]], List[Any]],
+        name: str = "inference",
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
+        self.predict_fn = predict_fn
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.logger = logging.getLogger(__name__)
+
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"{name}-inference"
+        )
+        self._owns_executor = executor is None
+
+        # Queue and worker are bound to the event loop that first uses them
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._batch_sizes = _Histogram(BATCH_SIZE_BUCKETS)
+        self._queue_wait_ms = _Histogram(LATENCY_BUCKETS_MS)
+        self._inference_ms = _Histogram(LATENCY_BUCKETS_MS)
+        self._errors = 0
+
+    async def infer(self, text: str) -> Any:
+        """
+        Run inference for one text, batched with any concurrent callers
+
+        Returns:
+            The predictor's result for this text
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((text, future, time.perf_counter()))
+        return await future
+
+    async def infer_many(self, texts: List[str]) -> List[Any]:
+        """Run inference for several texts, preserving order"""
+        return await asyncio.gather(*(self.infer(text) for text in texts))
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run_worker(), name=f"{self.name}-batcher")
+
+    async def _run_worker(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+
+            # Collect companions until the batch is full or the window closes
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future, float]]):
+        texts = [text for text, _, _ in batch]
+        dispatch_time = time.perf_counter()
+
+        for _, _, enqueued_at in batch:
+            self._queue_wait_ms.observe((dispatch_time - enqueued_at) * 1000)
+        self._batch_sizes.observe(len(batch))
+
+        try:
+            results = await self._loop.run_in_executor(self._executor, self.predict_fn, texts)
+            if len(results) != len(texts):
+                raise ValueError(
+                    f"{self.name} predictor returned {len(results)} results for {len(texts)} texts"
+                )
+        except Exception as e:
+            self._errors += 1
+            self.logger.warning(f"{self.name} batch inference failed: {str(e)}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._inference_ms.observe((time.perf_counter() - dispatch_time) * 1000)
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batch-size and latency histograms"""
+        return {
+            'name': self.name,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'queued': self._queue.qsize() if self._queue else 0,
+            'errors': self._errors,
+            'batch_size': self._batch_sizes.to_dict(),
+            'queue_wait_ms': self._queue_wait_ms.to_dict(),
+            'inference_ms': self._inference_ms.to_dict()
+        }
+
+    def shutdown(self):
+        """Stop the batching worker and release the inference thread"""
+        if self._worker and not self._worker.done():
+            self._worker.cancel()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+
+# Process-wide services keyed by model name so every caller shares one model and batcher
+_services: Dict[str, Optional[BatchedInferenceService]] = {}
+_services_lock = threading.Lock()
+
+
+def get_inference_service(
+    name: str,
+    loader: Callable[[], Optional[Callable[[List[str]], List[Any]]]],
+    **kwargs
+) -> Optional[BatchedInferenceService]:
+    """
+    Get or create the shared inference service for a model
+
+    Args:
+        name: Model/service name
+        loader: Called once per process to build the predictor; may return None
+            when the model is unavailable, in which case None is cached and returned
+        **kwargs: Extra BatchedInferenceService options
+
+    Returns:
+        Shared BatchedInferenceService, or None if the model could not be loaded
+    """
+    with _services_lock:
+        if name not in _services:
+            predict_fn = loader()
+            _services[name] = (
+                BatchedInferenceService(predict_fn, name=name, **kwargs) if predict_fn else None
+            )
+        return _services[name]
+
+
+def get_inference_stats() -> Dict[str, Dict[str, Any]]:
+    """Get stats for every loaded inference service"""
+    return {name: service.get_stats() for name, service in _services.items() if service}
+
+
+def shutdown_inference_services():
+    """Stop all batching workers and inference threads"""
+    with _services_lock:
+        for service in _services.values():
+            if service:
+                service.shutdown()
+        _services.clear()
@@ -0,0 +1,164 @@
+"""
+Process-wide pool of warm tool instances
+
+Tool constructors are expensive (trigger dictionaries, compiled patterns and,
+for some tools, transformer model loading), while tool runs are stateless.
+The pool keeps one instance per (tool class, config) so every orchestrator in
+the process reuses the same warm runners instead of rebuilding them per step.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, Any, List, Optional, Type, Tuple, Iterable
+
+from .core import ToolRunner, ToolConfig
+from .exceptions import ToolError
+
+
+def config_fingerprint(config: ToolConfig) -> str:
+    """Build a stable hash of the configuration fields that affect construction"""
+    payload = {
+        'name': config.name,
+        'tool_type': str(config.tool_type.value if hasattr(config.tool_type, 'value') else config.tool_type),
+        'execution_mode': str(getattr(config.execution_mode, 'value', config.execution_mode)),
+        'timeout': config.timeout,
+        'retry_count': config.retry_count,
+        'fallback_enabled': config.fallback_enabled,
+        'parameters': config.parameters,
+        # Digest credential values so configs with different secrets never share an instance
+        'credentials': {
+            name: hashlib.sha256(str(value).encode('utf-8')).hexdigest()
+            for name, value in config.credentials.items()
+        },
+        'cache_enabled': config.cache_enabled,
+        'cache_ttl': config.cache_ttl,
+        'max_batch_size': config.max_batch_size
+    }
+    serialized = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()[:16]
+
+
+class ToolInstancePool:
+    """
+    Shared cache of constructed tool runners
+
+    Mirrors the ``ToolRegistry._instances`` semantics (construct once, reuse,
+    clear on demand) but is keyed by tool class and config fingerprint so flow
+    steps that carry their own ``ToolConfig`` share instances too.
+    """
+
+    def __init__(self):
+        self._instances: Dict[str, ToolRunner] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(tool_class: Type[ToolRunner], config: ToolConfig) -> str:
+        """Build the pool key for a tool class and configuration"""
+        return f"{tool_class.__module__}.{tool_class.__qualname__}:{config_fingerprint(config)}"
+
+    def get_instance(self, tool_class: Type[ToolRunner], config: ToolConfig) -> ToolRunner:
+        """
+        Get a warm tool instance, constructing it on first use
+
+        Args:
+            tool_class: ToolRunner subclass
+            config: Tool configuration used for construction
+
+        Returns:
+            Shared ToolRunner instance
+        """
+        key = self.make_key(tool_class, config)
+
+        instance = self._instances.get(key)
+        if instance is not None:
+            self._record_hit(key)
+            return instance
+
+        with self._lock:
+            # Another thread may have built it while we waited
+            instance = self._instances.get(key)
+            if instance is not None:
+                self._record_hit(key)
+                return instance
+
+            start_time = time.time()
+            try:
+                instance = tool_class(config)
+            except Exception as e:
+                raise ToolError(
+                    f"Failed to instantiate tool '{config.name}': {str(e)}",
+                    tool_name=config.name,
+                    error_code="TOOL_INSTANTIATION_ERROR"
+                )
+
+            self._instances[key] = instance
+            self._misses += 1
+            self._stats[key] = {
+                'tool_name': config.name,
+                'class_name': tool_class.__name__,
+                'construction_time': time.time() - start_time,
+                'created_at': time.time(),
+                'hits': 0
+            }
+            return instance
+
+    def preload(self, tools: Iterable[Tuple[Type[ToolRunner], ToolConfig]]) -> Dict[str, Any]:
+        """
+        Construct instances ahead of the first request
+
+        Args:
+            tools: Iterable of (tool_class, config) pairs
+
+        Returns:
+            Dictionary with loaded tool names and any failures
+        """
+        loaded: List[str] = []
+        failed: Dict[str, str] = {}
+
+        for tool_class, config in tools:
+            try:
+                self.get_instance(tool_class, config)
+                loaded.append(config.name)
+            except ToolError as e:
+                failed[config.name] = e.message
+
+        return {'loaded': loaded, 'failed': failed}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage statistics"""
+        total_lookups = self._hits + self._misses
+        return {
+            'pooled_instances': len(self._instances),
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': self._hits / total_lookups if total_lookups else 0.0,
+            'total_construction_time': sum(s['construction_time'] for s in self._stats.values()),
+            'instances': {key: dict(stats) for key, stats in self._stats.items()}
+        }
+
+    def clear_cache(self, tool_class: Optional[Type[ToolRunner]] = None):
+        """Drop pooled instances, optionally only those of one tool class"""
+        with self._lock:
+            if tool_class is None:
+                self._instances.clear()
+                self._stats.clear()
+                return
+
+            prefix = f"{tool_class.__module__}.{tool_class.__qualname__}:"
+            for key in [k for k in self._instances if k.startswith(prefix)]:
+                del self._instances[key]
+                self._stats.pop(key, None)
+
+    def _record_hit(self, key: str):
+        self._hits += 1
+        if key in self._stats:
+            self._stats[key]['hits'] += 1
+
+
+# Global pool instance shared by all orchestrators in the process
+default_tool_pool = ToolInstancePool()
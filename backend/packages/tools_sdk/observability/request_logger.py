@@ -10,7 +10,7 @@ import json
 import logging
 import logging.handlers
 import sys
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass, asdict
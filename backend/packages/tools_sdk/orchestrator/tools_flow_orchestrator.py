@@ -13,7 +13,9 @@ from concurrent.futures import ThreadPoolExecutor
 import logging
 
 from ..core import ToolRunner, ToolInput, ToolOutput, ToolConfig, ToolType
-from ..exceptions import ToolValidationError, ToolExecutionError
+from ..exceptions import ToolValidationError, ToolExecutionError, ToolTimeoutError
+from ..instance_pool import ToolInstancePool, default_tool_pool, config_fingerprint
+from ..result_cache import content_hash
 from ..tools.performance_forensics_tool import PerformanceForensicsToolRunner
 from ..tools.psychology_scorer_tool import PsychologyScorerToolRunner
 from ..tools.brand_voice_engine_tool import BrandVoiceEngineToolRunner
@@ -88,13 +90,16 @@ class ToolsFlowOrchestrator:
     - Output aggregation and unification
     - Error handling and partial result recovery
     - Configurable flow templates
-    - Performance optimization
+    - Performance optimization (warm tool instances shared via ToolInstancePool)
     """
     
-    def __init__(self, max_workers: int = 4):
+    def __init__(self, max_workers: int = 4, tool_pool: Optional[ToolInstancePool] = None):
         self.max_workers = max_workers
         self.logger = logging.getLogger(__name__)
         
+        # Shared pool of constructed tool runners
+        self.tool_pool = tool_pool or default_tool_pool
+        
         # Available tools registry
         self.available_tools = {
             'performance_forensics': PerformanceForensicsToolRunner,
@@ -252,10 +257,7 @@ class ToolsFlowOrchestrator:
         start_time = time.time()
         
         # Resolve flow configuration
-        if isinstance(flow_config, str):
-            if flow_config not in self.flow_templates:
-                raise ValueError(f"Unknown flow template: {flow_config}")
-            flow_config = self.flow_templates[flow_config]
+        flow_config = self.resolve_flow(flow_config)
         
         self.logger.info(f"Starting flow execution: {flow_config.flow_id} [{execution_id}]")
         
@@ -265,7 +267,8 @@ class ToolsFlowOrchestrator:
             'start_time': start_time,
             'status': 'running',
             'completed_tools': set(),
-            'failed_tools': set()
+            'failed_tools': set(),
+            'step_timings': {}
         }
         
         try:
@@ -283,6 +286,8 @@ class ToolsFlowOrchestrator:
             combined_recommendations = self._combine_recommendations(tool_results)
             
             execution_time = time.time() - start_time
+            step_timings = self.active_executions[execution_id]['step_timings']
+            critical_path = self._compute_critical_path(flow_config, step_timings)
             
             # Determine overall success
             successful_tools = [name for name, result in tool_results.items() if result.success]
@@ -306,7 +311,9 @@ class ToolsFlowOrchestrator:
                     'successful_tools': successful_tools,
                     'failed_tools': failed_tools,
                     'execution_strategy': flow_config.execution_strategy.value,
-                    'total_tools': len(flow_config.steps)
+                    'total_tools': len(flow_config.steps),
+                    'step_timings': step_timings,
+                    'critical_path': critical_path
                 }
             )
             
@@ -408,28 +415,30 @@ class ToolsFlowOrchestrator:
                                 input_data: ToolInput, execution_id: str) -> Dict[str, ToolOutput]:
         """Execute tools sequentially"""
         results = {}
+        tracking = self.active_executions[execution_id]
+        deadline = self._flow_deadline(flow_config, tracking['start_time'])
         
         # Sort steps by dependencies
         sorted_steps = self._topological_sort(flow_config.steps)
         
         for step in sorted_steps:
+            started_at = time.time()
             try:
-                tool_runner = step.tool_class(step.config)
-                result = await tool_runner.run(input_data)
-                results[step.tool_name] = result
-                
-                self.active_executions[execution_id]['completed_tools'].add(step.tool_name)
-                
-                if not result.success and not flow_config.continue_on_error:
-                    self.logger.warning(f"Tool {step.tool_name} failed, stopping execution")
-                    break
-                    
+                result = await self._execute_single_tool(step, input_data, execution_id, deadline)
             except Exception as e:
                 self.logger.error(f"Error executing tool {step.tool_name}: {str(e)}")
-                results[step.tool_name] = self._create_error_result(step.tool_name, str(e), input_data)
-                self.active_executions[execution_id]['failed_tools'].add(step.tool_name)
-                
+                result = self._create_error_result(step.tool_name, str(e), input_data)
+            
+            self._record_step_timing(tracking, step.tool_name, started_at, started_at,
+                                     'completed' if result.success else 'failed')
+            results[step.tool_name] = result
+            
+            if result.success:
+                tracking['completed_tools'].add(step.tool_name)
+            else:
+                tracking['failed_tools'].add(step.tool_name)
                 if not flow_config.continue_on_error:
+                    self.logger.warning(f"Tool {step.tool_name} failed, stopping execution")
                     break
         
         return results
@@ -437,110 +446,219 @@ class ToolsFlowOrchestrator:
     async def _execute_parallel(self, flow_config: FlowConfiguration, 
                               input_data: ToolInput, execution_id: str) -> Dict[str, ToolOutput]:
         """Execute tools in parallel where possible"""
-        results = {}
-        
-        # Group steps by parallel groups and dependencies
-        parallel_groups = self._group_steps_for_parallel_execution(flow_config.steps)
-        
-        for group in parallel_groups:
-            # Execute current group in parallel
-            group_tasks = []
-            
-            for step in group:
-                task = self._execute_single_tool(step, input_data, execution_id)
-                group_tasks.append((step.tool_name, task))
-            
-            # Wait for all tasks in this group to complete
-            group_results = await asyncio.gather(*[task for _, task in group_tasks], return_exceptions=True)
-            
-            # Process group results
-            for (tool_name, _), result in zip(group_tasks, group_results):
-                if isinstance(result, Exception):
-                    self.logger.error(f"Error executing tool {tool_name}: {str(result)}")
-                    results[tool_name] = self._create_error_result(tool_name, str(result), input_data)
-                    self.active_executions[execution_id]['failed_tools'].add(tool_name)
-                else:
-                    results[tool_name] = result
-                    self.active_executions[execution_id]['completed_tools'].add(tool_name)
-        
-        return results
+        # Steps without dependencies between them run concurrently; parallel_group
+        # no longer serializes groups behind one another
+        return await self._execute_dag(flow_config, input_data, execution_id)
     
     async def _execute_mixed(self, flow_config: FlowConfiguration, 
                            input_data: ToolInput, execution_id: str) -> Dict[str, ToolOutput]:
         """Execute tools using mixed strategy (optimal parallelization)"""
-        # This is similar to parallel execution but more intelligent about dependencies
-        return await self._execute_parallel(flow_config, input_data, execution_id)
+        return await self._execute_dag(flow_config, input_data, execution_id)
     
-    async def _execute_single_tool(self, step: ToolFlowStep, 
-                                 input_data: ToolInput, execution_id: str) -> ToolOutput:
-        """Execute a single tool with proper error handling"""
+    async def _execute_dag(self, flow_config: FlowConfiguration,
+                           input_data: ToolInput, execution_id: str) -> Dict[str, ToolOutput]:
+        """
+        Execute steps as a dependency graph
+        
+        Each step starts as soon as all of its dependencies have finished, with
+        at most max_parallel_workers steps running at once. When a required step
+        fails its downstream steps are skipped, and unless continue_on_error is
+        set every other pending step is cancelled. total_timeout bounds the
+        whole flow; steps still pending when it expires are cancelled.
+        """
+        tracking = self.active_executions[execution_id]
+        deadline = self._flow_deadline(flow_config, tracking['start_time'])
+        
+        steps = {step.tool_name: step for step in flow_config.steps}
+        dependents: Dict[str, Set[str]] = {name: set() for name in steps}
+        waiting_on: Dict[str, int] = {}
+        for step in flow_config.steps:
+            # Dependencies outside the flow cannot be waited on
+            known_dependencies = {dep for dep in step.dependencies if dep in steps}
+            for dependency in step.dependencies - known_dependencies:
+                self.logger.warning(f"Step {step.tool_name} depends on unknown step {dependency}; ignoring")
+            for dependency in known_dependencies:
+                dependents[dependency].add(step.tool_name)
+            waiting_on[step.tool_name] = len(known_dependencies)
+        
+        results: Dict[str, ToolOutput] = {}
+        running: Dict[asyncio.Task, str] = {}
+        semaphore = asyncio.Semaphore(max(1, flow_config.max_parallel_workers))
+        
+        async def run_step(step: ToolFlowStep) -> ToolOutput:
+            ready_at = time.time()
+            async with semaphore:
+                started_at = time.time()
+                status = 'cancelled'
+                try:
+                    result = await self._execute_single_tool(step, input_data, execution_id, deadline)
+                    status = 'completed' if result.success else 'failed'
+                    return result
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.logger.error(f"Error executing tool {step.tool_name}: {str(e)}")
+                    status = 'failed'
+                    return self._create_error_result(step.tool_name, str(e), input_data)
+                finally:
+                    self._record_step_timing(tracking, step.tool_name, ready_at, started_at, status)
+        
+        def launch(name: str):
+            running[asyncio.ensure_future(run_step(steps[name]))] = name
+        
+        def skip_downstream(name: str, reason: str):
+            for child in dependents[name]:
+                if child not in results:
+                    results[child] = self._create_error_result(child, reason, input_data)
+                    tracking['failed_tools'].add(child)
+                    skip_downstream(child, reason)
+        
+        for name, count in waiting_on.items():
+            if count == 0:
+                launch(name)
+        
+        cancel_reason = None
         try:
-            tool_runner = step.tool_class(step.config)
-            
-            # Apply timeout override if specified
-            if step.timeout_override:
-                # In a real implementation, you'd set this on the tool runner
-                pass
-            
-            result = await tool_runner.run(input_data)
-            return result
-            
-        except Exception as e:
-            raise e
+            while running:
+                timeout = None if deadline is None else max(0.0, deadline - time.time())
+                done, _ = await asyncio.wait(list(running), timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    cancel_reason = f"Flow timed out after {flow_config.total_timeout} seconds"
+                    break
+                
+                for task in done:
+                    name = running.pop(task)
+                    result = task.result()
+                    results[name] = result
+                    
+                    if result.success:
+                        tracking['completed_tools'].add(name)
+                    else:
+                        tracking['failed_tools'].add(name)
+                        if steps[name].required:
+                            skip_downstream(name, f"Skipped: dependency '{name}' failed")
+                            if not flow_config.continue_on_error:
+                                cancel_reason = f"Cancelled: required step '{name}' failed"
+                            continue
+                    
+                    # Optional steps unblock their dependents even when they fail
+                    for child in dependents[name]:
+                        waiting_on[child] -= 1
+                        if waiting_on[child] == 0 and child not in results:
+                            launch(child)
+                
+                if cancel_reason:
+                    break
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        
+        for name in steps:
+            if name not in results:
+                results[name] = self._create_error_result(name, cancel_reason or "Cancelled", input_data)
+                tracking['failed_tools'].add(name)
+        
+        return results
+    
+    async def _execute_single_tool(self, step: ToolFlowStep, input_data: ToolInput,
+                                   execution_id: str, deadline: Optional[float] = None) -> ToolOutput:
+        """
+        Execute a single tool with its step timeout
+        
+        The timeout is ``timeout_override`` or the tool's configured timeout,
+        capped by the time left before the flow deadline.
+        """
+        tool_runner = self.tool_pool.get_instance(step.tool_class, step.config)
+        
+        timeout = step.timeout_override or step.config.timeout or None
+        if deadline is not None:
+            remaining = max(0.0, deadline - time.time())
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        
+        try:
+            return await asyncio.wait_for(tool_runner.cached_run(input_data), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise ToolTimeoutError(step.tool_name, round(timeout, 3))
+    
+    @staticmethod
+    def _flow_deadline(flow_config: FlowConfiguration, start_time: float) -> Optional[float]:
+        """Absolute time by which the flow must finish, if it has a total_timeout"""
+        return start_time + flow_config.total_timeout if flow_config.total_timeout else None
+    
+    @staticmethod
+    def _record_step_timing(tracking: Dict[str, Any], tool_name: str,
+                            ready_at: float, started_at: float, status: str):
+        """Record when a step became ready, started and finished, relative to flow start"""
+        flow_start = tracking['start_time']
+        finished_at = time.time()
+        tracking['step_timings'][tool_name] = {
+            'ready_at': ready_at - flow_start,
+            'started_at': started_at - flow_start,
+            'finished_at': finished_at - flow_start,
+            'queue_wait': started_at - ready_at,
+            'duration': finished_at - started_at,
+            'status': status
+        }
+    
+    def _compute_critical_path(self, flow_config: FlowConfiguration,
+                               step_timings: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Find the chain of steps that determined the flow's latency
+        
+        Starts from the step that finished last and walks back through the
+        dependency that finished last at each hop.
+        """
+        if not step_timings:
+            return {'steps': [], 'duration': 0.0, 'sum_of_step_durations': 0.0}
+        
+        dependencies = {step.tool_name: step.dependencies for step in flow_config.steps}
+        current = max(step_timings, key=lambda name: step_timings[name]['finished_at'])
+        path = [current]
+        while True:
+            finished_dependencies = [dep for dep in dependencies.get(current, ()) if dep in step_timings]
+            if not finished_dependencies:
+                break
+            current = max(finished_dependencies, key=lambda name: step_timings[name]['finished_at'])
+            path.append(current)
+        path.reverse()
+        
+        for name, timing in step_timings.items():
+            timing['on_critical_path'] = name in path
+        
+        return {
+            'steps': path,
+            'duration': step_timings[path[-1]]['finished_at'],
+            'sum_of_step_durations': sum(timing['duration'] for timing in step_timings.values())
+        }
     
     def _topological_sort(self, steps: List[ToolFlowStep]) -> List[ToolFlowStep]:
-        """Sort steps based on dependencies using topological sort"""
-        # Build adjacency lists
-        graph = {step.tool_name: list(step.dependencies) for step in steps}
+        """Sort steps so every step comes after its dependencies (Kahn's algorithm)"""
         step_map = {step.tool_name: step for step in steps}
+        dependents = {name: [] for name in step_map}
+        in_degree = {name: 0 for name in step_map}
+        for step in steps:
+            for dependency in step.dependencies:
+                if dependency in step_map:
+                    dependents[dependency].append(step.tool_name)
+                    in_degree[step.tool_name] += 1
         
-        # Kahn's algorithm
-        in_degree = {name: 0 for name in graph}
-        for node in graph:
-            for neighbor in graph[node]:
-                if neighbor in in_degree:
-                    in_degree[neighbor] += 1
-        
-        queue = [node for node in in_degree if in_degree[node] == 0]
+        queue = [name for name in step_map if in_degree[name] == 0]
         result = []
         
         while queue:
             current = queue.pop(0)
             result.append(step_map[current])
             
-            for neighbor in graph[current]:
-                if neighbor in in_degree:
-                    in_degree[neighbor] -= 1
-                    if in_degree[neighbor] == 0:
-                        queue.append(neighbor)
+            for dependent in dependents[current]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
         
         return result
     
-    def _group_steps_for_parallel_execution(self, steps: List[ToolFlowStep]) -> List[List[ToolFlowStep]]:
-        """Group steps that can be executed in parallel"""
-        # Simple implementation - group by parallel_group or execute independently
-        groups = []
-        grouped_steps = {}
-        independent_steps = []
-        
-        for step in steps:
-            if step.parallel_group:
-                if step.parallel_group not in grouped_steps:
-                    grouped_steps[step.parallel_group] = []
-                grouped_steps[step.parallel_group].append(step)
-            else:
-                independent_steps.append(step)
-        
-        # Add grouped steps
-        for group_steps in grouped_steps.values():
-            groups.append(group_steps)
-        
-        # Add independent steps as individual groups
-        for step in independent_steps:
-            groups.append([step])
-        
-        return groups
-    
     def _create_error_result(self, tool_name: str, error_message: str, input_data: ToolInput) -> ToolOutput:
         """Create error result for failed tool execution"""
         return ToolOutput(
@@ -715,6 +833,65 @@ class ToolsFlowOrchestrator:
         
         return prioritized
     
+    def preload_tools(self, flow_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Warm the tool pool with every step used by the given flow templates
+        
+        Args:
+            flow_ids: Flow templates to preload, or None for all templates
+            
+        Returns:
+            Dictionary with loaded tool names and any failures
+        """
+        flow_ids = flow_ids if flow_ids is not None else list(self.flow_templates.keys())
+        
+        steps = []
+        for flow_id in flow_ids:
+            flow_config = self.flow_templates.get(flow_id)
+            if flow_config:
+                steps.extend((step.tool_class, step.config) for step in flow_config.steps)
+        
+        result = self.tool_pool.preload(steps)
+        self.logger.info(
+            f"Preloaded {len(set(result['loaded']))} tools for flows {flow_ids}"
+            + (f" ({len(result['failed'])} failed)" if result['failed'] else "")
+        )
+        return result
+    
+    def resolve_flow(self, flow_config: Union[str, FlowConfiguration]) -> FlowConfiguration:
+        """Resolve a flow template name to its configuration"""
+        if isinstance(flow_config, str):
+            if flow_config not in self.flow_templates:
+                raise ValueError(f"Unknown flow template: {flow_config}")
+            return self.flow_templates[flow_config]
+        return flow_config
+    
+    def get_flow_fingerprint(self, flow_config: Union[str, FlowConfiguration]) -> str:
+        """
+        Fingerprint of the tool versions and configs a flow runs
+        
+        Changes whenever a step's tool class, ``ToolRunner.version`` or config
+        changes, so cached flow results can be keyed and invalidated on it.
+        """
+        flow_config = self.resolve_flow(flow_config)
+        return content_hash({
+            'flow_id': flow_config.flow_id,
+            'strategy': getattr(flow_config.execution_strategy, 'value', flow_config.execution_strategy),
+            'steps': [
+                {
+                    'tool_name': step.tool_name,
+                    'tool_class': f"{step.tool_class.__module__}.{step.tool_class.__qualname__}",
+                    'version': getattr(step.tool_class, 'version', None),
+                    'config': config_fingerprint(step.config)
+                }
+                for step in flow_config.steps
+            ]
+        })[:16]
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get statistics for the shared tool instance pool"""
+        return self.tool_pool.get_stats()
+    
     def get_available_flows(self) -> Dict[str, str]:
         """Get list of available flow templates"""
         return {
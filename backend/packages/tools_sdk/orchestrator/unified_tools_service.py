@@ -3,10 +3,12 @@ Unified Tools Flow Service - Main API interface for the complete ad copy analysi
 Integrates orchestrator, configuration management, and provides simplified API
 """
 
-import asyncio
+import copy
+import os
+import uuid
 import time
 import logging
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Union, AsyncIterator, Tuple
 from dataclasses import dataclass, asdict
 
 from .tools_flow_orchestrator import (
@@ -14,7 +16,9 @@ from .tools_flow_orchestrator import (
     ToolFlowStep, FlowExecutionStrategy, FlowPriority
 )
 from .flow_config_manager import FlowConfigurationManager, FlowTemplate
-from ..core import ToolInput, ToolOutput, ToolConfig
+from ..core import ToolInput, ToolOutput, ToolConfig, ToolRunner
+from ..result_cache import ResultCache, normalize_text
+from ..batch_runner import BatchRunner
 from ..tools.performance_forensics_tool import PerformanceForensicsToolRunner
 from ..tools.psychology_scorer_tool import PsychologyScorerToolRunner
 from ..tools.brand_voice_engine_tool import BrandVoiceEngineToolRunner
@@ -77,8 +81,12 @@ class UnifiedToolsService:
     - Error handling and fallback strategies
     """
     
-    def __init__(self, config_directory: str = None, max_workers: int = 4):
+    def __init__(self, config_directory: str = None, max_workers: int = 4,
+                 result_cache: Optional[ResultCache] = None, cache_ttl: float = 300,
+                 cache_max_entries: int = 1024, cache_redis_url: Optional[str] = None,
+                 batch_concurrency: int = 8):
         self.logger = logging.getLogger(__name__)
+        self.batch_concurrency = batch_concurrency
         
         # Initialize core components
         self.orchestrator = ToolsFlowOrchestrator(max_workers=max_workers)
@@ -92,9 +100,19 @@ class UnifiedToolsService:
             'optimization': 'optimization_focused'
         }
         
-        # Results cache for performance
-        self.results_cache: Dict[str, AnalysisResponse] = {}
-        self.cache_ttl = 300  # 5 minutes
+        # Content-addressed results cache, shared across workers when Redis is configured
+        self.cache_ttl = cache_ttl
+        self.result_cache = result_cache or ResultCache(
+            namespace="unified_tools",
+            max_entries=cache_max_entries,
+            default_ttl=cache_ttl,
+            redis_url=cache_redis_url or os.getenv('TOOLS_CACHE_REDIS_URL'),
+            serializer=asdict,
+            deserializer=lambda data: AnalysisResponse(**data)
+        )
+        
+        # Last seen tool-version fingerprint per flow, for cache invalidation
+        self._flow_fingerprints: Dict[str, str] = {}
         
         # Initialize default configurations if not exist
         self._ensure_default_configurations()
@@ -109,22 +127,23 @@ class UnifiedToolsService:
         start_time = time.time()
         
         try:
-            # Generate cache key
-            cache_key = self._generate_cache_key(request)
+            # Select flow configuration
+            flow_config = self._select_flow_configuration(request)
+            flow_fingerprint = await self._check_flow_version(flow_config)
             
             # Check cache first
-            if cache_key in self.results_cache:
-                cached_result = self.results_cache[cache_key]
-                if time.time() - cached_result.execution_metadata.get('cached_at', 0) < self.cache_ttl:
-                    self.logger.info(f"Returning cached result for {cache_key}")
-                    return cached_result
+            cache_key = self._generate_cache_key(request, flow_config, flow_fingerprint)
+            cached_result = await self.result_cache.get(cache_key)
+            if cached_result is not None:
+                # Callers own (and may mutate) their response; each gets its own request_id
+                self.logger.info(f"Returning cached result for {cache_key[:16]}")
+                response = copy.deepcopy(cached_result)
+                response.request_id = str(uuid.uuid4())
+                return response
             
             # Convert to ToolInput format
             tool_input = self._convert_to_tool_input(request)
             
-            # Select flow configuration
-            flow_config = self._select_flow_configuration(request)
-            
             # Execute analysis
             self.logger.info(f"Starting analysis: {request.analysis_type} for request {tool_input.request_id}")
             flow_result = await self.orchestrator.execute_flow(flow_config, tool_input)
@@ -137,10 +156,7 @@ class UnifiedToolsService:
             # Cache successful results
             if response.success:
                 response.execution_metadata['cached_at'] = time.time()
-                self.results_cache[cache_key] = response
-                
-                # Clean old cache entries
-                self._clean_cache()
+                await self.result_cache.set(cache_key, copy.deepcopy(response), tags=[flow_fingerprint])
             
             self.logger.info(
                 f"Analysis completed: {request.analysis_type} - "
@@ -172,59 +188,59 @@ class UnifiedToolsService:
                 errors=[str(e)]
             )
     
-    async def analyze_copy_batch(self, requests: List[AnalysisRequest]) -> List[AnalysisResponse]:
-        """Analyze multiple ad copies in batch with optimal performance"""
-        
-        # Group requests by analysis type for optimization
-        grouped_requests = {}
-        for i, request in enumerate(requests):
-            analysis_type = request.analysis_type
-            if analysis_type not in grouped_requests:
-                grouped_requests[analysis_type] = []
-            grouped_requests[analysis_type].append((i, request))
-        
-        # Process groups in parallel
-        all_tasks = []
-        result_mapping = {}
-        
-        for analysis_type, type_requests in grouped_requests.items():
-            for original_index, request in type_requests:
-                task = self.analyze_copy(request)
-                all_tasks.append(task)
-                result_mapping[len(all_tasks) - 1] = original_index
-        
-        # Execute all analyses
-        results = await asyncio.gather(*all_tasks, return_exceptions=True)
-        
-        # Reorder results to match original request order
-        ordered_results = [None] * len(requests)
-        for task_index, result in enumerate(results):
-            original_index = result_mapping[task_index]
-            
-            if isinstance(result, Exception):
-                # Create error response
-                ordered_results[original_index] = AnalysisResponse(
-                    success=False,
-                    request_id=f"batch_{original_index}",
-                    execution_time=0.0,
-                    analysis_type=requests[original_index].analysis_type,
-                    overall_score=0.0,
-                    performance_score=0.0,
-                    psychology_score=0.0,
-                    brand_score=0.0,
-                    legal_score=0.0,
-                    strengths=[],
-                    weaknesses=[],
-                    recommendations=[],
-                    tool_results={},
-                    execution_metadata={},
-                    errors=[str(result)]
-                )
-            else:
-                ordered_results[original_index] = result
-        
+    async def analyze_copy_batch(self, requests: List[AnalysisRequest],
+                                 max_parallel: Optional[int] = None) -> List[AnalysisResponse]:
+        """Analyze multiple ad copies in batch; results keep the request order"""
+        ordered_results: List[Optional[AnalysisResponse]] = [None] * len(requests)
+        async for index, result in self.analyze_copy_batch_stream(requests, max_parallel):
+            ordered_results[index] = result
         return ordered_results
     
+    async def analyze_copy_batch_stream(
+        self,
+        requests: List[AnalysisRequest],
+        max_parallel: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, AnalysisResponse]]:
+        """
+        Analyze multiple ad copies, yielding each result as soon as it completes
+        
+        At most ``max_parallel`` (default: batch_concurrency) analyses run at
+        once, so only in-flight results are held in memory.
+        
+        Yields:
+            (request index, AnalysisResponse) pairs in completion order
+        """
+        runner = BatchRunner(concurrency=max_parallel or self.batch_concurrency, item_timeout=None)
+        
+        async def analyze(index: int, request: AnalysisRequest) -> AnalysisResponse:
+            return await self.analyze_copy(request)
+        
+        async for item in runner.iter_completed(requests, analyze):
+            if item.success:
+                yield item.index, item.result
+            else:
+                yield item.index, self._build_batch_error_response(item.index, requests[item.index], item.error)
+    
+    def _build_batch_error_response(self, index: int, request: AnalysisRequest, error: str) -> AnalysisResponse:
+        """Create the response recorded for a batch item that raised"""
+        return AnalysisResponse(
+            success=False,
+            request_id=f"batch_{index}",
+            execution_time=0.0,
+            analysis_type=request.analysis_type,
+            overall_score=0.0,
+            performance_score=0.0,
+            psychology_score=0.0,
+            brand_score=0.0,
+            legal_score=0.0,
+            strengths=[],
+            weaknesses=[],
+            recommendations=[],
+            tool_results={},
+            execution_metadata={},
+            errors=[error]
+        )
+    
     def get_available_analysis_types(self) -> Dict[str, str]:
         """Get available analysis types and their descriptions"""
         return {
@@ -249,10 +265,13 @@ class UnifiedToolsService:
     def get_analysis_statistics(self) -> Dict[str, Any]:
         """Get usage statistics and performance metrics"""
         return {
-            'cached_results': len(self.results_cache),
+            'cached_results': self.result_cache.get_stats()['entries'],
+            'result_cache': self.result_cache.get_stats(),
             'available_flows': len(self.config_manager.list_configurations()),
             'available_templates': len(self.config_manager.list_templates()),
-            'active_executions': len(self.orchestrator.active_executions)
+            'active_executions': len(self.orchestrator.active_executions),
+            'tool_pool': self.orchestrator.get_pool_stats(),
+            'tool_memo': ToolRunner.get_memo_stats()
         }
     
     async def test_tools_health(self) -> Dict[str, bool]:
@@ -279,7 +298,7 @@ class UnifiedToolsService:
         
         for tool_name, tool_class in tools_to_test.items():
             try:
-                tool_runner = tool_class(tool_class.default_config())
+                tool_runner = self.orchestrator.tool_pool.get_instance(tool_class, tool_class.default_config())
                 result = await tool_runner.run(test_input)
                 health_status[tool_name] = result.success
             except Exception as e:
@@ -297,9 +316,11 @@ class UnifiedToolsService:
             industry=request.industry,
             platform=request.platform,
             target_audience=request.target_audience,
-            brand_guidelines=request.brand_guidelines or {},
-            request_id=f"req_{int(time.time())}_{hash(request.headline)}"[:16],
-            additional_data=request.request_metadata or {}
+            tool_params={
+                'brand_guidelines': request.brand_guidelines or {},
+                'additional_data': request.request_metadata or {}
+            },
+            request_id=f"req_{int(time.time())}_{hash(request.headline)}"[:16]
         )
     
     def _select_flow_configuration(self, request: AnalysisRequest) -> Union[str, FlowConfiguration]:
@@ -432,24 +453,53 @@ class UnifiedToolsService:
         
         return strengths[:5], weaknesses[:5]  # Limit to top 5 each
     
-    def _generate_cache_key(self, request: AnalysisRequest) -> str:
-        """Generate cache key for request"""
-        content_hash = hash(f"{request.headline}{request.body_text}{request.cta}")
-        context_hash = hash(f"{request.industry}{request.platform}{request.analysis_type}")
-        return f"cache_{content_hash}_{context_hash}"
+    def _generate_cache_key(self, request: AnalysisRequest,
+                            flow_config: Union[str, FlowConfiguration], flow_fingerprint: str) -> str:
+        """Generate a content-addressed cache key for a request"""
+        flow_id = flow_config if isinstance(flow_config, str) else flow_config.flow_id
+        return self.result_cache.make_key({
+            'headline': normalize_text(request.headline),
+            'body_text': normalize_text(request.body_text),
+            'cta': normalize_text(request.cta),
+            'industry': normalize_text(request.industry).lower(),
+            'platform': normalize_text(request.platform).lower(),
+            'target_audience': normalize_text(request.target_audience),
+            'brand_guidelines': request.brand_guidelines or {},
+            'flow_id': flow_id,
+            'tool_versions': flow_fingerprint
+        })
+    
+    async def _check_flow_version(self, flow_config: Union[str, FlowConfiguration]) -> str:
+        """Get the flow's tool-version fingerprint, invalidating results of older versions"""
+        flow_id = flow_config if isinstance(flow_config, str) else flow_config.flow_id
+        fingerprint = self.orchestrator.get_flow_fingerprint(flow_config)
+        
+        previous = self._flow_fingerprints.get(flow_id)
+        if previous is not None and previous != fingerprint:
+            removed = await self.result_cache.invalidate_tag(previous)
+            self.logger.info(f"Tool versions changed for flow {flow_id}, invalidated {removed} cached results")
+        self._flow_fingerprints[flow_id] = fingerprint
+        
+        return fingerprint
     
-    def _clean_cache(self):
-        """Clean expired cache entries"""
-        current_time = time.time()
-        expired_keys = []
-        
-        for key, result in self.results_cache.items():
-            cached_at = result.execution_metadata.get('cached_at', 0)
-            if current_time - cached_at > self.cache_ttl:
-                expired_keys.append(key)
-        
-        for key in expired_keys:
-            del self.results_cache[key]
+    async def invalidate_cache(self, flow_id: Optional[str] = None) -> int:
+        """
+        Explicitly drop cached results
+        
+        Args:
+            flow_id: Only drop results of this flow's current tool versions; None drops everything
+            
+        Returns:
+            Number of in-process entries removed
+        """
+        if flow_id is None:
+            removed = self.result_cache.get_stats()['entries']
+            self.result_cache.clear()
+            for fingerprint in self._flow_fingerprints.values():
+                await self.result_cache.invalidate_tag(fingerprint)
+            return removed
+        
+        return await self.result_cache.invalidate_tag(self.orchestrator.get_flow_fingerprint(flow_id))
     
     def _ensure_default_configurations(self):
         """Ensure default flow configurations are available"""
@@ -0,0 +1,148 @@
+"""
+Precompiled regex bank for the pattern-scanning tools
+
+The legal risk scanner and psychology scorer test dozens of raw pattern
+strings against every ad with ``re.finditer``/``re.search`` in nested loops,
+paying a pattern-cache lookup and a full text scan per pattern. A RegexBank
+compiles every rule of a tool into one alternation at construction and finds
+all rule matches with a single scan of the text, mapping each hit back to the
+rule (and therefore the category) that produced it.
+
+Results are identical to running each rule's own ``finditer``: rules that
+match at the same position, or inside another rule's match, are all reported.
+"""
+
+import re
+from collections import namedtuple
+from typing import Dict, Any, List, Iterable, Tuple
+
+
+# A single rule match: rule key, matched text and span in the scanned text
+BankMatch = namedtuple('BankMatch', ['rule', 'text', 'start', 'end'])
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """Whether a pattern contains a ``|`` outside any group or character class"""
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+    return False
+
+
+class RegexBank:
+    """
+    Ordered set of regex rules compiled into a single alternation
+
+    Args:
+        rules: Iterable of (rule_key, pattern) pairs. Keys are usually
+            (category, pattern_index) tuples so hits map back to their category
+        flags: Regex flags applied to every rule
+    """
+
+    def __init__(self, rules: Iterable[Tuple[Any, str]], flags: int = 0):
+        self.flags = flags
+        self._keys: List[Any] = []
+        self._patterns: List[str] = []
+
+        for key, pattern in rules:
+            # Validate each rule on its own so a bad pattern names its rule
+            try:
+                re.compile(pattern, flags)
+            except re.error as e:
+                raise ValueError(f"Invalid pattern for rule {key!r}: {e}")
+            self._keys.append(key)
+            self._patterns.append(pattern)
+
+        self._any_rule = None
+        self._rules_at = None
+        self._group_indices: List[int] = []
+        if self._patterns:
+            self._compile()
+
+    def _compile(self):
+        # Finds the next position where any rule can start. Rules anchored on
+        # a word boundary share one leading \b so positions inside words are
+        # rejected with a single check instead of one per rule.
+        boundary_rules = []
+        other_rules = []
+        for pattern in self._patterns:
+            if pattern.startswith(r'\b') and not _has_top_level_alternation(pattern):
+                boundary_rules.append(pattern[2:])
+            else:
+                other_rules.append(pattern)
+        alternatives = [f"(?:{pattern})" for pattern in other_rules]
+        if boundary_rules:
+            alternatives.insert(0, r'\b(?:' + '|'.join(f"(?:{p})" for p in boundary_rules) + ')')
+        self._any_rule = re.compile('|'.join(alternatives), self.flags)
+
+        # Captures every rule matching at a given position via named lookaheads
+        group_names = [f"r{index}" for index in range(len(self._patterns))]
+        self._rules_at = re.compile(
+            ''.join(f"(?=(?P<{name}>{pattern}))?"
+                    for name, pattern in zip(group_names, self._patterns)),
+            self.flags
+        )
+        self._group_indices = [self._rules_at.groupindex[name] for name in group_names]
+
+    @property
+    def rules(self) -> List[Any]:
+        """Rule keys in registration order"""
+        return list(self._keys)
+
+    def scan(self, text: str) -> Dict[Any, List[BankMatch]]:
+        """
+        Find every rule's matches in one pass over the text
+
+        Returns:
+            Dictionary mapping rule key to its non-overlapping matches in
+            position order; rules without matches are omitted
+        """
+        results: Dict[Any, List[BankMatch]] = {}
+        if self._any_rule is None or not text:
+            return results
+
+        # End of the last accepted match per rule, so each rule's own matches
+        # stay non-overlapping exactly as with ``finditer``
+        rule_ends = [0] * len(self._keys)
+        position = 0
+        text_length = len(text)
+
+        while position <= text_length:
+            candidate = self._any_rule.search(text, position)
+            if candidate is None:
+                break
+
+            start = candidate.start()
+            spans = self._rules_at.match(text, start).regs
+            for index, group_index in enumerate(self._group_indices):
+                end = spans[group_index][1]
+                if end == -1 or start < rule_ends[index]:
+                    continue
+                # Empty matches would never advance; finditer skips past them
+                rule_ends[index] = end if end > start else start + 1
+                key = self._keys[index]
+                results.setdefault(key, []).append(BankMatch(key, text[start:end], start, end))
+
+            position = start + 1
+
+        return results
+
+    def matched_rules(self, text: str) -> List[Any]:
+        """Rule keys with at least one match, in registration order"""
+        results = self.scan(text)
+        return [key for key in self._keys if key in results]
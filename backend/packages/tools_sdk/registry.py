@@ -6,15 +6,17 @@ import importlib
 from typing import Dict, List, Optional, Type, Any
 from .core import ToolRunner, ToolConfig, ToolType
 from .exceptions import ToolError, ToolConfigError
+from .instance_pool import ToolInstancePool, default_tool_pool
 
 
 class ToolRegistry:
     """Registry for managing available tools"""
     
-    def __init__(self):
+    def __init__(self, instance_pool: Optional[ToolInstancePool] = None):
         self._tools: Dict[str, Type[ToolRunner]] = {}
         self._configs: Dict[str, ToolConfig] = {}
         self._instances: Dict[str, ToolRunner] = {}
+        self._pool = instance_pool or default_tool_pool
     
     def register_tool(
         self, 
@@ -73,20 +75,36 @@ class ToolRegistry:
         if tool_name in self._instances:
             return self._instances[tool_name]
         
-        # Create new instance
+        # Create new instance (or reuse a warm one from the shared pool)
         tool_class = self._tools[tool_name]
         config = self._configs[tool_name]
         
-        try:
-            instance = tool_class(config)
-            self._instances[tool_name] = instance
-            return instance
-        except Exception as e:
-            raise ToolError(
-                f"Failed to instantiate tool '{tool_name}': {str(e)}",
-                tool_name=tool_name,
-                error_code="TOOL_INSTANTIATION_ERROR"
-            )
+        instance = self._pool.get_instance(tool_class, config)
+        self._instances[tool_name] = instance
+        return instance
+    
+    def preload_tools(self, tool_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Instantiate registered tools ahead of the first request
+        
+        Args:
+            tool_names: Tools to preload, or None for all registered tools
+            
+        Returns:
+            Dictionary with loaded tool names and any failures
+        """
+        names = tool_names if tool_names is not None else self.list_tools()
+        loaded = []
+        failed = {}
+        
+        for tool_name in names:
+            try:
+                self.get_tool(tool_name)
+                loaded.append(tool_name)
+            except ToolError as e:
+                failed[tool_name] = e.message
+        
+        return {'loaded': loaded, 'failed': failed}
     
     def list_tools(self) -> List[str]:
         """Get list of registered tool names"""
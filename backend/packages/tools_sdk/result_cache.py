@@ -0,0 +1,287 @@
+"""
+Content-addressed, bounded result cache
+
+Keys are SHA-256 digests of a normalized payload, so they are stable across
+processes (unlike ``hash()``, which is salted per interpreter) and gunicorn
+workers sharing a Redis instance serve each other's results. Entries live in
+a bounded in-process LRU tier with per-entry TTL and, optionally, in a shared
+Redis tier. Entries can be tagged (e.g. with the tool-version fingerprint of
+the flow that produced them) and invalidated by tag.
+"""
+
+import hashlib
+import json
+import logging
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Iterable, Set, Tuple
+
+# Optional shared tier
+try:
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis_asyncio = None
+    REDIS_AVAILABLE = False
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Normalize a text field for hashing (unicode NFC, surrounding whitespace stripped)"""
+    return unicodedata.normalize('NFC', value or '').strip()
+
+
+def content_hash(payload: Any) -> str:
+    """Stable SHA-256 digest of a JSON-serializable payload"""
+    serialized = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier TTL cache: bounded in-process LRU plus optional Redis
+
+    Args:
+        namespace: Prefix for Redis keys
+        max_entries: Maximum entries held in the in-process tier
+        default_ttl: Entry lifetime in seconds when set() gets no ttl
+        max_entry_bytes: Serialized entries larger than this are not written to Redis
+        redis_url: Redis URL for the shared tier; None keeps the cache process-local
+        serializer: Converts a value to a JSON-serializable object for Redis
+        deserializer: Rebuilds a value from the object produced by serializer
+    """
+
+    def __init__(
+        self,
+        namespace: str = "tools_sdk",
+        max_entries: int = 1024,
+        default_ttl: float = 300,
+        max_entry_bytes: int = 1_000_000,
+        redis_url: Optional[str] = None,
+        serializer: Optional[Callable[[Any], Any]] = None,
+        deserializer: Optional[Callable[[Any], Any]] = None
+    ):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.max_entry_bytes = max_entry_bytes
+        self.serializer = serializer or (lambda value: value)
+        self.deserializer = deserializer or (lambda data: data)
+        self.logger = logging.getLogger(__name__)
+
+        # key -> (expires_at, value, tags)
+        self._entries: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+        # key -> (expires_at, value) for increment() when Redis is not configured
+        self._counters: Dict[str, Tuple[float, int]] = {}
+
+        self._redis = None
+        if redis_url:
+            if REDIS_AVAILABLE:
+                self._redis = redis_asyncio.from_url(redis_url)
+            else:
+                self.logger.warning("redis package not installed - result cache is process-local")
+
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'redis_hits': 0,
+            'sets': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0,
+            'oversize_skips': 0,
+            'redis_errors': 0
+        }
+
+    @property
+    def redis_enabled(self) -> bool:
+        return self._redis is not None
+
+    def make_key(self, payload: Any) -> str:
+        """Build a content-addressed key for a payload"""
+        return content_hash(payload)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None on miss or expiry"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value, _ = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return value
+            self._remove(key)
+            self._stats['expirations'] += 1
+
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(self._redis_key(key))
+                if raw is not None:
+                    ttl = await self._redis.ttl(self._redis_key(key))
+                    stored = json.loads(raw)
+                    value = self.deserializer(stored['value'])
+                    self._store_local(key, value, ttl if ttl and ttl > 0 else self.default_ttl,
+                                      tuple(stored.get('tags', ())))
+                    self._stats['hits'] += 1
+                    self._stats['redis_hits'] += 1
+                    return value
+            except Exception as e:
+                self._stats['redis_errors'] += 1
+                self.logger.warning(f"Result cache Redis read failed: {str(e)}")
+
+        self._stats['misses'] += 1
+        return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()):
+        """
+        Store a value
+
+        Args:
+            key: Cache key (see make_key)
+            value: Value to cache
+            ttl: Lifetime in seconds; defaults to default_ttl
+            tags: Labels for invalidate_tag(), e.g. a tool-version fingerprint
+        """
+        ttl = ttl if ttl is not None else self.default_ttl
+        tags = tuple(tags)
+        self._store_local(key, value, ttl, tags)
+        self._stats['sets'] += 1
+
+        if self._redis is not None:
+            try:
+                payload = json.dumps({'value': self.serializer(value), 'tags': tags}, default=str)
+                if len(payload.encode('utf-8')) > self.max_entry_bytes:
+                    self._stats['oversize_skips'] += 1
+                    return
+                redis_key = self._redis_key(key)
+                pipe = self._redis.pipeline()
+                pipe.set(redis_key, payload, ex=max(1, int(ttl)))
+                for tag in tags:
+                    pipe.sadd(self._tag_key(tag), redis_key)
+                    pipe.expire(self._tag_key(tag), max(1, int(ttl)))
+                await pipe.execute()
+            except Exception as e:
+                self._stats['redis_errors'] += 1
+                self.logger.warning(f"Result cache Redis write failed: {str(e)}")
+
+    async def increment(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """
+        Add to a counter shared by every worker using the same Redis
+
+        Args:
+            key: Counter name
+            amount: Value to add; negative to give back
+            ttl: Seconds until the counter resets; defaults to default_ttl and
+                is refreshed on every call
+
+        Returns:
+            The counter value after the increment
+        """
+        ttl = ttl if ttl is not None else self.default_ttl
+
+        if self._redis is not None:
+            try:
+                counter_key = self._counter_key(key)
+                pipe = self._redis.pipeline()
+                pipe.incrby(counter_key, amount)
+                pipe.expire(counter_key, max(1, int(ttl)))
+                value, _ = await pipe.execute()
+                return int(value)
+            except Exception as e:
+                self._stats['redis_errors'] += 1
+                self.logger.warning(f"Result cache Redis increment failed: {str(e)}")
+
+        now = time.time()
+        expires_at, value = self._counters.get(key, (0.0, 0))
+        value = (value if expires_at > now else 0) + amount
+        self._counters[key] = (now + ttl, value)
+        return value
+
+    async def invalidate(self, key: str):
+        """Drop a single entry from both tiers"""
+        if key in self._entries:
+            self._remove(key)
+            self._stats['invalidations'] += 1
+
+        if self._redis is not None:
+            try:
+                await self._redis.delete(self._redis_key(key))
+            except Exception as e:
+                self._stats['redis_errors'] += 1
+                self.logger.warning(f"Result cache Redis delete failed: {str(e)}")
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Drop every entry stored with a tag
+
+        Returns:
+            Number of in-process entries removed
+        """
+        keys = list(self._tag_index.get(tag, ()))
+        for key in keys:
+            self._remove(key)
+        self._stats['invalidations'] += len(keys)
+
+        if self._redis is not None:
+            try:
+                tag_key = self._tag_key(tag)
+                redis_keys = await self._redis.smembers(tag_key)
+                if redis_keys:
+                    await self._redis.delete(*redis_keys)
+                await self._redis.delete(tag_key)
+            except Exception as e:
+                self._stats['redis_errors'] += 1
+                self.logger.warning(f"Result cache Redis tag invalidation failed: {str(e)}")
+
+        return len(keys)
+
+    def clear(self):
+        """Drop every in-process entry"""
+        self._entries.clear()
+        self._tag_index.clear()
+        self._counters.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and tier sizes"""
+        lookups = self._stats['hits'] + self._stats['misses']
+        return {
+            **self._stats,
+            'hit_rate': self._stats['hits'] / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'default_ttl': self.default_ttl,
+            'redis_enabled': self.redis_enabled
+        }
+
+    def _store_local(self, key: str, value: Any, ttl: float, tags: Tuple[str, ...]):
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.time() + ttl, value, tags)
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self._stats['evictions'] += 1
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:result:{key}"
+
+    def _counter_key(self, key: str) -> str:
+        return f"{self.namespace}:counter:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}:tag:{tag}"
@@ -14,7 +14,7 @@ from unittest.mock import Mock, AsyncMock, patch
 from pathlib import Path
 
 # Import the SDK components
-from ..core import ToolInput, ToolOutput, ToolConfig, ToolType
+from ..core import ToolInput, ToolOutput, ToolConfig, ToolType, ToolRunner
 from ..tools.performance_forensics_tool import PerformanceForensicsToolRunner
 from ..tools.psychology_scorer_tool import PsychologyScorerToolRunner
 from ..tools.brand_voice_engine_tool import BrandVoiceEngineToolRunner
@@ -31,6 +31,13 @@ from ..contracts.api_schemas import (
 )
 from ..observability.metrics_collector import MetricsCollector
 from ..observability.request_logger import RequestLogger
+from ..instance_pool import ToolInstancePool
+from ..inference_service import BatchedInferenceService
+from ..text_matcher import LexiconMatcher, BOUNDARY_NONE
+from ..regex_bank import RegexBank
+from ..text_analysis import AnalyzedText
+from ..result_cache import ResultCache
+from ..batch_runner import BatchRunner
 
 
 # ===== TEST FIXTURES =====
@@ -304,6 +311,484 @@ class TestToolsFlowOrchestrator:
             assert len(result.tool_results) > 0
             assert result.error_summary is not None
             assert "failed_tools" in result.error_summary
+    
+    def _dependent_flow(self, **kwargs) -> FlowConfiguration:
+        """Psychology scorer depending on performance forensics, scheduled as a DAG"""
+        return FlowConfiguration(
+            flow_id="dag_test",
+            name="DAG test",
+            description="Two-step dependency chain",
+            steps=[
+                ToolFlowStep(
+                    tool_name="performance_forensics",
+                    tool_class=PerformanceForensicsToolRunner,
+                    config=PerformanceForensicsToolRunner.default_config()
+                ),
+                ToolFlowStep(
+                    tool_name="psychology_scorer",
+                    tool_class=PsychologyScorerToolRunner,
+                    config=PsychologyScorerToolRunner.default_config(),
+                    dependencies={"performance_forensics"}
+                )
+            ],
+            **kwargs
+        )
+    
+    @pytest.mark.asyncio
+    async def test_dag_records_critical_path(self):
+        """Mixed flows should report per-step timings and the critical path"""
+        orchestrator = ToolsFlowOrchestrator()
+        input_data = ToolInput(headline="Sleep better tonight", body_text="Try our mattress for 100 nights.",
+                               cta="Shop Now", platform="facebook")
+        
+        result = await orchestrator.execute_flow(self._dependent_flow(), input_data)
+        
+        timings = result.execution_metadata["step_timings"]
+        assert timings["psychology_scorer"]["started_at"] >= timings["performance_forensics"]["finished_at"]
+        assert result.execution_metadata["critical_path"]["steps"] == ["performance_forensics", "psychology_scorer"]
+    
+    @pytest.mark.asyncio
+    async def test_dag_skips_downstream_of_failed_step(self):
+        """A failed required step should skip the steps that depend on it"""
+        orchestrator = ToolsFlowOrchestrator()
+        input_data = ToolInput(headline="Test", body_text="Body", cta="Go", platform="facebook")
+        
+        with patch.object(PerformanceForensicsToolRunner, 'run', side_effect=Exception("Simulated failure")):
+            result = await orchestrator.execute_flow(self._dependent_flow(), input_data)
+        
+        assert result.tool_results["psychology_scorer"].success is False
+        assert "Skipped" in result.tool_results["psychology_scorer"].error_message
+    
+    @pytest.mark.asyncio
+    async def test_dag_total_timeout(self):
+        """Steps still pending at total_timeout should be cancelled"""
+        orchestrator = ToolsFlowOrchestrator()
+        input_data = ToolInput(headline="Test", body_text="Body", cta="Go", platform="facebook")
+        
+        async def slow_run(self, input_data):
+            await asyncio.sleep(5)
+        
+        with patch.object(PerformanceForensicsToolRunner, 'run', new=slow_run):
+            start = time.time()
+            result = await orchestrator.execute_flow(self._dependent_flow(total_timeout=0.2), input_data)
+        
+        assert time.time() - start < 2
+        assert all(not output.success for output in result.tool_results.values())
+
+
+class TestToolInstancePool:
+    """Test suite for the shared tool instance pool"""
+    
+    def test_reuses_instance_for_same_config(self):
+        """Same class and config should return the same warm instance"""
+        pool = ToolInstancePool()
+        
+        first = pool.get_instance(PsychologyScorerToolRunner, PsychologyScorerToolRunner.default_config())
+        second = pool.get_instance(PsychologyScorerToolRunner, PsychologyScorerToolRunner.default_config())
+        
+        assert first is second
+        stats = pool.get_stats()
+        assert stats['pooled_instances'] == 1
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+    
+    def test_different_config_gets_new_instance(self):
+        """Changing config parameters should produce a separate instance"""
+        pool = ToolInstancePool()
+        config = PsychologyScorerToolRunner.default_config()
+        custom_config = PsychologyScorerToolRunner.default_config()
+        custom_config.parameters['custom_flag'] = True
+        
+        first = pool.get_instance(PsychologyScorerToolRunner, config)
+        second = pool.get_instance(PsychologyScorerToolRunner, custom_config)
+        
+        assert first is not second
+        assert pool.get_stats()['pooled_instances'] == 2
+    
+    def test_different_credentials_get_new_instance(self):
+        """Configs that differ only in credential values must not share an instance"""
+        pool = ToolInstancePool()
+        config = PsychologyScorerToolRunner.default_config()
+        config.credentials['api_key'] = 'key-a'
+        other_config = PsychologyScorerToolRunner.default_config()
+        other_config.credentials['api_key'] = 'key-b'
+        
+        first = pool.get_instance(PsychologyScorerToolRunner, config)
+        second = pool.get_instance(PsychologyScorerToolRunner, other_config)
+        
+        assert first is not second
+        assert pool.get_stats()['pooled_instances'] == 2
+    
+    @pytest.mark.asyncio
+    async def test_orchestrator_does_not_reconstruct_tools(self):
+        """Flow execution should construct each tool at most once"""
+        pool = ToolInstancePool()
+        orchestrator = ToolsFlowOrchestrator(tool_pool=pool)
+        orchestrator.preload_tools(['quick_performance'])
+        input_data = ToolInput(
+            headline="Revolutionary AI Tool Transforms Your Business",
+            body_text="Discover AI-driven insights that help you make better decisions and drive growth.",
+            cta="Start Your Free Trial Today",
+            platform="facebook",
+            industry="technology"
+        )
+        
+        await orchestrator.execute_flow("quick_performance", input_data)
+        await orchestrator.execute_flow("quick_performance", input_data)
+        
+        stats = orchestrator.get_pool_stats()
+        assert stats['misses'] == 2
+        assert stats['hits'] >= 4
+
+
+class TestBatchedInferenceService:
+    """Test suite for micro-batched model inference"""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_coalesced(self):
+        """Concurrent callers should share pipeline calls and keep their own results"""
+        batch_sizes = []
+        
+        def fake_pipeline(texts):
+            batch_sizes.append(len(texts))
+            return [{'label': 'POSITIVE', 'score': len(text)} for text in texts]
+        
+        service = BatchedInferenceService(fake_pipeline, name="test", max_batch_size=8, max_wait_ms=20)
+        results = await asyncio.gather(*(service.infer("x" * i) for i in range(20)))
+        service.shutdown()
+        
+        assert [r['score'] for r in results] == list(range(20))
+        assert len(batch_sizes) < 20
+        assert max(batch_sizes) <= 8
+        assert service.get_stats()['batch_size']['count'] == len(batch_sizes)
+    
+    @pytest.mark.asyncio
+    async def test_pipeline_failure_propagates_to_callers(self):
+        """A failing batch should raise for every waiting caller"""
+        def failing_pipeline(texts):
+            raise RuntimeError("model crashed")
+        
+        service = BatchedInferenceService(failing_pipeline, name="failing")
+        
+        with pytest.raises(RuntimeError):
+            await service.infer("text")
+        service.shutdown()
+        
+        assert service.get_stats()['errors'] == 1
+
+
+class TestLexiconMatcher:
+    """Test suite for the shared multi-pattern keyword matcher"""
+    
+    def test_single_scan_groups_hits_by_lexicon(self):
+        """One scan should report every lexicon's terms with positions"""
+        matcher = LexiconMatcher()
+        matcher.register("urgency", ["limited time", "now"])
+        matcher.register("trust", ["guaranteed", "secure"])
+        
+        hits = matcher.scan("Guaranteed results - buy now, limited time only!")
+        
+        assert hits.found("urgency") == ["limited time", "now"]
+        assert hits.found("trust") == ["guaranteed"]
+        assert hits.first_position("urgency", "now") == 25
+        assert hits.first_position("trust", "secure") == -1
+    
+    def test_start_boundary_avoids_partial_word_matches(self):
+        """Terms should not match inside longer words unless boundaries are disabled"""
+        matcher = LexiconMatcher()
+        matcher.register("claims", ["cure"])
+        matcher.register("raw", ["cure"], boundary=BOUNDARY_NONE)
+        
+        hits = matcher.scan("A secure checkout that cured nothing")
+        
+        assert hits.positions("claims", "cure") == [23]
+        assert hits.positions("raw", "cure") == [4, 23]
+    
+    def test_repeated_scans_are_cached(self):
+        """Tools analysing the same text should share one scan"""
+        matcher = LexiconMatcher()
+        matcher.register("words", ["fast"])
+        
+        matcher.scan("fast results")
+        matcher.scan("fast results")
+        
+        stats = matcher.get_stats()
+        assert stats['scans'] == 1
+        assert stats['scan_cache_hits'] == 1
+
+    def test_scan_many_splits_one_scan_per_text(self):
+        """Batch scans should report positions relative to each text"""
+        matcher = LexiconMatcher()
+        matcher.register("urgency", ["now", "limited time"])
+        matcher.register("raw", ["w l"], boundary=BOUNDARY_NONE)
+
+        first, second, third = matcher.scan_many(["Buy now", "", "Limited time - act now"])
+
+        assert first.positions("urgency", "now") == [4]
+        assert not second.any("urgency")
+        assert third.found("urgency") == ["now", "limited time"]
+        assert third.first_position("urgency", "now") == 19
+        assert matcher.get_stats()['scans'] == 1
+
+        # Matches spanning two texts are dropped
+        first, second = matcher.scan_many(["Buy now", "Limited time"], separator=" ")
+        assert not first.any("raw") and not second.any("raw")
+
+    def test_positions_index_original_text(self):
+        """Characters whose lowercase form is longer must not shift later offsets"""
+        matcher = LexiconMatcher()
+        matcher.register("urgency", ["act now"])
+        text = "İstanbul deals: act now"
+
+        hits = matcher.scan(text)
+
+        position = hits.first_position("urgency", "act now")
+        assert text[position:position + len("act now")] == "act now"
+
+
+class TestRegexBank:
+    """Test suite for the precompiled regex bank"""
+    
+    def test_matches_equal_per_pattern_finditer(self):
+        """Overlapping rules should all be reported, as with separate scans"""
+        import re
+        rules = [
+            ('absolute', r'\b(guaranteed?|guarantee)\b'),
+            ('financial', r'\b(guaranteed returns?|risk[- ]?free investment)\b'),
+            ('risk', r'\b(zero risk|no risk|risk[- ]?free)\b'),
+            ('earnings', r'\$\d+\s+per day')
+        ]
+        text = "Guaranteed returns on a risk-free investment: $500 per day, guaranteed."
+        
+        bank = RegexBank(rules, re.IGNORECASE)
+        results = bank.scan(text)
+        
+        for key, pattern in rules:
+            expected = [(m.group(), m.start()) for m in re.finditer(pattern, text, re.IGNORECASE)]
+            assert [(m.text, m.start) for m in results.get(key, [])] == expected
+    
+    def test_invalid_pattern_names_rule(self):
+        """A broken pattern should be reported with its rule key"""
+        with pytest.raises(ValueError, match="health"):
+            RegexBank([('health', r'\b(cure')])
+    
+    def test_legal_scanner_uses_bank(self):
+        """Legal risk flags should map back to their categories"""
+        tool = LegalRiskScannerToolRunner(LegalRiskScannerToolRunner.default_config())
+        
+        risks = tool._scan_legal_risks("Guaranteed returns, risk-free!", "finance", "facebook", "US")
+        
+        assert 'absolute_claims' in risks['risk_categories']
+        assert 'financial_promises' in risks['risk_categories']
+        assert 'Past performance does not guarantee future results' in risks['required_disclaimers']
+
+
+class TestAnalyzedText:
+    """Test suite for the shared text preprocessing artifact"""
+    
+    def test_features_are_derived_from_all_sections(self):
+        """Tokens, sentences and syllables should cover headline, body and CTA"""
+        analyzed = AnalyzedText("Sleep better tonight!", "Our simple pillow helps. Try it.", "Shop now")
+        
+        assert analyzed.full_text == "Sleep better tonight! Our simple pillow helps. Try it. Shop now"
+        assert analyzed.word_count == 11
+        assert analyzed.sentences == ["Sleep better tonight!", "Our simple pillow helps.", "Try it.", "Shop now"]
+        assert analyzed.syllable_counts[analyzed.tokens.index("simple")] == 2
+        assert ("shop", "now") in analyzed.ngrams(2)
+        assert analyzed.readability['sentence_count'] == 4
+    
+    def test_tool_input_shares_one_artifact(self):
+        """Every tool reading the same ToolInput should get the same cached artifact"""
+        tool_input = ToolInput(headline="Sleep better", body_text="Try our pillow.", cta="Shop now", platform="facebook")
+        first = tool_input.analyzed_text
+        assert tool_input.analyzed_text is first
+        
+        tool_input.headline = "A new headline"
+        assert tool_input.analyzed_text is not first
+        assert tool_input.analyzed_text.full_text.startswith("A new headline")
+
+
+class TestResultCache:
+    """Test suite for the content-addressed result cache"""
+    
+    def test_keys_are_stable_content_hashes(self):
+        """Equal payloads should map to the same key regardless of dict order"""
+        cache = ResultCache()
+        
+        key = cache.make_key({'headline': 'Sleep better', 'flow_id': 'quick_performance'})
+        
+        assert key == cache.make_key({'flow_id': 'quick_performance', 'headline': 'Sleep better'})
+        assert key != cache.make_key({'headline': 'Sleep better', 'flow_id': 'compliance_check'})
+        assert len(key) == 64
+    
+    @pytest.mark.asyncio
+    async def test_lru_bound_ttl_and_metrics(self):
+        """The in-process tier should evict, expire and count hits and misses"""
+        cache = ResultCache(max_entries=2, default_ttl=60)
+        
+        await cache.set('a', 1)
+        await cache.set('b', 2)
+        await cache.get('a')
+        await cache.set('c', 3)  # evicts 'b', the least recently used
+        await cache.set('a', 1, ttl=-1)  # replaced by an already expired entry
+        
+        assert await cache.get('b') is None
+        assert await cache.get('a') is None
+        assert await cache.get('c') == 3
+        
+        stats = cache.get_stats()
+        assert stats['hits'] == 2
+        assert stats['misses'] == 2
+        assert stats['evictions'] == 1
+        assert stats['expirations'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_by_tag(self):
+        """Entries tagged with an outdated tool-version fingerprint should be dropped"""
+        cache = ResultCache()
+        await cache.set('old', 'result', tags=['v1'])
+        await cache.set('new', 'result', tags=['v2'])
+        
+        assert await cache.invalidate_tag('v1') == 1
+        assert await cache.get('old') is None
+        assert await cache.get('new') == 'result'
+
+    @pytest.mark.asyncio
+    async def test_counter_increments_and_resets_after_ttl(self):
+        """Counters should add up, give back and start over once expired"""
+        cache = ResultCache()
+
+        assert await cache.increment('budget', ttl=60) == 1
+        assert await cache.increment('budget', 2, ttl=60) == 3
+        assert await cache.increment('budget', -1, ttl=60) == 2
+        assert await cache.increment('budget', ttl=-1) == 3  # expires immediately
+        assert await cache.increment('budget', ttl=60) == 1
+
+
+class TestToolMemoization:
+    """Test suite for per-tool memoization in ToolRunner"""
+    
+    @pytest.mark.asyncio
+    async def test_equivalent_inputs_share_output(self):
+        """Inputs that only differ in undeclared fields should reuse the memoized output"""
+        await ToolRunner.clear_memo()
+        tool = PsychologyScorerToolRunner(PsychologyScorerToolRunner.default_config())
+        first = ToolInput(headline="Limited time offer", body_text="Only 3 spots left.",
+                          cta="Book Now", platform="facebook", industry="fitness")
+        second = ToolInput(headline="Limited time offer", body_text="Only 3 spots left.",
+                           cta="Book Now", platform="google", industry="finance")
+        hits_before = ToolRunner.get_memo_stats()['hits']
+        
+        first_result = await tool.cached_run(first)
+        second_result = await tool.cached_run(second)
+        
+        assert tool.get_cache_key(first) == tool.get_cache_key(second)
+        assert second_result.scores == first_result.scores
+        assert second_result.request_id == second.request_id
+        assert ToolRunner.get_memo_stats()['hits'] == hits_before + 1
+    
+    @pytest.mark.asyncio
+    async def test_cache_enabled_false_disables_memoization(self):
+        """ToolConfig.cache_enabled=False should always run the tool"""
+        config = PsychologyScorerToolRunner.default_config()
+        config.cache_enabled = False
+        tool = PsychologyScorerToolRunner(config)
+        input_data = ToolInput(headline="Test", body_text="Body", cta="Go", platform="facebook")
+        
+        with patch.object(tool, 'run', new=AsyncMock(return_value=ToolOutput(
+                tool_name=tool.name, tool_type=tool.tool_type, success=True))) as run:
+            await tool.cached_run(input_data)
+            await tool.cached_run(input_data)
+        
+        assert tool.get_cache_key(input_data) is None
+        assert run.await_count == 2
+    
+    def test_declared_fields_drive_the_key(self):
+        """Changing a declared field should change the key"""
+        tool = LegalRiskScannerToolRunner(LegalRiskScannerToolRunner.default_config())
+        base = ToolInput(headline="Guaranteed results", body_text="Body", cta="Go", platform="facebook")
+        other = ToolInput(headline="Guaranteed results", body_text="Body", cta="Go", platform="google")
+        
+        assert tool.get_cache_key(base) != tool.get_cache_key(other)
+
+
+class TestBatchRunner:
+    """Test suite for bounded-concurrency batch execution"""
+    
+    @pytest.mark.asyncio
+    async def test_results_keep_input_order_and_isolate_failures(self):
+        """Outcomes should be in input order with failures and timeouts per item"""
+        runner = BatchRunner(concurrency=3, item_timeout=0.5)
+        
+        async def worker(index, delay):
+            await asyncio.sleep(delay)
+            if index == 2:
+                raise ValueError("bad ad")
+            return index
+        
+        results = await runner.run([0.1, 0.05, 0.01, 2.0, 0.0], worker)
+        
+        assert [r.index for r in results] == [0, 1, 2, 3, 4]
+        assert [r.success for r in results] == [True, True, False, False, True]
+        assert results[2].error == "bad ad"
+        assert results[3].timed_out is True
+        assert runner.get_stats()['timed_out'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """No more than `concurrency` items should run at once"""
+        runner = BatchRunner(concurrency=2, item_timeout=None)
+        in_flight = []
+        peak = []
+        
+        async def worker(index, item):
+            in_flight.append(index)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(index)
+            return item
+        
+        ordered = [r.result async for r in runner.iter_ordered(list(range(6)), worker)]
+        
+        assert ordered == list(range(6))
+        assert max(peak) == 2
+    
+    @pytest.mark.asyncio
+    async def test_items_start_only_as_slots_free_up(self):
+        """Stopping early should leave the rest of a large batch unstarted"""
+        runner = BatchRunner(concurrency=3, item_timeout=None)
+        started = []
+        
+        async def worker(index, item):
+            started.append(index)
+            await asyncio.sleep(0.001 * (index % 3))
+            return item
+        
+        stream = runner.iter_completed(list(range(10000)), worker)
+        first = [await stream.__anext__() for _ in range(5)]
+        await stream.aclose()
+        
+        assert len(first) == 5
+        assert len(started) <= 5 + runner.concurrency
+    
+    @pytest.mark.asyncio
+    async def test_ordered_stream_holds_back_at_most_concurrency_results(self):
+        """A slow first item should stop new items starting once the window is full"""
+        runner = BatchRunner(concurrency=2, item_timeout=None)
+        started = []
+        
+        async def worker(index, item):
+            started.append(index)
+            await asyncio.sleep(0.05 if index == 0 else 0)
+            return item
+        
+        ordered = runner.iter_ordered(list(range(20)), worker)
+        first = await ordered.__anext__()
+        
+        assert first.index == 0
+        # Item 0 plus the results that could be held back while it ran
+        assert len(started) <= 1 + 2 * runner.concurrency
+        assert [r.index async for r in ordered] == list(range(1, 20))
 
 
 class TestUnifiedToolsService:
@@ -348,6 +833,49 @@ class TestUnifiedToolsService:
             assert result.success is True
             assert result.overall_score > 0
     
+    @pytest.mark.asyncio
+    async def test_batch_analysis_stream(self):
+        """Streamed batch analysis should yield one result per request index"""
+        service = UnifiedToolsService()
+        
+        requests = [
+            AnalysisRequest(
+                headline=f"Streamed headline {i}",
+                body_text=f"Streamed body text {i}",
+                cta="Learn More",
+                analysis_type="quick"
+            )
+            for i in range(5)
+        ]
+        
+        streamed = [(index, result) async for index, result in
+                    service.analyze_copy_batch_stream(requests, max_parallel=2)]
+        
+        assert sorted(index for index, _ in streamed) == list(range(5))
+        assert all(result.success for _, result in streamed)
+    
+    @pytest.mark.asyncio
+    async def test_cached_response_is_a_copy_with_new_request_id(self):
+        """Cache hits should not share mutable state or request_id with earlier callers"""
+        service = UnifiedToolsService()
+        request = AnalysisRequest(
+            headline="Cached headline",
+            body_text="Cached body text for analysis",
+            cta="Learn More",
+            analysis_type="quick"
+        )
+        
+        first = await service.analyze_copy(request)
+        first.strengths.append("mutated by caller")
+        second = await service.analyze_copy(request)
+        third = await service.analyze_copy(request)
+        
+        assert first.success and second.success
+        assert "mutated by caller" not in second.strengths
+        assert second is not third
+        assert len({first.request_id, second.request_id, third.request_id}) == 3
+        assert second.overall_score == first.overall_score
+    
     @pytest.mark.asyncio
     async def test_analysis_types(self):
         """Test different analysis types"""
@@ -686,6 +1214,14 @@ __all__ = [
     "TestBrandVoiceEngineTool",
     "TestLegalRiskScannerTool",
     "TestToolsFlowOrchestrator",
+    "TestToolInstancePool",
+    "TestBatchedInferenceService",
+    "TestLexiconMatcher",
+    "TestRegexBank",
+    "TestAnalyzedText",
+    "TestResultCache",
+    "TestToolMemoization",
+    "TestBatchRunner",
     "TestUnifiedToolsService",
     "TestAPIContracts",
     "TestObservability",
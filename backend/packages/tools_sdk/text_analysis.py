@@ -0,0 +1,171 @@
+"""
+Shared text preprocessing artifact for tool runs
+
+Every tool used to rebuild the same derived data from the ad copy: the
+combined text, its lowercase form, word and sentence splits, syllable counts
+and readability scores. AnalyzedText computes each of these lazily, at most
+once, and is attached to ToolInput so every tool working on the same input
+(e.g. all tools in one ToolOrchestrator.run_tools call) reuses it.
+"""
+
+import re
+from functools import cached_property
+from typing import Dict, Any, List, Tuple
+
+# Optional imports with fallbacks
+try:
+    import textstat
+    TEXTSTAT_AVAILABLE = True
+except ImportError:
+    TEXTSTAT_AVAILABLE = False
+
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'[.!?]+')
+_VOWELS = set('aeiouy')
+
+
+def count_syllables(word: str) -> int:
+    """
+    Count syllables in a single word using heuristic rules
+
+    Vowel groups minus a silent trailing "e", plus one for a consonant + "le"
+    ending; every word has at least one syllable.
+    """
+    word = word.lower()
+    if not word:
+        return 1
+
+    vowel_groups = 0
+    prev_was_vowel = False
+    for char in word:
+        is_vowel = char in _VOWELS
+        if is_vowel and not prev_was_vowel:
+            vowel_groups += 1
+        prev_was_vowel = is_vowel
+
+    if word.endswith('e'):
+        vowel_groups -= 1
+
+    if word.endswith('le') and len(word) > 2 and word[-3] not in _VOWELS:
+        vowel_groups += 1
+
+    return max(1, vowel_groups)
+
+
+class AnalyzedText:
+    """
+    Lazily computed text features of one ad copy
+
+    Each property is computed on first access and cached on the instance.
+    """
+
+    def __init__(self, headline: str = "", body_text: str = "", cta: str = ""):
+        self.headline = headline or ""
+        self.body_text = body_text or ""
+        self.cta = cta or ""
+        self._ngrams: Dict[int, List[Tuple[str, ...]]] = {}
+
+    @classmethod
+    def from_tool_input(cls, input_data) -> 'AnalyzedText':
+        """Build the artifact for a ToolInput"""
+        return cls(input_data.headline, input_data.body_text, input_data.cta)
+
+    @property
+    def source(self) -> Tuple[str, str, str]:
+        """The copy sections this artifact was computed from"""
+        return (self.headline, self.body_text, self.cta)
+
+    @cached_property
+    def full_text(self) -> str:
+        """Headline, body and CTA joined with spaces"""
+        return f"{self.headline} {self.body_text} {self.cta}".strip()
+
+    @cached_property
+    def lower(self) -> str:
+        return self.full_text.lower()
+
+    @cached_property
+    def words(self) -> List[str]:
+        """Whitespace-separated words of the full text"""
+        return self.full_text.split()
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Lowercase word tokens without punctuation"""
+        return WORD_PATTERN.findall(self.lower)
+
+    @cached_property
+    def sentence_spans(self) -> List[Tuple[int, int]]:
+        """(start, end) offsets of each non-empty sentence in the full text"""
+        spans = []
+        start = 0
+        for boundary in SENTENCE_BOUNDARY_PATTERN.finditer(self.full_text):
+            if self.full_text[start:boundary.start()].strip():
+                spans.append((start, boundary.end()))
+            start = boundary.end()
+        if self.full_text[start:].strip():
+            spans.append((start, len(self.full_text)))
+        return spans
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        return [self.full_text[start:end].strip() for start, end in self.sentence_spans]
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentences)
+
+    @cached_property
+    def syllable_counts(self) -> List[int]:
+        """Syllable count of each token"""
+        return [count_syllables(token) for token in self.tokens]
+
+    @property
+    def syllable_count(self) -> int:
+        return sum(self.syllable_counts)
+
+    def ngrams(self, n: int) -> List[Tuple[str, ...]]:
+        """Token n-grams of the full text"""
+        if n not in self._ngrams:
+            tokens = self.tokens
+            self._ngrams[n] = [tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1)]
+        return self._ngrams[n]
+
+    @cached_property
+    def readability(self) -> Dict[str, Any]:
+        """
+        Readability metrics of the full text
+
+        Uses textstat when available, otherwise the Flesch formulas over the
+        heuristic syllable counts.
+        """
+        word_count = self.word_count
+        sentence_count = self.sentence_count
+        avg_words_per_sentence = word_count / max(sentence_count, 1)
+
+        if TEXTSTAT_AVAILABLE and self.full_text:
+            flesch_reading_ease = textstat.flesch_reading_ease(self.full_text)
+            flesch_kincaid_grade = textstat.flesch_kincaid_grade(self.full_text)
+        elif self.tokens:
+            asl = len(self.tokens) / max(sentence_count, 1)
+            asw = self.syllable_count / len(self.tokens)
+            flesch_reading_ease = 206.835 - 1.015 * asl - 84.6 * asw
+            flesch_kincaid_grade = 0.39 * asl + 11.8 * asw - 15.59
+        else:
+            flesch_reading_ease = None
+            flesch_kincaid_grade = None
+
+        return {
+            'flesch_reading_ease': flesch_reading_ease,
+            'flesch_kincaid_grade': flesch_kincaid_grade,
+            'word_count': word_count,
+            'sentence_count': sentence_count,
+            'avg_words_per_sentence': avg_words_per_sentence,
+            'avg_syllables_per_word': self.syllable_count / len(self.tokens) if self.tokens else 0.0,
+            'textstat_used': TEXTSTAT_AVAILABLE
+        }
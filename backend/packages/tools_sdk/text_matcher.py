@@ -0,0 +1,304 @@
+"""
+Compiled multi-pattern keyword matcher shared by the keyword-scanning tools
+
+Every tool used to test each of its trigger/cliché/banned words against the
+ad text with ``word in text_lower``, so a comprehensive analysis ran dozens
+of independent substring scans over the same text. The LexiconMatcher
+compiles every registered lexicon into one Aho-Corasick automaton and scans
+a text once, returning hits grouped by lexicon. Scan results are cached per
+text, so all tools analysing the same ad share a single pass.
+"""
+
+import threading
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from typing import Dict, Any, List, Iterable, Tuple
+
+# Optional C implementation of Aho-Corasick
+try:
+    import ahocorasick
+    PYAHOCORASICK_AVAILABLE = True
+except ImportError:
+    PYAHOCORASICK_AVAILABLE = False
+
+
+# Boundary modes for a lexicon
+BOUNDARY_NONE = "none"    # Raw substring match (legacy ``term in text`` behaviour)
+BOUNDARY_START = "start"  # Term must start at a word boundary ("cure" matches "cured", not "secure")
+BOUNDARY_WORD = "word"    # Term must be a whole word or phrase
+
+_VALID_BOUNDARIES = {BOUNDARY_NONE, BOUNDARY_START, BOUNDARY_WORD}
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def fold_case(text: str) -> str:
+    """
+    Lowercase text one character for one character
+
+    ``str.lower`` expands a few characters (``'İ'`` becomes ``'i̇'``), which
+    would shift every match offset after them; those characters keep only the
+    first character of their lowercase form so offsets index the original text.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(char.lower()[0] for char in text)
+
+
+class _PurePythonAutomaton:
+    """Minimal Aho-Corasick automaton used when pyahocorasick is not installed"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Any]] = [[]]
+
+    def add_word(self, word: str, value: Any):
+        node = 0
+        for char in word:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(value)
+
+    def make_automaton(self):
+        queue = deque()
+        for node in self._goto[0].values():
+            self._fail[node] = 0
+            queue.append(node)
+
+        while queue:
+            current = queue.popleft()
+            for char, child in self._goto[current].items():
+                queue.append(child)
+                fallback = self._fail[current]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def iter(self, text: str):
+        node = 0
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for value in output[node]:
+                yield index, value
+
+
+class LexiconHits:
+    """Result of scanning one text: hit positions grouped by lexicon and term"""
+
+    def __init__(self, hits: Dict[str, Dict[str, List[int]]], term_order: Dict[str, List[str]]):
+        self._hits = hits
+        self._term_order = term_order
+
+    def found(self, lexicon: str) -> List[str]:
+        """Distinct terms of a lexicon present in the text, in lexicon order"""
+        lexicon_hits = self._hits.get(lexicon)
+        if not lexicon_hits:
+            return []
+        return [term for term in self._term_order.get(lexicon, []) if term in lexicon_hits]
+
+    def contains(self, lexicon: str, term: str) -> bool:
+        """Whether a specific term of a lexicon is present"""
+        return fold_case(term) in self._hits.get(lexicon, {})
+
+    def any(self, lexicon: str) -> bool:
+        """Whether any term of a lexicon is present"""
+        return bool(self._hits.get(lexicon))
+
+    def positions(self, lexicon: str, term: str) -> List[int]:
+        """Start offsets of every occurrence of a term (overlaps included)"""
+        return list(self._hits.get(lexicon, {}).get(fold_case(term), []))
+
+    def first_position(self, lexicon: str, term: str) -> int:
+        """Start offset of the first occurrence, or -1 when absent"""
+        positions = self._hits.get(lexicon, {}).get(fold_case(term))
+        return positions[0] if positions else -1
+
+    def by_lexicon(self) -> Dict[str, Dict[str, List[int]]]:
+        """All hits as {lexicon: {term: [positions]}}"""
+        return {lexicon: {term: list(pos) for term, pos in terms.items()}
+                for lexicon, terms in self._hits.items()}
+
+
+class LexiconMatcher:
+    """
+    Registry of named keyword lexicons compiled into one automaton
+
+    Tools register their lexicons once at construction. The automaton is
+    rebuilt lazily on the first scan after a lexicon changes.
+    """
+
+    def __init__(self, scan_cache_size: int = 512):
+        self._lexicons: Dict[str, Tuple[List[str], str]] = {}
+        self._automaton = None
+        self._version = 0
+        self._built_version = -1
+        self._lock = threading.RLock()
+
+        self._scan_cache: "OrderedDict[Tuple[int, str], LexiconHits]" = OrderedDict()
+        self._scan_cache_size = scan_cache_size
+        self._scans = 0
+        self._cache_hits = 0
+
+    def register(self, lexicon: str, terms: Iterable[str], boundary: str = BOUNDARY_START):
+        """
+        Register (or replace) a named lexicon
+
+        Args:
+            lexicon: Unique lexicon name, e.g. "psychology.triggers.scarcity"
+            terms: Words or phrases to match (matched case-insensitively)
+            boundary: One of BOUNDARY_NONE, BOUNDARY_START, BOUNDARY_WORD
+        """
+        if boundary not in _VALID_BOUNDARIES:
+            raise ValueError(f"Unknown boundary mode: {boundary}")
+
+        normalized = []
+        for term in terms:
+            term = fold_case(term)
+            if term and term not in normalized:
+                normalized.append(term)
+
+        with self._lock:
+            if self._lexicons.get(lexicon) == (normalized, boundary):
+                return
+            self._lexicons[lexicon] = (normalized, boundary)
+            self._version += 1
+
+    def register_many(self, prefix: str, lexicons: Dict[str, Iterable[str]], boundary: str = BOUNDARY_START):
+        """Register a family of lexicons as "<prefix>.<key>" """
+        for key, terms in lexicons.items():
+            self.register(f"{prefix}.{key}", terms, boundary)
+
+    def has_lexicon(self, lexicon: str) -> bool:
+        return lexicon in self._lexicons
+
+    def scan(self, text: str) -> LexiconHits:
+        """Scan text once against every registered lexicon"""
+        with self._lock:
+            if self._built_version != self._version:
+                self._build()
+            cache_key = (self._version, text)
+            cached = self._scan_cache.get(cache_key)
+            if cached is not None:
+                self._scan_cache.move_to_end(cache_key)
+                self._cache_hits += 1
+                return cached
+            automaton = self._automaton
+            term_order = {name: terms for name, (terms, _) in self._lexicons.items()}
+
+        # Positions index the original text, so lowercase without changing its length
+        hits = self._scan_uncached(automaton, fold_case(text))
+        result = LexiconHits(hits, term_order)
+
+        with self._lock:
+            self._scans += 1
+            self._scan_cache[cache_key] = result
+            if len(self._scan_cache) > self._scan_cache_size:
+                self._scan_cache.popitem(last=False)
+
+        return result
+
+    def scan_many(self, texts: List[str], separator: str = "\n") -> List[LexiconHits]:
+        """
+        Scan several texts in one pass
+
+        The texts are joined with a non-word separator and scanned once; hits
+        are split back per text with positions relative to that text. Repeated
+        calls with the same texts share the cached combined scan.
+        """
+        if not texts:
+            return []
+
+        bounds = []
+        offset = 0
+        for text in texts:
+            bounds.append((offset, offset + len(text)))
+            offset += len(text) + len(separator)
+
+        combined = self.scan(separator.join(texts))
+
+        starts = [start for start, _ in bounds]
+        per_text: List[Dict[str, Dict[str, List[int]]]] = [{} for _ in texts]
+        for lexicon, terms in combined.by_lexicon().items():
+            for term, positions in terms.items():
+                for position in positions:
+                    index = bisect_right(starts, position) - 1
+                    start, end = bounds[index]
+                    # Drop matches that run into the separator or the next text
+                    if position + len(term) > end:
+                        continue
+                    per_text[index].setdefault(lexicon, {}).setdefault(term, []).append(position - start)
+
+        return [LexiconHits(hits, combined._term_order) for hits in per_text]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get matcher statistics"""
+        return {
+            'backend': 'pyahocorasick' if PYAHOCORASICK_AVAILABLE else 'python',
+            'lexicons': len(self._lexicons),
+            'terms': sum(len(terms) for terms, _ in self._lexicons.values()),
+            'scans': self._scans,
+            'scan_cache_hits': self._cache_hits,
+            'scan_cache_size': len(self._scan_cache)
+        }
+
+    def _build(self):
+        # Group entries by term so each pattern is inserted once
+        entries: Dict[str, List[Tuple[str, str]]] = {}
+        for lexicon, (terms, boundary) in self._lexicons.items():
+            for term in terms:
+                entries.setdefault(term, []).append((lexicon, boundary))
+
+        automaton = ahocorasick.Automaton() if PYAHOCORASICK_AVAILABLE else _PurePythonAutomaton()
+        for term, owners in entries.items():
+            automaton.add_word(term, (term, tuple(owners)))
+        if entries:
+            automaton.make_automaton()
+
+        self._automaton = automaton if entries else None
+        self._built_version = self._version
+        self._scan_cache.clear()
+
+    @staticmethod
+    def _scan_uncached(automaton, text: str) -> Dict[str, Dict[str, List[int]]]:
+        hits: Dict[str, Dict[str, List[int]]] = {}
+        if automaton is None or not text:
+            return hits
+
+        text_length = len(text)
+        for end_index, (term, owners) in automaton.iter(text):
+            start = end_index - len(term) + 1
+            starts_clean = start == 0 or not _is_word_char(text[start - 1]) or not _is_word_char(term[0])
+            ends_clean = (end_index + 1 == text_length or not _is_word_char(text[end_index + 1])
+                          or not _is_word_char(term[-1]))
+
+            for lexicon, boundary in owners:
+                if boundary == BOUNDARY_START and not starts_clean:
+                    continue
+                if boundary == BOUNDARY_WORD and not (starts_clean and ends_clean):
+                    continue
+                hits.setdefault(lexicon, {}).setdefault(term, []).append(start)
+
+        for lexicon_hits in hits.values():
+            for positions in lexicon_hits.values():
+                positions.sort()
+        return hits
+
+
+# Global matcher shared by all tools and services in the process
+default_matcher = LexiconMatcher()
@@ -233,7 +233,7 @@ class ToolOrchestrator:
             # Execute with timeout
             try:
                 output = await asyncio.wait_for(
-                    tool.run(input_data),
+                    tool.cached_run(input_data),
                     timeout=tool.config.timeout
                 )
                 return output
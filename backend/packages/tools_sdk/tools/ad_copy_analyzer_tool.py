@@ -4,17 +4,11 @@ Uses NLP and marketing frameworks to evaluate copy effectiveness
 """
 
 import time
-import re
 from typing import Dict, Any, List, Optional
 from ..core import ToolRunner, ToolInput, ToolOutput, ToolConfig, ToolType
 from ..exceptions import ToolValidationError, ToolDependencyError
-
-# Import analysis dependencies
-try:
-    import textstat
-    TEXTSTAT_AVAILABLE = True
-except ImportError:
-    TEXTSTAT_AVAILABLE = False
+from ..inference_service import get_inference_service
+from ..text_analysis import AnalyzedText, TEXTSTAT_AVAILABLE
 
 # Sentiment analysis fallback
 try:
@@ -24,6 +18,24 @@ except ImportError:
     TRANSFORMERS_AVAILABLE = False
 
 
+def _load_sentiment_pipeline():
+    """Load the sentiment pipeline, falling back to the default model"""
+    if not TRANSFORMERS_AVAILABLE:
+        return None
+    try:
+        return pipeline(
+            "sentiment-analysis",
+            model="cardiffnlp/twitter-roberta-base-sentiment-latest",
+            return_all_scores=True
+        )
+    except Exception:
+        # Fallback to simpler model
+        try:
+            return pipeline("sentiment-analysis")
+        except Exception:
+            return None
+
+
 class AdCopyAnalyzerToolRunner(ToolRunner):
     """
     Comprehensive Ad Copy Analyzer
@@ -40,21 +52,14 @@ class AdCopyAnalyzerToolRunner(ToolRunner):
     def __init__(self, config: ToolConfig):
         super().__init__(config)
         
-        # Initialize NLP components
-        self.sentiment_analyzer = None
-        if TRANSFORMERS_AVAILABLE:
-            try:
-                self.sentiment_analyzer = pipeline(
-                    "sentiment-analysis",
-                    model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-                    return_all_scores=True
-                )
-            except Exception:
-                # Fallback to simpler model
-                try:
-                    self.sentiment_analyzer = pipeline("sentiment-analysis")
-                except Exception:
-                    pass
+        # Initialize NLP components - the model is loaded once per process and
+        # inference runs batched on a worker thread, off the event loop
+        self.sentiment_service = get_inference_service(
+            "ad_copy_sentiment",
+            _load_sentiment_pipeline,
+            max_batch_size=config.get_parameter('sentiment_max_batch_size', 16),
+            max_wait_ms=config.get_parameter('sentiment_batch_wait_ms', 5.0)
+        )
         
         # Marketing frameworks and patterns
         self.emotional_triggers = {
@@ -124,11 +129,12 @@ class AdCopyAnalyzerToolRunner(ToolRunner):
         start_time = time.time()
         
         try:
-            # Combine all text for analysis
-            full_text = f"{input_data.headline} {input_data.body_text} {input_data.cta}".strip()
+            # Shared preprocessing (combined text, splits, readability)
+            analyzed = input_data.analyzed_text
+            full_text = analyzed.full_text
             
             # Core analysis components
-            readability_scores = self._analyze_readability(full_text)
+            readability_scores = self._analyze_readability(analyzed)
             sentiment_scores = await self._analyze_sentiment(full_text)
             hook_analysis = self._analyze_hook_strength(input_data.headline)
             cta_analysis = self._analyze_cta_effectiveness(input_data.cta)
@@ -176,8 +182,8 @@ class AdCopyAnalyzerToolRunner(ToolRunner):
                 'platform_optimization': platform_optimization,
                 'text_metrics': {
                     'total_length': len(full_text),
-                    'word_count': len(full_text.split()),
-                    'sentence_count': len(re.split(r'[.!?]+', full_text)),
+                    'word_count': analyzed.word_count,
+                    'sentence_count': analyzed.sentence_count,
                     'headline_words': len(input_data.headline.split()),
                     'body_words': len(input_data.body_text.split())
                 }
@@ -209,13 +215,15 @@ class AdCopyAnalyzerToolRunner(ToolRunner):
                 error_message=f"Ad copy analysis failed: {str(e)}"
             )
     
-    def _analyze_readability(self, text: str) -> Dict[str, Any]:
+    def _analyze_readability(self, analyzed: AnalyzedText) -> Dict[str, Any]:
         """Analyze text readability and clarity"""
+        readability = analyzed.readability
+        word_count = readability['word_count']
+        sentence_count = readability['sentence_count']
+        avg_words_per_sentence = readability['avg_words_per_sentence']
+        
         if not TEXTSTAT_AVAILABLE:
             # Basic fallback analysis
-            word_count = len(text.split())
-            sentence_count = len(re.split(r'[.!?]+', text))
-            avg_words_per_sentence = word_count / max(sentence_count, 1)
             
             # Simple clarity score based on word/sentence metrics
             clarity_score = max(0, min(100, 
@@ -232,11 +240,8 @@ class AdCopyAnalyzerToolRunner(ToolRunner):
             }
         
         # Full textstat analysis
-        flesch_score = textstat.flesch_reading_ease(text)
-        grade_level = textstat.flesch_kincaid_grade(text)
-        word_count = len(text.split())
-        sentence_count = len(re.split(r'[.!?]+', text))
-        avg_words_per_sentence = word_count / max(sentence_count, 1)
+        flesch_score = readability['flesch_reading_ease']
+        grade_level = readability['flesch_kincaid_grade']
         
         # Calculate clarity score with marketing optimization
         base_score = min(flesch_score, 100)
@@ -262,16 +267,15 @@ class AdCopyAnalyzerToolRunner(ToolRunner):
     
     async def _analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """Analyze sentiment and emotional tone"""
-        if self.sentiment_analyzer:
+        if self.sentiment_service:
             try:
-                results = self.sentiment_analyzer(text)
-                if isinstance(results[0], list):
+                result = await self.sentiment_service.infer(text)
+                if isinstance(result, list):
                     # Multiple scores returned
-                    sentiment_data = results[0]
-                    sentiment_scores = {item['label'].lower(): item['score'] for item in sentiment_data}
+                    sentiment_scores = {item['label'].lower(): item['score'] for item in result}
                 else:
                     # Single score returned
-                    sentiment_scores = {results[0]['label'].lower(): results[0]['score']}
+                    sentiment_scores = {result['label'].lower(): result['score']}
                 
                 # Calculate overall sentiment score (positive bias for ads)
                 positive_score = sentiment_scores.get('positive', 0)
@@ -760,6 +764,8 @@ class AdCopyAnalyzerToolRunner(ToolRunner):
             parameters={
                 'min_text_length': 10,
                 'max_recommendations': 8,
-                'sentiment_threshold': 0.7
+                'sentiment_threshold': 0.7,
+                'sentiment_max_batch_size': 16,
+                'sentiment_batch_wait_ms': 5.0
             }
         )
\ No newline at end of file
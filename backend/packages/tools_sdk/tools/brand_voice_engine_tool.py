@@ -8,6 +8,7 @@ import re
 from typing import Dict, Any, List, Optional, Tuple
 from ..core import ToolRunner, ToolInput, ToolOutput, ToolConfig, ToolType
 from ..exceptions import ToolValidationError
+from ..text_analysis import AnalyzedText
 
 
 class BrandVoiceEngineToolRunner(ToolRunner):
@@ -167,11 +168,12 @@ class BrandVoiceEngineToolRunner(ToolRunner):
             brand_lexicon = self._extract_brand_lexicon(input_data, brand_voice_profile)
             
             # Analyze current copy against brand voice
-            tone_analysis = self._analyze_tone_consistency(copy_data, brand_voice_profile, brand_samples)
-            vocabulary_analysis = self._analyze_vocabulary_alignment(copy_data, brand_lexicon)
-            personality_analysis = self._analyze_personality_consistency(copy_data, brand_voice_profile)
+            analyzed = input_data.analyzed_text
+            tone_analysis = self._analyze_tone_consistency(copy_data, analyzed, brand_voice_profile, brand_samples)
+            vocabulary_analysis = self._analyze_vocabulary_alignment(analyzed, brand_lexicon)
+            personality_analysis = self._analyze_personality_consistency(analyzed, brand_voice_profile)
             hierarchy_analysis = self._analyze_messaging_hierarchy(copy_data, brand_voice_profile)
-            phrase_analysis = self._analyze_brand_phrases(copy_data, brand_voice_profile)
+            phrase_analysis = self._analyze_brand_phrases(analyzed, brand_voice_profile)
             
             # Generate brand-aligned variations
             aligned_variations = self._generate_brand_aligned_variations(
@@ -475,10 +477,10 @@ class BrandVoiceEngineToolRunner(ToolRunner):
             'platform': platform
         }
     
-    def _analyze_tone_consistency(self, copy_data: Dict[str, str], brand_profile: Dict, 
+    def _analyze_tone_consistency(self, copy_data: Dict[str, str], analyzed: AnalyzedText, brand_profile: Dict, 
                                  brand_samples: List[str]) -> Dict[str, Any]:
         """Analyze tone consistency against brand profile"""
-        full_text = f"{copy_data['headline']} {copy_data['body_text']} {copy_data['cta']}".lower()
+        full_text = analyzed.lower
         primary_tone = brand_profile['primary_tone']
         tone_config = self.voice_dimensions['tone'].get(primary_tone, {})
         
@@ -510,9 +512,9 @@ class BrandVoiceEngineToolRunner(ToolRunner):
             'deviation_score': max(section_scores.values()) - min(section_scores.values()) if section_scores else 0
         }
     
-    def _analyze_vocabulary_alignment(self, copy_data: Dict[str, str], brand_lexicon: Dict) -> Dict[str, Any]:
+    def _analyze_vocabulary_alignment(self, analyzed: AnalyzedText, brand_lexicon: Dict) -> Dict[str, Any]:
         """Analyze vocabulary alignment with brand lexicon"""
-        full_text = f"{copy_data['headline']} {copy_data['body_text']} {copy_data['cta']}".lower()
+        full_text = analyzed.lower
         
         # Check preferred words usage
         preferred_words = brand_lexicon.get('preferred_words', [])
@@ -545,9 +547,9 @@ class BrandVoiceEngineToolRunner(ToolRunner):
             'suggestions': self._suggest_vocabulary_improvements(full_text, brand_lexicon)
         }
     
-    def _analyze_personality_consistency(self, copy_data: Dict[str, str], brand_profile: Dict) -> Dict[str, Any]:
+    def _analyze_personality_consistency(self, analyzed: AnalyzedText, brand_profile: Dict) -> Dict[str, Any]:
         """Analyze personality trait consistency"""
-        full_text = f"{copy_data['headline']} {copy_data['body_text']} {copy_data['cta']}".lower()
+        full_text = analyzed.lower
         personality_traits = brand_profile.get('personality_traits', [])
         
         traits_analysis = {}
@@ -632,21 +634,21 @@ class BrandVoiceEngineToolRunner(ToolRunner):
             'alignment_quality': 'excellent' if overall_hierarchy_score >= 80 else 'good' if overall_hierarchy_score >= 60 else 'needs_improvement'
         }
     
-    def _analyze_brand_phrases(self, copy_data: Dict[str, str], brand_profile: Dict) -> Dict[str, Any]:
+    def _analyze_brand_phrases(self, analyzed: AnalyzedText, brand_profile: Dict) -> Dict[str, Any]:
         """Analyze usage of brand-specific phrases"""
-        full_text = f"{copy_data['headline']} {copy_data['body_text']} {copy_data['cta']}"
+        full_text = analyzed.lower
         
         # Look for signature phrase patterns
         signature_matches = []
         for pattern in self.brand_phrase_patterns['signature_phrases']:
             # Simple pattern matching (in practice, would use more sophisticated NLP)
             base_pattern = pattern.split('{')[0].strip()
-            if base_pattern and base_pattern in full_text.lower():
+            if base_pattern and base_pattern in full_text:
                 signature_matches.append(pattern)
         
         # Count brand-specific terminology
         brand_terms = brand_profile.get('brand_specific_terms', [])
-        brand_term_usage = sum(1 for term in brand_terms if term.lower() in full_text.lower())
+        brand_term_usage = sum(1 for term in brand_terms if term.lower() in full_text)
         
         return {
             'usage_count': len(signature_matches) + brand_term_usage,
@@ -8,6 +8,7 @@ import re
 from typing import Dict, Any, List, Optional, Tuple, Set
 from ..core import ToolRunner, ToolInput, ToolOutput, ToolConfig, ToolType
 from ..exceptions import ToolValidationError
+from ..text_matcher import default_matcher
 
 
 class ComplianceCheckerToolRunner(ToolRunner):
@@ -22,6 +23,9 @@ class ComplianceCheckerToolRunner(ToolRunner):
     - Provides compliant alternatives and risk assessment
     """
     
+    # Output depends only on these input fields, so runs are memoized
+    cache_fields = ('headline', 'body_text', 'cta', 'platform', 'industry')
+    
     def __init__(self, config: ToolConfig):
         super().__init__(config)
         
@@ -205,6 +209,16 @@ class ComplianceCheckerToolRunner(ToolRunner):
             'click here': ['learn more', 'discover', 'explore'],
             'guaranteed results': ['potential results', 'designed to help']
         }
+        
+        # Compile banned/flagged term lists into the shared single-pass matcher
+        self.matcher = default_matcher
+        self.matcher.register_many('compliance.prohibited', {
+            platform: policy['prohibited_words'] for platform, policy in self.platform_policies.items()
+        })
+        self.matcher.register_many('compliance.industry_claims', {
+            industry: regulation['prohibited_claims'] for industry, regulation in self.industry_regulations.items()
+        })
+        self.matcher.register_many('compliance.flagged', self.flagged_words)
     
     async def run(self, input_data: ToolInput) -> ToolOutput:
         """Execute comprehensive compliance check"""
@@ -212,7 +226,7 @@ class ComplianceCheckerToolRunner(ToolRunner):
         
         try:
             # Combine all text for analysis
-            full_text = f"{input_data.headline} {input_data.body_text} {input_data.cta}".strip()
+            full_text = input_data.analyzed_text.full_text
             platform = input_data.platform.lower()
             industry = input_data.industry.lower() if input_data.industry else 'general'
             
@@ -304,23 +318,25 @@ class ComplianceCheckerToolRunner(ToolRunner):
     
     def _check_platform_compliance(self, text: str, platform: str) -> Dict[str, Any]:
         """Check compliance with platform-specific policies"""
-        policy = self.platform_policies.get(platform, self.platform_policies['facebook'])
+        policy_platform = platform if platform in self.platform_policies else 'facebook'
+        policy = self.platform_policies[policy_platform]
         text_lower = text.lower()
+        hits = self.matcher.scan(text)
         
         violations = []
         risk_score = 0
         
         # Check prohibited words
-        for word in policy['prohibited_words']:
-            if word in text_lower:
-                violations.append({
-                    'type': 'prohibited_word',
-                    'content': word,
-                    'severity': 'high',
-                    'message': f'"{word}" is prohibited on {platform}',
-                    'position': text_lower.find(word)
-                })
-                risk_score += 25
+        lexicon = f'compliance.prohibited.{policy_platform}'
+        for word in hits.found(lexicon):
+            violations.append({
+                'type': 'prohibited_word',
+                'content': word,
+                'severity': 'high',
+                'message': f'"{word}" is prohibited on {platform}',
+                'position': hits.first_position(lexicon, word)
+            })
+            risk_score += 25
         
         # Check restricted claims
         for claim in policy['restricted_claims']:
@@ -397,16 +413,15 @@ class ComplianceCheckerToolRunner(ToolRunner):
         risk_score = 0
         
         # Check for prohibited claims
-        for claim in regulation['prohibited_claims']:
-            if claim in text_lower:
-                violations.append({
-                    'type': 'prohibited_claim',
-                    'content': claim,
-                    'severity': 'high',
-                    'message': f'"{claim}" is prohibited in {industry} industry',
-                    'industry_requirement': True
-                })
-                risk_score += 35
+        for claim in self.matcher.scan(text).found(f'compliance.industry_claims.{industry}'):
+            violations.append({
+                'type': 'prohibited_claim',
+                'content': claim,
+                'severity': 'high',
+                'message': f'"{claim}" is prohibited in {industry} industry',
+                'industry_requirement': True
+            })
+            risk_score += 35
         
         # Check for missing required disclaimers
         missing_disclaimers = []
@@ -432,28 +447,28 @@ class ComplianceCheckerToolRunner(ToolRunner):
     
     def _check_flagged_words(self, text: str) -> Dict[str, Any]:
         """Check for commonly flagged words and phrases"""
-        text_lower = text.lower()
+        hits = self.matcher.scan(text)
         flagged_phrases = []
         risk_score = 0
         
-        for category, words in self.flagged_words.items():
+        for category in self.flagged_words:
             found_words = []
-            for word in words:
-                if word in text_lower:
-                    found_words.append({
-                        'word': word,
-                        'category': category,
-                        'position': text_lower.find(word),
-                        'severity': self._get_flag_severity(category)
-                    })
-                    
-                    # Add risk based on category
-                    if category == 'financial_red_flags':
-                        risk_score += 20
-                    elif category in ['spam_indicators', 'exaggerated_claims']:
-                        risk_score += 10
-                    else:
-                        risk_score += 5
+            lexicon = f'compliance.flagged.{category}'
+            for word in hits.found(lexicon):
+                found_words.append({
+                    'word': word,
+                    'category': category,
+                    'position': hits.first_position(lexicon, word),
+                    'severity': self._get_flag_severity(category)
+                })
+                
+                # Add risk based on category
+                if category == 'financial_red_flags':
+                    risk_score += 20
+                elif category in ['spam_indicators', 'exaggerated_claims']:
+                    risk_score += 10
+                else:
+                    risk_score += 5
             
             if found_words:
                 flagged_phrases.extend(found_words)
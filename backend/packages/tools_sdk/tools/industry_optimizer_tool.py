@@ -7,6 +7,7 @@ import time
 from typing import Dict, Any, List, Optional, Tuple
 from ..core import ToolRunner, ToolInput, ToolOutput, ToolConfig, ToolType
 from ..exceptions import ToolValidationError
+from ..text_analysis import AnalyzedText
 
 
 class IndustryOptimizerToolRunner(ToolRunner):
@@ -22,6 +23,9 @@ class IndustryOptimizerToolRunner(ToolRunner):
     - Adapts messaging to audience role/seniority
     """
     
+    # Output depends only on these input fields, so runs are memoized
+    cache_fields = ('headline', 'body_text', 'cta', 'industry')
+    
     def __init__(self, config: ToolConfig):
         super().__init__(config)
         
@@ -268,7 +272,7 @@ class IndustryOptimizerToolRunner(ToolRunner):
             
             industry = input_data.industry.lower() if input_data.industry else 'technology'
             target_role = self._extract_target_role(input_data)
-            market_type = self._determine_market_type(base_copy, industry)
+            market_type = self._determine_market_type(input_data.analyzed_text, industry)
             
             # Get industry-specific configuration
             industry_config = self.industry_vocabularies.get(industry, self.industry_vocabularies['technology'])
@@ -281,11 +285,12 @@ class IndustryOptimizerToolRunner(ToolRunner):
             # Generate variations with different industry approaches
             variations = self._generate_industry_variations(base_copy, industry_config, role_config, framework_config)
             
-            # Calculate optimization scores
-            industry_alignment = self._calculate_industry_alignment(optimized_copy, industry_config)
-            role_targeting = self._calculate_role_targeting(optimized_copy, role_config)
-            jargon_integration = self._calculate_jargon_integration(optimized_copy, industry_config)
-            framework_utilization = self._calculate_framework_utilization(optimized_copy, framework_config)
+            # Calculate optimization scores, sharing one text artifact for the optimized copy
+            optimized_text = AnalyzedText(optimized_copy['headline'], optimized_copy['body_text'], optimized_copy['cta'])
+            industry_alignment = self._calculate_industry_alignment(optimized_text, industry_config)
+            role_targeting = self._calculate_role_targeting(optimized_text, role_config)
+            jargon_integration = self._calculate_jargon_integration(optimized_text, industry_config)
+            framework_utilization = self._calculate_framework_utilization(optimized_text, framework_config)
             
             # Prepare scores
             scores = {
@@ -298,7 +303,7 @@ class IndustryOptimizerToolRunner(ToolRunner):
             
             # Generate recommendations
             recommendations = self._generate_optimization_recommendations(
-                base_copy, optimized_copy, industry_config, role_config
+                base_copy, optimized_copy, optimized_text, industry_config, role_config
             )
             
             # Detailed insights
@@ -318,9 +323,9 @@ class IndustryOptimizerToolRunner(ToolRunner):
                 },
                 'optimization_summary': {
                     'generic_terms_replaced': len(industry_config['generic_terms']),
-                    'jargon_terms_added': self._count_jargon_usage(optimized_copy, industry_config),
-                    'pain_points_addressed': self._count_pain_points_addressed(optimized_copy, industry_config),
-                    'certifications_mentioned': self._count_certifications_mentioned(optimized_copy, industry_config)
+                    'jargon_terms_added': self._count_jargon_usage(optimized_text, industry_config),
+                    'pain_points_addressed': self._count_pain_points_addressed(optimized_text, industry_config),
+                    'certifications_mentioned': self._count_certifications_mentioned(optimized_text, industry_config)
                 },
                 'changes_made': self._analyze_changes_made(base_copy, optimized_copy),
                 'variation_count': len(variations)
@@ -358,7 +363,7 @@ class IndustryOptimizerToolRunner(ToolRunner):
         """Extract target role from input data or infer from content"""
         # In practice, this would parse from input_data.additional_data
         # For now, return default based on content analysis
-        content = f"{input_data.headline} {input_data.body_text}".lower()
+        content = input_data.analyzed_text.lower
         
         if any(word in content for word in ['ceo', 'executive', 'leadership', 'strategic']):
             return 'c_level'
@@ -369,9 +374,9 @@ class IndustryOptimizerToolRunner(ToolRunner):
         else:
             return 'individual_contributor'
     
-    def _determine_market_type(self, copy: Dict[str, str], industry: str) -> str:
+    def _determine_market_type(self, analyzed: AnalyzedText, industry: str) -> str:
         """Determine if B2B or B2C based on copy content and industry"""
-        full_text = f"{copy['headline']} {copy['body_text']} {copy['cta']}".lower()
+        full_text = analyzed.lower
         
         b2b_score = sum(1 for indicator in self.market_context['b2b_indicators'] if indicator in full_text)
         b2c_score = sum(1 for indicator in self.market_context['b2c_indicators'] if indicator in full_text)
@@ -612,11 +617,11 @@ class IndustryOptimizerToolRunner(ToolRunner):
             'cta': cta
         }
     
-    def _calculate_industry_alignment(self, copy: Dict[str, str], industry_config: Dict) -> float:
+    def _calculate_industry_alignment(self, analyzed: AnalyzedText, industry_config: Dict) -> float:
         """Calculate how well copy aligns with industry norms"""
         score = 60  # Base score
         
-        full_text = f"{copy['headline']} {copy['body_text']} {copy['cta']}".lower()
+        full_text = analyzed.lower
         
         # Check for industry term replacements
         industry_terms_used = sum(1 for term in industry_config['generic_terms'].values() if term.lower() in full_text)
@@ -633,11 +638,11 @@ class IndustryOptimizerToolRunner(ToolRunner):
         
         return min(100, score)
     
-    def _calculate_role_targeting(self, copy: Dict[str, str], role_config: Dict) -> float:
+    def _calculate_role_targeting(self, analyzed: AnalyzedText, role_config: Dict) -> float:
         """Calculate how well copy targets specific role"""
         score = 65  # Base score
         
-        full_text = f"{copy['headline']} {copy['body_text']} {copy['cta']}".lower()
+        full_text = analyzed.lower
         
         # Check for role-specific focus areas
         focus_matches = sum(1 for focus in role_config['focus'] if focus.lower() in full_text)
@@ -649,11 +654,11 @@ class IndustryOptimizerToolRunner(ToolRunner):
         
         return min(100, score)
     
-    def _calculate_jargon_integration(self, copy: Dict[str, str], industry_config: Dict) -> float:
+    def _calculate_jargon_integration(self, analyzed: AnalyzedText, industry_config: Dict) -> float:
         """Calculate quality of jargon integration"""
         score = 50  # Base score
         
-        full_text = f"{copy['headline']} {copy['body_text']} {copy['cta']}".lower()
+        full_text = analyzed.lower
         
         # Count jargon terms used
         jargon_count = sum(1 for jargon in industry_config['industry_jargon'] if jargon.lower() in full_text)
@@ -671,11 +676,11 @@ class IndustryOptimizerToolRunner(ToolRunner):
         
         return min(100, score)
     
-    def _calculate_framework_utilization(self, copy: Dict[str, str], framework_config: Dict) -> float:
+    def _calculate_framework_utilization(self, analyzed: AnalyzedText, framework_config: Dict) -> float:
         """Calculate how well industry frameworks are utilized"""
         score = 70  # Base score
         
-        full_text = f"{copy['headline']} {copy['body_text']} {copy['cta']}".lower()
+        full_text = analyzed.lower
         
         # Check for framework mention
         framework_name = framework_config['framework'].lower()
@@ -689,19 +694,19 @@ class IndustryOptimizerToolRunner(ToolRunner):
         
         return min(100, score)
     
-    def _count_jargon_usage(self, copy: Dict[str, str], industry_config: Dict) -> int:
+    def _count_jargon_usage(self, analyzed: AnalyzedText, industry_config: Dict) -> int:
         """Count industry jargon terms used in copy"""
-        full_text = f"{copy['headline']} {copy['body_text']} {copy['cta']}".lower()
+        full_text = analyzed.lower
         return sum(1 for jargon in industry_config['industry_jargon'] if jargon.lower() in full_text)
     
-    def _count_pain_points_addressed(self, copy: Dict[str, str], industry_config: Dict) -> int:
+    def _count_pain_points_addressed(self, analyzed: AnalyzedText, industry_config: Dict) -> int:
         """Count pain points addressed in copy"""
-        full_text = f"{copy['headline']} {copy['body_text']} {copy['cta']}".lower()
+        full_text = analyzed.lower
         return sum(1 for pain in industry_config['pain_points'] if pain.lower() in full_text)
     
-    def _count_certifications_mentioned(self, copy: Dict[str, str], industry_config: Dict) -> int:
+    def _count_certifications_mentioned(self, analyzed: AnalyzedText, industry_config: Dict) -> int:
         """Count certifications mentioned in copy"""
-        full_text = f"{copy['headline']} {copy['body_text']} {copy['cta']}".lower()
+        full_text = analyzed.lower
         return sum(1 for cert in industry_config['certifications'] if cert.lower() in full_text)
     
     def _analyze_changes_made(self, original: Dict[str, str], optimized: Dict[str, str]) -> List[str]:
@@ -723,24 +728,25 @@ class IndustryOptimizerToolRunner(ToolRunner):
         return changes
     
     def _generate_optimization_recommendations(self, base_copy: Dict[str, str], optimized_copy: Dict[str, str],
-                                             industry_config: Dict, role_config: Dict) -> List[str]:
+                                             optimized_text: AnalyzedText, industry_config: Dict,
+                                             role_config: Dict) -> List[str]:
         """Generate industry optimization recommendations"""
         recommendations = []
         
         # Jargon integration recommendations
-        jargon_count = self._count_jargon_usage(optimized_copy, industry_config)
+        jargon_count = self._count_jargon_usage(optimized_text, industry_config)
         if jargon_count < 2:
             recommendations.append(f"Consider adding more industry jargon from: {', '.join(industry_config['industry_jargon'][:3])}")
         elif jargon_count > 5:
             recommendations.append("Reduce jargon density to avoid alienating broader audience")
         
         # Pain point recommendations
-        pain_count = self._count_pain_points_addressed(optimized_copy, industry_config)
+        pain_count = self._count_pain_points_addressed(optimized_text, industry_config)
         if pain_count == 0:
             recommendations.append(f"Address key industry pain point: {industry_config['pain_points'][0]}")
         
         # Certification recommendations
-        cert_count = self._count_certifications_mentioned(optimized_copy, industry_config)
+        cert_count = self._count_certifications_mentioned(optimized_text, industry_config)
         if cert_count == 0:
             recommendations.append(f"Consider mentioning relevant certification: {industry_config['certifications'][0]}")
         
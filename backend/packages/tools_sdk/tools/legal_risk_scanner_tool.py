@@ -8,6 +8,7 @@ import re
 from typing import Dict, Any, List, Optional, Tuple
 from ..core import ToolRunner, ToolInput, ToolOutput, ToolConfig, ToolType
 from ..exceptions import ToolValidationError
+from ..regex_bank import RegexBank
 
 
 class LegalRiskScannerToolRunner(ToolRunner):
@@ -23,6 +24,9 @@ class LegalRiskScannerToolRunner(ToolRunner):
     - Provides risk assessment with color-coded flags and alternative copy
     """
     
+    # Output depends only on these input fields, so runs are memoized
+    cache_fields = ('headline', 'body_text', 'cta', 'platform', 'industry')
+    
     def __init__(self, config: ToolConfig):
         super().__init__(config)
         
@@ -179,6 +183,16 @@ class LegalRiskScannerToolRunner(ToolRunner):
                 'testimonial_requirements': True
             }
         }
+        
+        # Compile every risk pattern into one bank scanned once per text
+        self.risk_pattern_bank = RegexBank(
+            (
+                ((category, index), pattern)
+                for category, category_config in self.legal_risk_patterns.items()
+                for index, pattern in enumerate(category_config['patterns'])
+            ),
+            re.IGNORECASE
+        )
     
     async def run(self, input_data: ToolInput) -> ToolOutput:
         """Scan copy for legal risks and provide safer alternatives"""
@@ -186,7 +200,7 @@ class LegalRiskScannerToolRunner(ToolRunner):
         
         try:
             # Combine all text for analysis
-            full_text = f"{input_data.headline} {input_data.body_text} {input_data.cta}"
+            full_text = input_data.analyzed_text.full_text
             
             # Extract campaign context
             industry = input_data.industry.lower() if input_data.industry else 'general'
@@ -288,20 +302,21 @@ class LegalRiskScannerToolRunner(ToolRunner):
             'required_disclaimers': set()
         }
         
-        # Scan each risk category
+        # Scan every risk pattern in a single pass
+        bank_matches = self.risk_pattern_bank.scan(text)
+        
         for category, config in self.legal_risk_patterns.items():
             category_risks = []
             
-            for pattern in config['patterns']:
-                matches = list(re.finditer(pattern, text, re.IGNORECASE))
-                for match in matches:
+            for index in range(len(config['patterns'])):
+                for match in bank_matches.get((category, index), []):
                     risk_flag = {
                         'category': category,
-                        'matched_text': match.group(),
-                        'position': match.start(),
+                        'matched_text': match.text,
+                        'position': match.start,
                         'severity': config['severity'],
                         'legal_area': config['legal_area'],
-                        'message': f"Potential legal risk: {match.group()}"
+                        'message': f"Potential legal risk: {match.text}"
                     }
                     
                     category_risks.append(risk_flag)
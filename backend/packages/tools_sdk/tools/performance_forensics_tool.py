@@ -7,6 +7,8 @@ import time
 from typing import Dict, Any, List, Optional, Tuple
 from ..core import ToolRunner, ToolInput, ToolOutput, ToolConfig, ToolType
 from ..exceptions import ToolValidationError
+from ..text_matcher import default_matcher
+from ..text_analysis import AnalyzedText
 
 
 class PerformanceForensicsToolRunner(ToolRunner):
@@ -126,6 +128,26 @@ class PerformanceForensicsToolRunner(ToolRunner):
                 'bid_strategy': ['automated_bidding', 'dayparting', 'device_optimization']
             }
         }
+        
+        # Copy element and content type indicators
+        self.element_indicators = {
+            'social_proof': ['customers', 'testimonial', 'reviews', 'trusted', 'thousands'],
+            'risk_reversal': ['guarantee', 'money back', 'risk free', 'no risk'],
+            'clear_benefits': ['save', 'get', 'improve', 'increase', 'reduce'],
+            'urgency': ['now', 'today', 'limited', 'expires', 'deadline']
+        }
+        
+        self.content_indicators = {
+            'storytelling': ['story', 'once', 'journey', 'experience'],
+            'questions': ['?', 'what', 'how', 'why', 'when'],
+            'controversial': ['shocking', 'surprising', 'truth', 'myth'],
+            'educational': ['learn', 'discover', 'guide', 'tips']
+        }
+        
+        # Compile indicators into the shared single-pass matcher
+        self.matcher = default_matcher
+        self.matcher.register_many('forensics.elements', self.element_indicators)
+        self.matcher.register_many('forensics.content', self.content_indicators)
     
     async def run(self, input_data: ToolInput) -> ToolOutput:
         """Perform comprehensive performance forensics analysis"""
@@ -149,7 +171,8 @@ class PerformanceForensicsToolRunner(ToolRunner):
             
             # Perform forensics analysis
             benchmark_analysis = self._analyze_against_benchmarks(performance_metrics, benchmarks)
-            copy_element_analysis = self._analyze_copy_elements(copy_data, performance_metrics)
+            analyzed = input_data.analyzed_text
+            copy_element_analysis = self._analyze_copy_elements(copy_data, analyzed, performance_metrics)
             funnel_analysis = self._analyze_conversion_funnel(performance_metrics, campaign_details)
             failure_point_analysis = self._identify_failure_points(performance_metrics, benchmarks, copy_data)
             
@@ -159,7 +182,7 @@ class PerformanceForensicsToolRunner(ToolRunner):
             )
             
             specific_recommendations = self._generate_specific_recommendations(
-                performance_metrics, benchmarks, copy_data, optimization_priorities
+                performance_metrics, benchmarks, copy_data, analyzed, optimization_priorities
             )
             
             # Calculate forensics scores
@@ -308,10 +331,10 @@ class PerformanceForensicsToolRunner(ToolRunner):
         
         return analysis
     
-    def _analyze_copy_elements(self, copy_data: Dict[str, str], 
+    def _analyze_copy_elements(self, copy_data: Dict[str, str], analyzed: AnalyzedText,
                               metrics: Dict[str, float]) -> Dict[str, Any]:
         """Analyze correlation between copy elements and performance"""
-        full_text = f"{copy_data['headline']} {copy_data['body_text']} {copy_data['cta']}".lower()
+        full_text = analyzed.lower
         
         element_analysis = {
             'ctr_correlations': {},
@@ -485,7 +508,8 @@ class PerformanceForensicsToolRunner(ToolRunner):
         return priorities
     
     def _generate_specific_recommendations(self, metrics: Dict[str, float], benchmarks: Dict[str, float],
-                                         copy_data: Dict[str, str], priorities: Dict) -> List[str]:
+                                         copy_data: Dict[str, str], analyzed: AnalyzedText,
+                                         priorities: Dict) -> List[str]:
         """Generate specific, actionable optimization recommendations"""
         recommendations = []
         
@@ -509,7 +533,7 @@ class PerformanceForensicsToolRunner(ToolRunner):
             recommendations.append("Add testimonials and guarantee to increase trust and conversion rate")
         
         # Copy-specific recommendations
-        full_text = f"{copy_data['headline']} {copy_data['body_text']} {copy_data['cta']}".lower()
+        full_text = analyzed.lower
         
         if 'guarantee' not in full_text and 'risk' not in full_text:
             recommendations.append("Add risk reversal (money-back guarantee) to reduce purchase anxiety")
@@ -543,27 +567,11 @@ class PerformanceForensicsToolRunner(ToolRunner):
     
     def _element_present(self, element: str, text: str) -> bool:
         """Check if copy element is present"""
-        element_indicators = {
-            'social_proof': ['customers', 'testimonial', 'reviews', 'trusted', 'thousands'],
-            'risk_reversal': ['guarantee', 'money back', 'risk free', 'no risk'],
-            'clear_benefits': ['save', 'get', 'improve', 'increase', 'reduce'],
-            'urgency': ['now', 'today', 'limited', 'expires', 'deadline']
-        }
-        
-        indicators = element_indicators.get(element, [])
-        return any(indicator in text for indicator in indicators)
+        return self.matcher.scan(text).any(f'forensics.elements.{element}')
     
     def _content_type_present(self, content_type: str, text: str) -> bool:
         """Check if content type is present"""
-        content_indicators = {
-            'storytelling': ['story', 'once', 'journey', 'experience'],
-            'questions': ['?', 'what', 'how', 'why', 'when'],
-            'controversial': ['shocking', 'surprising', 'truth', 'myth'],
-            'educational': ['learn', 'discover', 'guide', 'tips']
-        }
-        
-        indicators = content_indicators.get(content_type, [])
-        return any(indicator in text for indicator in indicators)
+        return self.matcher.scan(text).any(f'forensics.content.{content_type}')
     
     def _calculate_diagnostic_accuracy(self, metrics: Dict[str, float], benchmarks: Dict[str, float],
                                      copy_analysis: Dict) -> float:
@@ -8,6 +8,8 @@ import re
 from typing import Dict, Any, List, Optional, Tuple
 from ..core import ToolRunner, ToolInput, ToolOutput, ToolConfig, ToolType
 from ..exceptions import ToolValidationError
+from ..text_matcher import default_matcher
+from ..regex_bank import RegexBank
 
 
 class PsychologyScorerToolRunner(ToolRunner):
@@ -23,6 +25,9 @@ class PsychologyScorerToolRunner(ToolRunner):
     - Provides comprehensive psychology scorecard with trigger-specific recommendations
     """
     
+    # Output depends only on these input fields, so runs are memoized
+    cache_fields = ('headline', 'body_text', 'cta')
+    
     def __init__(self, config: ToolConfig):
         super().__init__(config)
         
@@ -184,6 +189,27 @@ class PsychologyScorerToolRunner(ToolRunner):
             'feature_benefit': ['feature → benefit', 'what → why', 'how → result'],
             'proof_promise': ['evidence → promise', 'data → outcome', 'proof → guarantee']
         }
+        
+        # Compile keyword lexicons into the shared single-pass matcher
+        self.matcher = default_matcher
+        self.matcher.register_many('psychology.triggers', {
+            name: data['indicators'] for name, data in self.psychological_triggers.items()
+        })
+        self.matcher.register_many('psychology.emotional', self.emotional_indicators)
+        self.matcher.register_many('psychology.trust', self.trust_signals)
+        self.matcher.register('psychology.rational.logical', self.rational_indicators['logical_words'])
+        self.matcher.register('psychology.rational.comparison', self.rational_indicators['comparison_words'])
+        
+        # Compile bias and statistics patterns into banks scanned once per text
+        self.bias_pattern_bank = RegexBank(
+            (
+                ((bias_name, index), pattern)
+                for bias_name, bias_data in self.cognitive_biases.items()
+                for index, pattern in enumerate(bias_data['patterns'])
+            ),
+            re.IGNORECASE
+        )
+        self.stats_pattern_bank = RegexBank(enumerate(self.rational_indicators['numbers_stats']))
     
     async def run(self, input_data: ToolInput) -> ToolOutput:
         """Evaluate copy using comprehensive psychology framework"""
@@ -191,7 +217,7 @@ class PsychologyScorerToolRunner(ToolRunner):
         
         try:
             # Combine all text for analysis
-            full_text = f"{input_data.headline} {input_data.body_text} {input_data.cta}"
+            full_text = input_data.analyzed_text.full_text
             
             # Extract psychographics and campaign intent
             target_psychographics = self._extract_psychographics(input_data)
@@ -314,15 +340,12 @@ class PsychologyScorerToolRunner(ToolRunner):
     
     def _analyze_psychological_triggers(self, text: str) -> Dict[str, Any]:
         """Analyze presence and strength of psychological triggers"""
-        text_lower = text.lower()
+        hits = self.matcher.scan(text)
         trigger_analysis = {}
         
         for trigger_name, trigger_data in self.psychological_triggers.items():
             # Count indicator matches
-            matches = []
-            for indicator in trigger_data['indicators']:
-                if indicator in text_lower:
-                    matches.append(indicator)
+            matches = hits.found(f'psychology.triggers.{trigger_name}')
             
             # Calculate trigger score
             raw_score = len(matches) * 20  # Base score per match
@@ -343,12 +366,13 @@ class PsychologyScorerToolRunner(ToolRunner):
     def _analyze_cognitive_biases(self, text: str) -> Dict[str, Any]:
         """Analyze cognitive biases being leveraged"""
         bias_analysis = {}
+        bank_matches = self.bias_pattern_bank.scan(text)
         
         for bias_name, bias_data in self.cognitive_biases.items():
-            matches = []
-            for pattern in bias_data['patterns']:
-                if re.search(pattern, text, re.IGNORECASE):
-                    matches.append(pattern)
+            matches = [
+                pattern for index, pattern in enumerate(bias_data['patterns'])
+                if (bias_name, index) in bank_matches
+            ]
             
             bias_analysis[bias_name] = {
                 'present': len(matches) > 0,
@@ -361,36 +385,34 @@ class PsychologyScorerToolRunner(ToolRunner):
     
     def _analyze_emotional_rational_balance(self, text: str) -> Dict[str, Any]:
         """Analyze emotional vs rational appeal balance"""
-        text_lower = text.lower()
+        hits = self.matcher.scan(text)
         
         # Count emotional indicators
         emotional_score = 0
         emotional_matches = []
         
-        for emotion_list in self.emotional_indicators.values():
-            for word in emotion_list:
-                if word in text_lower:
-                    emotional_score += 1
-                    emotional_matches.append(word)
+        for emotion_type in self.emotional_indicators:
+            for word in hits.found(f'psychology.emotional.{emotion_type}'):
+                emotional_score += 1
+                emotional_matches.append(word)
         
         # Count rational indicators
         rational_score = 0
         rational_matches = []
         
-        for word in self.rational_indicators['logical_words']:
-            if word in text_lower:
-                rational_score += 2  # Logical words get higher weight
-                rational_matches.append(word)
+        for word in hits.found('psychology.rational.logical'):
+            rational_score += 2  # Logical words get higher weight
+            rational_matches.append(word)
         
-        for pattern in self.rational_indicators['numbers_stats']:
-            matches = re.findall(pattern, text)
+        stats_matches = self.stats_pattern_bank.scan(text)
+        for index in range(len(self.rational_indicators['numbers_stats'])):
+            matches = [match.text for match in stats_matches.get(index, [])]
             rational_score += len(matches) * 3  # Stats get highest weight
             rational_matches.extend(matches)
         
-        for word in self.rational_indicators['comparison_words']:
-            if word in text_lower:
-                rational_score += 1
-                rational_matches.append(word)
+        for word in hits.found('psychology.rational.comparison'):
+            rational_score += 1
+            rational_matches.append(word)
         
         # Calculate balance
         total_score = emotional_score + rational_score
@@ -412,11 +434,11 @@ class PsychologyScorerToolRunner(ToolRunner):
     
     def _analyze_trust_signals(self, text: str) -> Dict[str, Any]:
         """Analyze trust signals and credibility markers"""
-        text_lower = text.lower()
+        hits = self.matcher.scan(text)
         trust_analysis = {}
         
-        for signal_type, indicators in self.trust_signals.items():
-            matches = [indicator for indicator in indicators if indicator in text_lower]
+        for signal_type in self.trust_signals:
+            matches = hits.found(f'psychology.trust.{signal_type}')
             
             trust_analysis[signal_type] = {
                 'present': len(matches) > 0,
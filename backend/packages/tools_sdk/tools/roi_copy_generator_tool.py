@@ -8,6 +8,7 @@ import random
 from typing import Dict, Any, List, Optional, Tuple
 from ..core import ToolRunner, ToolInput, ToolOutput, ToolConfig, ToolType
 from ..exceptions import ToolValidationError
+from ..text_analysis import AnalyzedText
 
 
 class ROICopyGeneratorToolRunner(ToolRunner):
@@ -185,7 +186,7 @@ class ROICopyGeneratorToolRunner(ToolRunner):
             platform = input_data.platform.lower()
             
             # Parse pricing information if available
-            pricing_info = self._extract_pricing_info(original_copy)
+            pricing_info = self._extract_pricing_info(input_data.analyzed_text)
             
             # Generate 3-5 variations with different ROI angles
             variations = []
@@ -262,11 +263,11 @@ class ROICopyGeneratorToolRunner(ToolRunner):
                 error_message=f"ROI copy generation failed: {str(e)}"
             )
     
-    def _extract_pricing_info(self, copy: Dict[str, str]) -> Dict[str, Any]:
+    def _extract_pricing_info(self, analyzed: AnalyzedText) -> Dict[str, Any]:
         """Extract pricing information from original copy"""
         import re
         
-        full_text = f"{copy['headline']} {copy['body_text']} {copy['cta']}"
+        full_text = analyzed.full_text
         
         # Look for price patterns
         price_patterns = [
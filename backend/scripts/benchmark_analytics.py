@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the user analytics dashboard query
+
+Seeds one synthetic user with a large analysis history in a scratch
+PostgreSQL database and times three ways of building the /api/analytics
+dashboard payload:
+
+    legacy   The previous implementation: every (platform, score) row of the
+             user pulled into Python, plus a monthly query and a user lookup
+    grouped  AnalyticsService.get_user_analytics: one grouped query
+    cached   AnalyticsService.get_user_analytics_cached on a warm cache
+
+The legacy and grouped results are compared before timing starts.
+
+Usage:
+    SECRET_KEY=... python scripts/benchmark_analytics.py \\
+        --database-url=postgresql://localhost/adcopysurge_bench \\
+        [--rows=100000] [--repeat=10] [--seed=42] [--keep] [--json=report.json]
+
+The database must be disposable: missing tables are created and the seeded
+user is deleted again unless --keep is given.
+"""
+
+import sys
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+PLATFORMS = ["facebook", "instagram", "linkedin", "google", "tiktok"]
+INSERT_CHUNK = 5000
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        'p50': percentile(values, 0.50),
+        'p95': percentile(values, 0.95),
+        'max': max(values) if values else None
+    }
+
+
+def seed_user(engine, rows: int, seed: int) -> int:
+    """Insert one user with `rows` analyses spread over the last two years"""
+    from app.models.user import User
+    from app.models.ad_analysis import AdAnalysis
+
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        user_id = conn.execute(User.__table__.insert().returning(User.__table__.c.id), {
+            'email': f"analytics-bench-{uuid.uuid4().hex[:12]}@example.com",
+            'hashed_password': 'x',
+            'full_name': 'Analytics Benchmark',
+            'monthly_analyses': rows,
+            'created_at': now - timedelta(days=730)
+        }).scalar_one()
+
+        for start in range(0, rows, INSERT_CHUNK):
+            batch = []
+            for _ in range(min(INSERT_CHUNK, rows - start)):
+                score = round(rng.uniform(30, 95), 1)
+                batch.append({
+                    'id': str(uuid.uuid4()),
+                    'user_id': user_id,
+                    'headline': 'Benchmark headline',
+                    'body_text': 'Benchmark body text',
+                    'cta': 'Learn more',
+                    'platform': rng.choice(PLATFORMS),
+                    'overall_score': score,
+                    'clarity_score': score,
+                    'persuasion_score': score,
+                    'emotion_score': score,
+                    'cta_strength_score': score,
+                    'platform_fit_score': score,
+                    'created_at': now - timedelta(seconds=rng.randint(0, 730 * 86400))
+                })
+            conn.execute(AdAnalysis.__table__.insert(), batch)
+    return user_id
+
+
+def delete_user(engine, user_id: int):
+    from app.models.user import User
+    from app.models.ad_analysis import AdAnalysis
+
+    with engine.begin() as conn:
+        conn.execute(AdAnalysis.__table__.delete().where(AdAnalysis.user_id == user_id))
+        conn.execute(User.__table__.delete().where(User.id == user_id))
+
+
+def legacy_user_analytics(db, user_id: int) -> Dict[str, Any]:
+    """The pre-aggregation AnalyticsService.get_user_analytics, kept for comparison"""
+    from sqlalchemy import func
+    from app.models.user import User
+    from app.models.ad_analysis import AdAnalysis
+
+    analyses = db.query(AdAnalysis.platform, AdAnalysis.overall_score)\
+                 .filter(AdAnalysis.user_id == user_id)\
+                 .all()
+    total_analyses = len(analyses)
+    avg_score = sum(a.overall_score for a in analyses) / total_analyses
+
+    platform_stats = {}
+    for analysis in analyses:
+        stats = platform_stats.setdefault(analysis.platform, {'count': 0, 'total_score': 0})
+        stats['count'] += 1
+        stats['total_score'] += analysis.overall_score
+    top_performing_platforms = sorted((
+        {'platform': platform, 'avg_score': stats['total_score'] / stats['count'], 'count': stats['count']}
+        for platform, stats in platform_stats.items()
+    ), key=lambda x: x['avg_score'], reverse=True)
+
+    month = func.date_trunc('month', AdAnalysis.created_at)
+    monthly_data = db.query(
+        month.label('month'),
+        func.count(AdAnalysis.id).label('analyses'),
+        func.avg(AdAnalysis.overall_score).label('avg_score')
+    ).filter(
+        AdAnalysis.user_id == user_id,
+        AdAnalysis.created_at >= datetime.utcnow() - timedelta(days=180)
+    ).group_by(month).order_by(month).all()
+    monthly_usage = [
+        {'month': row.month.strftime('%b %Y'), 'analyses': row.analyses,
+         'avg_score': round(float(row.avg_score), 1)}
+        for row in monthly_data
+    ]
+
+    user = db.query(User).filter(User.id == user_id).first()
+    return {
+        'total_analyses': total_analyses,
+        'avg_score_improvement': round(avg_score, 1),
+        'top_performing_platforms': top_performing_platforms,
+        'monthly_usage': monthly_usage,
+        'subscription_analytics': {'monthly_analyses': user.monthly_analyses}
+    }
+
+
+def check_results(legacy: Dict[str, Any], grouped: Dict[str, Any]):
+    """Raise if the grouped query disagrees with the legacy implementation"""
+    # Averages are summed in a different order, so allow one rounding step
+    def close(a: float, b: float) -> bool:
+        return abs(a - b) <= 0.1 + 1e-9
+
+    assert legacy['total_analyses'] == grouped['total_analyses'], 'total_analyses differs'
+    assert close(legacy['avg_score_improvement'], grouped['avg_score_improvement']), 'avg score differs'
+    legacy_platforms = {p['platform']: p for p in legacy['top_performing_platforms']}
+    grouped_platforms = {p['platform']: p for p in grouped['top_performing_platforms']}
+    assert legacy_platforms.keys() == grouped_platforms.keys(), 'platforms differ'
+    for platform, stats in legacy_platforms.items():
+        assert stats['count'] == grouped_platforms[platform]['count'], f'{platform} count differs'
+        assert close(stats['avg_score'], grouped_platforms[platform]['avg_score']), f'{platform} avg differs'
+    assert [(m['month'], m['analyses']) for m in legacy['monthly_usage']] == \
+        [(m['month'], m['analyses']) for m in grouped['monthly_usage']], 'monthly usage differs'
+    for legacy_month, grouped_month in zip(legacy['monthly_usage'], grouped['monthly_usage']):
+        assert close(legacy_month['avg_score'], grouped_month['avg_score']), f"{legacy_month['month']} avg differs"
+    assert legacy['subscription_analytics']['monthly_analyses'] == \
+        grouped['subscription_analytics']['monthly_analyses'], 'subscription analytics differ'
+
+
+def time_variant(operation: Callable[[], Any], repeat: int) -> Dict[str, Optional[float]]:
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start_time)
+    return summarize(timings)
+
+
+def run(args) -> Dict[str, Any]:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.core.database import Base
+    from app.models.user import User
+    from app.models.ad_analysis import AdAnalysis, AnalysisToolResult
+    from app.services.analytics_service import AnalyticsService, get_analytics_cache
+
+    database_url = args.database_url
+    if database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+psycopg2://", 1)
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine, tables=[User.__table__, AdAnalysis.__table__, AnalysisToolResult.__table__])
+
+    print(f"Seeding {args.rows} analyses...")
+    start_time = time.perf_counter()
+    user_id = seed_user(engine, args.rows, args.seed)
+    report: Dict[str, Any] = {'rows': args.rows, 'repeat': args.repeat,
+                              'seed_seconds': round(time.perf_counter() - start_time, 2)}
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE ad_analyses")
+
+    db = sessionmaker(bind=engine)()
+    try:
+        service = AnalyticsService(db)
+        check_results(legacy_user_analytics(db, user_id), service.get_user_analytics(user_id))
+
+        report['legacy'] = time_variant(lambda: legacy_user_analytics(db, user_id), args.repeat)
+        report['grouped'] = time_variant(lambda: service.get_user_analytics(user_id), args.repeat)
+
+        if get_analytics_cache() is None:
+            report['cached'] = None
+        else:
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(service.get_user_analytics_cached(user_id))
+                report['cached'] = time_variant(
+                    lambda: loop.run_until_complete(service.get_user_analytics_cached(user_id)), args.repeat
+                )
+            finally:
+                loop.close()
+    finally:
+        db.close()
+        if not args.keep:
+            delete_user(engine, user_id)
+        engine.dispose()
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    def fmt(value: Optional[float]) -> str:
+        return f"{value * 1000:9.2f}ms" if value is not None else "        n/a"
+
+    print(f"\nUser analytics over {report['rows']} analyses ({report['repeat']} runs each, "
+          f"seeded in {report['seed_seconds']}s)")
+    for name in ('legacy', 'grouped', 'cached'):
+        stats = report.get(name)
+        if stats is None:
+            print(f"  {name:8} disabled (ANALYTICS_CACHE_ENABLED=false)")
+            continue
+        print(f"  {name:8} " + "  ".join(f"{key} {fmt(stats[key])}" for key in ('p50', 'p95', 'max')))
+    if report['legacy']['p50'] and report['grouped']['p50']:
+        print(f"  grouped speedup at p50: {report['legacy']['p50'] / report['grouped']['p50']:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', required=True, help='Scratch PostgreSQL database')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--keep', action='store_true', help='Keep the seeded user and analyses')
+    parser.add_argument('--json', default=None, help='Write the report to this file')
+    args = parser.parse_args()
+    if not args.database_url.startswith("postgresql"):
+        parser.error("--database-url must point at PostgreSQL (the analytics queries use date_trunc)")
+    if args.rows < 1 or args.repeat < 1:
+        parser.error("--rows and --repeat must be positive")
+
+    report = run(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for ad generation
+
+Drives generation at a fixed concurrency and reports throughput, latency
+percentiles (plus time to first field for streaming scenarios), failures by
+type and token accounting. Run it against scripts/mock_llm_server.py to tune
+client pooling, rate governance, routing and batching reproducibly without
+API keys.
+
+Targets:
+    service  ProductionAIService in-process, its OpenAI client pointed at the
+             mock server (scenarios: alternative, alternatives, variant-set, stream)
+    http     A running API with OPENAI_BASE_URL set to the mock server
+             (scenarios: improve-stream, generate-stream)
+
+Usage:
+    python scripts/mock_llm_server.py --median-ms=800 --error-rate=0.02 &
+    python scripts/benchmark_generation.py --target=service --scenario=alternatives \\
+        [--requests=200] [--concurrency=20] [--mock-url=http://127.0.0.1:8090] \\
+        [--max-connections=100] [--cache] [--unbatched] [--json=report.json]
+    python scripts/benchmark_generation.py --target=http --scenario=improve-stream \\
+        --api-url=http://127.0.0.1:8000 --token=$JWT
+"""
+
+import sys
+import json
+import logging
+import time
+import random
+import asyncio
+import argparse
+import urllib.request
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+SERVICE_SCENARIOS = ('alternative', 'alternatives', 'variant-set', 'stream')
+HTTP_SCENARIOS = ('improve-stream', 'generate-stream')
+
+PRODUCTS = ["running shoes", "project management software", "meal kits", "online yoga classes",
+            "accounting services", "noise-cancelling headphones", "language lessons", "pet insurance"]
+PLATFORMS = ["facebook", "instagram", "linkedin", "google", "tiktok"]
+
+
+def build_ads(count: int, seed: int) -> List[Dict[str, Any]]:
+    """Deterministic ads; distinct so the generation cache only hits when asked to"""
+    rng = random.Random(seed)
+    ads = []
+    for index in range(count):
+        product = rng.choice(PRODUCTS)
+        ads.append({
+            'headline': f"Better {product} for everyone #{index}",
+            'body_text': f"Our {product} help you save time and money. Trusted by thousands of happy customers.",
+            'cta': "Get started",
+            'platform': rng.choice(PLATFORMS),
+            'industry': 'general',
+            'target_audience': 'busy professionals'
+        })
+    return ads
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        'p50': percentile(values, 0.50),
+        'p90': percentile(values, 0.90),
+        'p95': percentile(values, 0.95),
+        'p99': percentile(values, 0.99),
+        'max': max(values) if values else None,
+        'mean': sum(values) / len(values) if values else None
+    }
+
+
+def mock_request(mock_url: str, path: str, method: str = 'GET') -> Optional[Dict[str, Any]]:
+    """Call a mock server control endpoint; None if it is not reachable"""
+    try:
+        request = urllib.request.Request(f"{mock_url}{path}", data=b'' if method == 'POST' else None,
+                                         method=method)
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return json.loads(response.read())
+    except Exception as e:
+        print(f"Mock server {mock_url} not reachable ({e}); skipping its stats")
+        return None
+
+
+async def run_load(operation: Callable[[int], Awaitable[Optional[float]]], requests: int,
+                   concurrency: int) -> Dict[str, Any]:
+    """
+    Run operation(index) requests times with at most concurrency in flight
+
+    operation returns the time to first content for streaming scenarios, else None.
+    """
+    latencies: List[float] = []
+    first_content: List[float] = []
+    failures: Dict[str, int] = {}
+    next_index = iter(range(requests))
+
+    async def worker():
+        for index in next_index:
+            start_time = time.perf_counter()
+            try:
+                ttfc = await operation(index)
+            except Exception as e:
+                key = type(e).__name__
+                failures[key] = failures.get(key, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - start_time)
+            if ttfc is not None:
+                first_content.append(ttfc)
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall_time = time.perf_counter() - start_time
+
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'succeeded': len(latencies),
+        'failed': sum(failures.values()),
+        'failures': failures,
+        'wall_time': wall_time,
+        'throughput_rps': len(latencies) / wall_time if wall_time else 0.0,
+        'latency': summarize(latencies),
+        'time_to_first_content': summarize(first_content) if first_content else None
+    }
+
+
+async def benchmark_service(args) -> Dict[str, Any]:
+    """Drive ProductionAIService in-process against the mock server"""
+    from app.services.ai_client_registry import AIClientRegistry
+    from app.services.generation_cache import GenerationCache
+    from app.services.production_ai_generator import ProductionAIService
+    from app.services.provider_router import ProviderRouter
+
+    registry = AIClientRegistry(
+        max_connections=args.max_connections,
+        max_keepalive_connections=min(args.max_connections, args.max_keepalive),
+        openai_base_url=f"{args.mock_url}/v1",
+        gemini_api_endpoint=args.mock_url if args.gemini_key else None
+    )
+    service = ProductionAIService(
+        'sk-mock-benchmark', args.gemini_key,
+        client_registry=registry,
+        generation_cache=GenerationCache(enabled=args.cache),
+        router=ProviderRouter(hedging_enabled=not args.no_hedging)
+    )
+    ads = build_ads(args.distinct_ads or args.requests, args.seed)
+
+    async def operation(index: int) -> Optional[float]:
+        ad = ads[index % len(ads)]
+        tenant_id = f"bench-{index % 10}"
+        if args.scenario == 'alternative':
+            await service.generate_ad_alternative(ad, 'persuasive', tenant_id=tenant_id)
+        elif args.scenario == 'alternatives':
+            await service.generate_multiple_alternatives(ad, tenant_id=tenant_id, batched=not args.unbatched)
+        elif args.scenario == 'variant-set':
+            from app.services.variant_generator import VariantGenerator
+            await VariantGenerator(service).generate_variant_set(ad, num_variants=3, tenant_id=tenant_id)
+        else:
+            start_time = time.perf_counter()
+            first_content = None
+            async for event in service.stream_ad_alternative(ad, 'persuasive', tenant_id=tenant_id):
+                if event['type'] == 'field' and first_content is None:
+                    first_content = time.perf_counter() - start_time
+            return first_content
+        return None
+
+    if args.warm_up:
+        await service.warm_up()
+    report = await run_load(operation, args.requests, args.concurrency)
+
+    usage = service.get_usage_summary()
+    report['tokens'] = {
+        name: {'requests': stats['requests'], 'tokens': stats['tokens'], 'cost': round(stats['cost'], 4)}
+        for name, stats in usage['by_provider'].items()
+    }
+    report['service'] = {
+        'rate_limits': usage['rate_limits'],
+        'routing': {key: value for key, value in usage['routing'].items() if key != 'providers'},
+        'generation_cache': usage['generation_cache'],
+        'batched_generation': usage['batched_generation'],
+        'prompt_templates': {key: usage['prompt_templates'][key]
+                             for key in ('renders', 'trimmed_renders', 'tokens_trimmed', 'token_budget')},
+        'client_pool': usage['client_pool']
+    }
+    await registry.aclose()
+    return report
+
+
+async def benchmark_http(args) -> Dict[str, Any]:
+    """Drive the streaming generation endpoints of a running API"""
+    import httpx
+
+    if not args.token:
+        raise SystemExit("--token is required for the http target")
+    ads = build_ads(args.distinct_ads or args.requests, args.seed)
+    headers = {'Authorization': f"Bearer {args.token}"}
+
+    async with httpx.AsyncClient(base_url=args.api_url, headers=headers, timeout=args.timeout,
+                                 limits=httpx.Limits(max_connections=args.concurrency)) as client:
+        async def operation(index: int) -> Optional[float]:
+            ad = ads[index % len(ads)]
+            if args.scenario == 'improve-stream':
+                path, body = '/api/ads/improve/stream', {'ad': ad, 'variant_types': ['persuasive', 'emotional']}
+            else:
+                path, body = '/api/ads/generate/stream', {
+                    'platform': ad['platform'], 'productService': ad['body_text'],
+                    'valueProposition': ad['headline'], 'numVariations': 2
+                }
+            start_time = time.perf_counter()
+            first_content = None
+            event = None
+            async with client.stream('POST', path, json=body) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if line.startswith('event: '):
+                        event = line[len('event: '):]
+                        if event == 'field' and first_content is None:
+                            first_content = time.perf_counter() - start_time
+            if event != 'done':
+                raise RuntimeError("Stream ended without a done event")
+            return first_content
+
+        return await run_load(operation, args.requests, args.concurrency)
+
+
+def print_report(report: Dict[str, Any]):
+    def fmt(value: Optional[float]) -> str:
+        return f"{value * 1000:8.1f}ms" if value is not None else "       n/a"
+
+    print(f"\n{report['target']}/{report['scenario']}: {report['succeeded']}/{report['requests']} succeeded "
+          f"at concurrency {report['concurrency']} in {report['wall_time']:.2f}s "
+          f"({report['throughput_rps']:.2f} req/s)")
+    if report['failures']:
+        print(f"  failures: {report['failures']}")
+    for name in ('latency', 'time_to_first_content'):
+        stats = report.get(name)
+        if stats:
+            print(f"  {name:22} " + "  ".join(f"{key} {fmt(stats[key])}" for key in ('p50', 'p90', 'p95', 'p99', 'max')))
+    for name, stats in report.get('tokens', {}).items():
+        print(f"  {name} tokens: {stats['tokens']} over {stats['requests']} calls (${stats['cost']})")
+    if report.get('mock'):
+        for name, stats in report['mock']['providers'].items():
+            print(f"  mock {name}: {stats['requests']} requests, {stats['rate_limited']} rate limited, "
+                  f"{stats['errors_injected']} errors injected, "
+                  f"{stats['prompt_tokens']} prompt + {stats['completion_tokens']} completion tokens")
+        print(f"  mock connections: {report['mock']['connections']}, "
+              f"peak in-flight: {report['mock']['max_in_flight']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', choices=('service', 'http'), default='service')
+    parser.add_argument('--scenario', choices=SERVICE_SCENARIOS + HTTP_SCENARIOS, default='alternative')
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--distinct-ads', type=int, default=0, help='Ads to cycle through; 0 = one per request')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--mock-url', default='http://127.0.0.1:8090')
+    parser.add_argument('--gemini-key', default=None, help='Also route to Gemini on the mock server')
+    parser.add_argument('--max-connections', type=int, default=100)
+    parser.add_argument('--max-keepalive', type=int, default=20)
+    parser.add_argument('--cache', action='store_true', help='Enable the generation cache')
+    parser.add_argument('--unbatched', action='store_true', help='One provider call per variant')
+    parser.add_argument('--no-hedging', action='store_true')
+    parser.add_argument('--warm-up', action='store_true', help='Warm provider clients before the run')
+    parser.add_argument('--api-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--token', default=None, help='Bearer token for the http target')
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--json', default=None, help='Write the full report to this file')
+    parser.add_argument('--log-level', default='ERROR', help='Application log level during the run')
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+
+    scenarios = SERVICE_SCENARIOS if args.target == 'service' else HTTP_SCENARIOS
+    if args.scenario not in scenarios:
+        parser.error(f"--scenario for the {args.target} target must be one of {', '.join(scenarios)}")
+
+    mock_available = mock_request(args.mock_url, '/mock/reset', 'POST') is not None
+    runner = benchmark_service if args.target == 'service' else benchmark_http
+    report = {'target': args.target, 'scenario': args.scenario, **asyncio.run(runner(args))}
+    if mock_available:
+        report['mock'] = mock_request(args.mock_url, '/mock/stats')
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the OpenAI and Gemini APIs
+
+Serves the endpoints ProductionAIService calls -- OpenAI model listing and
+chat completions (plain and streamed), Gemini generateContent and
+streamGenerateContent -- and answers with ad copy in the format the service
+parses (line format, or a JSON array for batched prompts), so generation can
+be load-tested without API keys or spend. Latency, error rate and rate
+limiting are configurable at start-up or at runtime via POST /mock/config;
+GET /mock/stats reports requests, injected faults, tokens, peak concurrency
+and connection reuse. Standard library only, so it runs without the
+application's dependencies.
+
+Latency is the time to first token, drawn from the chosen distribution;
+completion tokens then take 1/tokens-per-second each, paced chunk by chunk
+when streaming.
+
+Usage:
+    python scripts/mock_llm_server.py [--port=8090] [--latency=lognormal]
+        [--median-ms=800] [--sigma=0.5] [--error-rate=0.0] [--rate-limit-rate=0.0]
+        [--rpm=0] [--tokens-per-second=80] [--seed=42]
+
+Point the backend at it with:
+    OPENAI_BASE_URL=http://127.0.0.1:8090/v1
+    GEMINI_API_ENDPOINT=http://127.0.0.1:8090
+"""
+
+import re
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'lognormal')
+
+HEADLINES = [
+    "Finally, {topic} that fits your week", "Your {topic}, minus the hassle",
+    "Why 12,000 teams switched their {topic}", "{topic} you will actually look forward to",
+    "Cut your {topic} time in half this month", "The {topic} upgrade you keep postponing"
+]
+BODIES = [
+    "Set up in five minutes, see results by Friday. No contracts, cancel anytime.",
+    "Built with feedback from 3,000 customers, so every detail solves a real problem.",
+    "Picture your Monday without the usual scramble. That is what our users describe.",
+    "Rated 4.8 out of 5 by people who were skeptical too. Try it risk-free for 14 days.",
+    "Save an average of 6 hours a week, measured across 500 accounts last quarter."
+]
+CTAS = ["Start your free trial", "Claim your spot today", "See it in action", "Get started in minutes", "Shop the collection"]
+REASONS = [
+    "Specific social proof and a concrete time saving replace vague claims",
+    "Leads with the reader's outcome and removes risk with a clear guarantee",
+    "Quantified benefit plus a low-friction call-to-action"
+]
+
+_BATCH_PATTERN = re.compile(r'JSON array of exactly (\d+) objects')
+_HEADLINE_PATTERN = re.compile(r'- Headline: (.+)')
+
+
+def estimate_tokens(text: str) -> int:
+    """About four characters per token, matching the service's fallback estimate"""
+    return (len(text) + 3) // 4
+
+
+def completion_text(prompt: str, rng: random.Random, max_tokens: Optional[int] = None) -> str:
+    """Ad copy in the format the prompt asks for, truncated to max_tokens"""
+    match = _HEADLINE_PATTERN.search(prompt)
+    topic = ' '.join((match.group(1) if match else 'workflow').split()[:3]).lower() or 'workflow'
+
+    def variant() -> Dict[str, str]:
+        return {
+            'headline': rng.choice(HEADLINES).format(topic=topic)[:80],
+            'body_text': rng.choice(BODIES),
+            'cta': rng.choice(CTAS),
+            'improvement_reason': rng.choice(REASONS)
+        }
+
+    batch = _BATCH_PATTERN.search(prompt)
+    if batch:
+        text = json.dumps([{'variant': number, **variant()} for number in range(1, int(batch.group(1)) + 1)])
+    else:
+        fields = variant()
+        text = (f"HEADLINE: {fields['headline']}\nBODY: {fields['body_text']}\n"
+                f"CTA: {fields['cta']}\nREASON: {fields['improvement_reason']}")
+    if max_tokens:
+        text = text[:max_tokens * 4]
+    return text
+
+
+def split_chunks(text: str, chunk_chars: int = 16) -> List[str]:
+    """Split text into stream chunks of roughly a few tokens"""
+    return [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)] or ['']
+
+
+class MockBehaviour:
+    """
+    Latency, fault and rate-limit behaviour of the stand-in providers
+
+    Args:
+        latency: One of LATENCY_DISTRIBUTIONS
+        median_ms: Median time to first token, in milliseconds
+        sigma: Spread; log-space sigma for lognormal, fraction of the median for normal
+        error_rate: Probability a request fails with a 500
+        rate_limit_rate: Probability a request is rejected with a 429
+        rpm: Requests per minute per provider before 429s; 0 disables
+        tokens_per_second: Completion speed; 0 returns completions instantly
+        seed: Random seed for reproducible runs
+    """
+
+    def __init__(self, latency: str = 'lognormal', median_ms: float = 800.0, sigma: float = 0.5,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, rpm: int = 0,
+                 tokens_per_second: float = 80.0, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+        self.configure(latency=latency, median_ms=median_ms, sigma=sigma, error_rate=error_rate,
+                       rate_limit_rate=rate_limit_rate, rpm=rpm, tokens_per_second=tokens_per_second)
+        self._windows: Dict[str, deque] = {}
+        self.reset_stats()
+
+    def configure(self, **options):
+        """Change behaviour; unknown options raise ValueError"""
+        for name, value in options.items():
+            if name not in ('latency', 'median_ms', 'sigma', 'error_rate', 'rate_limit_rate',
+                            'rpm', 'tokens_per_second'):
+                raise ValueError(f"Unknown option: {name}")
+            if name == 'latency' and value not in LATENCY_DISTRIBUTIONS:
+                raise ValueError(f"latency must be one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+            setattr(self, name, value)
+
+    def get_config(self) -> Dict[str, Any]:
+        return {
+            'latency': self.latency,
+            'median_ms': self.median_ms,
+            'sigma': self.sigma,
+            'error_rate': self.error_rate,
+            'rate_limit_rate': self.rate_limit_rate,
+            'rpm': self.rpm,
+            'tokens_per_second': self.tokens_per_second
+        }
+
+    def reset_stats(self):
+        self.stats = {
+            'connections': 0,
+            'in_flight': 0,
+            'max_in_flight': 0,
+            'providers': {}
+        }
+
+    def provider_stats(self, provider: str) -> Dict[str, Any]:
+        return self.stats['providers'].setdefault(provider, {
+            'requests': 0,
+            'completed': 0,
+            'streamed': 0,
+            'errors_injected': 0,
+            'rate_limited': 0,
+            'prompt_tokens': 0,
+            'completion_tokens': 0
+        })
+
+    def sample_latency(self) -> float:
+        """Time to first token, in seconds"""
+        median = self.median_ms / 1000.0
+        if self.latency == 'fixed':
+            return median
+        if self.latency == 'uniform':
+            return self.rng.uniform(0, 2 * median)
+        if self.latency == 'normal':
+            return max(0.0, self.rng.gauss(median, self.sigma * median))
+        return median * math.exp(self.rng.gauss(0, self.sigma))
+
+    def generation_time(self, completion_tokens: int) -> float:
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return completion_tokens / self.tokens_per_second
+
+    def admit(self, provider: str) -> Optional[Tuple[int, str, Optional[int]]]:
+        """
+        Decide whether a request fails
+
+        Returns:
+            None to serve the request, or (status, message, retry_after seconds)
+        """
+        stats = self.provider_stats(provider)
+        stats['requests'] += 1
+
+        if self.rpm > 0:
+            now = time.monotonic()
+            window = self._windows.setdefault(provider, deque())
+            while window and now - window[0] >= 60:
+                window.popleft()
+            if len(window) >= self.rpm:
+                stats['rate_limited'] += 1
+                return 429, f"Rate limit of {self.rpm} requests per minute reached", max(1, math.ceil(60 - (now - window[0])))
+            window.append(now)
+
+        if self.rng.random() < self.rate_limit_rate:
+            stats['rate_limited'] += 1
+            return 429, "Rate limit reached (injected)", 1
+        if self.rng.random() < self.error_rate:
+            stats['errors_injected'] += 1
+            return 500, "The server had an error while processing your request (injected)", None
+        return None
+
+
+class HTTPResponder:
+    """Minimal HTTP/1.1 response writer for one connection"""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+
+    async def send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode('utf-8')
+        self._write_head(status, {'Content-Type': 'application/json', 'Content-Length': str(len(body)),
+                                  **(headers or {})})
+        self.writer.write(body)
+        await self.writer.drain()
+
+    async def start_stream(self, content_type: str):
+        self._write_head(200, {'Content-Type': content_type, 'Transfer-Encoding': 'chunked',
+                               'Cache-Control': 'no-cache'})
+        await self.writer.drain()
+
+    async def send_chunk(self, data: str):
+        encoded = data.encode('utf-8')
+        self.writer.write(f"{len(encoded):x}\r\n".encode('ascii') + encoded + b"\r\n")
+        await self.writer.drain()
+
+    async def end_stream(self):
+        self.writer.write(b"0\r\n\r\n")
+        await self.writer.drain()
+
+    def _write_head(self, status: int, headers: Dict[str, str]):
+        reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 429: 'Too Many Requests',
+                  500: 'Internal Server Error'}.get(status, 'OK')
+        lines = [f"HTTP/1.1 {status} {reason}"] + [f"{name}: {value}" for name, value in headers.items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+
+
+class MockLLMServer:
+    """Routes requests to the OpenAI and Gemini stand-ins"""
+
+    def __init__(self, behaviour: MockBehaviour):
+        self.behaviour = behaviour
+        self._request_ids = 0
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.behaviour.stats['connections'] += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0) or 0))
+
+                await self.dispatch(method, target, body, HTTPResponder(writer))
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, target: str, body: bytes, responder: HTTPResponder):
+        url = urlsplit(target)
+        path = url.path
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            await responder.send_json(400, {'error': {'message': 'Invalid JSON body'}})
+            return
+
+        if method == 'GET' and path == '/mock/stats':
+            await responder.send_json(200, {**self.behaviour.stats, 'config': self.behaviour.get_config()})
+        elif method == 'POST' and path == '/mock/reset':
+            self.behaviour.reset_stats()
+            await responder.send_json(200, {'status': 'reset'})
+        elif method == 'POST' and path == '/mock/config':
+            try:
+                self.behaviour.configure(**payload)
+            except ValueError as e:
+                await responder.send_json(400, {'error': {'message': str(e)}})
+                return
+            await responder.send_json(200, self.behaviour.get_config())
+        elif method == 'GET' and path == '/v1/models':
+            await responder.send_json(200, {'object': 'list', 'data': [
+                {'id': 'gpt-4', 'object': 'model', 'created': 0, 'owned_by': 'mock'}
+            ]})
+        elif method == 'POST' and path == '/v1/chat/completions':
+            await self._tracked(self.openai_chat(payload, responder))
+        elif method == 'POST' and path.startswith('/v1beta/models/') and ':' in path:
+            model, action = path[len('/v1beta/models/'):].split(':', 1)
+            stream = action == 'streamGenerateContent'
+            sse = parse_qs(url.query).get('alt', [''])[0] == 'sse'
+            await self._tracked(self.gemini_generate(model, payload, stream, sse, responder))
+        else:
+            await responder.send_json(404, {'error': {'message': f"No mock route for {method} {path}"}})
+
+    async def _tracked(self, handler):
+        stats = self.behaviour.stats
+        stats['in_flight'] += 1
+        stats['max_in_flight'] = max(stats['max_in_flight'], stats['in_flight'])
+        try:
+            await handler
+        finally:
+            stats['in_flight'] -= 1
+
+    async def openai_chat(self, payload: Dict[str, Any], responder: HTTPResponder):
+        fault = self.behaviour.admit('openai')
+        if fault is not None:
+            status, message, retry_after = fault
+            await responder.send_json(status, {'error': {
+                'message': message,
+                'type': 'rate_limit_error' if status == 429 else 'server_error',
+                'code': 'rate_limit_exceeded' if status == 429 else None
+            }}, {'Retry-After': str(retry_after)} if retry_after else None)
+            return
+
+        prompt = '\n'.join(str(message.get('content', '')) for message in payload.get('messages', []))
+        text = completion_text(prompt, self.behaviour.rng, payload.get('max_tokens'))
+        usage = self._account('openai', prompt, text)
+        model = payload.get('model', 'gpt-4')
+        self._request_ids += 1
+        completion_id = f"chatcmpl-mock-{self._request_ids}"
+        created = int(time.time())
+
+        await asyncio.sleep(self.behaviour.sample_latency())
+        if not payload.get('stream'):
+            await asyncio.sleep(self.behaviour.generation_time(usage['completion_tokens']))
+            await responder.send_json(200, {
+                'id': completion_id, 'object': 'chat.completion', 'created': created, 'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': text},
+                             'finish_reason': 'stop'}],
+                'usage': usage
+            })
+            return
+
+        self.behaviour.provider_stats('openai')['streamed'] += 1
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+            return 'data: ' + json.dumps({
+                'id': completion_id, 'object': 'chat.completion.chunk', 'created': created, 'model': model,
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+            }) + '\n\n'
+
+        await responder.start_stream('text/event-stream')
+        await responder.send_chunk(chunk({'role': 'assistant', 'content': ''}))
+        for piece in split_chunks(text):
+            await asyncio.sleep(self.behaviour.generation_time(estimate_tokens(piece)))
+            await responder.send_chunk(chunk({'content': piece}))
+        await responder.send_chunk(chunk({}, 'stop'))
+        if (payload.get('stream_options') or {}).get('include_usage'):
+            await responder.send_chunk('data: ' + json.dumps({
+                'id': completion_id, 'object': 'chat.completion.chunk', 'created': created,
+                'model': model, 'choices': [], 'usage': usage
+            }) + '\n\n')
+        await responder.send_chunk('data: [DONE]\n\n')
+        await responder.end_stream()
+
+    async def gemini_generate(self, model: str, payload: Dict[str, Any], stream: bool, sse: bool,
+                              responder: HTTPResponder):
+        fault = self.behaviour.admit('gemini')
+        if fault is not None:
+            status, message, retry_after = fault
+            await responder.send_json(status, {'error': {
+                'code': status,
+                'message': message,
+                'status': 'RESOURCE_EXHAUSTED' if status == 429 else 'INTERNAL'
+            }}, {'Retry-After': str(retry_after)} if retry_after else None)
+            return
+
+        prompt = '\n'.join(
+            str(part.get('text', ''))
+            for content in payload.get('contents', [])
+            for part in content.get('parts', [])
+        )
+        max_tokens = (payload.get('generationConfig') or {}).get('maxOutputTokens')
+        text = completion_text(prompt, self.behaviour.rng, max_tokens)
+        usage = self._account('gemini', prompt, text)
+        usage_metadata = {
+            'promptTokenCount': usage['prompt_tokens'],
+            'candidatesTokenCount': usage['completion_tokens'],
+            'totalTokenCount': usage['total_tokens']
+        }
+
+        def response(piece: str, finish_reason: Optional[str]) -> Dict[str, Any]:
+            candidate = {'content': {'parts': [{'text': piece}], 'role': 'model'}, 'index': 0}
+            if finish_reason:
+                candidate['finishReason'] = finish_reason
+            return {'candidates': [candidate], 'usageMetadata': usage_metadata, 'modelVersion': model}
+
+        await asyncio.sleep(self.behaviour.sample_latency())
+        if not stream:
+            await asyncio.sleep(self.behaviour.generation_time(usage['completion_tokens']))
+            await responder.send_json(200, response(text, 'STOP'))
+            return
+
+        self.behaviour.provider_stats('gemini')['streamed'] += 1
+        pieces = split_chunks(text)
+        if sse:
+            await responder.start_stream('text/event-stream')
+        else:
+            # Without alt=sse the REST API streams one JSON array
+            await responder.start_stream('application/json')
+            await responder.send_chunk('[')
+        for index, piece in enumerate(pieces):
+            await asyncio.sleep(self.behaviour.generation_time(estimate_tokens(piece)))
+            item = json.dumps(response(piece, 'STOP' if index == len(pieces) - 1 else None))
+            if sse:
+                await responder.send_chunk(f"data: {item}\r\n\r\n")
+            else:
+                await responder.send_chunk(('' if index == 0 else ',') + item)
+        if not sse:
+            await responder.send_chunk(']')
+        await responder.end_stream()
+
+    def _account(self, provider: str, prompt: str, text: str) -> Dict[str, int]:
+        usage = {'prompt_tokens': estimate_tokens(prompt), 'completion_tokens': estimate_tokens(text)}
+        usage['total_tokens'] = usage['prompt_tokens'] + usage['completion_tokens']
+        stats = self.behaviour.provider_stats(provider)
+        stats['completed'] += 1
+        stats['prompt_tokens'] += usage['prompt_tokens']
+        stats['completion_tokens'] += usage['completion_tokens']
+        return usage
+
+
+async def serve(host: str, port: int, behaviour: MockBehaviour):
+    server = MockLLMServer(behaviour)
+    listener = await asyncio.start_server(server.handle_connection, host, port)
+    print(f"Mock LLM server listening on http://{host}:{port} ({behaviour.get_config()})")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency', choices=LATENCY_DISTRIBUTIONS, default='lognormal')
+    parser.add_argument('--median-ms', type=float, default=800.0, help='Median time to first token')
+    parser.add_argument('--sigma', type=float, default=0.5, help='Latency spread')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability of a 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Probability of a 429')
+    parser.add_argument('--rpm', type=int, default=0, help='Requests per minute per provider before 429s')
+    parser.add_argument('--tokens-per-second', type=float, default=80.0, help='Completion speed; 0 = instant')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    behaviour = MockBehaviour(
+        latency=args.latency, median_ms=args.median_ms, sigma=args.sigma, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, rpm=args.rpm, tokens_per_second=args.tokens_per_second,
+        seed=args.seed
+    )
+    try:
+        asyncio.run(serve(args.host, args.port, behaviour))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
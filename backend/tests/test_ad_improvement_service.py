@@ -0,0 +1,94 @@
+"""
+Tests for variant score prediction in AdImprovementService and the
+variant set post-processing that relies on it.
+"""
+import pytest
+
+from app.constants.creative_controls import EmotionType
+from app.services.ad_improvement_service import AdImprovementService
+from app.services.ai_client_registry import AIClientRegistry
+from app.services.generation_cache import GenerationCache
+from app.services.production_ai_generator import ProductionAIService
+from app.services.prompt_templates import PromptTemplateRegistry
+from app.services.provider_router import ProviderRouter
+from app.services.variant_generator import VariantConfig, VariantGenerator, VariantStrategy
+
+
+AD = {
+    'headline': "Fresh roasted coffee beans",
+    'body_text': "Small batches roasted every Monday and shipped the same day.",
+    'cta': "Order now",
+    'platform': 'facebook',
+    'industry': 'food'
+}
+
+VARIANTS = [
+    {'headline': "Imagine your perfect morning", 'body_text': "Feel the warmth of a fresh cup.",
+     'cta': "Treat yourself"},
+    {'headline': "Proven 30% fresher beans", 'body_text': "Data from 1,000 customers shows results.",
+     'cta': "See the study"},
+    {'headline': "Last chance this week", 'body_text': "Only 50 bags left, ends tonight.",
+     'cta': "Order now"}
+]
+
+
+def variant_texts():
+    return [f"{v['headline']} {v['body_text']} {v['cta']}" for v in VARIANTS]
+
+
+def variant_config(name: str) -> VariantConfig:
+    return VariantConfig(
+        creativity_level=5, urgency_level=5, emotion_type=EmotionType.INSPIRING,
+        filter_cliches=True, variant_name=name, strategy_description=name
+    )
+
+
+class TestPredictVariantScores:
+    """Test suite for AdImprovementService.predict_variant_scores"""
+
+    def test_service_registers_strategy_keywords(self):
+        service = AdImprovementService(client_registry=AIClientRegistry())
+
+        assert service.matcher is not None
+
+    def test_scores_every_variant(self):
+        service = AdImprovementService(client_registry=AIClientRegistry())
+
+        scores = service.predict_variant_scores(variant_texts(), 'facebook')
+
+        assert len(scores) == len(VARIANTS)
+        assert all(0 < score['overall_score'] <= 100 for score in scores)
+
+    def test_matches_per_variant_detection(self):
+        service = AdImprovementService(client_registry=AIClientRegistry())
+        texts = variant_texts()
+
+        batched = service.predict_variant_scores(texts, 'facebook')
+        single = [service._predict_variant_score(text, 'facebook') for text in texts]
+
+        assert [s['overall_score'] for s in batched] == [s['overall_score'] for s in single]
+
+
+class TestVariantComparisonSet:
+    """Test suite for VariantGenerator._create_variant_comparison_set"""
+
+    @pytest.mark.asyncio
+    async def test_builds_comparisons_for_every_variant(self):
+        ai_service = ProductionAIService(
+            'sk-unit',
+            client_registry=AIClientRegistry(),
+            generation_cache=GenerationCache(),
+            router=ProviderRouter(),
+            prompt_templates=PromptTemplateRegistry()
+        )
+        generator = VariantGenerator(ai_service)
+        configs = [variant_config(f"variant {i}") for i in range(len(VARIANTS))]
+        variants = [generator._annotate_variant(dict(v), c) for v, c in zip(VARIANTS, configs)]
+
+        result = await generator._create_variant_comparison_set(
+            variants, AD, VariantStrategy.DIVERSE, configs
+        )
+
+        assert result['total_variants'] == len(VARIANTS)
+        assert [c['variant_id'] for c in result['comparisons']] == ['variant_1', 'variant_2', 'variant_3']
+        assert all(c['predicted_score'] is not None for c in result['comparisons'])
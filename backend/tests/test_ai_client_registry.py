@@ -0,0 +1,94 @@
+"""
+Tests for the pooled LLM provider client registry.
+"""
+import asyncio
+
+import pytest
+
+from app.services.ai_client_registry import AIClientRegistry
+
+
+class TestOpenAIClients:
+    """Test suite for AIClientRegistry.get_openai_client"""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused_per_key(self):
+        registry = AIClientRegistry()
+
+        first = registry.get_openai_client('sk-tenant-a')
+        second = registry.get_openai_client('sk-tenant-a')
+
+        assert first is second
+        stats = registry.get_stats()
+        assert stats['openai_clients_created'] == 1
+        assert stats['openai_client_reuses'] == 1
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_different_keys_get_separate_clients(self):
+        registry = AIClientRegistry()
+
+        client_a = registry.get_openai_client('sk-tenant-a')
+        client_b = registry.get_openai_client('sk-tenant-b')
+
+        assert client_a is not client_b
+        assert client_a.api_key == 'sk-tenant-a'
+        assert client_b.api_key == 'sk-tenant-b'
+        assert registry.get_stats()['openai_clients'] == 2
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_pool_settings_are_applied(self):
+        registry = AIClientRegistry(request_timeout=12.0, openai_base_url='http://127.0.0.1:9999/v1')
+
+        client = registry.get_openai_client('sk-unit')
+
+        assert str(client.base_url).startswith('http://127.0.0.1:9999/v1')
+        assert client.timeout == 12.0
+        await registry.aclose()
+
+    def test_client_from_another_event_loop_is_replaced_and_closed(self):
+        registry = AIClientRegistry()
+
+        async def get_client():
+            return registry.get_openai_client('sk-unit')
+
+        async def get_client_and_shut_down():
+            client = registry.get_openai_client('sk-unit')
+            await registry.aclose()
+            return client
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client_and_shut_down())
+
+        assert first is not second
+        assert first.is_closed()
+        assert registry.get_stats()['openai_clients_retired'] == 1
+
+
+class TestShutdown:
+    """Test suite for AIClientRegistry.aclose and warm_up"""
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_every_client(self):
+        registry = AIClientRegistry()
+        clients = [registry.get_openai_client('sk-tenant-a'), registry.get_openai_client('sk-tenant-b')]
+
+        await registry.aclose()
+
+        assert all(client.is_closed() for client in clients)
+        assert registry.get_stats()['openai_clients'] == 0
+        # The next request builds a fresh client
+        assert registry.get_openai_client('sk-tenant-a') not in clients
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_warm_up_without_connecting_creates_the_client(self):
+        registry = AIClientRegistry()
+
+        results = await registry.warm_up(openai_key='sk-unit', connect=False)
+
+        assert results['openai']['status'] == 'warm'
+        assert registry.get_stats()['openai_clients_created'] == 1
+        assert registry.get_stats()['warmups'] == 1
+        await registry.aclose()
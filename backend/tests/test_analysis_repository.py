@@ -0,0 +1,306 @@
+"""
+Tests for ad analysis queries shared by the sync and async data access paths.
+"""
+import base64
+import copy
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.ads import get_analysis_history, get_analysis_history_page
+from app.core.database import Base
+from app.models.ad_analysis import AdAnalysis
+from app.services.analysis_repository import (
+    detail_query, full_analysis_data, history_page, history_query, save_analysis, store_tool_results
+)
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def make_analysis(user_id: int = 1, headline: str = "Fresh roasted coffee", **fields) -> AdAnalysis:
+    scores = {name: 70.0 for name in ('overall_score', 'clarity_score', 'persuasion_score',
+                                      'emotion_score', 'cta_strength_score', 'platform_fit_score')}
+    return AdAnalysis(**{
+        'id': str(uuid.uuid4()),
+        'user_id': user_id,
+        'headline': headline,
+        'body_text': "Small batches roasted every Monday.",
+        'cta': "Order now",
+        'platform': 'facebook',
+        **scores,
+        **fields
+    })
+
+
+def read_all_pages(db, user_id: int, limit: int, max_pages: int = 20):
+    """Follow next_cursor to the end; fails instead of looping forever"""
+    headlines, cursor = [], None
+    for _ in range(max_pages):
+        page = history_page(db.execute(history_query(user_id, limit + 1, cursor=cursor)).scalars().all(), limit)
+        headlines.extend(item['headline'] for item in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return headlines
+    pytest.fail(f"history did not end after {max_pages} pages: {headlines}")
+
+
+class TestCursor:
+    """Test suite for encode_cursor and decode_cursor"""
+
+    @pytest.mark.parametrize('created_at', [
+        datetime(2026, 10, 16, 12, 0, 7),
+        datetime(2026, 10, 16, 12, 0, 7, 123456),
+        datetime(2026, 10, 16, 12, 0, 7, tzinfo=timezone.utc),
+        datetime(2026, 10, 16, 12, 0, 7, 500, tzinfo=timezone(timedelta(hours=2))),
+    ])
+    def test_round_trip(self, created_at):
+        assert decode_cursor(encode_cursor(created_at, 'analysis-1')) == (created_at, 'analysis-1')
+
+    def test_row_id_may_contain_separator(self):
+        created_at = datetime(2026, 10, 16, 12, 0, 7)
+
+        assert decode_cursor(encode_cursor(created_at, 'a|b'))[1] == 'a|b'
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor(datetime(2026, 10, 16, 12, 0, 7), '???>>>')
+
+        assert '=' not in cursor and '+' not in cursor and '/' not in cursor
+
+    @pytest.mark.parametrize('cursor', [
+        '',
+        'not a cursor!',
+        base64.urlsafe_b64encode(b'no separator').decode('ascii'),
+        base64.urlsafe_b64encode(b'yesterday|analysis-1').decode('ascii'),
+    ])
+    def test_malformed_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestHistoryPage:
+    """Test suite for history_page"""
+
+    ROWS = [
+        SimpleNamespace(id=f'analysis-{index}', headline=f"Headline {index}", platform='facebook',
+                        overall_score=70.0, created_at=datetime(2026, 10, 16, 12, 0, 10 - index))
+        for index in range(3)
+    ]
+
+    def test_extra_row_means_another_page(self):
+        page = history_page(self.ROWS, 2)
+
+        assert [item['id'] for item in page['items']] == ['analysis-0', 'analysis-1']
+        assert decode_cursor(page['next_cursor']) == (self.ROWS[1].created_at, 'analysis-1')
+
+    def test_last_page_has_no_cursor(self):
+        page = history_page(self.ROWS, 3)
+
+        assert len(page['items']) == 3
+        assert page['next_cursor'] is None
+        assert history_page([], 10) == {'items': [], 'next_cursor': None}
+
+    def test_item_shape(self):
+        assert history_page(self.ROWS[:1], 1)['items'][0] == {
+            'id': 'analysis-0',
+            'headline': "Headline 0",
+            'platform': 'facebook',
+            'overall_score': 70.0,
+            'created_at': '2026-10-16T12:00:10'
+        }
+
+
+class TestHistoryQuery:
+    """history_query keyset pagination against the database"""
+
+    def test_server_default_timestamps_in_one_second(self, db_session):
+        """Regression: second-precision created_at values on SQLite paged forever"""
+        for index in range(5):
+            db_session.add(make_analysis(headline=f"Headline {index}"))
+        db_session.flush()
+
+        headlines = read_all_pages(db_session, 1, 2)
+
+        assert sorted(headlines) == [f"Headline {index}" for index in range(5)]
+
+    def test_equal_sub_second_timestamps_break_ties_on_id(self, db_session):
+        base = datetime(2026, 10, 16, 12, 0, 7, 250)
+        db_session.add(make_analysis(headline="Newest", created_at=base + timedelta(microseconds=1)))
+        db_session.add(make_analysis(headline="Oldest", created_at=base - timedelta(seconds=1)))
+        for index in range(3):
+            db_session.add(make_analysis(headline=f"Tied {index}", created_at=base))
+        db_session.flush()
+
+        headlines = read_all_pages(db_session, 1, 2)
+
+        assert headlines[0] == "Newest"
+        assert headlines[-1] == "Oldest"
+        assert sorted(headlines[1:4]) == [f"Tied {index}" for index in range(3)]
+
+    def test_pages_are_newest_first_and_per_user(self, db_session):
+        base = datetime(2026, 10, 16, 12, 0, 0)
+        for index in range(4):
+            db_session.add(make_analysis(headline=f"Headline {index}", created_at=base + timedelta(minutes=index)))
+        db_session.add(make_analysis(user_id=2, headline="Other user", created_at=base))
+        db_session.flush()
+
+        assert read_all_pages(db_session, 1, 3) == ["Headline 3", "Headline 2", "Headline 1", "Headline 0"]
+
+    def test_malformed_cursor_raises(self):
+        with pytest.raises(ValueError):
+            history_query(1, 10, cursor='not a cursor!')
+
+
+@pytest.fixture
+def history_databases(tmp_path):
+    """A sync Session and an AsyncSession on the same SQLite file with committed analyses"""
+    path = tmp_path / 'history.db'
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    base = datetime(2026, 10, 16, 12, 0, 0)
+    for index in range(5):
+        db.add(make_analysis(headline=f"Headline {index}", created_at=base + timedelta(minutes=index)))
+    db.add(make_analysis(user_id=2, headline="Other user", created_at=base))
+    db.commit()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async_db = sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)()
+    yield db, async_db
+    db.close()
+    engine.dispose()
+    async_engine.sync_engine.dispose()
+
+
+class TestHistoryEndpoints:
+    """/history and /history/page answer the same on the sync and async paths"""
+
+    USER = SimpleNamespace(id=1)
+
+    @pytest.mark.asyncio
+    async def test_history_paths_agree(self, history_databases):
+        db, async_db = history_databases
+
+        sync_history = await get_analysis_history(limit=3, offset=1, db=db, async_db=None, current_user=self.USER)
+        async_history = await get_analysis_history(limit=3, offset=1, db=None, async_db=async_db,
+                                                   current_user=self.USER)
+        await async_db.close()
+
+        assert [item['headline'] for item in sync_history] == ["Headline 3", "Headline 2", "Headline 1"]
+        assert async_history == sync_history
+
+    @pytest.mark.asyncio
+    async def test_history_page_paths_agree(self, history_databases):
+        db, async_db = history_databases
+        pages = {}
+        for path, sessions in (('sync', {'db': db, 'async_db': None}), ('async', {'db': None, 'async_db': async_db})):
+            cursor, pages[path] = None, []
+            while True:
+                page = await get_analysis_history_page(limit=2, cursor=cursor, current_user=self.USER, **sessions)
+                pages[path].append(page)
+                cursor = page['next_cursor']
+                if cursor is None:
+                    break
+        await async_db.close()
+
+        assert [[item['headline'] for item in page['items']] for page in pages['sync']] == [
+            ["Headline 4", "Headline 3"], ["Headline 2", "Headline 1"], ["Headline 0"]
+        ]
+        assert pages['async'] == pages['sync']
+
+    @pytest.mark.asyncio
+    async def test_history_page_rejects_malformed_cursor(self, history_databases):
+        db, async_db = history_databases
+
+        for sessions in ({'db': db, 'async_db': None}, {'db': None, 'async_db': async_db}):
+            with pytest.raises(HTTPException) as exc_info:
+                await get_analysis_history_page(limit=2, cursor='not a cursor!', current_user=self.USER, **sessions)
+            assert exc_info.value.status_code == 400
+        await async_db.close()
+
+
+ANALYSIS_DATA = {
+    'scores': {'overall': 72.5, 'clarity': 80},
+    'orchestration_result': {
+        'success': True,
+        'execution_time': 1.8,
+        'tool_results': {
+            'readability_analyzer': {'score': 80, 'insights': ["Short sentences"], 'raw': {'grade': 6.1}},
+            'emotion_analyzer': {'score': 65, 'insights': [], 'raw': {'primary': 'trust'}},
+        }
+    }
+}
+
+
+class TestToolResultStorage:
+    """store_tool_results and full_analysis_data round-trip analysis_data"""
+
+    def test_round_trip_in_memory(self):
+        analysis = make_analysis(analysis_data=copy.deepcopy(ANALYSIS_DATA))
+
+        store_tool_results(analysis)
+
+        assert {row.tool_name for row in analysis.tool_results} == {'readability_analyzer', 'emotion_analyzer'}
+        assert 'tool_results' not in analysis.analysis_data['orchestration_result']
+        assert analysis.analysis_data['orchestration_result']['execution_time'] == 1.8
+        assert full_analysis_data(analysis) == ANALYSIS_DATA
+
+    def test_round_trip_through_the_database(self, db_session):
+        analysis = make_analysis(analysis_data=copy.deepcopy(ANALYSIS_DATA))
+        store_tool_results(analysis)
+        db_session.add(analysis)
+        db_session.flush()
+        db_session.expunge_all()
+
+        saved = db_session.execute(detail_query(analysis.id, 1)).scalar_one()
+
+        assert len(saved.tool_results) == 2
+        assert full_analysis_data(saved) == ANALYSIS_DATA
+
+    @pytest.mark.asyncio
+    async def test_round_trip_through_save_analysis(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'detail.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        Session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        analysis = make_analysis(analysis_data=copy.deepcopy(ANALYSIS_DATA))
+
+        async with Session() as db:
+            await save_analysis(db, analysis)
+        async with Session() as db:
+            saved = (await db.execute(detail_query(analysis.id, 1))).scalar_one()
+            missing = (await db.execute(detail_query(analysis.id, 2))).scalar_one_or_none()
+        await engine.dispose()
+
+        assert full_analysis_data(saved) == ANALYSIS_DATA
+        assert missing is None
+
+    def test_legacy_row_passes_through_unchanged(self, db_session):
+        legacy_data = copy.deepcopy(ANALYSIS_DATA)
+        db_session.add(make_analysis(id='legacy-analysis', analysis_data=legacy_data))
+        db_session.flush()
+        db_session.expunge_all()
+
+        saved = db_session.execute(detail_query('legacy-analysis', 1)).scalar_one()
+
+        assert saved.tool_results == []
+        assert full_analysis_data(saved) == ANALYSIS_DATA
+
+    @pytest.mark.parametrize('analysis_data', [
+        None,
+        {'scores': {'overall': 72.5}},
+        {'orchestration_result': {'success': False, 'tool_results': {}}},
+        {'orchestration_result': 'unexpected'},
+    ])
+    def test_data_without_tool_results_is_left_alone(self, analysis_data):
+        analysis = make_analysis(analysis_data=copy.deepcopy(analysis_data))
+
+        store_tool_results(analysis)
+
+        assert not analysis.tool_results
+        assert analysis.analysis_data == analysis_data
+        assert full_analysis_data(analysis) == analysis_data
@@ -0,0 +1,94 @@
+"""
+Tests for the grouped user analytics query.
+"""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session
+
+from app.services.analytics_service import AnalyticsService
+
+
+def grouped_row(platform, month, analyses, score_sum, created_at=None):
+    return SimpleNamespace(
+        subscription_tier=SimpleNamespace(value='growth'),
+        monthly_analyses=12,
+        created_at=created_at or datetime.utcnow() - timedelta(days=10),
+        platform=platform,
+        month=month,
+        analyses=analyses,
+        score_sum=score_sum
+    )
+
+
+def mocked_session(rows) -> MagicMock:
+    db = MagicMock()
+    db.query.return_value.outerjoin.return_value.filter.return_value.group_by.return_value.all.return_value = rows
+    return db
+
+
+class TestUserAnalytics:
+    """Test suite for AnalyticsService.get_user_analytics"""
+
+    def test_grouped_rows_become_dashboard_analytics(self):
+        db = mocked_session([
+            grouped_row('facebook', datetime(2026, 9, 1), 2, 150.0),
+            grouped_row('facebook', None, 1, 60.0),  # older than six months
+            grouped_row('linkedin', datetime(2026, 10, 1), 1, 90.0),
+            grouped_row('linkedin', datetime(2026, 9, 1), 2, 140.0),
+        ])
+
+        analytics = AnalyticsService(db).get_user_analytics(1)
+
+        assert analytics['total_analyses'] == 6
+        assert analytics['avg_score_improvement'] == 73.3
+        assert analytics['top_performing_platforms'] == [
+            {'platform': 'linkedin', 'avg_score': 230.0 / 3, 'count': 3},
+            {'platform': 'facebook', 'avg_score': 70.0, 'count': 3},
+        ]
+        assert analytics['monthly_usage'] == [
+            {'month': 'Sep 2026', 'analyses': 4, 'avg_score': 72.5},
+            {'month': 'Oct 2026', 'analyses': 1, 'avg_score': 90.0},
+        ]
+        assert analytics['subscription_analytics'] == {
+            'current_tier': 'growth', 'monthly_analyses': 12, 'account_age_days': 10
+        }
+
+    def test_user_without_analyses(self):
+        # The outer join yields one row with no analyses
+        db = mocked_session([grouped_row(None, None, 0, None)])
+
+        assert AnalyticsService(db).get_user_analytics(1) == {
+            'total_analyses': 0,
+            'avg_score_improvement': 0,
+            'top_performing_platforms': [],
+            'monthly_usage': {},
+            'subscription_analytics': {}
+        }
+
+    def test_aware_created_at_and_missing_tier(self):
+        row = grouped_row('facebook', datetime(2026, 9, 1), 1, 80.0,
+                          created_at=datetime.now(timezone.utc) - timedelta(days=3))
+        row.subscription_tier = None
+
+        analytics = AnalyticsService(mocked_session([row])).get_user_analytics(1)
+
+        assert analytics['subscription_analytics']['current_tier'] == 'free'
+        assert analytics['subscription_analytics']['account_age_days'] == 3
+
+    def test_postgresql_groups_by_month_column(self, monkeypatch):
+        compiled = {}
+
+        def capture(query):
+            compiled['sql'] = str(query.statement.compile(dialect=postgresql.dialect()))
+            return []
+
+        monkeypatch.setattr(Query, 'all', capture)
+        AnalyticsService(Session()).get_user_analytics(1)
+
+        group_by = compiled['sql'].split('GROUP BY')[1]
+        assert group_by.split(',')[-1].strip() == 'month'
+        assert 'CASE' not in group_by
+        assert compiled['sql'].count('%(created_at_1)s') == 1
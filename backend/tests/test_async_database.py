@@ -0,0 +1,138 @@
+"""
+Tests for async data access and query timing.
+"""
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import async_database
+from app.core.async_database import QueryStats, TimedConnection
+
+
+class FakeRawConnection:
+    """Stands in for an asyncpg connection"""
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.calls = []
+
+    async def fetch(self, query, *args):
+        self.calls.append((query, args))
+        if self.error is not None:
+            raise self.error
+        return [{'id': 1}]
+
+    def transaction(self):
+        return 'transaction'
+
+
+@pytest.fixture
+def sqlite_async_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+    yield engine
+    engine.sync_engine.dispose()
+
+
+class TestQueryStats:
+    """Test suite for QueryStats"""
+
+    def test_empty(self):
+        assert QueryStats().get_stats() == {
+            'queries': 0, 'avg_ms': 0.0, 'max_ms': 0.0, 'slow_queries': 0, 'errors': 0, 'slow_query_ms': 200.0
+        }
+
+    def test_records_timing_and_errors(self):
+        stats = QueryStats(slow_query_ms=100)
+        stats.record("SELECT 1", 10)
+        stats.record("SELECT 2", 30, failed=True)
+
+        assert stats.get_stats() == {
+            'queries': 2, 'avg_ms': 20.0, 'max_ms': 30.0, 'slow_queries': 0, 'errors': 1, 'slow_query_ms': 100
+        }
+
+    def test_slow_query_is_logged_on_one_line(self, caplog):
+        stats = QueryStats(slow_query_ms=100)
+
+        with caplog.at_level(logging.WARNING, logger='app.core.async_database'):
+            stats.record("SELECT *\n    FROM ad_analyses\n    WHERE user_id = $1", 100)
+
+        assert stats.slow_queries == 1
+        assert "Slow query (100.0ms): SELECT * FROM ad_analyses WHERE user_id = $1" in caplog.text
+
+
+class TestTimedConnection:
+    """Test suite for TimedConnection"""
+
+    @pytest.mark.asyncio
+    async def test_records_queries(self, monkeypatch):
+        stats = QueryStats()
+        monkeypatch.setattr(async_database, 'query_stats', stats)
+        raw = FakeRawConnection()
+
+        rows = await TimedConnection(raw).fetch("SELECT id FROM users WHERE id = $1", 1)
+
+        assert rows == [{'id': 1}]
+        assert raw.calls == [("SELECT id FROM users WHERE id = $1", (1,))]
+        assert stats.queries == 1
+
+    @pytest.mark.asyncio
+    async def test_records_failures(self, monkeypatch):
+        stats = QueryStats()
+        monkeypatch.setattr(async_database, 'query_stats', stats)
+
+        with pytest.raises(RuntimeError):
+            await TimedConnection(FakeRawConnection(RuntimeError("connection lost"))).fetch("SELECT 1")
+
+        assert stats.queries == 1
+        assert stats.errors == 1
+
+    def test_other_methods_pass_through(self):
+        assert TimedConnection(FakeRawConnection()).transaction() == 'transaction'
+
+
+class TestEngineInstrumentation:
+    """Statements run on an instrumented engine are timed"""
+
+    @pytest.mark.asyncio
+    async def test_statements_and_errors_are_recorded(self, monkeypatch, sqlite_async_engine):
+        stats = QueryStats()
+        monkeypatch.setattr(async_database, 'query_stats', stats)
+        async_database._instrument_engine(sqlite_async_engine)
+
+        async with sqlite_async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            with pytest.raises(Exception):
+                await conn.execute(text("SELECT * FROM missing_table"))
+
+        assert stats.queries == 2
+        assert stats.errors == 1
+
+
+class TestOptionalAsyncDb:
+    """Test suite for get_optional_async_db and get_async_db"""
+
+    @pytest.mark.asyncio
+    async def test_yields_none_without_async_database(self, monkeypatch):
+        # SQLite DATABASE_URLs get no async engine
+        monkeypatch.setattr(async_database, 'AsyncSessionLocal', None)
+        monkeypatch.setattr(async_database, 'async_engine', None)
+
+        sessions = [session async for session in async_database.get_optional_async_db()]
+
+        assert sessions == [None]
+        assert async_database.async_db_available() is False
+        with pytest.raises(RuntimeError):
+            await async_database.get_async_db().__anext__()
+
+    @pytest.mark.asyncio
+    async def test_yields_session_with_async_database(self, monkeypatch, sqlite_async_engine):
+        monkeypatch.setattr(async_database, 'AsyncSessionLocal', sessionmaker(
+            bind=sqlite_async_engine, class_=AsyncSession, expire_on_commit=False
+        ))
+
+        async for session in async_database.get_optional_async_db():
+            assert isinstance(session, AsyncSession)
+            assert (await session.execute(text("SELECT 1"))).scalar() == 1
@@ -0,0 +1,309 @@
+"""
+Tests for the dashboard rollup query layer.
+
+Rollup answers are checked against the same metrics computed directly from
+raw ad_analyses rows, through both the asyncpg and the Supabase paths.
+"""
+import random
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from api.dashboard_rollups import (
+    IMPROVEMENT_BASELINE, SCORE_BUCKETS, daily_activity, fetch_window_slices,
+    fetch_window_slices_supabase, period_metrics, rollup_rows_from_analyses,
+    score_bucket, score_distribution, split_window
+)
+
+USER_ID = 'user-1'
+FIRST_DAY = datetime(2026, 9, 1, tzinfo=timezone.utc)
+DAYS = 30
+PLATFORMS = ['facebook', 'instagram', 'linkedin', None]
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def make_analyses(rng: random.Random, count: int = 600):
+    analyses = []
+    for index in range(count):
+        created_at = FIRST_DAY + timedelta(seconds=rng.randrange(DAYS * 86400))
+        if index % 25 == 0:
+            # Rows exactly on a day boundary
+            created_at = created_at.replace(hour=0, minute=0, second=0)
+        analyses.append({
+            'user_id': USER_ID if index % 10 else 'user-2',
+            'platform': rng.choice(PLATFORMS),
+            'industry': rng.choice(['food', 'saas', None]),
+            'overall_score': None if index % 50 == 7 else round(rng.uniform(20, 100), 1),
+            'created_at': created_at
+        })
+    return analyses
+
+
+def make_rollups(analyses):
+    """The rollup table as the trigger maintains it: one slice per (user, day, platform, industry)"""
+    rollups = []
+    for user_id in {analysis['user_id'] for analysis in analyses}:
+        for row in rollup_rows_from_analyses([a for a in analyses if a['user_id'] == user_id]):
+            rollups.append({**row, 'user_id': user_id})
+    return rollups
+
+
+def expected_metrics(analyses, start: datetime, end: datetime):
+    scores = [a['overall_score'] for a in analyses
+              if a['user_id'] == USER_ID and start <= a['created_at'] <= end and a['overall_score'] is not None]
+    days = {}
+    for a in analyses:
+        if a['user_id'] == USER_ID and start <= a['created_at'] <= end and a['overall_score'] is not None:
+            days.setdefault(a['created_at'].date().isoformat(), []).append(a['overall_score'])
+    return {
+        'period': {
+            'ads_analyzed': len(scores),
+            'avg_improvement': sum(max(s - IMPROVEMENT_BASELINE, 0) for s in scores) / len(scores) if scores else 0.0,
+            'avg_score': sum(scores) / len(scores) if scores else 0.0,
+            'top_performing': max(scores) if scores else 0
+        },
+        'distribution': {column: sum(1 for s in scores if score_bucket(s) == column) for column, _, _ in SCORE_BUCKETS},
+        'daily': {day: (len(values), round(sum(values) / len(values), 1)) for day, values in days.items()}
+    }
+
+
+class FakeConnection:
+    """asyncpg connection answering the rollup and raw slice queries from lists"""
+
+    def __init__(self, analyses, rollups):
+        self.analyses = analyses
+        self.rollups = rollups
+        self.queries = []
+
+    async def fetch(self, query, user_id, low, high):
+        if 'ad_analysis_daily_rollups' in query:
+            self.queries.append(('rollups', low, high))
+            return [row for row in self.rollups if row['user_id'] == user_id and low <= row['day'] < high]
+        inclusive = '<= $3' in query
+        self.queries.append(('raw', low, high, inclusive))
+        return rollup_rows_from_analyses([
+            a for a in self.analyses
+            if a['user_id'] == user_id and a['overall_score'] is not None and low <= a['created_at']
+            and (a['created_at'] <= high if inclusive else a['created_at'] < high)
+        ])
+
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """The subset of the Supabase query builder fetch_window_slices_supabase uses"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+
+    @staticmethod
+    def _value(column, value):
+        if column == 'created_at':
+            return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+        return value if isinstance(value, str) else value.isoformat()
+
+    def _filter(self, column, test):
+        self.filters.append(lambda row: test(self._value(column, row[column])))
+        return self
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, lambda v: v == value)
+
+    def gte(self, column, value):
+        return self._filter(column, lambda v: v >= self._value(column, value))
+
+    def lt(self, column, value):
+        return self._filter(column, lambda v: v < self._value(column, value))
+
+    def lte(self, column, value):
+        return self._filter(column, lambda v: v <= self._value(column, value))
+
+    @property
+    def not_(self):
+        query = self
+
+        class Not:
+            def is_(self, column, value):
+                query.filters.append(lambda row: row[column] is not None)
+                return query
+        return Not()
+
+    def execute(self):
+        return FakeResult([dict(row) for row in self.rows if all(test(row) for test in self.filters)])
+
+
+class FakeSupabase:
+    def __init__(self, analyses, rollups):
+        # Supabase returns dates and timestamps as ISO strings
+        self.tables = {
+            'ad_analyses': [{**a, 'created_at': a['created_at'].isoformat()} for a in analyses],
+            'ad_analysis_daily_rollups': [{**r, 'day': r['day'].isoformat()} for r in rollups]
+        }
+
+    def table(self, name):
+        return FakeQuery(self.tables[name])
+
+
+def random_windows(rng: random.Random, count: int = 40):
+    windows = [
+        (utc(2026, 9, 3), utc(2026, 9, 10)),                    # both edges at midnight
+        (utc(2026, 9, 3, 12, 30), utc(2026, 9, 3, 18)),         # within one day
+        (utc(2026, 9, 3, 22), utc(2026, 9, 4, 2)),              # across one midnight
+        (utc(2026, 9, 1), utc(2026, 10, 1)),                    # everything
+    ]
+    for _ in range(count):
+        start = FIRST_DAY + timedelta(seconds=rng.randrange(DAYS * 86400))
+        windows.append((start, start + timedelta(seconds=rng.randrange(12 * 86400))))
+    return windows
+
+
+def assert_matches(rows, expected):
+    metrics = period_metrics(rows)
+    assert metrics['ads_analyzed'] == expected['period']['ads_analyzed']
+    assert metrics['avg_score'] == pytest.approx(expected['period']['avg_score'])
+    assert metrics['avg_improvement'] == pytest.approx(expected['period']['avg_improvement'])
+    assert metrics['top_performing'] == expected['period']['top_performing']
+    assert {entry['range']: entry['count'] for entry in score_distribution(rows)} == {
+        label: expected['distribution'][column] for column, label, _ in SCORE_BUCKETS
+        if expected['distribution'][column]
+    }
+    assert {entry['date']: (entry['count'], entry['avgScore']) for entry in daily_activity(rows, DAYS + 1)} == \
+        expected['daily']
+
+
+class TestRollupsMatchRawRows:
+    """Rollups plus edge-day aggregation give the same metrics as raw rows"""
+
+    @pytest.mark.asyncio
+    async def test_asyncpg_path(self):
+        rng = random.Random(21)
+        analyses = make_analyses(rng)
+        db = FakeConnection(analyses, make_rollups(analyses))
+
+        for start, end in random_windows(rng):
+            rows = await fetch_window_slices(db, USER_ID, start, end)
+            assert_matches(rows, expected_metrics(analyses, start, end))
+
+    def test_supabase_path(self):
+        rng = random.Random(42)
+        analyses = make_analyses(rng)
+        client = FakeSupabase(analyses, make_rollups(analyses))
+
+        for start, end in random_windows(rng):
+            rows = fetch_window_slices_supabase(client, USER_ID, start, end)
+            assert_matches(rows, expected_metrics(analyses, start, end))
+
+    @pytest.mark.asyncio
+    async def test_naive_window_is_utc(self):
+        rng = random.Random(7)
+        analyses = make_analyses(rng)
+        db = FakeConnection(analyses, make_rollups(analyses))
+
+        rows = await fetch_window_slices(db, USER_ID, datetime(2026, 9, 5, 6), datetime(2026, 9, 20, 18))
+
+        assert_matches(rows, expected_metrics(analyses, utc(2026, 9, 5, 6), utc(2026, 9, 20, 18)))
+
+    @pytest.mark.asyncio
+    async def test_whole_days_come_from_rollups(self):
+        db = FakeConnection([], [])
+
+        await fetch_window_slices(db, USER_ID, utc(2026, 9, 5, 6), utc(2026, 9, 20, 18))
+
+        assert db.queries == [
+            ('rollups', date(2026, 9, 6), date(2026, 9, 20)),
+            ('raw', utc(2026, 9, 5, 6), utc(2026, 9, 6), False),
+            ('raw', utc(2026, 9, 20), utc(2026, 9, 20, 18), True),
+        ]
+
+
+class TestSplitWindow:
+    """Test suite for split_window"""
+
+    def test_partial_edges(self):
+        window = split_window(utc(2026, 9, 5, 6), utc(2026, 9, 20, 18))
+
+        assert (window.full_start, window.full_end) == (date(2026, 9, 6), date(2026, 9, 20))
+        assert window.has_full_days
+
+    def test_start_at_midnight_is_a_full_day(self):
+        window = split_window(utc(2026, 9, 5), utc(2026, 9, 20, 18))
+
+        assert window.full_start == date(2026, 9, 5)
+        assert window.raw_ranges() == [(utc(2026, 9, 20), utc(2026, 9, 20, 18), True)]
+
+    def test_end_at_midnight_still_reads_the_end_instant(self):
+        window = split_window(utc(2026, 9, 5), utc(2026, 9, 20))
+
+        assert window.full_end == date(2026, 9, 20)
+        assert window.raw_ranges() == [(utc(2026, 9, 20), utc(2026, 9, 20), True)]
+
+    def test_window_without_full_days(self):
+        for start, end in [(utc(2026, 9, 5, 6), utc(2026, 9, 5, 18)),
+                           (utc(2026, 9, 5, 22), utc(2026, 9, 6, 2))]:
+            window = split_window(start, end)
+
+            assert not window.has_full_days
+            assert window.raw_ranges() == [(start, end, True)]
+
+    def test_naive_and_offset_datetimes_are_utc(self):
+        offset = timezone(timedelta(hours=-5))
+        window = split_window(datetime(2026, 9, 5, 20, tzinfo=offset), datetime(2026, 9, 10, 12))
+
+        assert window.start == utc(2026, 9, 6, 1)
+        assert window.end == utc(2026, 9, 10, 12)
+        assert window.full_start == date(2026, 9, 7)
+
+
+class TestDashboardAggregates:
+    """Test suite for period_metrics, score_distribution and daily_activity"""
+
+    ROWS = rollup_rows_from_analyses([
+        {'platform': 'facebook', 'overall_score': 95, 'created_at': '2026-09-05T10:00:00Z'},
+        {'platform': 'facebook', 'overall_score': 45, 'created_at': '2026-09-05T11:00:00Z'},
+        {'platform': 'linkedin', 'overall_score': 82.5, 'created_at': '2026-09-06T09:00:00+00:00'},
+        {'platform': 'linkedin', 'overall_score': None, 'created_at': '2026-09-06T09:30:00+00:00'},
+    ])
+
+    def test_period_metrics(self):
+        metrics = period_metrics(self.ROWS)
+
+        assert metrics['ads_analyzed'] == 3
+        assert metrics['avg_score'] == pytest.approx((95 + 45 + 82.5) / 3)
+        assert metrics['avg_improvement'] == pytest.approx((45 + 0 + 32.5) / 3)
+        assert metrics['top_performing'] == 95
+
+    def test_empty_window(self):
+        assert period_metrics([]) == {'ads_analyzed': 0, 'avg_improvement': 0.0, 'avg_score': 0.0,
+                                      'top_performing': 0}
+        assert score_distribution([]) == []
+        assert daily_activity([], 7) == []
+
+    def test_score_distribution_skips_empty_buckets(self):
+        assert score_distribution(self.ROWS) == [
+            {'range': 'Excellent (90-100)', 'count': 1},
+            {'range': 'Good (80-89)', 'count': 1},
+            {'range': 'Needs Improvement (<60)', 'count': 1},
+        ]
+
+    def test_daily_activity_most_recent_first(self):
+        assert daily_activity(self.ROWS, 7) == [
+            {'date': '2026-09-06', 'count': 1, 'avgScore': 82.5},
+            {'date': '2026-09-05', 'count': 2, 'avgScore': 70.0},
+        ]
+        assert len(daily_activity(self.ROWS, 1)) == 1
+
+    def test_bucket_boundaries(self):
+        assert [score_bucket(score) for score in (100, 90, 89.9, 80, 70, 60, 59.9, 0)] == [
+            'bucket_excellent', 'bucket_excellent', 'bucket_good', 'bucket_good',
+            'bucket_fair', 'bucket_poor', 'bucket_needs_improvement', 'bucket_needs_improvement'
+        ]
@@ -0,0 +1,88 @@
+"""
+Tests for the AI generation cache.
+"""
+import pytest
+
+from app.services.generation_cache import GenerationCache
+
+
+RESULT = {
+    'headline': "Fresh roasted coffee, delivered weekly",
+    'body_text': "Beans roasted on Monday arrive at your door by Wednesday.",
+    'cta': "Start your subscription",
+    'improvement_reason': "Concrete delivery promise",
+    'variant_type': 'persuasive'
+}
+
+
+def make_key(cache: GenerationCache, tenant_id, provider='openai', prompt="Rewrite this ad"):
+    return cache.make_key(tenant_id, provider, 'gpt-4', prompt, {'temperature': 0.7})
+
+
+class TestGenerationCache:
+    """Test suite for GenerationCache"""
+
+    @pytest.mark.asyncio
+    async def test_tenants_are_isolated(self):
+        """The same request from another tenant must not see the first tenant's result"""
+        cache = GenerationCache()
+        await cache.set(make_key(cache, 'tenant-a'), 'tenant-a', RESULT)
+
+        assert await cache.get(make_key(cache, 'tenant-a')) == RESULT
+        assert await cache.get(make_key(cache, 'tenant-b')) is None
+        assert await cache.get(make_key(cache, None)) is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tenant_keeps_other_tenants(self):
+        cache = GenerationCache()
+        await cache.set(make_key(cache, 'tenant-a'), 'tenant-a', RESULT)
+        await cache.set(make_key(cache, 'tenant-b'), 'tenant-b', RESULT)
+
+        await cache.invalidate_tenant('tenant-a')
+
+        assert await cache.get(make_key(cache, 'tenant-a')) is None
+        assert await cache.get(make_key(cache, 'tenant-b')) == RESULT
+
+    def test_high_creativity_bypasses_cache(self):
+        """Generations above max_creativity are never cached"""
+        cache = GenerationCache(max_creativity=7)
+
+        assert cache.is_cacheable(7) is True
+        assert cache.is_cacheable(8) is False
+        assert cache.get_stats()['bypassed'] == 1
+
+    def test_disabled_cache_bypasses_everything(self):
+        cache = GenerationCache(enabled=False)
+
+        assert cache.is_cacheable(1) is False
+
+    @pytest.mark.asyncio
+    async def test_results_are_deep_copies(self):
+        """Neither the stored result nor a returned hit may be mutated through a caller's reference"""
+        cache = GenerationCache()
+        key = make_key(cache, 'tenant-a')
+        result = {**RESULT, 'tags': ['coffee']}
+        await cache.set(key, 'tenant-a', result, tokens=120)
+
+        result['tags'].append('changed after set')
+        first = await cache.get(key)
+        first['tags'].append('changed by caller')
+        second = await cache.get(key)
+
+        assert second['tags'] == ['coffee']
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_get_first_checks_keys_in_order_as_one_lookup(self):
+        cache = GenerationCache()
+        openai_key = make_key(cache, 'tenant-a', provider='openai')
+        gemini_key = make_key(cache, 'tenant-a', provider='gemini')
+        await cache.set(gemini_key, 'tenant-a', RESULT, tokens=100)
+
+        assert await cache.get_first([openai_key, gemini_key]) == RESULT
+        assert await cache.get_first([openai_key]) is None
+
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['tokens_saved'] == 100
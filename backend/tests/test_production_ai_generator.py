@@ -0,0 +1,627 @@
+"""
+Tests for ProductionAIService generation, with provider calls replaced by
+in-process stand-ins.
+"""
+import asyncio
+import json
+
+import pytest
+
+from app.core.exceptions import AIProviderUnavailable
+from app.services.ai_client_registry import AIClientRegistry
+from app.services.generation_cache import GenerationCache
+from app.services.production_ai_generator import AIProviderConfig, ProductionAIService
+from app.services.prompt_templates import PromptTemplateRegistry
+from app.services.provider_rate_governor import ProviderRateGovernor
+from app.services.provider_router import ProviderRouter
+
+
+AD = {
+    'headline': "Fresh roasted coffee beans",
+    'body_text': "Small batches roasted every Monday and shipped the same day.",
+    'cta': "Order now",
+    'platform': 'facebook',
+    'industry': 'food'
+}
+
+
+def generated(provider: str) -> dict:
+    return {
+        'headline': f"Coffee roasted this week ({provider})",
+        'body_text': "Beans roasted on Monday are in your cup by Wednesday.",
+        'cta': "Start your subscription",
+        'improvement_reason': "Concrete freshness promise",
+        'variant_type': 'persuasive',
+        'ai_generated': True
+    }
+
+
+def make_service(router: ProviderRouter = None, cache: GenerationCache = None) -> ProductionAIService:
+    """Service with openai and gemini configured and no shared worker state"""
+    service = ProductionAIService(
+        'sk-unit',
+        client_registry=AIClientRegistry(),
+        generation_cache=cache or GenerationCache(),
+        router=router or ProviderRouter(),
+        prompt_templates=PromptTemplateRegistry()
+    )
+    service.providers['gemini'] = AIProviderConfig(
+        name='gemini', priority=2, cost_per_1k_tokens=0.001, max_tokens=2048,
+        rate_limit_rpm=60, required_env_var='GEMINI_API_KEY'
+    )
+    service.usage_stats['gemini'] = {'requests': 0, 'tokens': 0, 'cost': 0}
+    service.router.register('gemini', 0.001)
+    service.rate_governors = {name: ProviderRateGovernor(name, 0) for name in service.providers}
+    return service
+
+
+def stub_provider(service: ProductionAIService, provider: str, delay: float = 0.0, error: Exception = None):
+    """Replace a provider's generate call; returns the list of calls made"""
+    calls = []
+
+    async def generate(*args, prompt=None, ai_params=None, usage=None, **kwargs):
+        calls.append(prompt)
+        if delay:
+            await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        if usage is not None:
+            usage['tokens'] = 100
+        return generated(provider)
+
+    setattr(service, f"_{provider}_generate", generate)
+    return calls
+
+
+class TestGenerationCaching:
+    """Generation cache use by ProductionAIService"""
+
+    @pytest.mark.asyncio
+    async def test_failover_result_is_cached_under_the_producing_provider(self):
+        service = make_service()
+        stub_provider(service, 'openai', error=RuntimeError("upstream down"))
+        gemini_calls = stub_provider(service, 'gemini')
+
+        result = await service.generate_ad_alternative(AD, 'persuasive', tenant_id='tenant-a')
+        prompt = gemini_calls[0]
+        ai_params = service._resolve_sampling_params(AD, 'conversational', 5, 5, 'inspiring')
+
+        assert result['headline'].endswith("(gemini)")
+        assert await service.generation_cache.get(
+            service._generation_cache_key('tenant-a', 'gemini', prompt, ai_params)) is not None
+        assert await service.generation_cache.get(
+            service._generation_cache_key('tenant-a', 'openai', prompt, ai_params)) is None
+
+    @pytest.mark.asyncio
+    async def test_cached_result_survives_a_ranking_change(self):
+        service = make_service()
+        openai_calls = stub_provider(service, 'openai')
+        gemini_calls = stub_provider(service, 'gemini')
+        await service.generate_ad_alternative(AD, 'persuasive', tenant_id='tenant-a')
+
+        # openai's circuit opens, so gemini is now ranked first
+        for _ in range(service.router.providers['openai'].failure_threshold):
+            service.router.record_failure('openai', 1.0)
+        result = await service.generate_ad_alternative(AD, 'persuasive', tenant_id='tenant-a')
+
+        assert result['headline'].endswith("(openai)")
+        assert len(openai_calls) == 1
+        assert gemini_calls == []
+
+    @pytest.mark.asyncio
+    async def test_other_tenant_does_not_hit(self):
+        service = make_service()
+        openai_calls = stub_provider(service, 'openai')
+
+        await service.generate_ad_alternative(AD, 'persuasive', tenant_id='tenant-a')
+        await service.generate_ad_alternative(AD, 'persuasive', tenant_id='tenant-b')
+
+        assert len(openai_calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_high_creativity_is_not_cached(self):
+        service = make_service()
+        openai_calls = stub_provider(service, 'openai')
+
+        for _ in range(2):
+            await service.generate_ad_alternative(AD, 'persuasive', creativity_level=9, tenant_id='tenant-a')
+
+        assert len(openai_calls) == 2
+        assert service.generation_cache.get_stats()['stores'] == 0
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_are_independent_copies(self):
+        service = make_service()
+        stub_provider(service, 'openai')
+
+        first = await service.generate_ad_alternative(AD, 'persuasive', tenant_id='tenant-a')
+        first['headline'] = "changed by caller"
+        second = await service.generate_ad_alternative(AD, 'persuasive', tenant_id='tenant-a')
+
+        assert second['headline'].endswith("(openai)")
+
+
+class TestPromptBudget:
+    """Prompt token budget applied by ProductionAIService"""
+
+    def test_full_prompt_by_default(self):
+        service = make_service()
+
+        for platform in ('facebook', 'instagram', 'linkedin', 'tiktok'):
+            prompt = service._build_production_prompt({**AD, 'platform': platform}, 'persuasive')
+            assert "🎨 CREATIVE INSTRUCTIONS" in prompt
+
+        assert service.prompt_token_budget is None
+        assert service.prompt_templates.get_stats()['trimmed_renders'] == 0
+
+
+class FailingCompletions:
+    async def create(self, **kwargs):
+        raise RuntimeError("connection reset")
+
+
+class FailingClient:
+    def __init__(self):
+        self.chat = type('Chat', (), {'completions': FailingCompletions()})()
+
+
+class TestRateGovernance:
+    """Rate governor accounting around provider calls"""
+
+    @pytest.mark.asyncio
+    async def test_failed_call_refunds_its_token_estimate(self):
+        service = make_service()
+        governor = ProviderRateGovernor('openai', 0, tokens_per_minute=10000)
+        service.rate_governors['openai'] = governor
+        service.client_registry.get_openai_client = lambda api_key: FailingClient()
+
+        with pytest.raises(RuntimeError):
+            await service._openai_complete("Rewrite this coffee ad", {
+                'temperature': 0.7, 'presence_penalty': 0.0, 'frequency_penalty': 0.0
+            })
+
+        assert governor.tokens.available == pytest.approx(10000, abs=1)
+        assert governor.get_stats()['admitted'] == 1
+
+
+def seed_latency(router: ProviderRouter, provider: str, latency: float, samples: int = 10):
+    for _ in range(samples):
+        router.record_success(provider, latency)
+
+
+class TestRoutedGeneration:
+    """Hedging and failover in _generate_routed"""
+
+    @pytest.mark.asyncio
+    async def test_fails_over_to_next_provider(self):
+        service = make_service(router=ProviderRouter(cost_weight=0))
+        stub_provider(service, 'openai', error=RuntimeError("upstream down"))
+        stub_provider(service, 'gemini')
+
+        result = await service.generate_ad_alternative(AD, 'persuasive', creativity_level=9)
+
+        assert result['headline'].endswith("(gemini)")
+        state = service.router.get_state()
+        assert state['failovers'] == 1
+        assert state['providers']['openai']['consecutive_failures'] == 1
+
+    @pytest.mark.asyncio
+    async def test_all_providers_failing_raises(self):
+        service = make_service(router=ProviderRouter(cost_weight=0))
+        stub_provider(service, 'openai', error=RuntimeError("upstream down"))
+        stub_provider(service, 'gemini', error=RuntimeError("quota exceeded"))
+
+        with pytest.raises(AIProviderUnavailable) as exc_info:
+            await service.generate_ad_alternative(AD, 'persuasive', creativity_level=9)
+
+        assert exc_info.value.provider_name == 'all_providers'
+
+    @pytest.mark.asyncio
+    async def test_slow_provider_is_hedged(self):
+        router = ProviderRouter(cost_weight=0, min_hedge_delay=0.01, min_samples=1)
+        service = make_service(router=router)
+        seed_latency(router, 'openai', 0.01)
+        stub_provider(service, 'openai', delay=1.0)
+        stub_provider(service, 'gemini')
+
+        result = await service.generate_ad_alternative(AD, 'persuasive', creativity_level=9)
+
+        assert result['headline'].endswith("(gemini)")
+        state = router.get_state()
+        assert state['hedges'] == 1
+        assert state['hedge_wins'] == 1
+        # The cancelled hedge loser is not counted as a failure
+        assert state['providers']['openai']['consecutive_failures'] == 0
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_queue_time_is_not_latency_and_does_not_hedge(self):
+        router = ProviderRouter(cost_weight=0, min_hedge_delay=0.05, min_samples=1)
+        service = make_service(router=router)
+        seed_latency(router, 'openai', 0.01)
+        governor = ProviderRateGovernor('openai', requests_per_minute=300)
+        governor.requests._tokens = 0  # next slot frees up in 0.2s
+        service.rate_governors['openai'] = governor
+        stub_provider(service, 'openai')
+        gemini_calls = stub_provider(service, 'gemini')
+
+        result = await service.generate_ad_alternative(AD, 'persuasive', creativity_level=9)
+
+        assert result['headline'].endswith("(openai)")
+        assert gemini_calls == []
+        assert router.get_state()['hedges'] == 0
+        assert router.providers['openai'].latency_percentile(1.0) < 0.1
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_rejection_is_not_a_provider_failure(self):
+        service = make_service(router=ProviderRouter(cost_weight=0))
+        governor = ProviderRateGovernor('openai', requests_per_minute=1, max_wait=0.0)
+        governor.requests._tokens = 0
+        service.rate_governors['openai'] = governor
+        openai_calls = stub_provider(service, 'openai')
+        stub_provider(service, 'gemini')
+
+        for _ in range(6):
+            result = await service.generate_ad_alternative(AD, 'persuasive', creativity_level=9)
+            assert result['headline'].endswith("(gemini)")
+
+        health = service.router.providers['openai']
+        assert openai_calls == []
+        assert health.sample_count == 0
+        assert health.circuit == 'closed'
+        assert governor.get_stats()['rejected'] == 6
+
+    @pytest.mark.asyncio
+    async def test_half_open_provider_gets_a_single_probe(self):
+        """Concurrent requests ranking a half-open provider send it one probe between them"""
+        router = ProviderRouter(cost_weight=0, failure_threshold=1, cooldown=30)
+        service = make_service(router=router)
+        router.record_failure('openai', 1.0)
+        router.providers['openai'].opened_at -= 30
+        # Admission takes a moment, so every request ranks openai before any dispatches
+        governor = ProviderRateGovernor('openai', requests_per_minute=6000)
+        governor.requests._tokens = 0
+        service.rate_governors['openai'] = governor
+        openai_calls = stub_provider(service, 'openai', delay=0.05)
+        gemini_calls = stub_provider(service, 'gemini')
+
+        results = await asyncio.gather(*[
+            service.generate_ad_alternative(AD, 'persuasive', creativity_level=9)
+            for _ in range(5)
+        ])
+
+        assert len(openai_calls) == 1
+        assert len(gemini_calls) == 4
+        assert sum(result['headline'].endswith("(openai)") for result in results) == 1
+        assert router.providers['openai'].circuit == 'closed'
+
+
+STREAMED = (
+    "HEADLINE: Coffee roasted this week\n"
+    "BODY: Beans roasted on Monday are in your cup by Wednesday.\n"
+    "CTA: Start your subscription\n"
+    "REASON: Concrete freshness promise"
+)
+
+
+def stub_stream(service: ProductionAIService, responses: dict):
+    """Replace provider streaming; responses maps provider to its text or an exception"""
+    calls = []
+
+    async def chunks(provider, prompt, ai_params):
+        calls.append(provider)
+        response = responses[provider]
+        if isinstance(response, Exception):
+            raise response
+        for start in range(0, len(response), 9):
+            yield response[start:start + 9]
+
+    service._provider_text_chunks = chunks
+    return calls
+
+
+async def collect(stream) -> list:
+    return [event async for event in stream]
+
+
+class TestStreamingGeneration:
+    """Field-by-field generation in stream_ad_alternative"""
+
+    @pytest.mark.asyncio
+    async def test_fields_stream_in_order_then_result(self):
+        service = make_service(router=ProviderRouter(cost_weight=0))
+        stub_stream(service, {'openai': STREAMED})
+
+        events = await collect(service.stream_ad_alternative(AD, 'persuasive', creativity_level=9))
+
+        assert [event.get('field') for event in events[:-1]] == [
+            'headline', 'body_text', 'cta', 'improvement_reason'
+        ]
+        assert events[-1]['type'] == 'result'
+        assert events[-1]['provider'] == 'openai'
+        assert events[-1]['result']['cta'] == "Start your subscription"
+
+    @pytest.mark.asyncio
+    async def test_placeholder_before_any_field_fails_over(self):
+        service = make_service(router=ProviderRouter(cost_weight=0))
+        calls = stub_stream(service, {
+            'openai': "HEADLINE: [Headline]\nBODY: [Body]\n",
+            'gemini': STREAMED
+        })
+
+        events = await collect(service.stream_ad_alternative(AD, 'persuasive', creativity_level=9))
+
+        assert calls == ['openai', 'gemini']
+        assert events[0] == {'type': 'field', 'field': 'headline', 'value': "Coffee roasted this week"}
+        assert events[-1]['provider'] == 'gemini'
+        assert service.router.get_state()['failovers'] == 1
+
+    @pytest.mark.asyncio
+    async def test_placeholder_after_emitted_fields_does_not_fail_over(self):
+        service = make_service(router=ProviderRouter(cost_weight=0))
+        calls = stub_stream(service, {
+            'openai': "HEADLINE: Coffee roasted this week\nCTA: Click here\nBODY: Fresh beans\n",
+            'gemini': STREAMED
+        })
+
+        events = []
+        with pytest.raises(AIProviderUnavailable) as exc_info:
+            async for event in service.stream_ad_alternative(AD, 'persuasive', creativity_level=9):
+                events.append(event)
+
+        assert 'placeholder' in str(exc_info.value)
+        assert calls == ['openai']
+        assert events == [{'type': 'field', 'field': 'headline', 'value': "Coffee roasted this week"}]
+        assert service.router.providers['openai'].consecutive_failures == 1
+
+    @pytest.mark.asyncio
+    async def test_error_after_emitted_fields_does_not_fail_over(self):
+        service = make_service(router=ProviderRouter(cost_weight=0))
+        calls = stub_stream(service, {
+            'openai': "HEADLINE: Coffee roasted this week\nBODY: Beans",
+            'gemini': STREAMED
+        })
+
+        # Stream ends mid-body: the result is incomplete after the headline went out
+        with pytest.raises(AIProviderUnavailable):
+            await collect(service.stream_ad_alternative(AD, 'persuasive', creativity_level=9))
+
+        assert calls == ['openai']
+        assert service.router.get_state()['failovers'] == 0
+
+    @pytest.mark.asyncio
+    async def test_error_before_first_field_fails_over(self):
+        service = make_service(router=ProviderRouter(cost_weight=0))
+        calls = stub_stream(service, {'openai': RuntimeError("connection reset"), 'gemini': STREAMED})
+
+        events = await collect(service.stream_ad_alternative(AD, 'persuasive', creativity_level=9))
+
+        assert calls == ['openai', 'gemini']
+        assert events[-1]['provider'] == 'gemini'
+
+
+def batch_item(number, headline="Coffee roasted this week", **fields) -> dict:
+    return {
+        'variant': number,
+        'headline': headline,
+        'body_text': "Beans roasted on Monday are in your cup by Wednesday.",
+        'cta': "Start your subscription",
+        'improvement_reason': "Concrete freshness promise",
+        **fields
+    }
+
+
+class TestBatchResponseParsing:
+    """_parse_batch_response and _extract_json_objects"""
+
+    def test_fenced_json(self):
+        service = make_service()
+        response = "```json\n" + json.dumps([batch_item(1), batch_item(2, "Roasted Monday, yours Wednesday")]) + "\n```"
+
+        parsed = service._parse_batch_response(response, ['persuasive', 'emotional'])
+
+        assert [item['headline'] for item in parsed] == ["Coffee roasted this week", "Roasted Monday, yours Wednesday"]
+        assert [item['variant_type'] for item in parsed] == ['persuasive', 'emotional']
+
+    def test_surrounding_text(self):
+        service = make_service()
+        response = f"Here are your variations:\n{json.dumps([batch_item(1)])}\nLet me know [if] you need more."
+
+        parsed = service._parse_batch_response(response, ['persuasive'])
+
+        assert parsed[0]['headline'] == "Coffee roasted this week"
+
+    def test_truncated_array_keeps_complete_objects(self):
+        service = make_service()
+        complete = json.dumps([batch_item(1), batch_item(2)])
+        response = complete[:-1] + ', {"variant": 3, "headline": "Cut off mid'
+
+        assert len(ProductionAIService._extract_json_objects(response)) == 2
+        parsed = service._parse_batch_response(response, ['persuasive', 'emotional', 'data_driven'])
+
+        assert parsed[0] is not None and parsed[1] is not None
+        assert parsed[2] is None
+
+    def test_variant_numbers_place_results(self):
+        service = make_service()
+        response = json.dumps([batch_item(2, "Second brief answer"), batch_item(1, "First brief answer")])
+
+        parsed = service._parse_batch_response(response, ['persuasive', 'emotional'])
+
+        assert parsed[0]['headline'] == "First brief answer"
+        assert parsed[1]['headline'] == "Second brief answer"
+        assert parsed[1]['variant_type'] == 'emotional'
+
+    def test_misnumbered_variants_fall_back_to_position(self):
+        service = make_service()
+        response = json.dumps([
+            batch_item(7, "Out of range number"),
+            batch_item('two', "Non-numeric number"),
+            batch_item(1, "Duplicate of first")
+        ])
+
+        parsed = service._parse_batch_response(response, ['persuasive', 'emotional'])
+
+        assert parsed[0]['headline'] == "Out of range number"
+        assert parsed[1]['headline'] == "Non-numeric number"
+
+    def test_placeholder_and_incomplete_variants_are_rejected(self):
+        service = make_service()
+        response = json.dumps([
+            batch_item(1, cta="Click here"),
+            batch_item(2, body_text="Body"),
+            batch_item(3, "Sample headline for demo")
+        ])
+
+        assert service._parse_batch_response(response, ['persuasive', 'emotional', 'data_driven']) == [
+            None, None, None
+        ]
+
+    def test_no_json_at_all(self):
+        service = make_service()
+
+        assert service._parse_batch_response("I cannot help with that.", ['persuasive']) == [None]
+
+
+class TestBatchedGeneration:
+    """generate_alternatives_batched"""
+
+    @pytest.mark.asyncio
+    async def test_variants_with_different_emotions_share_one_request(self):
+        service = make_service(router=ProviderRouter(cost_weight=0))
+        batch_prompts = []
+
+        async def complete(prompt, ai_params, max_tokens=None, admitted_tokens=None):
+            batch_prompts.append(prompt)
+            return json.dumps([batch_item(1, "Roasted Monday, yours Wednesday"), batch_item(2), batch_item(3)]), 400
+
+        service._openai_complete = complete
+        single_calls = stub_provider(service, 'openai')
+
+        results = await service.generate_alternatives_batched(AD, [
+            {'variant_type': 'persuasive', 'emotion_type': 'urgent'},
+            {'variant_type': 'emotional', 'emotion_type': 'comfort'},
+            {'variant_type': 'data_driven', 'emotion_type': 'urgent'},
+        ])
+
+        assert len(batch_prompts) == 1
+        assert "Emotion: Urgent" in batch_prompts[0]
+        assert "Emotion: Comfort" in batch_prompts[0]
+        assert [result['variant_type'] for result in results] == ['persuasive', 'emotional', 'data_driven']
+        assert single_calls == []
+        assert service.batch_stats['batched_variants'] == 3
+        assert service.batch_stats['fallback_variants'] == 0
+
+    @pytest.mark.asyncio
+    async def test_different_creative_controls_share_one_request(self):
+        """Each brief keeps its controls; the request samples with their mean"""
+        service = make_service(router=ProviderRouter(cost_weight=0))
+        batch_calls = []
+
+        async def complete(prompt, ai_params, max_tokens=None, admitted_tokens=None):
+            batch_calls.append((prompt, ai_params))
+            return json.dumps([batch_item(1), batch_item(2), batch_item(3)]), 400
+
+        service._openai_complete = complete
+        single_calls = stub_provider(service, 'openai')
+
+        await service.generate_alternatives_batched(AD, [
+            {'variant_type': 'persuasive', 'creativity_level': 2},
+            {'variant_type': 'emotional', 'creativity_level': 6},
+            {'variant_type': 'data_driven', 'urgency_level': 9},
+        ])
+
+        assert single_calls == []
+        ((prompt, ai_params),) = batch_calls
+        assert "Creativity 2/10" in prompt
+        assert "Creativity 6/10" in prompt
+        assert "Urgency 9/10" in prompt
+        # Temperatures 0.55, 0.75 and 0.7 for creativity 2, 6 and the default 5
+        assert ai_params['temperature'] == 0.67
+
+    @pytest.mark.asyncio
+    async def test_different_style_options_are_batched_separately(self):
+        service = make_service(router=ProviderRouter(cost_weight=0))
+        batch_prompts = []
+
+        async def complete(prompt, ai_params, max_tokens=None, admitted_tokens=None):
+            batch_prompts.append(prompt)
+            return json.dumps([batch_item(1), batch_item(2)]), 400
+
+        service._openai_complete = complete
+        single_calls = stub_provider(service, 'openai')
+
+        await service.generate_alternatives_batched(AD, [
+            {'variant_type': 'persuasive', 'brand_tone': 'professional'},
+            {'variant_type': 'emotional', 'brand_tone': 'playful'},
+            {'variant_type': 'data_driven', 'brand_tone': 'professional'},
+            {'variant_type': 'platform_optimized', 'brand_tone': 'playful'},
+        ])
+
+        assert len(batch_prompts) == 2
+        assert single_calls == []
+
+    @pytest.mark.asyncio
+    async def test_batch_results_are_not_cached_as_single_generations(self):
+        service = make_service(router=ProviderRouter(cost_weight=0))
+        batch_prompts = []
+
+        async def complete(prompt, ai_params, max_tokens=None, admitted_tokens=None):
+            batch_prompts.append(prompt)
+            return json.dumps([batch_item(1, "Batched headline"), batch_item(2)]), 400
+
+        service._openai_complete = complete
+        single_calls = stub_provider(service, 'openai')
+        variants = [
+            {'variant_type': 'persuasive', 'creativity_level': 3},
+            {'variant_type': 'emotional', 'creativity_level': 3},
+        ]
+
+        first = await service.generate_alternatives_batched(AD, variants, tenant_id='tenant-a')
+        single = await service.generate_ad_alternative(AD, 'persuasive', creativity_level=3, tenant_id='tenant-a')
+        again = await service.generate_alternatives_batched(AD, variants, tenant_id='tenant-a')
+
+        # The single request does not get the batch's answer
+        assert first[0]['headline'] == "Batched headline"
+        assert single['headline'].endswith("(openai)")
+        # The repeated batch gets the cached single result for its first variant,
+        # which leaves the second to be generated on its own
+        assert again[0] == single
+        assert len(single_calls) == 2
+        assert len(batch_prompts) == 1
+
+    @pytest.mark.asyncio
+    async def test_identical_batch_is_served_from_cache(self):
+        service = make_service(router=ProviderRouter(cost_weight=0))
+        batch_prompts = []
+
+        async def complete(prompt, ai_params, max_tokens=None, admitted_tokens=None):
+            batch_prompts.append(prompt)
+            return json.dumps([batch_item(1, "Batched headline"), batch_item(2)]), 400
+
+        service._openai_complete = complete
+        variants = [{'variant_type': 'persuasive'}, {'variant_type': 'emotional'}]
+
+        first = await service.generate_alternatives_batched(AD, variants, tenant_id='tenant-a')
+        second = await service.generate_alternatives_batched(AD, variants, tenant_id='tenant-a')
+        other_tenant = await service.generate_alternatives_batched(AD, variants, tenant_id='tenant-b')
+
+        assert second == first
+        assert [result['headline'] for result in other_tenant] == [result['headline'] for result in first]
+        # The other tenant does not share the cached batch
+        assert len(batch_prompts) == 2
+        assert service.batch_stats['batch_requests'] == 2
+
+    @pytest.mark.asyncio
+    async def test_generate_batch_rejects_mixed_options(self):
+        service = make_service()
+
+        with pytest.raises(ValueError):
+            await service._generate_batch('openai', AD, [
+                {'variant_type': 'persuasive', 'human_tone': 'friendly'},
+                {'variant_type': 'emotional'},
+            ], {})
+        with pytest.raises(ValueError):
+            await service._generate_batch('openai', AD, [
+                {'variant_type': 'persuasive', 'target_audience_description': "Home baristas"},
+                {'variant_type': 'emotional', 'target_audience_description': "Office managers"},
+            ], {})
@@ -0,0 +1,160 @@
+"""
+Tests for compiled generation prompts and token-budget trimming.
+"""
+import pytest
+
+from app.services.prompt_templates import CreativeSections, PromptTemplateRegistry, count_tokens
+
+
+AD = {
+    'headline': "Fresh roasted coffee beans",
+    'body_text': "Small batches roasted every Monday and shipped the same day.",
+    'cta': "Order now",
+    'platform': 'facebook',
+    'industry': 'food'
+}
+
+# Sections that are never trimmed, by a line each starts with
+REQUIRED_MARKERS = ["Original Ad Copy:", "AUDIENCE & BRAND:", "CREATIVE CONTROLS", "CALL-TO-ACTION:",
+                    "Create a HIGHLY PERSUASIVE", "CRITICAL: Respond ONLY"]
+
+
+def rendered_tokens(registry: PromptTemplateRegistry) -> float:
+    """Tokens of the one prompt the registry has rendered, as it counted them"""
+    (tokens,) = registry.get_stats()['avg_prompt_tokens'].values()
+    return tokens
+
+
+def creative_sections() -> CreativeSections:
+    return CreativeSections('facebook', 5, 5, 'inspiring', True)
+
+
+class TestPromptTemplateRegistry:
+    """Test suite for PromptTemplateRegistry.build"""
+
+    def test_no_budget_keeps_full_prompt(self):
+        registry = PromptTemplateRegistry()
+
+        prompt = registry.build(AD, 'persuasive')
+
+        assert "🎨 CREATIVE INSTRUCTIONS" in prompt
+        assert "Emotion Keywords" in prompt
+        assert "PLATFORM REQUIREMENTS" in prompt
+        assert registry.get_stats()['trimmed_renders'] == 0
+
+    def test_budget_above_prompt_size_trims_nothing(self):
+        registry = PromptTemplateRegistry()
+        full = registry.build(AD, 'persuasive')
+
+        assert registry.build(AD, 'persuasive', token_budget=count_tokens(full) + 50) == full
+        assert registry.get_stats()['trimmed_renders'] == 0
+
+    def test_creative_guidance_is_trimmed_first(self):
+        registry = PromptTemplateRegistry()
+        full_tokens = count_tokens(registry.build(AD, 'persuasive'))
+
+        prompt = registry.build(AD, 'persuasive', token_budget=full_tokens - 1)
+
+        assert "🎨 CREATIVE INSTRUCTIONS" not in prompt
+        assert "Emotion Keywords" in prompt
+        assert "PLATFORM REQUIREMENTS" in prompt
+
+    def test_sections_trimmed_in_rank_order(self):
+        registry = PromptTemplateRegistry()
+        full_registry = PromptTemplateRegistry()
+        full_registry.build(AD, 'persuasive')
+        full_tokens = rendered_tokens(full_registry)
+        creative = creative_sections()
+
+        prompt = registry.build(
+            AD, 'persuasive', token_budget=int(full_tokens - creative.guidance.tokens - 1)
+        )
+
+        assert "🎨 CREATIVE INSTRUCTIONS" not in prompt
+        assert "Emotion Keywords" not in prompt
+        assert "PLATFORM REQUIREMENTS" in prompt
+        assert "STYLE GUIDELINES" in prompt
+        assert registry.get_stats()['tokens_trimmed'] == creative.guidance.tokens + creative.emotion_keywords.tokens
+
+    @pytest.mark.parametrize('fraction', [0.0, 0.25, 0.5, 0.9])
+    def test_trimmed_prompt_fits_budget(self, fraction):
+        """Any budget between the required sections and the full prompt is met"""
+        bounds = []
+        for budget in (1, None):
+            bound_registry = PromptTemplateRegistry()
+            bound_registry.build(AD, 'persuasive', token_budget=budget)
+            bounds.append(rendered_tokens(bound_registry))
+        required_tokens, full_tokens = bounds
+        budget = int(required_tokens + fraction * (full_tokens - required_tokens)) + 1
+        registry = PromptTemplateRegistry()
+
+        prompt = registry.build(AD, 'persuasive', token_budget=budget)
+
+        assert rendered_tokens(registry) <= budget
+        for marker in REQUIRED_MARKERS:
+            assert marker in prompt
+
+    def test_required_sections_kept_when_budget_is_unreachable(self):
+        registry = PromptTemplateRegistry()
+
+        prompt = registry.build(AD, 'persuasive', token_budget=10)
+
+        for marker in REQUIRED_MARKERS:
+            assert marker in prompt
+        for optional in ("🎨 CREATIVE INSTRUCTIONS", "Emotion Keywords", "PLATFORM REQUIREMENTS",
+                         "AVOID if filtering", "STYLE GUIDELINES"):
+            assert optional not in prompt
+        assert rendered_tokens(registry) > 10
+        assert registry.get_stats()['trimmed_renders'] == 1
+
+    def test_templates_are_compiled_once(self):
+        registry = PromptTemplateRegistry()
+        registry.build(AD, 'persuasive')
+        registry.build({**AD, 'headline': "Coffee for night owls"}, 'persuasive')
+
+        stats = registry.get_stats()
+        assert stats['compiled'] == 2  # one template, one creative section set
+        assert stats['renders'] == 2
+
+
+BATCH = [
+    {'variant_type': 'persuasive', 'creativity_level': 3, 'emotion_type': 'excitement'},
+    {'variant_type': 'emotional', 'creativity_level': 7, 'urgency_level': 8},
+]
+
+
+class TestBatchPrompts:
+    """Test suite for PromptTemplateRegistry.build_batch"""
+
+    def test_briefs_carry_each_variants_controls(self):
+        registry = PromptTemplateRegistry()
+
+        prompt = registry.build_batch(AD, BATCH)
+
+        assert "1. HIGHLY PERSUASIVE" in prompt
+        assert "2. EMOTIONALLY COMPELLING" in prompt
+        assert "Creativity 3/10" in prompt and "Creativity 7/10" in prompt
+        assert "Urgency 8/10" in prompt
+        assert "Emotion: Excitement" in prompt
+        assert "JSON array of exactly 2 objects" in prompt
+
+    def test_budget_trims_optional_sections_only(self):
+        registry = PromptTemplateRegistry()
+
+        prompt = registry.build_batch(AD, BATCH, token_budget=10)
+
+        for optional in ("PLATFORM REQUIREMENTS", "AVOID if filtering", "STYLE GUIDELINES"):
+            assert optional not in prompt
+        for required in ("Original Ad Copy:", "AUDIENCE & BRAND:", "CALL-TO-ACTION:",
+                         "Creativity 7/10", "JSON array of exactly 2 objects"):
+            assert required in prompt
+        assert registry.get_stats()['trimmed_renders'] == 1
+
+    def test_briefs_reuse_compiled_creative_sections(self):
+        registry = PromptTemplateRegistry()
+        registry.build(AD, 'persuasive', creativity_level=3, emotion_type='excitement')
+
+        registry.build_batch(AD, BATCH)
+
+        # The first brief's creative sections were compiled for the single prompt
+        assert registry.get_stats()['compiled'] == 4
@@ -0,0 +1,175 @@
+"""
+Tests for per-provider rate limiting and request coalescing.
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.core.exceptions import AIProviderUnavailable
+from app.services.provider_rate_governor import ProviderRateGovernor, TokenBucket
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket"""
+
+    @pytest.mark.asyncio
+    async def test_refills_with_elapsed_time(self):
+        bucket = TokenBucket(rate_per_minute=60)
+        assert await bucket.acquire(60) is True
+        assert bucket.available < 1
+
+        # 30 seconds later, half a minute of tokens is back
+        bucket._updated_at -= 30
+        assert bucket.available == pytest.approx(30, abs=0.5)
+
+        bucket._updated_at -= 600
+        assert bucket.available == bucket.capacity
+
+    @pytest.mark.asyncio
+    async def test_waits_for_tokens_within_deadline(self):
+        bucket = TokenBucket(rate_per_minute=6000, capacity=1)
+        await bucket.acquire(1)
+
+        start = time.monotonic()
+        assert await bucket.acquire(1, deadline=start + 1.0) is True
+        assert time.monotonic() - start < 0.5
+
+    @pytest.mark.asyncio
+    async def test_rejects_past_deadline_without_taking_tokens(self):
+        bucket = TokenBucket(rate_per_minute=60)
+        await bucket.acquire(50)
+
+        start = time.monotonic()
+        assert await bucket.acquire(30, deadline=start + 0.05) is False
+        assert time.monotonic() - start < 0.05
+        assert bucket.available == pytest.approx(10, abs=0.5)
+
+    @pytest.mark.asyncio
+    async def test_unlimited_bucket_never_waits(self):
+        bucket = TokenBucket(rate_per_minute=0)
+
+        assert bucket.unlimited
+        assert await bucket.acquire(10 ** 9) is True
+        assert bucket.wait_time(10 ** 9) == 0.0
+
+    def test_adjust_refunds_up_to_capacity(self):
+        bucket = TokenBucket(rate_per_minute=100)
+        bucket.adjust(-80)
+        assert bucket.available == pytest.approx(20, abs=0.5)
+
+        bucket.adjust(500)
+        assert bucket.available == 100
+
+
+class TestProviderRateGovernor:
+    """Test suite for ProviderRateGovernor admission"""
+
+    @pytest.mark.asyncio
+    async def test_rejects_up_front_with_retry_after(self):
+        """A request whose projected wait exceeds max_wait fails immediately"""
+        governor = ProviderRateGovernor('openai', requests_per_minute=6, max_wait=0.5)
+        for _ in range(6):
+            await governor.acquire()
+
+        start = time.monotonic()
+        with pytest.raises(AIProviderUnavailable) as exc_info:
+            await governor.acquire()
+
+        assert time.monotonic() - start < 0.1
+        assert exc_info.value.retry_after == 10
+        assert governor.get_stats()['rejected'] == 1
+        assert governor.get_stats()['admitted'] == 6
+
+    @pytest.mark.asyncio
+    async def test_token_limit_rejection(self):
+        governor = ProviderRateGovernor('gemini', requests_per_minute=0, tokens_per_minute=1000, max_wait=1.0)
+        await governor.acquire(estimated_tokens=900)
+
+        with pytest.raises(AIProviderUnavailable):
+            await governor.acquire(estimated_tokens=900)
+
+    @pytest.mark.asyncio
+    async def test_record_usage_settles_the_estimate(self):
+        governor = ProviderRateGovernor('openai', requests_per_minute=0, tokens_per_minute=1000)
+        await governor.acquire(estimated_tokens=800)
+        governor.record_usage(800, 300)
+        assert governor.tokens.available == pytest.approx(700, abs=1)
+
+        # A failed call settles with no usage and gets its estimate back
+        await governor.acquire(estimated_tokens=600)
+        governor.record_usage(600, 0)
+        assert governor.tokens.available == pytest.approx(700, abs=1)
+
+
+class TestCoalescing:
+    """Test suite for ProviderRateGovernor.coalesce"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        governor = ProviderRateGovernor('openai', 0)
+        calls = []
+
+        async def factory():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {'headline': "Shared", 'tags': []}
+
+        results = await asyncio.gather(*[governor.coalesce('key', factory) for _ in range(4)])
+
+        assert len(calls) == 1
+        assert all(result == {'headline': "Shared", 'tags': []} for result in results)
+        # Followers get copies, not the leader's object
+        results[1]['tags'].append('changed')
+        assert results[2]['tags'] == []
+        assert governor.get_stats()['coalesced'] == 3
+        assert governor.get_stats()['inflight_coalescable'] == 0
+
+    @pytest.mark.asyncio
+    async def test_followers_receive_the_leaders_exception(self):
+        governor = ProviderRateGovernor('openai', 0)
+
+        async def factory():
+            await asyncio.sleep(0.01)
+            raise AIProviderUnavailable('openai', "upstream down")
+
+        results = await asyncio.gather(*[governor.coalesce('key', factory) for _ in range(3)],
+                                       return_exceptions=True)
+
+        assert all(isinstance(result, AIProviderUnavailable) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_follower_takes_over_when_leader_is_cancelled(self):
+        governor = ProviderRateGovernor('openai', 0)
+        calls = []
+        started = asyncio.Event()
+
+        async def factory():
+            calls.append(1)
+            started.set()
+            await asyncio.sleep(0.05)
+            return {'call': len(calls)}
+
+        leader = asyncio.ensure_future(governor.coalesce('key', factory))
+        await started.wait()
+        follower = asyncio.ensure_future(governor.coalesce('key', factory))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == {'call': 2}
+        assert leader.cancelled()
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_different_keys_do_not_coalesce(self):
+        governor = ProviderRateGovernor('openai', 0)
+        calls = []
+
+        async def factory():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        await asyncio.gather(governor.coalesce('a', factory), governor.coalesce('b', factory))
+
+        assert len(calls) == 2
@@ -0,0 +1,158 @@
+"""
+Tests for latency- and cost-aware provider ranking and circuit breaking.
+"""
+from app.services.provider_router import (
+    CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, ProviderHealth, ProviderRouter
+)
+
+
+def make_router(**options) -> ProviderRouter:
+    options.setdefault('cost_weight', 0)
+    options.setdefault('min_samples', 3)
+    router = ProviderRouter(**options)
+    router.register('openai', 0.03)
+    router.register('gemini', 0.001)
+    return router
+
+
+def record(router: ProviderRouter, provider: str, latency: float, count: int = 3, succeeded: bool = True):
+    for _ in range(count):
+        if succeeded:
+            router.record_success(provider, latency)
+        else:
+            router.record_failure(provider, latency)
+
+
+class TestRanking:
+    """Test suite for ProviderRouter.rank"""
+
+    def test_preference_order_without_samples(self):
+        router = make_router()
+
+        assert router.rank(['openai', 'gemini']) == ['openai', 'gemini']
+        assert router.rank(['gemini', 'openai']) == ['gemini', 'openai']
+
+    def test_faster_provider_ranks_first(self):
+        router = make_router()
+        record(router, 'openai', 2.0)
+        record(router, 'gemini', 0.5)
+
+        assert router.rank(['openai', 'gemini']) == ['gemini', 'openai']
+        assert router.get_state()['reordered'] == 1
+
+    def test_unmeasured_provider_ties_with_best_measured(self):
+        router = make_router()
+        record(router, 'gemini', 0.5)
+
+        # openai has no samples: scores like gemini, so preference decides
+        assert router.rank(['openai', 'gemini']) == ['openai', 'gemini']
+
+    def test_error_rate_is_penalized(self):
+        router = make_router(failure_threshold=100, error_rate_threshold=1.1)
+        record(router, 'openai', 0.5)
+        record(router, 'openai', 0.5, count=2, succeeded=False)
+        record(router, 'gemini', 1.0)
+
+        assert router.rank(['openai', 'gemini']) == ['gemini', 'openai']
+
+    def test_cost_is_weighed(self):
+        router = make_router(cost_weight=100)
+        record(router, 'openai', 1.0)
+        record(router, 'gemini', 1.5)
+
+        # 0.03 * 100 = 3s of penalty outweighs 0.5s of latency
+        assert router.rank(['openai', 'gemini']) == ['gemini', 'openai']
+
+    def test_unregistered_and_open_providers_are_left_out(self):
+        router = make_router(failure_threshold=2)
+        record(router, 'openai', 1.0, count=2, succeeded=False)
+
+        assert router.rank(['openai', 'gemini', 'claude']) == ['gemini']
+        assert router.rank(['openai']) == []
+        assert router.get_state()['all_unavailable'] == 1
+
+
+class TestCircuitBreaker:
+    """Test suite for ProviderHealth circuit states"""
+
+    def test_consecutive_failures_open_the_circuit(self):
+        health = ProviderHealth('openai', failure_threshold=3)
+        for _ in range(2):
+            health.record_failure(1.0)
+        assert health.circuit == CIRCUIT_CLOSED
+
+        health.record_failure(1.0)
+        assert health.circuit == CIRCUIT_OPEN
+        assert health.is_available() is False
+        assert health.times_opened == 1
+
+    def test_error_rate_opens_the_circuit(self):
+        health = ProviderHealth('openai', failure_threshold=100, min_samples=4, error_rate_threshold=0.5)
+        health.record_success(1.0)
+        health.record_failure(1.0)
+        health.record_success(1.0)
+        health.record_failure(1.0)
+
+        assert health.circuit == CIRCUIT_OPEN
+
+    def test_half_open_allows_a_single_probe(self):
+        health = ProviderHealth('openai', failure_threshold=1, cooldown=30)
+        health.record_failure(1.0)
+        health.opened_at -= 30
+
+        assert health.is_available() is True
+        assert health.circuit == CIRCUIT_HALF_OPEN
+        assert health.try_dispatch() is True
+        assert health.is_available() is False
+        assert health.try_dispatch() is False
+
+        # An abandoned probe frees the slot for another one
+        health.on_cancel()
+        assert health.is_available() is True
+
+    def test_successful_probe_closes_the_circuit(self):
+        health = ProviderHealth('openai', failure_threshold=1, cooldown=30)
+        health.record_failure(1.0)
+        health.opened_at -= 30
+        assert health.try_dispatch() is True
+
+        health.record_success(0.5)
+
+        assert health.circuit == CIRCUIT_CLOSED
+        assert health.consecutive_failures == 0
+        assert health.is_available() is True
+
+    def test_failed_probe_reopens_the_circuit(self):
+        health = ProviderHealth('openai', failure_threshold=1, cooldown=30)
+        health.record_failure(1.0)
+        health.opened_at -= 30
+        assert health.try_dispatch() is True
+
+        health.record_failure(1.0)
+
+        assert health.circuit == CIRCUIT_OPEN
+        assert health.is_available() is False
+        assert health.times_opened == 2
+
+
+class TestHedgeDelay:
+    """Test suite for ProviderRouter.hedge_delay"""
+
+    def test_no_hedge_without_samples(self):
+        router = make_router()
+
+        assert router.hedge_delay('openai') is None
+
+    def test_hedge_delay_is_p95_with_a_floor(self):
+        router = make_router(min_hedge_delay=1.0)
+        record(router, 'openai', 2.5)
+        record(router, 'gemini', 0.1)
+
+        assert router.hedge_delay('openai') == 2.5
+        assert router.hedge_delay('gemini') == 1.0
+
+    def test_hedging_disabled(self):
+        router = make_router(hedging_enabled=False)
+        record(router, 'openai', 2.0)
+
+        assert router.hedge_delay('openai') is None
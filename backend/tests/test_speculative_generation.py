@@ -0,0 +1,249 @@
+"""
+Tests for speculative pre-generation of alternatives.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.provider_rate_governor import ProviderRateGovernor
+from app.services.speculative_generation import SpeculativeGenerator, ad_fingerprint
+
+
+AD = {
+    'headline': "Fresh roasted coffee beans",
+    'body_text': "Small batches roasted every Monday and shipped the same day.",
+    'cta': "Order now",
+    'platform': 'facebook'
+}
+
+
+class FakeAIService:
+    """Stands in for ProductionAIService.generate_multiple_alternatives"""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.calls = []
+        self.ad_data = []
+        self.rate_governors = {'openai': ProviderRateGovernor('openai', requests_per_minute=60)}
+
+    async def generate_multiple_alternatives(self, ad_data, variant_types, tenant_id=None):
+        self.calls.append(tenant_id)
+        self.ad_data.append(ad_data)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [{
+            'variant_type': variant_type,
+            'headline': f"Coffee roasted this week ({variant_type})",
+            'body_text': "Beans roasted on Monday are in your cup by Wednesday.",
+            'cta': "Start your subscription",
+            'improvement_reason': "Concrete freshness promise"
+        } for variant_type in variant_types]
+
+
+def make_generator(ai_service=None, **options) -> SpeculativeGenerator:
+    options.setdefault('tier_budgets', {'free': 0, 'growth': 2})
+    return SpeculativeGenerator(ai_service=ai_service or FakeAIService(), **options)
+
+
+async def run_job(generator: SpeculativeGenerator, analysis_id: str, user_id=7,
+                  tier='growth', ad_data=None) -> bool:
+    """Schedule a job and wait for it to finish"""
+    started = generator.schedule(analysis_id, user_id, tier, ad_data or AD)
+    if started:
+        await generator._tasks[analysis_id]
+    return started
+
+
+class TestAdFingerprint:
+    """Test suite for ad_fingerprint"""
+
+    def test_ignores_surrounding_whitespace_and_other_fields(self):
+        assert ad_fingerprint(AD) == ad_fingerprint({**AD, 'headline': f"  {AD['headline']}\n"})
+        assert ad_fingerprint(AD) == ad_fingerprint({**AD, 'industry': 'food'})
+
+    def test_edits_change_the_fingerprint(self):
+        for field in ('headline', 'body_text', 'cta', 'platform'):
+            assert ad_fingerprint(AD) != ad_fingerprint({**AD, field: 'edited'})
+
+
+class TestSpeculativeGenerator:
+    """Test suite for SpeculativeGenerator scheduling and claiming"""
+
+    @pytest.mark.asyncio
+    async def test_scheduled_job_result_is_claimed(self):
+        ai_service = FakeAIService()
+        generator = make_generator(ai_service, variant_types=['persuasive', 'emotional'])
+
+        assert await run_job(generator, 'analysis-1') is True
+        alternatives = await generator.claim('analysis-1', 7, AD)
+
+        assert [alt['variant_type'] for alt in alternatives] == ['persuasive', 'emotional']
+        assert ai_service.calls == ['7']
+        assert generator.get_stats()['completed'] == 1
+        assert generator.get_stats()['claimed'] == 1
+
+    @pytest.mark.asyncio
+    async def test_unset_fields_are_not_passed_to_generation(self):
+        ai_service = FakeAIService()
+        generator = make_generator(ai_service)
+
+        await run_job(generator, 'analysis-1', ad_data={**AD, 'industry': None, 'target_audience': None})
+
+        assert ai_service.ad_data == [AD]
+
+    @pytest.mark.asyncio
+    async def test_other_user_cannot_claim(self):
+        generator = make_generator()
+        await run_job(generator, 'analysis-1', user_id=7)
+
+        assert await generator.claim('analysis-1', 8) is None
+        assert await generator.claim('analysis-1', '7') is not None
+        assert generator.get_stats()['missed'] == 1
+
+    @pytest.mark.asyncio
+    async def test_edited_ad_is_not_served(self):
+        generator = make_generator()
+        await run_job(generator, 'analysis-1')
+
+        assert await generator.claim('analysis-1', 7, {**AD, 'headline': "Decaf, finally done right"}) is None
+        assert await generator.claim('analysis-1', 7, AD) is not None
+
+    @pytest.mark.asyncio
+    async def test_claim_waits_for_running_job(self):
+        generator = make_generator(FakeAIService(delay=0.05))
+        generator.schedule('analysis-1', 7, 'growth', AD)
+
+        assert await generator.claim('analysis-1', 7, AD) is None
+        assert await generator.claim('analysis-1', 7, AD, wait=1.0) is not None
+        assert generator.get_stats()['claimed_after_wait'] == 1
+
+    @pytest.mark.asyncio
+    async def test_claim_wait_times_out(self):
+        generator = make_generator(FakeAIService(delay=1.0))
+        generator.schedule('analysis-1', 7, 'growth', AD)
+
+        assert await generator.claim('analysis-1', 7, AD, wait=0.01) is None
+        generator._tasks['analysis-1'].cancel()
+
+    @pytest.mark.asyncio
+    async def test_disabled_and_duplicate_schedules_are_ignored(self):
+        disabled = make_generator(enabled=False)
+        assert disabled.schedule('analysis-1', 7, 'growth', AD) is False
+        assert disabled.get_stats()['skipped_disabled'] == 1
+
+        generator = make_generator(FakeAIService(delay=0.01))
+        assert generator.schedule('analysis-1', 7, 'growth', AD) is True
+        assert generator.schedule('analysis-1', 7, 'growth', AD) is False
+        await generator._tasks['analysis-1']
+
+    @pytest.mark.asyncio
+    async def test_daily_budget_per_tier(self):
+        ai_service = FakeAIService()
+        generator = make_generator(ai_service)
+
+        for analysis_id in ('analysis-1', 'analysis-2', 'analysis-3'):
+            assert await run_job(generator, analysis_id) is True
+        assert await generator.claim('analysis-3', 7) is None
+        # Budgets are per user
+        assert await run_job(generator, 'analysis-4', user_id=8) is True
+        assert await run_job(generator, 'analysis-5', user_id=9, tier='free') is False
+        assert await run_job(generator, 'analysis-6', user_id=9, tier=None) is False
+        assert ai_service.calls == ['7', '7', '8']
+        assert generator.get_stats()['skipped_budget'] == 3
+
+    @pytest.mark.asyncio
+    async def test_budget_is_shared_through_the_store(self):
+        first = make_generator(tier_budgets={'growth': 1})
+        second = make_generator(tier_budgets={'growth': 1})
+        second._store = first._store  # stands in for two workers on one Redis
+
+        await run_job(first, 'analysis-1')
+        await run_job(second, 'analysis-2')
+
+        assert first.get_stats()['completed'] == 1
+        assert second.get_stats()['skipped_budget'] == 1
+
+    @pytest.mark.asyncio
+    async def test_job_dropped_under_rate_limit_pressure_is_refunded(self):
+        ai_service = FakeAIService()
+        ai_service.rate_governors['openai'].requests._tokens = 10  # under half of 60 left
+        generator = make_generator(ai_service, tier_budgets={'growth': 1})
+
+        assert await run_job(generator, 'analysis-1') is True
+        assert generator.get_stats()['skipped_pressure'] == 1
+        assert ai_service.calls == []
+
+        ai_service.rate_governors['openai'].requests._tokens = 60
+        assert await run_job(generator, 'analysis-2') is True
+        assert generator.get_stats()['completed'] == 1
+        await run_job(generator, 'analysis-3')
+        assert generator.get_stats()['skipped_budget'] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_job_is_refunded(self):
+        ai_service = FakeAIService(error=RuntimeError("All AI providers failed"))
+        generator = make_generator(ai_service, tier_budgets={'growth': 1})
+
+        assert await run_job(generator, 'analysis-1') is True
+        assert generator.get_stats()['failed'] == 1
+        assert await generator.claim('analysis-1', 7) is None
+
+        ai_service.error = None
+        assert await run_job(generator, 'analysis-2') is True
+        assert generator.get_stats()['completed'] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_job_is_refunded(self):
+        generator = make_generator(FakeAIService(delay=1.0), tier_budgets={'growth': 1})
+        generator.schedule('analysis-1', 7, 'growth', AD)
+        task = generator._tasks['analysis-1']
+        await asyncio.sleep(0)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        usage_day, _ = generator._utc_day()
+        assert await generator._store.increment(generator._usage_key('7', usage_day), 0) == 0
+
+    @pytest.mark.asyncio
+    async def test_refund_after_day_rollover_does_not_touch_new_day(self):
+        generator = make_generator(FakeAIService(delay=0.05, error=RuntimeError("upstream down")))
+        generator.schedule('analysis-1', 7, 'growth', AD)
+        task = generator._tasks['analysis-1']
+        await asyncio.sleep(0)
+
+        # The UTC day ends while the job runs and the user is charged for the new day
+        generator._utc_day = lambda: ('2999-01-01', 60.0)
+        await generator._store.increment(generator._usage_key('7', '2999-01-01'), 1)
+        await task
+
+        assert await generator._store.increment(generator._usage_key('7', '2999-01-01'), 0) == 1
+
+
+class TestGenerateAlternativesEndpoint:
+    """/generate-alternatives answers in one shape whether or not speculation hit"""
+
+    @pytest.mark.asyncio
+    async def test_claimed_alternatives_are_serialized_as_ad_alternatives(self, monkeypatch):
+        from app.api import ads
+        from app.schemas.ads import AdAlternative, AdInput
+
+        generator = make_generator()
+        await run_job(generator, 'analysis-1')
+        monkeypatch.setattr(ads.settings, 'SPECULATIVE_GENERATION_ENABLED', True)
+        monkeypatch.setattr(ads.settings, 'SPECULATIVE_GENERATION_CLAIM_WAIT', 0.0)
+        monkeypatch.setattr(ads, 'get_speculative_generator', lambda: generator)
+
+        response = await ads.generate_alternatives(
+            AdInput(**AD), analysis_id='analysis-1', db=None, current_user=SimpleNamespace(id=7)
+        )
+
+        assert response['pregenerated'] is True
+        assert all(isinstance(alternative, AdAlternative) for alternative in response['alternatives'])
+        assert [alternative.variant_type for alternative in response['alternatives']] == generator.variant_types
+        assert 'expected_improvement' in response['alternatives'][0].dict()
@@ -0,0 +1,82 @@
+"""
+Tests for the incremental HEADLINE/BODY/CTA/REASON response parser.
+"""
+from app.services.streaming_response_parser import StreamingFieldParser, parse_field_line
+
+
+RESPONSE = (
+    "HEADLINE: Coffee roasted this week\n"
+    "BODY: Beans roasted on Monday are in your cup by Wednesday.\n"
+    "CTA: Start your subscription\n"
+    "REASON: Concrete freshness promise"
+)
+
+
+class TestParseFieldLine:
+    """Test suite for parse_field_line"""
+
+    def test_known_field(self):
+        assert parse_field_line("  headline :  Coffee roasted this week ") == (
+            'headline', "Coffee roasted this week"
+        )
+
+    def test_value_may_contain_colons(self):
+        assert parse_field_line("BODY: Ready at 7:30 every morning") == ('body_text', "Ready at 7:30 every morning")
+
+    def test_unknown_or_malformed_lines(self):
+        assert parse_field_line("Here is your ad copy") is None
+        assert parse_field_line("TITLE: Coffee") is None
+        assert parse_field_line("") is None
+
+    def test_value_truncated_to_field_limit(self):
+        assert len(parse_field_line("CTA: " + "x" * 100)[1]) == 40
+
+
+class TestStreamingFieldParser:
+    """Test suite for StreamingFieldParser"""
+
+    def test_fields_split_across_chunk_boundaries(self):
+        parser = StreamingFieldParser()
+        chunks = [RESPONSE[i:i + 7] for i in range(0, len(RESPONSE), 7)]
+
+        completed = []
+        for chunk in chunks:
+            completed.extend(parser.feed(chunk))
+        completed.extend(parser.close())
+
+        assert [field for field, _ in completed] == ['headline', 'body_text', 'cta', 'improvement_reason']
+        assert parser.fields['body_text'] == "Beans roasted on Monday are in your cup by Wednesday."
+        assert parser.fields['improvement_reason'] == "Concrete freshness promise"
+
+    def test_field_reported_only_once_its_line_ends(self):
+        parser = StreamingFieldParser()
+
+        assert parser.feed("HEADLINE: Coffee ro") == []
+        assert parser.feed("asted this week") == []
+        assert parser.feed("\nBO") == [('headline', "Coffee roasted this week")]
+
+    def test_key_split_across_chunks(self):
+        parser = StreamingFieldParser()
+
+        assert parser.feed("HEAD") == []
+        assert parser.feed("LINE: Coffee\nC") == [('headline', "Coffee")]
+        assert parser.feed("TA: Order now\n") == [('cta', "Order now")]
+
+    def test_close_flushes_unterminated_line(self):
+        parser = StreamingFieldParser()
+        parser.feed("REASON: Concrete freshness promise")
+
+        assert parser.close() == [('improvement_reason', "Concrete freshness promise")]
+        assert parser.close() == []
+
+    def test_repeated_field_reported_again_and_later_value_wins(self):
+        parser = StreamingFieldParser()
+
+        parser.feed("CTA: Order now\n")
+        assert parser.feed("CTA: Start your subscription\n") == [('cta', "Start your subscription")]
+        assert parser.fields['cta'] == "Start your subscription"
+
+    def test_preamble_and_blank_lines_are_ignored(self):
+        parser = StreamingFieldParser()
+
+        assert parser.feed("Sure! Here is the rewrite:\n\nHEADLINE: Coffee\n") == [('headline', "Coffee")]
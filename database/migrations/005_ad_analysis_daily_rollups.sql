@@ -0,0 +1,222 @@
+-- ============================================================================
+-- AdCopySurge Dashboard Rollups Migration
+-- Per-user daily aggregates of ad_analyses, maintained by triggers, so the
+-- dashboard reads a few rows per day instead of the user's whole history
+-- ============================================================================
+
+BEGIN;
+
+-- ============================================================================
+-- STEP 1: Create ad_analysis_daily_rollups table
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS ad_analysis_daily_rollups (
+  user_id UUID NOT NULL,
+  day DATE NOT NULL,                          -- UTC day of ad_analyses.created_at
+  platform TEXT NOT NULL,
+  industry TEXT NOT NULL DEFAULT 'Unknown',   -- NULL industries are rolled up as 'Unknown'
+
+  analyses_count INTEGER NOT NULL DEFAULT 0,
+  score_sum NUMERIC NOT NULL DEFAULT 0,
+  score_min NUMERIC,
+  score_max NUMERIC,
+  improvement_sum NUMERIC NOT NULL DEFAULT 0, -- SUM(GREATEST(overall_score - 50, 0))
+
+  -- Score-bucket histogram (same ranges as the dashboard score distribution)
+  bucket_excellent INTEGER NOT NULL DEFAULT 0,          -- 90-100
+  bucket_good INTEGER NOT NULL DEFAULT 0,               -- 80-89
+  bucket_fair INTEGER NOT NULL DEFAULT 0,               -- 70-79
+  bucket_poor INTEGER NOT NULL DEFAULT 0,               -- 60-69
+  bucket_needs_improvement INTEGER NOT NULL DEFAULT 0,  -- <60
+
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+  PRIMARY KEY (user_id, day, platform, industry)
+);
+
+COMMENT ON TABLE ad_analysis_daily_rollups IS 'Per-user daily ad analysis aggregates by platform and industry, maintained by triggers on ad_analyses';
+COMMENT ON COLUMN ad_analysis_daily_rollups.improvement_sum IS 'Sum of score improvement over the 50-point baseline, for average improvement';
+
+-- Partial edge days of a dashboard window are read from ad_analyses
+CREATE INDEX IF NOT EXISTS idx_ad_analyses_user_created ON ad_analyses(user_id, created_at DESC);
+
+-- ============================================================================
+-- STEP 2: Maintenance functions
+-- ============================================================================
+
+-- Add one analysis to its rollup row (insert hot path)
+CREATE OR REPLACE FUNCTION ad_analysis_rollup_add(
+  p_user_id UUID,
+  p_created_at TIMESTAMPTZ,
+  p_platform TEXT,
+  p_industry TEXT,
+  p_score NUMERIC
+)
+RETURNS VOID AS $$
+BEGIN
+  IF p_score IS NULL THEN
+    RETURN;
+  END IF;
+
+  INSERT INTO ad_analysis_daily_rollups AS r (
+    user_id, day, platform, industry,
+    analyses_count, score_sum, score_min, score_max, improvement_sum,
+    bucket_excellent, bucket_good, bucket_fair, bucket_poor, bucket_needs_improvement
+  )
+  VALUES (
+    p_user_id,
+    (p_created_at AT TIME ZONE 'UTC')::DATE,
+    p_platform,
+    COALESCE(p_industry, 'Unknown'),
+    1, p_score, p_score, p_score, GREATEST(p_score - 50, 0),
+    (p_score >= 90)::INTEGER,
+    (p_score >= 80 AND p_score < 90)::INTEGER,
+    (p_score >= 70 AND p_score < 80)::INTEGER,
+    (p_score >= 60 AND p_score < 70)::INTEGER,
+    (p_score < 60)::INTEGER
+  )
+  ON CONFLICT (user_id, day, platform, industry) DO UPDATE SET
+    analyses_count = r.analyses_count + 1,
+    score_sum = r.score_sum + EXCLUDED.score_sum,
+    score_min = LEAST(r.score_min, EXCLUDED.score_min),
+    score_max = GREATEST(r.score_max, EXCLUDED.score_max),
+    improvement_sum = r.improvement_sum + EXCLUDED.improvement_sum,
+    bucket_excellent = r.bucket_excellent + EXCLUDED.bucket_excellent,
+    bucket_good = r.bucket_good + EXCLUDED.bucket_good,
+    bucket_fair = r.bucket_fair + EXCLUDED.bucket_fair,
+    bucket_poor = r.bucket_poor + EXCLUDED.bucket_poor,
+    bucket_needs_improvement = r.bucket_needs_improvement + EXCLUDED.bucket_needs_improvement,
+    updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recompute one rollup row from ad_analyses (deletes and score edits, where MIN/MAX
+-- cannot be maintained incrementally; reads a single user-day through idx_ad_analyses_user_created)
+CREATE OR REPLACE FUNCTION ad_analysis_rollup_refresh(
+  p_user_id UUID,
+  p_created_at TIMESTAMPTZ,
+  p_platform TEXT,
+  p_industry TEXT
+)
+RETURNS VOID AS $$
+DECLARE
+  v_day DATE := (p_created_at AT TIME ZONE 'UTC')::DATE;
+  v_day_start TIMESTAMPTZ := v_day::TIMESTAMP AT TIME ZONE 'UTC';
+BEGIN
+  DELETE FROM ad_analysis_daily_rollups
+  WHERE user_id = p_user_id
+    AND day = v_day
+    AND platform = p_platform
+    AND industry = COALESCE(p_industry, 'Unknown');
+
+  INSERT INTO ad_analysis_daily_rollups (
+    user_id, day, platform, industry,
+    analyses_count, score_sum, score_min, score_max, improvement_sum,
+    bucket_excellent, bucket_good, bucket_fair, bucket_poor, bucket_needs_improvement
+  )
+  SELECT
+    p_user_id, v_day, p_platform, COALESCE(p_industry, 'Unknown'),
+    COUNT(*), SUM(overall_score), MIN(overall_score), MAX(overall_score),
+    SUM(GREATEST(overall_score - 50, 0)),
+    COUNT(*) FILTER (WHERE overall_score >= 90),
+    COUNT(*) FILTER (WHERE overall_score >= 80 AND overall_score < 90),
+    COUNT(*) FILTER (WHERE overall_score >= 70 AND overall_score < 80),
+    COUNT(*) FILTER (WHERE overall_score >= 60 AND overall_score < 70),
+    COUNT(*) FILTER (WHERE overall_score < 60)
+  FROM ad_analyses
+  WHERE user_id = p_user_id
+    AND created_at >= v_day_start
+    AND created_at < v_day_start + INTERVAL '1 day'
+    AND platform = p_platform
+    AND COALESCE(industry, 'Unknown') = COALESCE(p_industry, 'Unknown')
+    AND overall_score IS NOT NULL
+  HAVING COUNT(*) > 0;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION ad_analyses_maintain_rollups()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM ad_analysis_rollup_add(NEW.user_id, NEW.created_at, NEW.platform, NEW.industry, NEW.overall_score);
+    RETURN NEW;
+  END IF;
+
+  IF TG_OP = 'DELETE' THEN
+    PERFORM ad_analysis_rollup_refresh(OLD.user_id, OLD.created_at, OLD.platform, OLD.industry);
+    RETURN OLD;
+  END IF;
+
+  -- UPDATE: only rows whose rollup inputs changed
+  IF (NEW.user_id, NEW.created_at, NEW.platform, NEW.industry, NEW.overall_score)
+     IS DISTINCT FROM (OLD.user_id, OLD.created_at, OLD.platform, OLD.industry, OLD.overall_score) THEN
+    PERFORM ad_analysis_rollup_refresh(OLD.user_id, OLD.created_at, OLD.platform, OLD.industry);
+    PERFORM ad_analysis_rollup_refresh(NEW.user_id, NEW.created_at, NEW.platform, NEW.industry);
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;  -- users may not write rollups directly (RLS)
+
+-- ============================================================================
+-- STEP 3: Triggers
+-- ============================================================================
+
+DROP TRIGGER IF EXISTS maintain_ad_analysis_rollups ON ad_analyses;
+CREATE TRIGGER maintain_ad_analysis_rollups
+  AFTER INSERT OR UPDATE OR DELETE ON ad_analyses
+  FOR EACH ROW
+  EXECUTE FUNCTION ad_analyses_maintain_rollups();
+
+-- ============================================================================
+-- STEP 4: Backfill existing analyses
+-- ============================================================================
+
+-- Block writes while backfilling so no insert is counted twice or missed
+LOCK TABLE ad_analyses IN SHARE ROW EXCLUSIVE MODE;
+
+TRUNCATE ad_analysis_daily_rollups;
+
+INSERT INTO ad_analysis_daily_rollups (
+  user_id, day, platform, industry,
+  analyses_count, score_sum, score_min, score_max, improvement_sum,
+  bucket_excellent, bucket_good, bucket_fair, bucket_poor, bucket_needs_improvement
+)
+SELECT
+  user_id,
+  (created_at AT TIME ZONE 'UTC')::DATE,
+  platform,
+  COALESCE(industry, 'Unknown'),
+  COUNT(*), SUM(overall_score), MIN(overall_score), MAX(overall_score),
+  SUM(GREATEST(overall_score - 50, 0)),
+  COUNT(*) FILTER (WHERE overall_score >= 90),
+  COUNT(*) FILTER (WHERE overall_score >= 80 AND overall_score < 90),
+  COUNT(*) FILTER (WHERE overall_score >= 70 AND overall_score < 80),
+  COUNT(*) FILTER (WHERE overall_score >= 60 AND overall_score < 70),
+  COUNT(*) FILTER (WHERE overall_score < 60)
+FROM ad_analyses
+WHERE overall_score IS NOT NULL
+GROUP BY user_id, (created_at AT TIME ZONE 'UTC')::DATE, platform, COALESCE(industry, 'Unknown');
+
+-- ============================================================================
+-- STEP 5: Row level security
+-- ============================================================================
+
+ALTER TABLE ad_analysis_daily_rollups ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view own rollups" ON ad_analysis_daily_rollups;
+CREATE POLICY "Users can view own rollups" ON ad_analysis_daily_rollups
+  FOR SELECT USING (auth.uid() = user_id);
+
+COMMIT;
+
+-- ============================================================================
+-- VERIFICATION QUERIES (Optional - for testing)
+-- ============================================================================
+
+-- Rollup totals should match the raw table
+-- SELECT
+--   (SELECT SUM(analyses_count) FROM ad_analysis_daily_rollups) AS rolled_up,
+--   (SELECT COUNT(*) FROM ad_analyses WHERE overall_score IS NOT NULL) AS raw;
+
+-- Rollup rows for one user
+-- SELECT * FROM ad_analysis_daily_rollups WHERE user_id = '<user-uuid>' ORDER BY day DESC;